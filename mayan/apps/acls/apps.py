@@ -1,3 +1,9 @@
+from celery.signals import task_postrun, task_prerun
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished, request_started
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.apps import MayanAppConfig
@@ -9,6 +15,11 @@ from mayan.apps.views.html_widgets import ObjectLinkWidget
 
 from .classes import ModelPermission
 from .events import event_acl_deleted, event_acl_edited
+from .handlers import (
+    handler_access_cache_activate, handler_access_cache_clear,
+    handler_access_cache_deactivate, handler_effective_access_acl_delete,
+    handler_effective_access_acl_permissions
+)
 from .links import (
     link_acl_create, link_acl_delete, link_acl_permissions,
     link_global_acl_list
@@ -30,6 +41,8 @@ class ACLsApp(MayanAppConfig):
         GlobalAccessControlListProxy = self.get_model(
             model_name='GlobalAccessControlListProxy'
         )
+        Role = apps.get_model(app_label='permissions', model_name='Role')
+        User = get_user_model()
 
         EventModelRegistry.register(model=AccessControlList, menu=menu_object)
 
@@ -76,3 +89,59 @@ class ACLsApp(MayanAppConfig):
         menu_setup.bind_links(
             links=(link_global_acl_list,)
         )
+
+        for model in (AccessControlList, GlobalAccessControlListProxy):
+            post_delete.connect(
+                dispatch_uid='acls_handler_effective_access_acl_delete_{}'.format(
+                    model._meta.model_name
+                ), receiver=handler_effective_access_acl_delete,
+                sender=model
+            )
+
+        m2m_changed.connect(
+            dispatch_uid='acls_handler_effective_access_acl_permissions',
+            receiver=handler_effective_access_acl_permissions,
+            sender=AccessControlList.permissions.through
+        )
+
+        # Access decisions are memoized for the duration of each request
+        # and task.
+        request_started.connect(
+            dispatch_uid='acls_handler_access_cache_activate_request',
+            receiver=handler_access_cache_activate
+        )
+        request_finished.connect(
+            dispatch_uid='acls_handler_access_cache_deactivate_request',
+            receiver=handler_access_cache_deactivate
+        )
+        # Celery signals only accept the receiver as a positional argument.
+        task_prerun.connect(
+            handler_access_cache_activate,
+            dispatch_uid='acls_handler_access_cache_activate_task'
+        )
+        task_postrun.connect(
+            handler_access_cache_deactivate,
+            dispatch_uid='acls_handler_access_cache_deactivate_task'
+        )
+
+        for model in (AccessControlList, GlobalAccessControlListProxy):
+            post_delete.connect(
+                dispatch_uid='acls_handler_access_cache_clear_delete_{}'.format(
+                    model._meta.model_name
+                ), receiver=handler_access_cache_clear, sender=model
+            )
+            post_save.connect(
+                dispatch_uid='acls_handler_access_cache_clear_save_{}'.format(
+                    model._meta.model_name
+                ), receiver=handler_access_cache_clear, sender=model
+            )
+
+        for through in (
+            AccessControlList.permissions.through, Role.groups.through,
+            Role.permissions.through, User.groups.through
+        ):
+            m2m_changed.connect(
+                dispatch_uid='acls_handler_access_cache_clear_{}'.format(
+                    through._meta.label
+                ), receiver=handler_access_cache_clear, sender=through
+            )
@@ -1,8 +1,10 @@
 import itertools
 import logging
+import threading
 
 from django.apps import apps
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
 
@@ -12,6 +14,56 @@ from mayan.apps.events.classes import EventModelRegistry
 logger = logging.getLogger(name=__name__)
 
 
+class AccessCache:
+    """
+    Memoize access decisions for the duration of a request or a task.
+    Entries are kept per thread and only while a scope is active, scopes
+    can be nested. The entries are cleared when access control lists,
+    roles or group memberships change.
+    """
+    _local = threading.local()
+
+    @staticmethod
+    def get_key_access(obj, permission, user):
+        return (
+            'access', user.pk, permission.pk, obj._meta.label, obj.pk
+        )
+
+    @staticmethod
+    def get_key_permission(permission, user):
+        return ('permission', user.pk, permission.pk)
+
+    @classmethod
+    def activate(cls):
+        cls._local.depth = getattr(cls._local, 'depth', 0) + 1
+        if cls._local.depth == 1:
+            cls._local.entries = {}
+
+    @classmethod
+    def clear(cls):
+        entries = getattr(cls._local, 'entries', None)
+        if entries:
+            entries.clear()
+
+    @classmethod
+    def deactivate(cls):
+        cls._local.depth = max(getattr(cls._local, 'depth', 0) - 1, 0)
+        if not cls._local.depth:
+            cls._local.entries = None
+
+    @classmethod
+    def get(cls, key):
+        entries = getattr(cls._local, 'entries', None)
+        if entries is not None:
+            return entries.get(key)
+
+    @classmethod
+    def set(cls, key, value):
+        entries = getattr(cls._local, 'entries', None)
+        if entries is not None:
+            entries[key] = value
+
+
 class ModelPermission:
     _field_query_functions = {}
     _inheritances = {}
@@ -19,9 +71,60 @@ class ModelPermission:
     _manager_names = {}
     _model_permissions = {}
 
+    @classmethod
+    def _connect_effective_access_handlers(cls, model, connect_save=False):
+        """
+        Connect the effective access handlers only to the models that can
+        be granted access or inherit it. A catch all receiver would
+        disable the fast delete path of every other model.
+        """
+        from .handlers import (
+            handler_effective_access_instance_delete,
+            handler_effective_access_instance_save
+        )
+
+        for sender in cls._get_model_and_proxies(model=model):
+            post_delete.connect(
+                dispatch_uid='acls_handler_effective_access_instance_delete',
+                receiver=handler_effective_access_instance_delete,
+                sender=sender
+            )
+            if connect_save:
+                post_save.connect(
+                    dispatch_uid='acls_handler_effective_access_instance_save',
+                    receiver=handler_effective_access_instance_save,
+                    sender=sender
+                )
+
+    @classmethod
+    def _get_model_and_proxies(cls, model):
+        concrete_model = model._meta.concrete_model
+        result = [model]
+
+        for proxy_model in apps.get_models():
+            if proxy_model._meta.proxy and proxy_model._meta.concrete_model == concrete_model and proxy_model not in result:
+                result.append(proxy_model)
+
+        return result
+
     @classmethod
     def deregister(cls, model):
         cls._model_permissions.pop(model, None)
+        cls._inheritances.pop(model, None)
+        cls._inheritances_reverse.pop(model, None)
+
+        for models in cls._inheritances_reverse.values():
+            while model in models:
+                models.remove(model)
+
+        post_delete.disconnect(
+            dispatch_uid='acls_handler_effective_access_instance_delete',
+            sender=model
+        )
+        post_save.disconnect(
+            dispatch_uid='acls_handler_effective_access_instance_save',
+            sender=model
+        )
 
     @classmethod
     def get_classes(cls, as_content_type=False):
@@ -149,6 +252,8 @@ class ModelPermission:
         # Allow the model to be used as the action_object for the ACL events.
         EventModelRegistry.register(model=model)
 
+        cls._connect_effective_access_handlers(model=model)
+
     @classmethod
     def register_field_query_function(cls, model, function):
         cls._field_query_functions[model] = function
@@ -166,6 +271,10 @@ class ModelPermission:
             {'field_name': related, 'fk_field_cast': fk_field_cast}
         )
 
+        cls._connect_effective_access_handlers(
+            connect_save=True, model=model
+        )
+
     @classmethod
     def register_manager(cls, model, manager_name):
         cls._manager_names[model] = manager_name
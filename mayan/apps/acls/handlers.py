@@ -0,0 +1,104 @@
+from django.apps import apps
+
+from .classes import AccessCache, ModelPermission
+from .settings import setting_effective_access_enabled
+
+
+def handler_access_cache_activate(sender, **kwargs):
+    AccessCache.activate()
+
+
+def handler_access_cache_clear(sender, **kwargs):
+    AccessCache.clear()
+
+
+def handler_access_cache_deactivate(sender, **kwargs):
+    AccessCache.deactivate()
+
+
+def handler_effective_access_acl_delete(sender, **kwargs):
+    if not setting_effective_access_enabled.value:
+        return
+
+    EffectiveAccess = apps.get_model(
+        app_label='acls', model_name='EffectiveAccess'
+    )
+
+    instance = kwargs['instance']
+    model = instance.content_type.model_class()
+
+    if model:
+        EffectiveAccess.objects.refresh(
+            model=model, object_ids=(instance.object_id,)
+        )
+
+
+def handler_effective_access_acl_permissions(sender, **kwargs):
+    if not setting_effective_access_enabled.value:
+        return
+
+    if kwargs['action'] not in ('post_add', 'post_clear', 'post_remove'):
+        return
+
+    AccessControlList = apps.get_model(
+        app_label='acls', model_name='AccessControlList'
+    )
+    EffectiveAccess = apps.get_model(
+        app_label='acls', model_name='EffectiveAccess'
+    )
+
+    if kwargs['reverse']:
+        if kwargs['pk_set'] is None:
+            # A permission was removed from all the access control lists.
+            EffectiveAccess.objects.rebuild()
+            return
+
+        acls = AccessControlList.objects.filter(pk__in=kwargs['pk_set'])
+    else:
+        acls = (kwargs['instance'],)
+
+    for acl in acls:
+        model = acl.content_type.model_class()
+
+        if model:
+            EffectiveAccess.objects.refresh(
+                model=model, object_ids=(acl.object_id,)
+            )
+
+
+def handler_effective_access_instance_delete(sender, **kwargs):
+    if not setting_effective_access_enabled.value:
+        return
+
+    # Only objects that can be granted access or inherit it have entries.
+    models = (sender, sender._meta.concrete_model)
+    if any(
+        model in ModelPermission._model_permissions or model in ModelPermission._inheritances
+        for model in models
+    ):
+        EffectiveAccess = apps.get_model(
+            app_label='acls', model_name='EffectiveAccess'
+        )
+        EffectiveAccess.objects.delete_objects(
+            model=sender, object_ids=(kwargs['instance'].pk,)
+        )
+
+
+def handler_effective_access_instance_save(sender, **kwargs):
+    if not setting_effective_access_enabled.value:
+        return
+
+    try:
+        ModelPermission.get_inheritances(model=sender)
+    except KeyError:
+        """
+        The model doesn't inherit access, its effective access only
+        changes with its access control lists.
+        """
+    else:
+        EffectiveAccess = apps.get_model(
+            app_label='acls', model_name='EffectiveAccess'
+        )
+        EffectiveAccess.objects.refresh(
+            model=sender, object_ids=(kwargs['instance'].pk,)
+        )
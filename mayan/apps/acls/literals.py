@@ -0,0 +1,5 @@
+DEFAULT_ACLS_EFFECTIVE_ACCESS_ENABLED = False
+
+EFFECTIVE_ACCESS_BATCH_SIZE = 1000
+
+TASK_EFFECTIVE_ACCESS_RETRY_DELAY = 10
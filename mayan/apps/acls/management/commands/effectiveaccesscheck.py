@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import EffectiveAccess
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the effective access table with the access control lists '
+        'and report the entries that are missing or should not exist.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verbose-entries', action='store_true', dest='verbose_entries',
+            help='Show each inconsistent entry.'
+        )
+
+    def handle(self, *args, **options):
+        result = EffectiveAccess.objects.check_consistency()
+
+        for label in ('missing', 'extra'):
+            self.stdout.write(
+                '{}: {}'.format(label.capitalize(), len(result[label]))
+            )
+            if options['verbose_entries']:
+                for entry in sorted(result[label]):
+                    self.stdout.write(
+                        '    content type: {}, object: {}, role: {}, '
+                        'permission: {}'.format(*entry)
+                    )
+
+        if result['missing'] or result['extra']:
+            raise CommandError(
+                'The effective access table is not consistent. Run the '
+                '"effectiveaccessrebuild" command to recreate it.'
+            )
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from ...models import EffectiveAccess
+
+
+class Command(BaseCommand):
+    help = 'Recreate the effective access table from the access control lists.'
+
+    def handle(self, *args, **options):
+        EffectiveAccess.objects.rebuild()
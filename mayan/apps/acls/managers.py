@@ -2,10 +2,11 @@ from functools import reduce
 import logging
 import operator
 
+from django.apps import apps
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
-from django.db import models
+from django.db import models, transaction
 from django.db.models import CharField, Q, Value
 from django.db.models.functions import Cast, Concat
 from django.utils.encoding import force_text
@@ -18,7 +19,9 @@ from mayan.apps.permissions import Permission
 from mayan.apps.permissions.models import StoredPermission
 
 from .exceptions import PermissionNotValidForClass
-from .classes import ModelPermission
+from .classes import AccessCache, ModelPermission
+from .literals import EFFECTIVE_ACCESS_BATCH_SIZE
+from .settings import setting_effective_access_enabled
 
 logger = logging.getLogger(name=__name__)
 
@@ -245,18 +248,10 @@ class AccessControlListManager(models.Manager):
                 ) % force_text(s=obj)
             )
             return True
-        else:
-            manager = ModelPermission.get_manager(model=obj._meta.model)
-            source_queryset = manager.all()
-
-        restricted_queryset = manager.none()
-        for permission in permissions:
-            # Default relationship betweens permissions is OR.
-            restricted_queryset = restricted_queryset | self.restrict_queryset(
-                permission=permission, queryset=source_queryset, user=user
-            )
 
-        if restricted_queryset.filter(pk=obj.pk).exists():
+        if self.restrict_objects(
+            objects=(obj,), permissions=permissions, user=user
+        ):
             return True
         else:
             raise PermissionDenied(
@@ -265,16 +260,61 @@ class AccessControlListManager(models.Manager):
                 )
             )
 
+    def check_user_permissions(self, permissions, user):
+        """
+        Memoized version of Permission.check_user_permissions.
+        """
+        for permission in permissions:
+            key = AccessCache.get_key_permission(
+                permission=permission, user=user
+            )
+            result = AccessCache.get(key=key)
+
+            if result is None:
+                try:
+                    Permission.check_user_permissions(
+                        permissions=(permission,), user=user
+                    )
+                except PermissionDenied:
+                    result = False
+                else:
+                    result = True
+
+                AccessCache.set(key=key, value=result)
+
+            if result:
+                return True
+
+        raise PermissionDenied(ugettext(message='Insufficient permissions.'))
+
     def restrict_queryset(self, permission, queryset, user):
         if not user.is_authenticated:
             return queryset.none()
 
         # Check directly granted permission via a role
         try:
-            Permission.check_user_permissions(
+            self.check_user_permissions(
                 permissions=(permission,), user=user
             )
         except PermissionDenied:
+            if setting_effective_access_enabled.value:
+                try:
+                    ModelPermission.get_field_query_function(
+                        model=queryset.model._meta.concrete_model
+                    )
+                except KeyError:
+                    EffectiveAccess = apps.get_model(
+                        app_label='acls', model_name='EffectiveAccess'
+                    )
+                    return queryset.filter(
+                        pk__in=EffectiveAccess.objects.filter(
+                            content_type=ContentType.objects.get_for_model(
+                                model=queryset.model
+                            ), role__groups__user=user,
+                            stored_permission=permission.stored_permission
+                        ).values('object_id')
+                    )
+
             acl_filters = self._get_acl_filters(
                 queryset=queryset,
                 stored_permission=permission.stored_permission, user=user
@@ -293,6 +333,56 @@ class AccessControlListManager(models.Manager):
             # or is staff. Return the entire queryset.
             return queryset
 
+    def restrict_objects(self, objects, permissions, user):
+        """
+        Return the objects of the list the user can access with any of the
+        permissions. The access not already memoized is resolved with one
+        query per model and permission.
+        """
+        granted = set()
+
+        for permission in permissions:
+            pending = {}
+
+            for obj in objects:
+                if id(obj) in granted:
+                    continue
+
+                result = AccessCache.get(
+                    key=AccessCache.get_key_access(
+                        obj=obj, permission=permission, user=user
+                    )
+                )
+
+                if result is None:
+                    pending.setdefault(obj._meta.model, []).append(obj)
+                elif result:
+                    granted.add(id(obj))
+
+            for model, model_objects in pending.items():
+                manager = ModelPermission.get_manager(model=model)
+
+                object_ids = set(
+                    self.restrict_queryset(
+                        permission=permission, queryset=manager.filter(
+                            pk__in=[obj.pk for obj in model_objects]
+                        ), user=user
+                    ).values_list('pk', flat=True)
+                )
+
+                for obj in model_objects:
+                    result = obj.pk in object_ids
+                    AccessCache.set(
+                        key=AccessCache.get_key_access(
+                            obj=obj, permission=permission, user=user
+                        ), value=result
+                    )
+
+                    if result:
+                        granted.add(id(obj))
+
+        return [obj for obj in objects if id(obj) in granted]
+
     def get_inherited_permissions(self, obj, role):
         # Get permission inherited from a related object's ACLs.
         queryset = self._get_inherited_object_permissions(obj=obj, role=role)
@@ -380,3 +470,310 @@ class AccessControlListManager(models.Manager):
 
         if acl.permissions.count() == 0:
             acl.delete()
+
+
+class EffectiveAccessManager(models.Manager):
+    """
+    The effective access of an object is the union of the access granted
+    by its access control lists and the effective access of each of its
+    inheritance parents. Refreshing an object whose effective access
+    changes refreshes the objects that inherit from it.
+    """
+    @staticmethod
+    def _get_inheritance_lookups(model, field_name):
+        """
+        Return the parent model and the lookups of the content type and of
+        the primary key of the parent. The parent model and the content
+        type lookup are None for generic foreign keys and regular foreign
+        keys respectively.
+        """
+        related_field = get_related_field(
+            model=model, related_field_name=field_name
+        )
+
+        if isinstance(related_field, GenericForeignKey):
+            prefix = field_name.split('__')[0:-1]
+            return (
+                None, '__'.join(prefix + [related_field.ct_field]),
+                '__'.join(prefix + [related_field.fk_field])
+            )
+        else:
+            return related_field.related_model, None, field_name
+
+    def _get_child_querysets(self, model, object_ids):
+        """
+        Yield the model and the queryset of the instances that inherit
+        access from the specified instances.
+        """
+        content_type = ContentType.objects.get_for_model(model=model)
+
+        child_models = set(
+            ModelPermission._inheritances_reverse.get(
+                model._meta.concrete_model, ()
+            )
+        )
+        # Generic foreign keys can point to any model.
+        child_models.update(ModelPermission._inheritances_reverse.get(None, ()))
+
+        for child_model in child_models:
+            for inheritance in ModelPermission.get_inheritances(model=child_model):
+                parent_model, content_type_lookup, object_id_lookup = self._get_inheritance_lookups(
+                    field_name=inheritance['field_name'], model=child_model
+                )
+
+                if content_type_lookup:
+                    lookups = {
+                        content_type_lookup: content_type,
+                        '{}__in'.format(object_id_lookup): object_ids
+                    }
+                elif parent_model._meta.concrete_model == model._meta.concrete_model:
+                    lookups = {'{}__in'.format(object_id_lookup): object_ids}
+                else:
+                    continue
+
+                yield child_model, child_model._base_manager.filter(**lookups)
+
+    def _get_object_permissions(self, model, object_ids):
+        """
+        Return a dictionary with the set of (role id, stored permission id)
+        pairs the objects should have.
+        """
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        result = {object_id: set() for object_id in object_ids}
+
+        acl_permissions = AccessControlList.objects.filter(
+            content_type=ContentType.objects.get_for_model(model=model),
+            object_id__in=object_ids, permissions__isnull=False
+        ).values_list('object_id', 'role_id', 'permissions')
+
+        for object_id, role_id, stored_permission_id in acl_permissions:
+            result[object_id].add((role_id, stored_permission_id))
+
+        try:
+            inheritances = ModelPermission.get_inheritances(model=model)
+        except KeyError:
+            return result
+
+        for inheritance in inheritances:
+            parent_model, content_type_lookup, object_id_lookup = self._get_inheritance_lookups(
+                field_name=inheritance['field_name'], model=model
+            )
+
+            # Parent (content type id, object id) of each object.
+            parents = {}
+            if content_type_lookup:
+                values = model._base_manager.filter(
+                    pk__in=object_ids
+                ).values_list('pk', content_type_lookup, object_id_lookup)
+
+                for object_id, content_type_id, parent_id in values:
+                    try:
+                        parents.setdefault(
+                            (content_type_id, int(parent_id)), set()
+                        ).add(object_id)
+                    except (TypeError, ValueError):
+                        """
+                        Unset or non integer parent reference, can't have
+                        access entries.
+                        """
+            else:
+                content_type_id = ContentType.objects.get_for_model(
+                    model=parent_model
+                ).pk
+                values = model._base_manager.filter(
+                    pk__in=object_ids
+                ).values_list('pk', object_id_lookup)
+
+                for object_id, parent_id in values:
+                    if parent_id is not None:
+                        parents.setdefault(
+                            (content_type_id, parent_id), set()
+                        ).add(object_id)
+
+            parent_object_ids = {}
+            for content_type_id, parent_id in parents:
+                parent_object_ids.setdefault(content_type_id, []).append(
+                    parent_id
+                )
+
+            for content_type_id, parent_ids in parent_object_ids.items():
+                parent_permissions = self.filter(
+                    content_type_id=content_type_id, object_id__in=parent_ids
+                ).values_list('object_id', 'role_id', 'stored_permission_id')
+
+                for parent_id, role_id, stored_permission_id in parent_permissions:
+                    for object_id in parents[(content_type_id, parent_id)]:
+                        result[object_id].add((role_id, stored_permission_id))
+
+        return result
+
+    def check_consistency(self):
+        """
+        Compare the table with the result of a rebuild. Return the entries
+        that are missing and the ones that should not exist as tuples of
+        content type id, object id, role id and stored permission id.
+        """
+        field_names = (
+            'content_type_id', 'object_id', 'role_id', 'stored_permission_id'
+        )
+
+        current = set(self.values_list(*field_names))
+
+        with transaction.atomic():
+            savepoint = transaction.savepoint()
+            self.rebuild()
+            expected = set(self.values_list(*field_names))
+            transaction.savepoint_rollback(sid=savepoint)
+
+        return {
+            'extra': current - expected, 'missing': expected - current
+        }
+
+    def delete_objects(self, model, object_ids):
+        self.filter(
+            content_type=ContentType.objects.get_for_model(model=model),
+            object_id__in=object_ids
+        ).delete()
+
+    def rebuild(self):
+        """
+        Recreate the table from the access control lists.
+        """
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        with transaction.atomic():
+            self.all().delete()
+
+            object_ids = {}
+            for content_type_id, object_id in AccessControlList.objects.values_list('content_type_id', 'object_id'):
+                object_ids.setdefault(content_type_id, set()).add(object_id)
+
+            for content_type_id, ids in object_ids.items():
+                model = ContentType.objects.get_for_id(
+                    id=content_type_id
+                ).model_class()
+
+                if model:
+                    self.refresh(
+                        inline=True, model=model, object_ids=sorted(ids)
+                    )
+
+    def refresh(self, model, object_ids, inline=False):
+        """
+        Update the effective access of the objects. The objects that
+        inherit from those that lost access are updated before returning,
+        so that revocations take effect in the same transaction. The
+        objects that inherit from those that only gained access are
+        updated by a task once the transaction commits, or before returning
+        when `inline` is True.
+        """
+        object_ids = list(object_ids)
+
+        for index in range(0, len(object_ids), EFFECTIVE_ACCESS_BATCH_SIZE):
+            granted_object_ids, revoked_object_ids = self._refresh_batch(
+                model=model, object_ids=object_ids[
+                    index:index + EFFECTIVE_ACCESS_BATCH_SIZE
+                ]
+            )
+
+            if revoked_object_ids:
+                self.refresh_children(
+                    inline=True, model=model, object_ids=revoked_object_ids
+                )
+
+            if granted_object_ids:
+                if inline:
+                    self.refresh_children(
+                        inline=True, model=model,
+                        object_ids=granted_object_ids
+                    )
+                else:
+                    self._refresh_children_defer(
+                        model=model, object_ids=granted_object_ids
+                    )
+
+    def _refresh_batch(self, model, object_ids):
+        """
+        Update the effective access of the objects. Return the ids of the
+        objects that only gained entries and the ids of the objects that
+        lost at least one entry. Concurrent refreshes of the same objects
+        can insert the same entries, these are ignored.
+        """
+        content_type = ContentType.objects.get_for_model(model=model)
+
+        expected = self._get_object_permissions(
+            model=model, object_ids=object_ids
+        )
+
+        current = {object_id: set() for object_id in object_ids}
+        entries = self.filter(
+            content_type=content_type, object_id__in=object_ids
+        ).values_list('object_id', 'role_id', 'stored_permission_id')
+
+        for object_id, role_id, stored_permission_id in entries:
+            current[object_id].add((role_id, stored_permission_id))
+
+        granted_object_ids = []
+        revoked_object_ids = []
+
+        for object_id in object_ids:
+            if current[object_id] - expected[object_id]:
+                revoked_object_ids.append(object_id)
+            elif expected[object_id] != current[object_id]:
+                granted_object_ids.append(object_id)
+
+        changed_object_ids = granted_object_ids + revoked_object_ids
+
+        if not changed_object_ids:
+            return granted_object_ids, revoked_object_ids
+
+        with transaction.atomic():
+            self.filter(
+                content_type=content_type, object_id__in=changed_object_ids
+            ).delete()
+
+            self.bulk_create(
+                batch_size=EFFECTIVE_ACCESS_BATCH_SIZE, ignore_conflicts=True,
+                objs=[
+                    self.model(
+                        content_type=content_type, object_id=object_id,
+                        role_id=role_id,
+                        stored_permission_id=stored_permission_id
+                    ) for object_id in changed_object_ids
+                    for role_id, stored_permission_id in expected[object_id]
+                ]
+            )
+
+        return granted_object_ids, revoked_object_ids
+
+    def _refresh_children_defer(self, model, object_ids):
+        # Hide a circular import.
+        from .tasks import task_effective_access_refresh_children
+
+        transaction.on_commit(
+            func=lambda: task_effective_access_refresh_children.apply_async(
+                kwargs={
+                    'app_label': model._meta.app_label,
+                    'model_name': model._meta.model_name,
+                    'object_ids': object_ids
+                }
+            )
+        )
+
+    def refresh_children(self, model, object_ids, inline=False):
+        """
+        Update the effective access of the objects that inherit access
+        from the specified objects.
+        """
+        for child_model, queryset in self._get_child_querysets(
+            model=model, object_ids=object_ids
+        ):
+            self.refresh(
+                inline=inline, model=child_model,
+                object_ids=queryset.values_list('pk', flat=True)
+            )
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('permissions', '0004_auto_20191213_0044'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('acls', '0004_auto_20210130_0322'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EffectiveAccess',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.ContentType')),
+                ('role', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='effective_access', to='permissions.Role', verbose_name='Role')),
+                ('stored_permission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='effective_access', to='permissions.StoredPermission', verbose_name='Permission')),
+            ],
+            options={
+                'verbose_name': 'Effective access entry',
+                'verbose_name_plural': 'Effective access entries',
+                'unique_together': {('content_type', 'stored_permission', 'role', 'object_id')},
+            },
+        ),
+    ]
@@ -14,7 +14,7 @@ from mayan.apps.events.decorators import method_event
 from mayan.apps.permissions.models import Role, StoredPermission
 
 from .events import event_acl_created, event_acl_deleted, event_acl_edited
-from .managers import AccessControlListManager
+from .managers import AccessControlListManager, EffectiveAccessManager
 
 logger = logging.getLogger(name=__name__)
 
@@ -121,3 +121,38 @@ class AccessControlList(ExtraDataModelMixin, models.Model):
 class GlobalAccessControlListProxy(AccessControlList):
     class Meta:
         proxy = True
+
+
+class EffectiveAccess(models.Model):
+    """
+    Materialized access of a role to an object with a permission, granted
+    directly by an access control list or inherited from a parent object.
+    Maintained from the access control lists and the saved instances when
+    the ACLS_EFFECTIVE_ACCESS_ENABLED setting is enabled.
+    """
+    content_type = models.ForeignKey(
+        on_delete=models.CASCADE, related_name='+', to=ContentType
+    )
+    object_id = models.PositiveIntegerField()
+    role = models.ForeignKey(
+        on_delete=models.CASCADE, related_name='effective_access', to=Role,
+        verbose_name=_('Role')
+    )
+    stored_permission = models.ForeignKey(
+        on_delete=models.CASCADE, related_name='effective_access',
+        to=StoredPermission, verbose_name=_('Permission')
+    )
+
+    objects = EffectiveAccessManager()
+
+    class Meta:
+        unique_together = (
+            'content_type', 'stored_permission', 'role', 'object_id'
+        )
+        verbose_name = _('Effective access entry')
+        verbose_name_plural = _('Effective access entries')
+
+    def __str__(self):
+        return '{}: {}-{}'.format(
+            self.role, self.content_type, self.object_id
+        )
@@ -0,0 +1,14 @@
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.task_manager.classes import CeleryQueue
+from mayan.apps.task_manager.workers import worker_b
+
+queue_acls = CeleryQueue(
+    label=_('Access control lists'), name='acls', worker=worker_b
+)
+
+queue_acls.add_task_type(
+    dotted_path='mayan.apps.acls.tasks.task_effective_access_refresh_children',
+    label=_('Update the effective access of the objects inheriting access'),
+    name='task_effective_access_refresh_children'
+)
@@ -0,0 +1,20 @@
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.smart_settings.classes import SettingNamespace
+
+from .literals import DEFAULT_ACLS_EFFECTIVE_ACCESS_ENABLED
+
+namespace = SettingNamespace(
+    label=_('Access control lists'), name='acls'
+)
+
+setting_effective_access_enabled = namespace.add_setting(
+    default=DEFAULT_ACLS_EFFECTIVE_ACCESS_ENABLED,
+    global_name='ACLS_EFFECTIVE_ACCESS_ENABLED', help_text=_(
+        'Restrict querysets using the table of the effective access of '
+        'each role, including the access inherited from parent objects, '
+        'instead of resolving the access control lists on each query. '
+        'Run the "effectiveaccessrebuild" management command after '
+        'enabling.'
+    )
+)
@@ -0,0 +1,43 @@
+import logging
+
+from django.apps import apps
+from django.db import OperationalError
+
+from mayan.celery import app
+
+from .literals import TASK_EFFECTIVE_ACCESS_RETRY_DELAY
+
+logger = logging.getLogger(name=__name__)
+
+
+@app.task(
+    bind=True, default_retry_delay=TASK_EFFECTIVE_ACCESS_RETRY_DELAY,
+    ignore_result=True
+)
+def task_effective_access_refresh_children(
+    self, app_label, model_name, object_ids
+):
+    EffectiveAccess = apps.get_model(
+        app_label='acls', model_name='EffectiveAccess'
+    )
+
+    try:
+        model = apps.get_model(app_label=app_label, model_name=model_name)
+    except LookupError:
+        """
+        The app or model does not exists anymore. Non fatal, just exit
+        the task.
+        """
+        return
+
+    try:
+        EffectiveAccess.objects.refresh_children(
+            model=model, object_ids=object_ids
+        )
+    except OperationalError as exception:
+        logger.warning(
+            'Operational error refreshing the effective access of the '
+            'children of %s: %s; %s. Retrying.', model_name, object_ids,
+            exception
+        )
+        raise self.retry(exc=exception)
@@ -1,3 +1,5 @@
+import mock
+
 from django.core.exceptions import ImproperlyConfigured
 from django.db.models import Q
 
@@ -9,6 +11,7 @@ from mayan.apps.user_management.tests.mixins import UserTestCaseMixin
 from ..classes import ModelPermission
 from ..models import AccessControlList
 from ..permissions import permission_acl_edit, permission_acl_view
+from ..settings import setting_effective_access_enabled
 
 
 class ACLAPIViewTestMixin:
@@ -122,6 +125,28 @@ class ACLTestCaseMixin(RoleTestCaseMixin, UserTestCaseMixin):
         )
 
 
+class EffectiveAccessTestMixin:
+    def setUp(self):
+        super().setUp()
+        self._test_effective_access_enabled = setting_effective_access_enabled.value
+        setting_effective_access_enabled.set(value=True)
+
+        # The test case transaction is never committed, run the commit
+        # callbacks that update the children immediately.
+        patcher = mock.patch(
+            'mayan.apps.acls.managers.transaction.on_commit',
+            side_effect=lambda func: func()
+        )
+        self._test_on_commit = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        setting_effective_access_enabled.set(
+            value=self._test_effective_access_enabled
+        )
+        super().tearDown()
+
+
 class ACLTestMixin(RoleTestMixin):
     auto_create_test_role = True
     auto_create_acl_test_object = False
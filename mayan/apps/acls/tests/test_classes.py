@@ -1,6 +1,29 @@
 from mayan.apps.testing.tests.base import BaseTestCase
 
-from ..classes import ModelPermission
+from ..classes import AccessCache, ModelPermission
+
+
+class AccessCacheTestCase(BaseTestCase):
+    def tearDown(self):
+        AccessCache.deactivate()
+        super().tearDown()
+
+    def test_inactive(self):
+        AccessCache.set(key='test', value=True)
+        self.assertEqual(AccessCache.get(key='test'), None)
+
+    def test_nested_scopes(self):
+        AccessCache.activate()
+        AccessCache.set(key='test', value=True)
+
+        AccessCache.activate()
+        self.assertEqual(AccessCache.get(key='test'), True)
+        AccessCache.deactivate()
+
+        self.assertEqual(AccessCache.get(key='test'), True)
+        AccessCache.deactivate()
+
+        self.assertEqual(AccessCache.get(key='test'), None)
 
 
 class ModelPermissionTestCase(BaseTestCase):
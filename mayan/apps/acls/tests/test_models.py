@@ -6,10 +6,10 @@ from django.db import models
 from mayan.apps.events.classes import EventModelRegistry
 from mayan.apps.testing.tests.base import BaseTestCase
 
-from ..classes import ModelPermission
-from ..models import AccessControlList
+from ..classes import AccessCache, ModelPermission
+from ..models import AccessControlList, EffectiveAccess
 
-from .mixins import ACLTestMixin
+from .mixins import ACLTestMixin, EffectiveAccessTestMixin
 
 
 class PermissionTestCase(ACLTestMixin, BaseTestCase):
@@ -625,3 +625,265 @@ class ProxyModelPermissionTestCase(ACLTestMixin, BaseTestCase):
                 user=self._test_case_user
             )
         )
+
+
+class EffectiveAccessGenericForeignKeyFieldModelTestCase(
+    EffectiveAccessTestMixin, GenericForeignKeyFieldModelTestCase
+):
+    """
+    Repeat the generic foreign key tests restricting querysets with the
+    effective access table.
+    """
+
+
+class EffectiveAccessPermissionTestCase(
+    EffectiveAccessTestMixin, PermissionTestCase
+):
+    """
+    Repeat the permission tests restricting querysets with the effective
+    access table.
+    """
+
+
+class EffectiveAccessProxyModelPermissionTestCase(
+    EffectiveAccessTestMixin, ProxyModelPermissionTestCase
+):
+    """
+    Repeat the proxy model tests restricting querysets with the effective
+    access table.
+    """
+
+
+class EffectiveAccessTestCase(
+    EffectiveAccessTestMixin, ACLTestMixin, BaseTestCase
+):
+    def setUp(self):
+        super().setUp()
+        self._create_test_permission()
+        self.TestModelParent = self._create_test_model(
+            model_name='TestModelParent'
+        )
+        self.TestModelChild = self._create_test_model(
+            fields={
+                'parent': models.ForeignKey(
+                    on_delete=models.CASCADE, related_name='children',
+                    to='TestModelParent',
+                )
+            }, model_name='TestModelChild'
+        )
+
+        ModelPermission.register(
+            model=self.TestModelParent, permissions=(self.test_permission,)
+        )
+        ModelPermission.register_inheritance(
+            model=self.TestModelChild, related='parent',
+        )
+
+        self.test_object_parents = [
+            self.TestModelParent.objects.create(),
+            self.TestModelParent.objects.create()
+        ]
+
+    def _get_test_child_queryset(self):
+        return AccessControlList.objects.restrict_queryset(
+            permission=self.test_permission,
+            queryset=self.TestModelChild.objects.all(),
+            user=self._test_case_user
+        )
+
+    def test_child_created_after_grant(self):
+        self.grant_access(
+            obj=self.test_object_parents[0], permission=self.test_permission
+        )
+
+        test_object_child = self.TestModelChild.objects.create(
+            parent=self.test_object_parents[0]
+        )
+
+        self.assertEqual(
+            list(self._get_test_child_queryset()), [test_object_child]
+        )
+
+    def test_child_parent_change(self):
+        test_object_child = self.TestModelChild.objects.create(
+            parent=self.test_object_parents[0]
+        )
+        self.grant_access(
+            obj=self.test_object_parents[0], permission=self.test_permission
+        )
+
+        test_object_child.parent = self.test_object_parents[1]
+        test_object_child.save()
+
+        self.assertEqual(self._get_test_child_queryset().count(), 0)
+
+    def test_child_refresh_deferred(self):
+        self.TestModelChild.objects.create(
+            parent=self.test_object_parents[0]
+        )
+
+        self._test_on_commit.side_effect = None
+        self.grant_access(
+            obj=self.test_object_parents[0], permission=self.test_permission
+        )
+        self.assertEqual(self._get_test_child_queryset().count(), 0)
+
+        for call in self._test_on_commit.call_args_list:
+            call[1]['func']()
+
+        self.assertEqual(self._get_test_child_queryset().count(), 1)
+
+    def test_child_refresh_revoke_inline(self):
+        self.TestModelChild.objects.create(
+            parent=self.test_object_parents[0]
+        )
+        self.grant_access(
+            obj=self.test_object_parents[0], permission=self.test_permission
+        )
+        self.assertEqual(self._get_test_child_queryset().count(), 1)
+
+        self._test_on_commit.reset_mock()
+        self._test_on_commit.side_effect = None
+        self.revoke_access(
+            obj=self.test_object_parents[0], permission=self.test_permission
+        )
+        self.assertEqual(self._get_test_child_queryset().count(), 0)
+        self._test_on_commit.assert_not_called()
+
+    def test_revoke_inherited_access(self):
+        self.TestModelChild.objects.create(
+            parent=self.test_object_parents[0]
+        )
+        self.grant_access(
+            obj=self.test_object_parents[0], permission=self.test_permission
+        )
+        self.assertEqual(self._get_test_child_queryset().count(), 1)
+
+        self.revoke_access(
+            obj=self.test_object_parents[0], permission=self.test_permission
+        )
+        self.assertEqual(self._get_test_child_queryset().count(), 0)
+
+    def test_method_check_consistency(self):
+        test_object_child = self.TestModelChild.objects.create(
+            parent=self.test_object_parents[0]
+        )
+        self.grant_access(
+            obj=self.test_object_parents[0], permission=self.test_permission
+        )
+
+        self.assertEqual(
+            EffectiveAccess.objects.check_consistency(),
+            {'extra': set(), 'missing': set()}
+        )
+
+        EffectiveAccess.objects.filter(
+            object_id=test_object_child.pk
+        ).delete()
+
+        result = EffectiveAccess.objects.check_consistency()
+        self.assertEqual(len(result['missing']), 1)
+        self.assertEqual(result['extra'], set())
+
+    def test_method_rebuild(self):
+        self.TestModelChild.objects.create(
+            parent=self.test_object_parents[0]
+        )
+        self.grant_access(
+            obj=self.test_object_parents[0], permission=self.test_permission
+        )
+        entry_count = EffectiveAccess.objects.count()
+
+        EffectiveAccess.objects.all().delete()
+        EffectiveAccess.objects.rebuild()
+
+        self.assertEqual(EffectiveAccess.objects.count(), entry_count)
+        self.assertEqual(self._get_test_child_queryset().count(), 1)
+
+
+class AccessCacheManagerTestCase(ACLTestMixin, BaseTestCase):
+    auto_create_acl_test_object = False
+
+    def setUp(self):
+        super().setUp()
+        AccessCache.activate()
+
+        self._create_test_permission()
+        self.TestModel = self._create_test_model()
+        ModelPermission.register(
+            model=self.TestModel, permissions=(self.test_permission,)
+        )
+        for count in range(3):
+            self.test_objects.append(self.TestModel.objects.create())
+
+    def tearDown(self):
+        AccessCache.deactivate()
+        super().tearDown()
+
+    def test_check_access_memoization(self):
+        self.grant_access(
+            obj=self.test_objects[0], permission=self.test_permission
+        )
+
+        AccessControlList.objects.check_access(
+            obj=self.test_objects[0], permissions=(self.test_permission,),
+            user=self._test_case_user
+        )
+
+        with self.assertNumQueries(num=0):
+            AccessControlList.objects.check_access(
+                obj=self.test_objects[0],
+                permissions=(self.test_permission,),
+                user=self._test_case_user
+            )
+
+    def test_check_access_after_revoke(self):
+        self.grant_access(
+            obj=self.test_objects[0], permission=self.test_permission
+        )
+
+        AccessControlList.objects.check_access(
+            obj=self.test_objects[0], permissions=(self.test_permission,),
+            user=self._test_case_user
+        )
+
+        self.revoke_access(
+            obj=self.test_objects[0], permission=self.test_permission
+        )
+
+        with self.assertRaises(expected_exception=PermissionDenied):
+            AccessControlList.objects.check_access(
+                obj=self.test_objects[0],
+                permissions=(self.test_permission,),
+                user=self._test_case_user
+            )
+
+    def test_restrict_objects(self):
+        self.grant_access(
+            obj=self.test_objects[0], permission=self.test_permission
+        )
+        self.grant_access(
+            obj=self.test_objects[2], permission=self.test_permission
+        )
+
+        self.assertEqual(
+            AccessControlList.objects.restrict_objects(
+                objects=self.test_objects,
+                permissions=(self.test_permission,),
+                user=self._test_case_user
+            ), [self.test_objects[0], self.test_objects[2]]
+        )
+
+        with self.assertNumQueries(num=0):
+            for test_object in self.test_objects[0::2]:
+                AccessControlList.objects.check_access(
+                    obj=test_object, permissions=(self.test_permission,),
+                    user=self._test_case_user
+                )
+
+            with self.assertRaises(expected_exception=PermissionDenied):
+                AccessControlList.objects.check_access(
+                    obj=self.test_objects[1],
+                    permissions=(self.test_permission,),
+                    user=self._test_case_user
+                )
@@ -1,5 +1,7 @@
 import io
 import logging
+import os
+import re
 import shutil
 import struct
 
@@ -10,7 +12,7 @@ import sh
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
 
-from mayan.apps.storage.utils import NamedTemporaryFile
+from mayan.apps.storage.utils import NamedTemporaryFile, fs_cleanup, mkdtemp
 
 from ..classes import ConverterBase
 from ..exceptions import PageCountError
@@ -18,7 +20,8 @@ from ..settings import setting_graphics_backend_arguments
 
 from ..literals import (
     DEFAULT_PDFTOPPM_DPI, DEFAULT_PDFTOPPM_FORMAT, DEFAULT_PDFTOPPM_PATH,
-    DEFAULT_PDFINFO_PATH, DEFAULT_PILLOW_MAXIMUM_IMAGE_PIXELS
+    DEFAULT_PDFINFO_PATH, DEFAULT_PILLOW_MAXIMUM_IMAGE_PIXELS,
+    PDFTOPPM_OUTPUT_FILENAME_PREFIX, PDFTOPPM_PAGE_RUN_MAXIMUM_SIZE
 )
 
 logger = logging.getLogger(name=__name__)
@@ -62,27 +65,106 @@ Image.MAX_IMAGE_PIXELS = pillow_maximum_image_pixels
 
 
 class Python(ConverterBase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.named_file_object = None
+        self.named_file_object_source = None
+
+    def close(self):
+        super().close()
+
+        if self.named_file_object:
+            self.named_file_object.close()
+            self.named_file_object = None
+            self.named_file_object_source = None
+
     def convert(self, *args, **kwargs):
         super().convert(*args, **kwargs)
 
         if self.mime_type == 'application/pdf' and pdftoppm:
-            new_file_object = NamedTemporaryFile()
-            input_filepath = new_file_object.name
+            image_buffer = io.BytesIO()
+            pdftoppm(
+                self.get_named_file_object().name, f=self.page_number + 1,
+                l=self.page_number + 1, _out=image_buffer
+            )
+            image_buffer.seek(0)
+            return Image.open(fp=image_buffer)
+
+    def get_named_file_object(self):
+        """
+        Return a copy of the source file object with a filesystem name
+        for the command line utilities. The copy is made once and reused
+        by the following calls until the converter is closed.
+        """
+        if self.named_file_object_source is not self.file_object:
+            if self.named_file_object:
+                self.named_file_object.close()
+
+            self.named_file_object = NamedTemporaryFile()
             self.file_object.seek(0)
-            shutil.copyfileobj(fsrc=self.file_object, fdst=new_file_object)
+            shutil.copyfileobj(
+                fsrc=self.file_object, fdst=self.named_file_object
+            )
             self.file_object.seek(0)
-            new_file_object.seek(0)
+            self.named_file_object.flush()
+            self.named_file_object_source = self.file_object
 
-            image_buffer = io.BytesIO()
-            try:
-                pdftoppm(
-                    input_filepath, f=self.page_number + 1,
-                    l=self.page_number + 1, _out=image_buffer
-                )
-                image_buffer.seek(0)
-                return Image.open(fp=image_buffer)
-            finally:
-                new_file_object.close()
+        return self.named_file_object
+
+    def get_pages(self, page_numbers, output_format=None):
+        """
+        Rasterize PDF pages with one pdftoppm execution per run of
+        contiguous pages instead of once per page. Sparse page numbers are
+        split into separate runs and the runs are bounded in size to limit
+        the temporary disk space used, the runs are returned in ascending
+        page order. Other files return the pages in the order requested.
+        Repeated page numbers are returned once.
+        """
+        page_numbers = list(dict.fromkeys(page_numbers))
+
+        if not page_numbers or self.mime_type != 'application/pdf' or not pdftoppm:
+            yield from super().get_pages(
+                output_format=output_format, page_numbers=page_numbers
+            )
+            return
+
+        for first_page_number, last_page_number in self.get_page_number_runs(
+            maximum_size=PDFTOPPM_PAGE_RUN_MAXIMUM_SIZE,
+            page_numbers=page_numbers
+        ):
+            yield from self._get_pages_run(
+                first_page_number=first_page_number,
+                last_page_number=last_page_number, output_format=output_format
+            )
+
+    def _get_pages_run(
+        self, first_page_number, last_page_number, output_format=None
+    ):
+        temporary_directory = mkdtemp()
+
+        try:
+            pdftoppm(
+                self.get_named_file_object().name, os.path.join(
+                    temporary_directory, PDFTOPPM_OUTPUT_FILENAME_PREFIX
+                ), f=first_page_number + 1, l=last_page_number + 1
+            )
+
+            # pdftoppm names the output files <prefix>-<page number>.<ext>
+            # with the page number starting with 1 and zero padded.
+            page_filenames = {}
+            for filename in os.listdir(temporary_directory):
+                match = re.search(r'-(\d+)\.\w+$', filename)
+                if match:
+                    page_filenames[int(match.group(1)) - 1] = filename
+
+            for page_number in range(first_page_number, last_page_number + 1):
+                with open(os.path.join(temporary_directory, page_filenames[page_number]), mode='rb') as file_object:
+                    self.image = Image.open(fp=file_object)
+                    self.image.load()
+
+                yield page_number, self.get_page(output_format=output_format)
+        finally:
+            fs_cleanup(filename=temporary_directory)
 
     def get_page_count(self):
         super().get_page_count()
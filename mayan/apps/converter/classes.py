@@ -1,8 +1,10 @@
+from collections import OrderedDict
 import copy
 from io import BytesIO
 import logging
 import os
 import shutil
+import threading
 
 import PIL
 from PIL import Image
@@ -28,10 +30,12 @@ from mayan.apps.storage.utils import (
 )
 
 from .exceptions import (
-    InvalidOfficeFormat, LayerError, OfficeConversionError
+    InvalidOfficeFormat, LayerError, LibreOfficeServerError,
+    OfficeConversionError
 )
+from .libreoffice import LibreOfficeServerPool, libreoffice_path
 from .literals import (
-    CONVERTER_OFFICE_FILE_MIMETYPES, DEFAULT_LIBREOFFICE_PATH,
+    CONVERTER_OFFICE_FILE_MIMETYPES, CONVERTER_SESSION_MAXIMUM_COUNT,
     DEFAULT_PAGE_NUMBER, DEFAULT_PILLOW_FORMAT
 )
 from .settings import (
@@ -41,13 +45,6 @@ from .settings import (
 logger = logging.getLogger(name=__name__)
 
 
-libreoffice_path = setting_graphics_backend_arguments.value.get(
-    'libreoffice_path', DEFAULT_LIBREOFFICE_PATH
-)
-
-logger = logging.getLogger(name=__name__)
-
-
 class AppImageErrorImage:
     _registry = {}
 
@@ -72,24 +69,79 @@ class AppImageErrorImage:
 
 
 class ConverterBase:
+    _command_libreoffice = None
+    _initialized = False
+
     @staticmethod
     def get_converter_class():
         return import_string(dotted_path=setting_graphics_backend.value)
 
+    @staticmethod
+    def get_page_number_runs(page_numbers, maximum_size):
+        """
+        Split the page numbers into runs of contiguous page numbers of at
+        most `maximum_size` pages. Returns a list of (first, last) tuples.
+        """
+        runs = []
+
+        for page_number in sorted(set(page_numbers)):
+            if runs and page_number == runs[-1][1] + 1 and page_number - runs[-1][0] < maximum_size:
+                runs[-1] = (runs[-1][0], page_number)
+            else:
+                runs.append((page_number, page_number))
+
+        return runs
+
+    @staticmethod
+    def initialize():
+        """
+        Initialize Pillow and resolve the LibreOffice command once per
+        process instead of once per converter instance.
+        """
+        if not ConverterBase._initialized:
+            Image.init()
+            try:
+                ConverterBase._command_libreoffice = sh.Command(
+                    path=libreoffice_path
+                ).bake('--headless', '--convert-to', 'pdf:writer_pdf_Export')
+            except sh.CommandNotFound:
+                ConverterBase._command_libreoffice = None
+
+            ConverterBase._initialized = True
+
     def __init__(self, file_object, mime_type=None):
+        self.initialize()
+        self.command_libreoffice = ConverterBase._command_libreoffice
         self.file_object = file_object
         self.image = None
-        self.mime_type = mime_type or get_mimetype(
-            file_object=file_object, mimetype_only=False
-        )[0]
+        self._mime_type = mime_type
         self.soffice_file = None
-        Image.init()
-        try:
-            self.command_libreoffice = sh.Command(path=libreoffice_path).bake(
-                '--headless', '--convert-to', 'pdf:writer_pdf_Export'
-            )
-        except sh.CommandNotFound:
-            self.command_libreoffice = None
+
+    @property
+    def mime_type(self):
+        # Detected only when needed. Paged image files are opened by
+        # Pillow directly and never need it.
+        if not self._mime_type:
+            self._mime_type = get_mimetype(
+                file_object=self.file_object, mimetype_only=False
+            )[0]
+
+        return self._mime_type
+
+    @mime_type.setter
+    def mime_type(self, value):
+        self._mime_type = value
+
+    def close(self):
+        """
+        Release the resources the converter keeps between calls. The
+        source file object is owned by the caller and is not closed.
+        """
+        self.image = None
+
+        if self.soffice_file:
+            self.soffice_file.close()
+            self.soffice_file = None
 
     def convert(self, page_number=DEFAULT_PAGE_NUMBER):
         self.page_number = page_number
@@ -116,6 +168,16 @@ class ConverterBase:
 
         return image_buffer
 
+    def get_pages(self, page_numbers, output_format=None):
+        """
+        Generator returning a tuple with the page number and the image of
+        each page in `page_numbers`. Page numbers start with 0. Backends
+        can override this method to render all the pages in a single pass.
+        """
+        for page_number in page_numbers:
+            self.seek_page(page_number=page_number)
+            yield page_number, self.get_page(output_format=output_format)
+
     def get_page_count(self):
         try:
             self.soffice_file = self.to_pdf()
@@ -150,8 +212,22 @@ class ConverterBase:
 
     def soffice(self):
         """
-        Executes LibreOffice as a sub process.
+        Convert the file using a LibreOffice conversion server or execute
+        LibreOffice as a sub process when the servers are not available.
         """
+        libreoffice_server_pool = LibreOfficeServerPool.get_instance()
+
+        if libreoffice_server_pool:
+            try:
+                return libreoffice_server_pool.convert(
+                    file_object=self.file_object, mime_type=self.mime_type
+                )
+            except LibreOfficeServerError as exception:
+                logger.warning(
+                    'LibreOffice conversion server not available, '
+                    'falling back to a LibreOffice process; %s', exception
+                )
+
         if not self.command_libreoffice:
             raise OfficeConversionError(
                 _('LibreOffice not installed or not found.')
@@ -274,6 +350,94 @@ class ConverterBase:
             self.image = transformation.execute_on(image=self.image)
 
 
+class ConverterSession:
+    """
+    Keep a converter instance open for a file to serve several page count
+    and page image requests without detecting the mimetype, copying the
+    file for the command line utilities or counting the pages again.
+    Sessions are kept per thread and the least recently used ones are
+    closed when there are more than CONVERTER_SESSION_MAXIMUM_COUNT.
+    """
+    _local = threading.local()
+
+    @classmethod
+    def _get_sessions(cls):
+        try:
+            return cls._local.sessions
+        except AttributeError:
+            cls._local.sessions = OrderedDict()
+            return cls._local.sessions
+
+    @classmethod
+    def discard(cls, name):
+        session = cls._get_sessions().pop(name, None)
+        if session:
+            session.close()
+
+    @classmethod
+    def discard_all(cls):
+        sessions = cls._get_sessions()
+        while sessions:
+            name, session = sessions.popitem()
+            session.close()
+
+    @classmethod
+    def get(cls, name, file_object_factory, mime_type=None):
+        """
+        Return the open session named `name` or open a new one using the
+        file object returned by `file_object_factory`.
+        """
+        sessions = cls._get_sessions()
+
+        try:
+            session = sessions.pop(name)
+        except KeyError:
+            session = cls(
+                file_object=file_object_factory(), mime_type=mime_type,
+                name=name
+            )
+
+        sessions[name] = session
+
+        while len(sessions) > CONVERTER_SESSION_MAXIMUM_COUNT:
+            name, session_expired = sessions.popitem(last=False)
+            session_expired.close()
+
+        return session
+
+    def __init__(self, name, file_object, mime_type=None):
+        self.converter = ConverterBase.get_converter_class()(
+            file_object=file_object, mime_type=mime_type
+        )
+        self.file_object = file_object
+        self.name = name
+        self.page_count = None
+
+    def close(self):
+        self.converter.close()
+        self.file_object.close()
+
+    def get_page(self, page_number, output_format=None, transformations=None):
+        """
+        Return the image of a page with the transformations applied.
+        Page numbers start with 0.
+        """
+        self.converter.seek_page(page_number=page_number)
+        self.converter.transform_many(transformations=transformations or ())
+        return self.converter.get_page(output_format=output_format)
+
+    def get_page_count(self):
+        if self.page_count is None:
+            self.page_count = self.converter.get_page_count()
+
+        return self.page_count
+
+    def get_pages(self, page_numbers, output_format=None):
+        return self.converter.get_pages(
+            output_format=output_format, page_numbers=page_numbers
+        )
+
+
 class Layer:
     _registry = {}
 
@@ -31,6 +31,13 @@ class UnkownConvertError(ConvertError):
     """
 
 
+class LibreOfficeServerError(ConvertError):
+    """
+    Raised when a LibreOffice conversion server can't be started or
+    reached. The conversion falls back to a LibreOffice process per file.
+    """
+
+
 class OfficeConversionError(ConvertError):
     """
     Used to encapsulate errors while executing LibreOffice or when
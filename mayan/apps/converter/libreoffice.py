@@ -0,0 +1,315 @@
+import atexit
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+
+import sh
+
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.storage.utils import NamedTemporaryFile, fs_cleanup, mkdtemp
+
+from .exceptions import LibreOfficeServerError, OfficeConversionError
+from .literals import (
+    DEFAULT_LIBREOFFICE_PATH, LIBREOFFICE_SERVER_CONNECT_INTERVAL,
+    LIBREOFFICE_SERVER_OUTPUT_FILTERS, LIBREOFFICE_SERVER_STARTUP_TIMEOUT
+)
+from .settings import (
+    setting_graphics_backend_arguments,
+    setting_libreoffice_server_conversion_limit,
+    setting_libreoffice_server_count, setting_libreoffice_server_timeout
+)
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:
+    uno = None
+
+logger = logging.getLogger(name=__name__)
+
+libreoffice_path = setting_graphics_backend_arguments.value.get(
+    'libreoffice_path', DEFAULT_LIBREOFFICE_PATH
+)
+
+
+class LibreOfficeServer:
+    """
+    Long lived headless LibreOffice instance reached over a UNO pipe. Each
+    server has its own user profile directory.
+    """
+    def __init__(self, name):
+        self.conversion_count = 0
+        self.desktop = None
+        self.name = name
+        self.process = None
+        self.user_installation_directory = None
+
+    def _get_property_values(self, **kwargs):
+        return tuple(
+            PropertyValue(Name=key, Value=value) for key, value in kwargs.items()
+        )
+
+    def convert(self, file_object, mime_type, timeout):
+        """
+        Convert the file object to PDF and return a named temporary file
+        with the result. The server is killed if the conversion takes
+        longer than `timeout` seconds.
+        """
+        timer = threading.Timer(interval=timeout, function=self.kill)
+        temporary_directory = mkdtemp()
+
+        try:
+            input_filename = os.path.join(temporary_directory, 'input')
+            output_filename = os.path.join(temporary_directory, 'output.pdf')
+
+            with open(file=input_filename, mode='wb') as input_file_object:
+                file_object.seek(0)
+                shutil.copyfileobj(fsrc=file_object, fdst=input_file_object)
+                file_object.seek(0)
+
+            load_properties = {'Hidden': True, 'ReadOnly': True}
+            if mime_type == 'text/plain':
+                load_properties.update(
+                    {
+                        'FilterName': 'Text (encoded)',
+                        'FilterOptions': 'UTF8,LF,,,'
+                    }
+                )
+
+            timer.start()
+
+            try:
+                document = self.desktop.loadComponentFromURL(
+                    uno.systemPathToFileUrl(input_filename), '_blank', 0,
+                    self._get_property_values(**load_properties)
+                )
+                if not document:
+                    raise OfficeConversionError(
+                        _('LibreOffice was unable to load the file.')
+                    )
+
+                try:
+                    document.storeToURL(
+                        uno.systemPathToFileUrl(output_filename),
+                        self._get_property_values(
+                            FilterName=self.get_output_filter(
+                                document=document
+                            ), Overwrite=True
+                        )
+                    )
+                finally:
+                    document.close(True)
+            except OfficeConversionError:
+                raise
+            except Exception as exception:
+                if not timer.is_alive():
+                    raise OfficeConversionError(
+                        _(
+                            'LibreOffice conversion exceeded the timeout '
+                            'of %d seconds.'
+                        ) % timeout
+                    )
+                raise OfficeConversionError(exception)
+            finally:
+                timer.cancel()
+
+            self.conversion_count += 1
+
+            temporary_converted_file_object = NamedTemporaryFile()
+            with open(file=output_filename, mode='rb') as converted_file_object:
+                shutil.copyfileobj(
+                    fsrc=converted_file_object,
+                    fdst=temporary_converted_file_object
+                )
+            temporary_converted_file_object.seek(0)
+            return temporary_converted_file_object
+        finally:
+            fs_cleanup(filename=temporary_directory)
+
+    def get_output_filter(self, document):
+        for service_name, filter_name in LIBREOFFICE_SERVER_OUTPUT_FILTERS:
+            if document.supportsService(service_name):
+                return filter_name
+
+        return LIBREOFFICE_SERVER_OUTPUT_FILTERS[0][1]
+
+    def get_pipe_name(self):
+        return 'mayan_libreoffice_{}_{}'.format(os.getpid(), self.name)
+
+    def is_healthy(self):
+        if not self.process or not self.process.is_alive():
+            return False
+
+        try:
+            self.desktop.getComponents()
+        except Exception as exception:
+            logger.debug(
+                'LibreOffice server "%s" health check failed; %s',
+                self.name, exception
+            )
+            return False
+        else:
+            return True
+
+    def kill(self):
+        logger.warning('Killing LibreOffice server "%s".', self.name)
+        if self.process:
+            try:
+                self.process.kill()
+            except Exception as exception:
+                logger.debug(
+                    'Error killing LibreOffice server "%s"; %s', self.name,
+                    exception
+                )
+
+    def start(self):
+        self.conversion_count = 0
+        self.user_installation_directory = mkdtemp()
+
+        try:
+            self.process = sh.Command(path=libreoffice_path)(
+                '--headless', '--invisible', '--nocrashreport',
+                '--nodefault', '--nofirststartwizard', '--nologo',
+                '--norestore', '--accept=pipe,name={};urp;'.format(
+                    self.get_pipe_name()
+                ), '-env:UserInstallation=file://{}'.format(
+                    self.user_installation_directory
+                ), _bg=True, _bg_exc=False,
+                _env={'HOME': self.user_installation_directory}
+            )
+        except sh.CommandNotFound as exception:
+            self.stop()
+            raise LibreOfficeServerError(exception)
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.bridge.UnoUrlResolver', local_context
+        )
+
+        start_time = time.time()
+
+        while True:
+            try:
+                context = resolver.resolve(
+                    'uno:pipe,name={};urp;StarOffice.ComponentContext'.format(
+                        self.get_pipe_name()
+                    )
+                )
+            except Exception as exception:
+                if not self.process.is_alive() or time.time() - start_time > LIBREOFFICE_SERVER_STARTUP_TIMEOUT:
+                    self.stop()
+                    raise LibreOfficeServerError(
+                        'Unable to connect to LibreOffice server "{}"; '
+                        '{}'.format(self.name, exception)
+                    )
+                time.sleep(LIBREOFFICE_SERVER_CONNECT_INTERVAL)
+            else:
+                break
+
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.frame.Desktop', context
+        )
+        logger.info('LibreOffice server "%s" started.', self.name)
+
+    def stop(self):
+        if self.desktop:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                """
+                Non fatal, the process is killed below if it is still
+                running.
+                """
+            self.desktop = None
+
+        if self.process:
+            if self.process.is_alive():
+                self.process.terminate()
+                try:
+                    self.process.wait(timeout=LIBREOFFICE_SERVER_STARTUP_TIMEOUT)
+                except Exception:
+                    self.kill()
+            self.process = None
+
+        if self.user_installation_directory:
+            fs_cleanup(filename=self.user_installation_directory)
+            self.user_installation_directory = None
+
+
+class LibreOfficeServerPool:
+    """
+    Per process pool of LibreOffice servers. Servers are started on first
+    use, health checked before each conversion and recycled after a
+    number of conversions.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Return the pool of the current process or None if the pool is
+        disabled or the UNO Python bridge is not installed.
+        """
+        if not setting_libreoffice_server_count.value or not uno:
+            return None
+
+        with cls._lock:
+            # Forked worker processes don't inherit the servers of the
+            # parent.
+            if not cls._instance or cls._instance.pid != os.getpid():
+                cls._instance = cls(
+                    conversion_limit=setting_libreoffice_server_conversion_limit.value,
+                    size=setting_libreoffice_server_count.value,
+                    timeout=setting_libreoffice_server_timeout.value
+                )
+                atexit.register(cls._instance.stop)
+
+            return cls._instance
+
+    def __init__(
+        self, conversion_limit, size, timeout, server_class=LibreOfficeServer
+    ):
+        self.conversion_limit = conversion_limit
+        self.pid = os.getpid()
+        self.servers = queue.Queue()
+        self.timeout = timeout
+
+        for index in range(size):
+            self.servers.put(server_class(name=index))
+
+    def convert(self, file_object, mime_type):
+        server = self.servers.get()
+
+        try:
+            if server.conversion_count >= self.conversion_limit:
+                logger.debug('Recycling LibreOffice server "%s".', server.name)
+                server.stop()
+                server.start()
+            elif not server.is_healthy():
+                server.stop()
+                server.start()
+
+            return server.convert(
+                file_object=file_object, mime_type=mime_type,
+                timeout=self.timeout
+            )
+        except OfficeConversionError:
+            # The document might have left the server in a bad state.
+            server.stop()
+            raise
+        finally:
+            self.servers.put(server)
+
+    def stop(self):
+        while True:
+            try:
+                server = self.servers.get_nowait()
+            except queue.Empty:
+                break
+            else:
+                server.stop()
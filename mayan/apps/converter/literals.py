@@ -52,6 +52,7 @@ CONVERTER_OFFICE_FILE_MIMETYPES = (
     'text/plain',
     'text/rtf',
 )
+CONVERTER_SESSION_MAXIMUM_COUNT = 5
 
 if platform.system() in ('FreeBSD', 'OpenBSD', 'Darwin'):
     DEFAULT_LIBREOFFICE_PATH = '/usr/local/bin/libreoffice'
@@ -73,6 +74,9 @@ DEFAULT_CONVERTER_ASSET_STORAGE_BACKEND_ARGUMENTS = {
     'location': os.path.join(settings.MEDIA_ROOT, 'converter_assets')
 }
 DEFAULT_CONVERTER_GRAPHICS_BACKEND = 'mayan.apps.converter.backends.python.Python'
+DEFAULT_LIBREOFFICE_SERVER_CONVERSION_LIMIT = 200
+DEFAULT_LIBREOFFICE_SERVER_COUNT = 0
+DEFAULT_LIBREOFFICE_SERVER_TIMEOUT = 120  # seconds
 DEFAULT_PAGE_NUMBER = 1
 DEFAULT_PDFTOPPM_DPI = 300
 DEFAULT_PDFTOPPM_FORMAT = 'jpeg'  # Possible values jpeg, png, tiff
@@ -91,6 +95,21 @@ DEFAULT_CONVERTER_GRAPHICS_BACKEND_ARGUMENTS = {
     'pillow_maximum_image_pixels': DEFAULT_PILLOW_MAXIMUM_IMAGE_PIXELS,
 }
 
+LIBREOFFICE_SERVER_CONNECT_INTERVAL = 0.25  # seconds
+# Output filter by document service. The first entry is used for
+# documents that don't match any service.
+LIBREOFFICE_SERVER_OUTPUT_FILTERS = (
+    ('com.sun.star.text.GenericTextDocument', 'writer_pdf_Export'),
+    ('com.sun.star.sheet.SpreadsheetDocument', 'calc_pdf_Export'),
+    ('com.sun.star.presentation.PresentationDocument', 'impress_pdf_Export'),
+    ('com.sun.star.drawing.DrawingDocument', 'draw_pdf_Export'),
+)
+LIBREOFFICE_SERVER_STARTUP_TIMEOUT = 30  # seconds
+
+PDFTOPPM_OUTPUT_FILENAME_PREFIX = 'page'
+# Maximum number of pages rendered by a single pdftoppm execution.
+PDFTOPPM_PAGE_RUN_MAXIMUM_SIZE = 16
+
 STORAGE_NAME_ASSETS = 'converter__assets'
 STORAGE_NAME_ASSETS_CACHE = 'converter__assets_cache'
 
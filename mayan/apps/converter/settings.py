@@ -10,7 +10,9 @@ from .literals import (
     DEFAULT_CONVERTER_ASSET_STORAGE_BACKEND,
     DEFAULT_CONVERTER_ASSET_STORAGE_BACKEND_ARGUMENTS,
     DEFAULT_CONVERTER_GRAPHICS_BACKEND,
-    DEFAULT_CONVERTER_GRAPHICS_BACKEND_ARGUMENTS
+    DEFAULT_CONVERTER_GRAPHICS_BACKEND_ARGUMENTS,
+    DEFAULT_LIBREOFFICE_SERVER_CONVERSION_LIMIT,
+    DEFAULT_LIBREOFFICE_SERVER_COUNT, DEFAULT_LIBREOFFICE_SERVER_TIMEOUT
 )
 from .setting_callbacks import callback_update_asset_cache_size
 from .setting_migrations import ConvertSettingMigration
@@ -76,3 +78,29 @@ setting_graphics_backend_arguments = namespace.add_setting(
         'Configuration options for the graphics conversion backend.'
     )
 )
+setting_libreoffice_server_conversion_limit = namespace.add_setting(
+    default=DEFAULT_LIBREOFFICE_SERVER_CONVERSION_LIMIT,
+    global_name='CONVERTER_LIBREOFFICE_SERVER_CONVERSION_LIMIT',
+    help_text=_(
+        'Number of conversions after which a LibreOffice conversion server '
+        'is restarted.'
+    )
+)
+setting_libreoffice_server_count = namespace.add_setting(
+    default=DEFAULT_LIBREOFFICE_SERVER_COUNT,
+    global_name='CONVERTER_LIBREOFFICE_SERVER_COUNT', help_text=_(
+        'Number of persistent LibreOffice conversion servers to start per '
+        'worker process. The servers avoid the LibreOffice startup time '
+        'on each office file conversion. Requires the UNO Python bridge '
+        '(python3-uno). A value of 0 disables the servers and a '
+        'LibreOffice process is launched per conversion.'
+    )
+)
+setting_libreoffice_server_timeout = namespace.add_setting(
+    default=DEFAULT_LIBREOFFICE_SERVER_TIMEOUT,
+    global_name='CONVERTER_LIBREOFFICE_SERVER_TIMEOUT', help_text=_(
+        'Maximum time in seconds a LibreOffice conversion server is '
+        'allowed to take to convert a file. The server is killed and '
+        'restarted when the time is exceeded.'
+    )
+)
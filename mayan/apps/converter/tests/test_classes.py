@@ -0,0 +1,82 @@
+import mock
+
+from mayan.apps.documents.tests.literals import TEST_MULTI_PAGE_TIFF_PATH
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..classes import ConverterBase, ConverterSession
+from ..literals import CONVERTER_SESSION_MAXIMUM_COUNT
+
+
+class ConverterSessionTestCase(BaseTestCase):
+    def tearDown(self):
+        ConverterSession.discard_all()
+        super().tearDown()
+
+    def _get_test_converter_session(self, name='test_session'):
+        return ConverterSession.get(
+            file_object_factory=lambda: open(
+                file=TEST_MULTI_PAGE_TIFF_PATH, mode='rb'
+            ), name=name
+        )
+
+    def test_session_reuse(self):
+        test_converter_session = self._get_test_converter_session()
+
+        self.assertEqual(
+            self._get_test_converter_session(), test_converter_session
+        )
+
+    @mock.patch('mayan.apps.converter.classes.get_mimetype')
+    def test_session_mimetype_detection(self, mock_get_mimetype):
+        mock_get_mimetype.return_value = ('image/tiff', 'binary')
+
+        test_converter_session = self._get_test_converter_session()
+
+        self.assertEqual(test_converter_session.get_page_count(), 2)
+        test_converter_session.get_page(page_number=0)
+        test_converter_session.get_page(page_number=1)
+        self.assertEqual(test_converter_session.get_page_count(), 2)
+
+        self.assertEqual(mock_get_mimetype.call_count, 1)
+
+    def test_session_get_pages_order(self):
+        test_converter_session = self._get_test_converter_session()
+
+        self.assertEqual(
+            [
+                page_number for page_number, image in test_converter_session.get_pages(
+                    page_numbers=(1, 0, 1)
+                )
+            ], [1, 0]
+        )
+
+    def test_session_page_count_cache(self):
+        test_converter_session = self._get_test_converter_session()
+        test_converter_session.get_page_count()
+
+        with mock.patch.object(
+            test_converter_session.converter, 'get_page_count'
+        ) as mock_get_page_count:
+            self.assertEqual(test_converter_session.get_page_count(), 2)
+            mock_get_page_count.assert_not_called()
+
+    def test_session_maximum_count(self):
+        test_converter_session = self._get_test_converter_session(name='0')
+
+        for index in range(CONVERTER_SESSION_MAXIMUM_COUNT):
+            self._get_test_converter_session(name=str(index + 1))
+
+        self.assertTrue(test_converter_session.file_object.closed)
+        self.assertNotEqual(
+            self._get_test_converter_session(name='0'),
+            test_converter_session
+        )
+
+
+class ConverterBaseTestCase(BaseTestCase):
+    def test_method_get_page_number_runs(self):
+        self.assertEqual(
+            ConverterBase.get_page_number_runs(
+                maximum_size=3, page_numbers=(9, 0, 1, 2, 3, 5, 6)
+            ), [(0, 2), (3, 3), (5, 6), (9, 9)]
+        )
@@ -0,0 +1,92 @@
+from io import BytesIO
+
+import mock
+
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..classes import ConverterBase
+from ..exceptions import LibreOfficeServerError, OfficeConversionError
+from ..libreoffice import LibreOfficeServerPool
+
+
+class TestLibreOfficeServer:
+    def __init__(self, name):
+        self.conversion_count = 0
+        self.healthy = False
+        self.name = name
+        self.start_count = 0
+
+    def convert(self, file_object, mime_type, timeout):
+        self.conversion_count += 1
+        return BytesIO(file_object.read())
+
+    def is_healthy(self):
+        return self.healthy
+
+    def start(self):
+        self.conversion_count = 0
+        self.healthy = True
+        self.start_count += 1
+
+    def stop(self):
+        self.healthy = False
+
+
+class LibreOfficeServerPoolTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.test_pool = LibreOfficeServerPool(
+            conversion_limit=2, server_class=TestLibreOfficeServer, size=1,
+            timeout=1
+        )
+        self.test_server = self.test_pool.servers.queue[0]
+
+    def _convert_test_file(self):
+        return self.test_pool.convert(
+            file_object=BytesIO(b'test'), mime_type='text/plain'
+        )
+
+    def test_server_start_on_first_use(self):
+        self.assertEqual(self._convert_test_file().read(), b'test')
+        self.assertEqual(self.test_server.start_count, 1)
+
+    def test_server_recycle(self):
+        self._convert_test_file()
+        self._convert_test_file()
+        self._convert_test_file()
+
+        self.assertEqual(self.test_server.start_count, 2)
+        self.assertEqual(self.test_server.conversion_count, 1)
+
+    def test_server_restart_unhealthy(self):
+        self._convert_test_file()
+        self.test_server.healthy = False
+        self._convert_test_file()
+
+        self.assertEqual(self.test_server.start_count, 2)
+
+    def test_server_stop_on_conversion_error(self):
+        with mock.patch.object(
+            self.test_server, 'convert', side_effect=OfficeConversionError
+        ):
+            with self.assertRaises(OfficeConversionError):
+                self._convert_test_file()
+
+        self.assertFalse(self.test_server.healthy)
+        self.assertEqual(self.test_pool.servers.qsize(), 1)
+
+
+class LibreOfficeServerFallbackTestCase(BaseTestCase):
+    @mock.patch.object(LibreOfficeServerPool, 'get_instance')
+    def test_soffice_fallback(self, mock_get_instance):
+        mock_get_instance.return_value.convert.side_effect = LibreOfficeServerError
+
+        converter = ConverterBase(
+            file_object=BytesIO(b'test'), mime_type='text/plain'
+        )
+        converter.command_libreoffice = None
+
+        with self.assertRaises(OfficeConversionError):
+            converter.soffice()
+
+        mock_get_instance.return_value.convert.assert_called_once()
@@ -60,6 +60,9 @@ class DocumentIndexingApp(MayanAppConfig):
         DocumentType = apps.get_model(
             app_label='documents', model_name='DocumentType'
         )
+        TrashedDocument = apps.get_model(
+            app_label='documents', model_name='TrashedDocument'
+        )
 
         DocumentIndexInstanceNode = self.get_model(
             model_name='DocumentIndexInstanceNode'
@@ -139,6 +142,11 @@ class DocumentIndexingApp(MayanAppConfig):
             source=IndexTemplate, widget=TwoStateWidget
         )
         column_index_enabled.add_exclude(source=IndexInstance)
+        column_index_rebuild_progress = SourceColumn(
+            attribute='get_rebuild_progress_display', include_label=True,
+            source=IndexTemplate
+        )
+        column_index_rebuild_progress.add_exclude(source=IndexInstance)
 
         SourceColumn(
             func=lambda context: context[
@@ -274,6 +282,12 @@ class DocumentIndexingApp(MayanAppConfig):
             receiver=handler_index_document,
             sender=Document
         )
+        # Restored documents are saved as trashed documents.
+        post_save.connect(
+            dispatch_uid='document_indexing_handler_index_trashed_document',
+            receiver=handler_index_document,
+            sender=TrashedDocument
+        )
         post_delete.connect(
             dispatch_uid='document_indexing_handler_delete_empty',
             receiver=handler_delete_empty,
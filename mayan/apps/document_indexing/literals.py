@@ -1 +1,3 @@
+DEFAULT_REBUILD_CHUNK_SIZE = 500
 DEFAULT_TASK_RETRY_DELAY = 5
+DOCUMENT_COUNT_BATCH_SIZE = 1000
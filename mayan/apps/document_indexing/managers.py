@@ -1,7 +1,16 @@
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import PermissionDenied
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
 
 from mptt.managers import TreeManager
 
+from mayan.apps.acls.models import AccessControlList
+from mayan.apps.documents.permissions import permission_document_view
+
+from .literals import DOCUMENT_COUNT_BATCH_SIZE
+
 
 class DocumentIndexInstanceNodeManager(models.Manager):
     def get_for(self, document):
@@ -15,9 +24,239 @@ class IndexInstanceNodeManager(TreeManager):
             for index_instance_node in root_nodes.get_leafnodes():
                 index_instance_node.delete_empty()
 
+    def get_document_counts(self, nodes, user, include_descendants=True):
+        """
+        Return a dictionary with the number of valid documents the user can
+        view for each node, keyed by node primary key. Users with the
+        document view permission granted by a role get the stored
+        counters. For the rest, the counters of the document types to which
+        the user has access and the count of the documents accessible
+        individually are obtained with one grouped query each. The counts
+        are cached in the node instances.
+        """
+        DocumentType = apps.get_model(
+            app_label='documents', model_name='DocumentType'
+        )
+        IndexInstanceNodeDocumentTypeCount = apps.get_model(
+            app_label='document_indexing',
+            model_name='IndexInstanceNodeDocumentTypeCount'
+        )
+
+        nodes = list(nodes)
+
+        if include_descendants:
+            field_name = 'descendants_document_count'
+        else:
+            field_name = 'document_count'
+
+        if not user.is_authenticated:
+            result = {node.pk: 0 for node in nodes}
+        else:
+            try:
+                AccessControlList.objects.check_user_permissions(
+                    permissions=(permission_document_view,), user=user
+                )
+            except PermissionDenied:
+                result = self._get_document_counts_restricted(
+                    document_type_model=DocumentType, field_name=field_name,
+                    count_model=IndexInstanceNodeDocumentTypeCount,
+                    include_descendants=include_descendants, nodes=nodes,
+                    user=user
+                )
+            else:
+                result = {node.pk: getattr(node, field_name) for node in nodes}
+
+        for node in nodes:
+            if not hasattr(node, '_document_counts_cache'):
+                node._document_counts_cache = {}
+
+            node._document_counts_cache[
+                (user.pk, include_descendants)
+            ] = result[node.pk]
+
+        return result
+
+    def _get_document_counts_restricted(
+        self, count_model, document_type_model, field_name,
+        include_descendants, nodes, user
+    ):
+        Document = apps.get_model(
+            app_label='documents', model_name='Document'
+        )
+
+        result = {node.pk: 0 for node in nodes}
+
+        # Documents of a document type granted by an ACL are all
+        # accessible, use the per document type counters.
+        document_type_ids = list(
+            AccessControlList.objects.filter(
+                content_type=ContentType.objects.get_for_model(
+                    model=document_type_model
+                ), permissions=permission_document_view.stored_permission,
+                role__groups__user=user
+            ).values_list('object_id', flat=True)
+        )
+
+        if document_type_ids:
+            for node_id, count in count_model.objects.filter(
+                document_type_id__in=document_type_ids,
+                index_instance_node_id__in=result.keys()
+            ).order_by().values('index_instance_node_id').annotate(
+                count=Sum(field_name)
+            ).values_list('index_instance_node_id', 'count'):
+                result[node_id] += count
+
+        document_queryset = AccessControlList.objects.restrict_queryset(
+            permission=permission_document_view,
+            queryset=Document.valid.exclude(
+                document_type_id__in=document_type_ids
+            ), user=user
+        )
+
+        IndexInstanceNodeDocument = self.model.documents.through
+
+        if include_descendants:
+            count_subquery = IndexInstanceNodeDocument.objects.filter(
+                document__in=document_queryset,
+                indexinstancenode__tree_id=OuterRef('tree_id'),
+                indexinstancenode__lft__gte=OuterRef('lft'),
+                indexinstancenode__rght__lte=OuterRef('rght')
+            ).order_by().values('indexinstancenode__tree_id').annotate(
+                count=Count('pk')
+            ).values('count')
+
+            queryset = self.filter(pk__in=result.keys()).annotate(
+                document_count_restricted=Subquery(
+                    output_field=IntegerField(), queryset=count_subquery
+                )
+            ).values_list('pk', 'document_count_restricted')
+        else:
+            queryset = IndexInstanceNodeDocument.objects.filter(
+                document__in=document_queryset,
+                indexinstancenode_id__in=result.keys()
+            ).order_by().values('indexinstancenode_id').annotate(
+                count=Count('pk')
+            ).values_list('indexinstancenode_id', 'count')
+
+        for node_id, count in queryset:
+            result[node_id] += count or 0
+
+        return result
+
+    def get_queryset_parent_ancestors(self, queryset, include_self=False):
+        """
+        Return the ancestors of the nodes of the queryset using only the
+        parent links, with one query per tree level. Unlike
+        `get_queryset_ancestors` the result does not depend on the tree
+        fields, which are not valid while an index is being rebuilt.
+        """
+        node_ids = set()
+        parent_ids = set()
+
+        for pk, parent_id in queryset.values_list('pk', 'parent_id'):
+            if include_self:
+                node_ids.add(pk)
+
+            parent_ids.add(parent_id)
+
+        parent_ids.discard(None)
+
+        while parent_ids - node_ids:
+            new_node_ids = parent_ids - node_ids
+            node_ids.update(new_node_ids)
+
+            parent_ids = set(
+                self.filter(
+                    parent_id__isnull=False, pk__in=new_node_ids
+                ).values_list('parent_id', flat=True)
+            )
+
+        return self.filter(pk__in=node_ids)
+
     def remove_document(self, document):
         for index_instance_node in self.filter(documents=document):
             index_instance_node.remove_document(document=document)
+            index_instance_node.delete_empty()
+
+    def update_document_counts(self, queryset, include_ancestors=True):
+        """
+        Recalculate the document counters of the nodes of the queryset and
+        of their ancestors. Only valid documents are counted. The nodes are
+        updated one level at a time from the deepest, the descendants
+        counters are the node's own count plus the descendants counters of
+        its children. Only the parent links are used, the tree fields might
+        be outdated during a rebuild.
+        """
+        IndexInstanceNodeDocumentTypeCount = apps.get_model(
+            app_label='document_indexing',
+            model_name='IndexInstanceNodeDocumentTypeCount'
+        )
+
+        if include_ancestors:
+            queryset = self.get_queryset_parent_ancestors(
+                include_self=True, queryset=queryset
+            )
+
+        levels = sorted(
+            set(queryset.order_by().values_list('level', flat=True)),
+            reverse=True
+        )
+
+        IndexInstanceNodeDocument = self.model.documents.through
+
+        for level in levels:
+            level_queryset = queryset.filter(level=level).values('pk')
+
+            counts = {}
+
+            for node_id, document_type_id, count in IndexInstanceNodeDocument.objects.filter(
+                document__in_trash=False,
+                indexinstancenode_id__in=level_queryset
+            ).order_by().values(
+                'indexinstancenode_id', 'document__document_type_id'
+            ).annotate(count=Count('pk')).values_list(
+                'indexinstancenode_id', 'document__document_type_id', 'count'
+            ):
+                counts[(node_id, document_type_id)] = [count, count]
+
+            for node_id, document_type_id, count in IndexInstanceNodeDocumentTypeCount.objects.filter(
+                index_instance_node__parent_id__in=level_queryset
+            ).order_by().values(
+                'index_instance_node__parent_id', 'document_type_id'
+            ).annotate(count=Sum('descendants_document_count')).values_list(
+                'index_instance_node__parent_id', 'document_type_id', 'count'
+            ):
+                counts.setdefault((node_id, document_type_id), [0, 0])[1] += count
+
+            IndexInstanceNodeDocumentTypeCount.objects.filter(
+                index_instance_node_id__in=level_queryset
+            ).delete()
+            IndexInstanceNodeDocumentTypeCount.objects.bulk_create(
+                batch_size=DOCUMENT_COUNT_BATCH_SIZE, objs=[
+                    IndexInstanceNodeDocumentTypeCount(
+                        descendants_document_count=descendants_document_count,
+                        document_count=document_count,
+                        document_type_id=document_type_id,
+                        index_instance_node_id=node_id
+                    ) for (node_id, document_type_id), (document_count, descendants_document_count) in counts.items()
+                ]
+            )
+
+            nodes = {
+                node_id: self.model(
+                    descendants_document_count=0, document_count=0,
+                    pk=node_id
+                ) for node_id in level_queryset.values_list('pk', flat=True)
+            }
+            for (node_id, document_type_id), (document_count, descendants_document_count) in counts.items():
+                nodes[node_id].document_count += document_count
+                nodes[node_id].descendants_document_count += descendants_document_count
+
+            self.bulk_update(
+                batch_size=DOCUMENT_COUNT_BATCH_SIZE,
+                fields=('descendants_document_count', 'document_count'),
+                objs=nodes.values()
+            )
 
 
 class IndexTemplateManager(models.Manager):
@@ -0,0 +1,96 @@
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def operation_calculate_document_counts(apps, schema_editor):
+    IndexInstanceNode = apps.get_model(
+        app_label='document_indexing', model_name='IndexInstanceNode'
+    )
+    IndexInstanceNodeDocumentTypeCount = apps.get_model(
+        app_label='document_indexing',
+        model_name='IndexInstanceNodeDocumentTypeCount'
+    )
+
+    alias = schema_editor.connection.alias
+
+    counts = {}
+    for node_id, document_type_id, count in IndexInstanceNode.documents.through.objects.using(
+        alias=alias
+    ).filter(document__in_trash=False).order_by().values(
+        'indexinstancenode_id', 'document__document_type_id'
+    ).annotate(count=Count('pk')).values_list(
+        'indexinstancenode_id', 'document__document_type_id', 'count'
+    ):
+        counts.setdefault(node_id, {})[document_type_id] = [count, count]
+
+    # Add the counts of each node to its ancestors starting from the
+    # deepest level.
+    for node in IndexInstanceNode.objects.using(alias=alias).exclude(
+        parent=None
+    ).order_by('-level').only('parent_id'):
+        parent_counts = counts.setdefault(node.parent_id, {})
+        for document_type_id, (document_count, descendants_document_count) in counts.get(node.pk, {}).items():
+            parent_counts.setdefault(document_type_id, [0, 0])[1] += descendants_document_count
+
+    for node_id, document_type_counts in counts.items():
+        IndexInstanceNodeDocumentTypeCount.objects.using(
+            alias=alias
+        ).bulk_create(
+            objs=[
+                IndexInstanceNodeDocumentTypeCount(
+                    descendants_document_count=descendants_document_count,
+                    document_count=document_count,
+                    document_type_id=document_type_id,
+                    index_instance_node_id=node_id
+                ) for document_type_id, (document_count, descendants_document_count) in document_type_counts.items()
+            ]
+        )
+        IndexInstanceNode.objects.using(alias=alias).filter(
+            pk=node_id
+        ).update(
+            descendants_document_count=sum(
+                entry[1] for entry in document_type_counts.values()
+            ), document_count=sum(
+                entry[0] for entry in document_type_counts.values()
+            )
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('documents', '0075_delete_duplicateddocumentold'),
+        ('document_indexing', '0022_indexinstance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='indexinstancenode',
+            name='descendants_document_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of valid documents linked to this node and its descendants.', verbose_name='Descendants document count'),
+        ),
+        migrations.AddField(
+            model_name='indexinstancenode',
+            name='document_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of valid documents linked to this node.', verbose_name='Document count'),
+        ),
+        migrations.CreateModel(
+            name='IndexInstanceNodeDocumentTypeCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('document_count', models.PositiveIntegerField(default=0, verbose_name='Document count')),
+                ('descendants_document_count', models.PositiveIntegerField(default=0, verbose_name='Descendants document count')),
+                ('document_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='index_instance_node_counts', to='documents.DocumentType', verbose_name='Document type')),
+                ('index_instance_node', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='document_type_counts', to='document_indexing.IndexInstanceNode', verbose_name='Index instance node')),
+            ],
+            options={
+                'verbose_name': 'Index instance node document type count',
+                'verbose_name_plural': 'Index instance node document type counts',
+                'unique_together': {('index_instance_node', 'document_type')},
+            },
+        ),
+        migrations.RunPython(
+            code=operation_calculate_document_counts,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('document_indexing', '0023_indexinstancenode_document_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexTemplateRebuildChunk',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chunk_number', models.PositiveIntegerField(verbose_name='Chunk number')),
+                ('chunk_count', models.PositiveIntegerField(verbose_name='Chunk count')),
+                ('id_start', models.PositiveIntegerField(verbose_name='ID start')),
+                ('id_end', models.PositiveIntegerField(verbose_name='ID end')),
+                ('index_template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rebuild_chunks', to='document_indexing.IndexTemplate', verbose_name='Index template')),
+            ],
+            options={
+                'verbose_name': 'Index template rebuild chunk',
+                'verbose_name_plural': 'Index template rebuild chunks',
+                'ordering': ('index_template', 'chunk_number'),
+            },
+        ),
+    ]
@@ -1,6 +1,6 @@
 import logging
 
-from django.db import models, transaction
+from django.db import connection, models, transaction
 from django.urls import reverse
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext, ugettext_lazy as _
@@ -8,10 +8,8 @@ from django.utils.translation import ugettext, ugettext_lazy as _
 from mptt.fields import TreeForeignKey
 from mptt.models import MPTTModel
 
-from mayan.apps.acls.models import AccessControlList
 from mayan.apps.databases.model_mixins import ExtraDataModelMixin
 from mayan.apps.documents.models import Document, DocumentType
-from mayan.apps.documents.permissions import permission_document_view
 from mayan.apps.events.classes import EventManagerSave
 from mayan.apps.events.decorators import method_event
 from mayan.apps.lock_manager.backends.base import LockingBackend
@@ -23,6 +21,7 @@ from .managers import (
     DocumentIndexInstanceNodeManager, IndexTemplateManager,
     IndexInstanceNodeManager
 )
+from .settings import setting_rebuild_chunk_size
 
 logger = logging.getLogger(name=__name__)
 
@@ -92,6 +91,62 @@ class IndexTemplate(ExtraDataModelMixin, models.Model):
         except IndexInstanceNode.DoesNotExist:
             return '#'
 
+    def get_document_id_ranges(self, size, id_start=None):
+        """
+        Yield the first and last primary key of consecutive chunks of
+        `size` documents of the index.
+        """
+        queryset = self.get_document_queryset().order_by('pk')
+        if id_start is not None:
+            queryset = queryset.filter(pk__gte=id_start)
+
+        chunk_start = queryset.values_list('pk', flat=True).first()
+
+        while chunk_start is not None:
+            queryset_chunk = queryset.filter(
+                pk__gte=chunk_start
+            ).values_list('pk', flat=True)
+
+            chunk_end = queryset_chunk[size - 1:size].first()
+
+            if chunk_end is None:
+                yield chunk_start, queryset_chunk.last()
+                break
+
+            yield chunk_start, chunk_end
+
+            chunk_start = queryset.filter(
+                pk__gt=chunk_end
+            ).values_list('pk', flat=True).first()
+
+    def get_rebuild_progress(self):
+        """
+        Return the number of indexed chunks and the chunk count of the
+        rebuild of the index or None if no rebuild is pending.
+        """
+        chunk = self.rebuild_chunks.first()
+        if chunk:
+            return (
+                chunk.chunk_count - self.rebuild_chunks.count(),
+                chunk.chunk_count
+            )
+
+    def get_rebuild_progress_display(self):
+        progress = self.get_rebuild_progress()
+        if progress:
+            return _('%(indexed)d of %(count)d chunks indexed') % {
+                'count': progress[1], 'indexed': progress[0]
+            }
+        else:
+            return _('None')
+
+    get_rebuild_progress_display.short_description = _('Rebuild progress')
+
+    def get_document_queryset(self):
+        return Document.valid.filter(
+            document_type__in=self.document_types.all()
+        )
+
     def get_document_types_names(self):
         return ', '.join(
             [
@@ -99,32 +154,261 @@ class IndexTemplate(ExtraDataModelMixin, models.Model):
             ] or ['None']
         )
 
+    def _get_document_instance_node_paths(self, document):
+        """
+        Return a dictionary of the paths of the instance nodes that
+        currently contain the document and the nodes along those paths.
+        A path is a tuple of (template node ID, value) pairs from the first
+        level down to the node. Only the parent links are used, the tree
+        fields might be outdated during a rebuild.
+        """
+        queryset = IndexInstanceNode.objects.filter(
+            documents=document, index_template_node__index=self
+        )
+
+        nodes = {
+            node.pk: node for node in IndexInstanceNode.objects.get_queryset_parent_ancestors(
+                include_self=True, queryset=queryset
+            )
+        }
+
+        result = {}
+        for node_id in queryset.values_list('pk', flat=True):
+            path = []
+            node = nodes[node_id]
+            while node.parent_id is not None:
+                path.insert(0, (node.index_template_node_id, node.value))
+                node = nodes[node.parent_id]
+
+            result[tuple(path)] = nodes[node_id]
+
+        return result
+
+    def _get_document_template_node_paths(
+        self, document, template_node_children=None
+    ):
+        """
+        Evaluate the template nodes for the document and return the set of
+        paths of the instance nodes that should contain the document.
+        """
+        if template_node_children is None:
+            template_node_children = self._get_template_node_children()
+
+        result = set()
+
+        def evaluate(template_node_id, path):
+            for template_node in template_node_children.get(template_node_id, ()):
+                if template_node.enabled:
+                    value = template_node.evaluate(document=document)
+                    if value:
+                        node_path = path + ((template_node.pk, value),)
+                        if template_node.link_documents:
+                            result.add(node_path)
+
+                        evaluate(
+                            path=node_path, template_node_id=template_node.pk
+                        )
+
+        evaluate(path=(), template_node_id=self.template_root.pk)
+
+        return result
+
+    def _get_instance_node_paths(self, instance_root):
+        """
+        Return a dictionary of the paths of all the instance nodes of the
+        index and their primary keys. Only the parent links are used, the
+        tree fields might be outdated during a rebuild.
+        """
+        parents = {}
+        for pk, parent_id, template_node_id, value in IndexInstanceNode.objects.filter(
+            tree_id=instance_root.tree_id
+        ).values_list('pk', 'parent_id', 'index_template_node_id', 'value'):
+            parents[pk] = (parent_id, template_node_id, value)
+
+        paths = {instance_root.pk: ()}
+
+        def get_path(pk):
+            if pk not in paths:
+                parent_id, template_node_id, value = parents[pk]
+                paths[pk] = get_path(pk=parent_id) + (
+                    (template_node_id, value),
+                )
+
+            return paths[pk]
+
+        return {get_path(pk=pk): pk for pk in parents}
+
+    def _get_template_node_children(self):
+        result = {}
+        for template_node in self.node_templates.all():
+            result.setdefault(template_node.parent_id, []).append(
+                template_node
+            )
+
+        return result
+
     def index_document(self, document):
         """
-        Method to start the indexing process for a document. The entire process
-        happens inside one transaction. The document is first removed from all
-        the index nodes to which it already belongs. The different index
-        templates that match this document's type are evaluated and for each
-        result a node is fetched or created and the document is added to that
-        node.
+        Method to start the indexing process for a document. The template
+        nodes are evaluated to obtain the paths of the instance nodes that
+        should contain the document. These are compared to the instance
+        nodes that contain the document and only the difference is applied.
+        The document is added to the missing nodes, creating them as
+        needed, and removed from the nodes that no longer match. Only the
+        nodes from which the document was removed and their ancestors are
+        checked for emptiness. The document counters of the nodes of the
+        document and of their ancestors are updated afterwards.
         """
         logger.debug('Index; Indexing document: %s', document)
 
-        if Document.valid.filter(pk=document.pk).exists():
+        is_valid = Document.valid.filter(pk=document.pk).exists()
+
+        if is_valid:
             # Only index valid documents
             self.initialize_instance_root()
 
+        template_root = self.template_root
+        lock = LockingBackend.get_backend().acquire_lock(
+            name=template_root.get_lock_string()
+        )
+        try:
             with transaction.atomic():
-                # Remove the document from all instance nodes from
-                # this index
-                for index_instance_node in IndexInstanceNode.objects.filter(index_template_node__index=self, documents=document):
-                    index_instance_node.remove_document(document=document)
+                updated_node_ids = ()
+
+                if is_valid:
+                    current_paths = self._get_document_instance_node_paths(
+                        document=document
+                    )
+                    target_paths = self._get_document_template_node_paths(
+                        document=document
+                    )
+                    removed_paths = set(current_paths) - target_paths
+
+                    if removed_paths:
+                        # The nodes might be deleted, keep their ancestors
+                        # to update their counters. Obtained before
+                        # changing the tree.
+                        updated_node_ids = list(
+                            IndexInstanceNode.objects.get_queryset_parent_ancestors(
+                                queryset=IndexInstanceNode.objects.filter(
+                                    pk__in=[
+                                        current_paths[path].pk for path in removed_paths
+                                    ]
+                                )
+                            ).values_list('pk', flat=True)
+                        )
+
+                    nodes = {(): template_root.get_instance_root_node()}
+                    for path, node in current_paths.items():
+                        nodes[path] = node
+
+                    for path in sorted(target_paths - set(current_paths)):
+                        for index in range(1, len(path) + 1):
+                            if path[:index] not in nodes:
+                                template_node_id, value = path[index - 1]
+                                nodes[path[:index]], created = IndexInstanceNode.objects.get_or_create(
+                                    index_template_node_id=template_node_id,
+                                    parent=nodes[path[:index - 1]],
+                                    value=value
+                                )
 
-                # Delete all empty nodes. Starting from the bottom up
-                for index_instance_node in self.instance_root.get_leafnodes():
-                    index_instance_node.delete_empty()
+                        nodes[path].documents.add(document)
+
+                    for path in removed_paths:
+                        current_paths[path].documents.remove(document)
+                        current_paths[path].delete_empty()
+
+                # Trashed documents keep their nodes but are not counted.
+                # Updating the nodes of the document also covers a change
+                # of its document type.
+                IndexInstanceNode.objects.update_document_counts(
+                    queryset=IndexInstanceNode.objects.filter(
+                        index_template_node__index=self
+                    ).filter(
+                        models.Q(documents=document) |
+                        models.Q(pk__in=updated_node_ids)
+                    ).distinct()
+                )
+        finally:
+            lock.release()
 
-            self.template_root.index_document(document=document)
+    def index_document_chunk(self, id_start, id_end):
+        """
+        Add the documents of a primary key range to the index. Used to
+        rebuild the index after it is reset. The template nodes are
+        evaluated before acquiring the index lock. The missing instance
+        nodes are created with one bulk insert per level and the document
+        links with a single bulk insert. The tree fields of the new nodes
+        are not calculated, `rebuild_finish` must be called after the last
+        chunk. Chunks can be indexed again safely. Documents can be indexed
+        individually between chunks, `index_document` only uses the parent
+        links of the nodes.
+        """
+        template_node_children = self._get_template_node_children()
+
+        document_paths = [
+            (
+                document.pk, self._get_document_template_node_paths(
+                    document=document,
+                    template_node_children=template_node_children
+                )
+            ) for document in self.get_document_queryset().filter(
+                pk__gte=id_start, pk__lte=id_end
+            )
+        ]
+
+        template_root = self.template_root
+        lock = LockingBackend.get_backend().acquire_lock(
+            name=template_root.get_lock_string()
+        )
+        try:
+            with transaction.atomic():
+                instance_root = template_root.get_instance_root_node()
+                nodes = self._get_instance_node_paths(
+                    instance_root=instance_root
+                )
+
+                new_paths = set()
+                for document_id, paths in document_paths:
+                    for path in paths:
+                        for index in range(1, len(path) + 1):
+                            if path[:index] not in nodes:
+                                new_paths.add(path[:index])
+
+                for level in sorted(set(len(path) for path in new_paths)):
+                    level_paths = sorted(
+                        path for path in new_paths if len(path) == level
+                    )
+                    instances = [
+                        IndexInstanceNode(
+                            index_template_node_id=path[-1][0], level=level,
+                            lft=0, parent_id=nodes[path[:-1]], rght=0,
+                            tree_id=instance_root.tree_id, value=path[-1][1]
+                        ) for path in level_paths
+                    ]
+
+                    if connection.features.can_return_ids_from_bulk_insert:
+                        IndexInstanceNode.objects.bulk_create(objs=instances)
+                    else:
+                        with IndexInstanceNode.objects.disable_mptt_updates():
+                            for instance in instances:
+                                instance.save(force_insert=True)
+
+                    for path, instance in zip(level_paths, instances):
+                        nodes[path] = instance.pk
+
+                IndexInstanceNodeDocument = IndexInstanceNode.documents.through
+                IndexInstanceNodeDocument.objects.bulk_create(
+                    ignore_conflicts=True, objs=[
+                        IndexInstanceNodeDocument(
+                            document_id=document_id,
+                            indexinstancenode_id=nodes[path]
+                        ) for document_id, paths in document_paths
+                        for path in paths
+                    ]
+                )
+        finally:
+            lock.release()
 
     def initialize_instance_root(self):
         return self.template_root.initialize_index_instance_root_node()
@@ -139,26 +423,52 @@ class IndexTemplate(ExtraDataModelMixin, models.Model):
     def rebuild(self):
         """
         Delete and reconstruct the index by deleting of all its instance nodes
-        and recreating them for the documents whose types are associated with
-        this index
+        and indexing the documents whose types are associated with this
+        index in chunks.
         """
-        # Delete all index instance nodes by deleting the root index
-        # instance node. All child index instance nodes will be cascade
-        # deleted.
-        try:
-            self.instance_root.delete()
-        except IndexInstanceNode.DoesNotExist:
-            # Empty index, ignore this exception
-            pass
+        self.reset()
 
-        # Create the new root index instance node
-        self.template_root.index_instance_nodes.create()
+        for id_start, id_end in self.get_document_id_ranges(
+            size=setting_rebuild_chunk_size.value
+        ):
+            logger.debug(
+                'Rebuilding index: %s, IDs %d to %d', self, id_start, id_end
+            )
+            self.index_document_chunk(id_end=id_end, id_start=id_start)
+
+        self.rebuild_finish()
 
-        # Re-index each document with a type associated with this index
-        for document in Document.objects.filter(document_type__in=self.document_types.all()):
-            # Evaluate each index template node for each document
-            # associated with this index.
-            self.index_document(document=document)
+    def rebuild_chunks_create(self, size):
+        """
+        Split the documents of the index into primary key ranges of `size`
+        documents and store them as the pending chunks of a new rebuild.
+        """
+        id_ranges = list(self.get_document_id_ranges(size=size))
+
+        return IndexTemplateRebuildChunk.objects.bulk_create(
+            objs=[
+                IndexTemplateRebuildChunk(
+                    chunk_count=len(id_ranges), chunk_number=chunk_number,
+                    id_end=id_end, id_start=id_start, index_template=self
+                ) for chunk_number, (id_start, id_end) in enumerate(
+                    iterable=id_ranges, start=1
+                )
+            ]
+        )
+
+    def rebuild_finish(self):
+        """
+        Calculate the tree fields and the document counters of the instance
+        nodes created by `index_document_chunk`.
+        """
+        tree_id = self.instance_root.tree_id
+
+        with transaction.atomic():
+            IndexInstanceNode.objects.partial_rebuild(tree_id=tree_id)
+            IndexInstanceNode.objects.update_document_counts(
+                include_ancestors=False,
+                queryset=IndexInstanceNode.objects.filter(tree_id=tree_id)
+            )
 
     def reset(self):
         try:
@@ -247,88 +557,35 @@ class IndexTemplateNode(MPTTModel):
         else:
             return self.expression
 
-    def get_lock_string(self):
-        return 'indexing:indexing_template_node_{}'.format(self.pk)
-
-    def get_instance_root_node(self):
-        return self.index_instance_nodes.get(parent=None)
+    def evaluate(self, document):
+        """
+        Render the expression for the document. Returns None if the
+        expression cannot be rendered.
+        """
+        logger.debug(
+            'IndexTemplateNode; Evaluating template: %s', self.expression
+        )
 
-    def index_document(self, document, acquire_lock=True, index_instance_node_parent=None):
-        # Start transaction after the lock in case the locking backend uses
-        # the database.
         try:
-            if acquire_lock:
-                lock = LockingBackend.get_backend().acquire_lock(
-                    name=self.get_lock_string()
-                )
-        except LockError:
-            raise
+            template = Template(template_string=self.expression)
+            result = template.render(context={'document': document})
+        except Exception as exception:
+            logger.debug(
+                'Error indexing document: %(document)s; expression: '
+                '%(expression)s; %(exception)s', {
+                    'document': document, 'expression': self.expression,
+                    'exception': exception
+                }
+            )
         else:
-            try:
-                logger.debug(
-                    'IndexTemplateNode; Indexing document: %s', document
-                )
-
-                if not index_instance_node_parent:
-                    # I'm the root
-                    with transaction.atomic():
-                        index_instance_root_node = self.get_instance_root_node()
-
-                        for child in self.get_children():
-                            child.index_document(
-                                document=document, acquire_lock=False,
-                                index_instance_node_parent=index_instance_root_node
-                            )
-                elif self.enabled:
-                    with transaction.atomic():
-                        logger.debug('IndexTemplateNode; non parent: evaluating')
-                        logger.debug('My parent template is: %s', self.parent)
-                        logger.debug(
-                            'My parent instance node is: %s',
-                            index_instance_node_parent
-                        )
-                        logger.debug(
-                            'IndexTemplateNode; Evaluating template: %s', self.expression
-                        )
-
-                        try:
-                            template = Template(
-                                template_string=self.expression
-                            )
-                            result = template.render(
-                                context={'document': document}
-                            )
-                        except Exception as exception:
-                            logger.debug('Evaluating error: %s', exception)
-                            error_message = _(
-                                'Error indexing document: %(document)s; expression: '
-                                '%(expression)s; %(exception)s'
-                            ) % {
-                                'document': document,
-                                'expression': self.expression,
-                                'exception': exception
-                            }
-                            logger.debug(error_message)
-                        else:
-                            logger.debug('Evaluation result: %s', result)
-
-                            if result:
-                                index_instance_node, created = self.index_instance_nodes.get_or_create(
-                                    parent=index_instance_node_parent,
-                                    value=result
-                                )
+            logger.debug('Evaluation result: %s', result)
+            return result
 
-                                if self.link_documents:
-                                    index_instance_node.documents.add(document)
+    def get_lock_string(self):
+        return 'indexing:indexing_template_node_{}'.format(self.pk)
 
-                                for child in self.get_children():
-                                    child.index_document(
-                                        document=document, acquire_lock=False,
-                                        index_instance_node_parent=index_instance_node
-                                    )
-            finally:
-                if acquire_lock:
-                    lock.release()
+    def get_instance_root_node(self):
+        return self.index_instance_nodes.get(parent=None)
 
     def initialize_index_instance_root_node(self):
         self.index_instance_nodes.get_or_create(parent=None)
@@ -392,6 +649,17 @@ class IndexInstanceNode(MPTTModel):
         related_name='index_instance_nodes', to=Document,
         verbose_name=_('Documents')
     )
+    document_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text=_(
+            'Number of valid documents linked to this node.'
+        ), verbose_name=_('Document count')
+    )
+    descendants_document_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text=_(
+            'Number of valid documents linked to this node and its '
+            'descendants.'
+        ), verbose_name=_('Descendants document count')
+    )
 
     objects = IndexInstanceNodeManager()
 
@@ -420,7 +688,7 @@ class IndexInstanceNode(MPTTModel):
                         # I'm not a root node, I can be deleted
                         self.delete()
 
-                        if self.parent.is_root_node():
+                        if not self.parent.is_root_node():
                             # My parent is not a root node, it can be deleted
                             self.parent.delete_empty()
             finally:
@@ -436,18 +704,22 @@ class IndexInstanceNode(MPTTModel):
     def get_children_count(self):
         return self.get_children().count()
 
+    def _get_document_count(self, user, include_descendants):
+        try:
+            return self._document_counts_cache[
+                (user.pk, include_descendants)
+            ]
+        except (AttributeError, KeyError):
+            return IndexInstanceNode.objects.get_document_counts(
+                include_descendants=include_descendants, nodes=(self,),
+                user=user
+            )[self.pk]
+
     def get_descendants_count(self):
-        return self.get_descendants().count()
+        return self.get_descendant_count()
 
     def get_descendants_document_count(self, user):
-        return AccessControlList.objects.restrict_queryset(
-            permission=permission_document_view,
-            queryset=Document.objects.filter(
-                index_instance_nodes__in=self.get_descendants(
-                    include_self=True
-                )
-            ), user=user
-        ).count()
+        return self._get_document_count(include_descendants=True, user=user)
 
     def get_documents(self):
         return Document.valid.filter(pk__in=self.documents.values('pk'))
@@ -468,12 +740,9 @@ class IndexInstanceNode(MPTTModel):
 
     def get_item_count(self, user):
         if self.index_template_node.link_documents:
-            queryset = AccessControlList.objects.restrict_queryset(
-                permission=permission_document_view,
-                queryset=self.get_documents(), user=user
+            return self._get_document_count(
+                include_descendants=False, user=user
             )
-
-            return queryset.count()
         else:
             return self.get_children().count()
 
@@ -503,7 +772,11 @@ class IndexInstanceNode(MPTTModel):
             raise
         else:
             try:
-                self.documents.remove(document)
+                with transaction.atomic():
+                    self.documents.remove(document)
+                    IndexInstanceNode.objects.update_document_counts(
+                        queryset=IndexInstanceNode.objects.filter(pk=self.pk)
+                    )
             finally:
                 lock.release()
 
@@ -522,6 +795,64 @@ class DocumentIndexInstanceNode(IndexInstanceNode):
         verbose_name_plural = _('Document indexes node instances')
 
 
+class IndexInstanceNodeDocumentTypeCount(models.Model):
+    """
+    Number of valid documents of a document type linked to an index instance
+    node and to its descendants. Maintained by the indexing process.
+    """
+    index_instance_node = models.ForeignKey(
+        on_delete=models.CASCADE, related_name='document_type_counts',
+        to=IndexInstanceNode, verbose_name=_('Index instance node')
+    )
+    document_type = models.ForeignKey(
+        on_delete=models.CASCADE, related_name='index_instance_node_counts',
+        to=DocumentType, verbose_name=_('Document type')
+    )
+    document_count = models.PositiveIntegerField(
+        default=0, verbose_name=_('Document count')
+    )
+    descendants_document_count = models.PositiveIntegerField(
+        default=0, verbose_name=_('Descendants document count')
+    )
+
+    class Meta:
+        unique_together = ('index_instance_node', 'document_type')
+        verbose_name = _('Index instance node document type count')
+        verbose_name_plural = _('Index instance node document type counts')
+
+    def __str__(self):
+        return '{}: {}'.format(self.index_instance_node, self.document_type)
+
+
+class IndexTemplateRebuildChunk(models.Model):
+    """
+    Primary key range of the documents of an index pending to be indexed by
+    a rebuild. Chunks are removed once indexed. The chunks left by an
+    interrupted rebuild are indexed when the index is rebuilt again
+    instead of starting a new rebuild.
+    """
+    index_template = models.ForeignKey(
+        on_delete=models.CASCADE, related_name='rebuild_chunks',
+        to=IndexTemplate, verbose_name=_('Index template')
+    )
+    chunk_number = models.PositiveIntegerField(
+        verbose_name=_('Chunk number')
+    )
+    chunk_count = models.PositiveIntegerField(verbose_name=_('Chunk count'))
+    id_start = models.PositiveIntegerField(verbose_name=_('ID start'))
+    id_end = models.PositiveIntegerField(verbose_name=_('ID end'))
+
+    class Meta:
+        ordering = ('index_template', 'chunk_number')
+        verbose_name = _('Index template rebuild chunk')
+        verbose_name_plural = _('Index template rebuild chunks')
+
+    def __str__(self):
+        return '{}: {}/{}'.format(
+            self.index_template, self.chunk_number, self.chunk_count
+        )
+
+
 class IndexInstanceNodeSearchResult(IndexInstanceNode):
     class Meta:
         proxy = True
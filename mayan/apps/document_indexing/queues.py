@@ -20,6 +20,14 @@ queue_indexing.add_task_type(
     label=_('Index document'),
     dotted_path='mayan.apps.document_indexing.tasks.task_index_document'
 )
+queue_indexing.add_task_type(
+    label=_('Rebuild an index chunk'),
+    dotted_path='mayan.apps.document_indexing.tasks.task_rebuild_index_chunk'
+)
+queue_indexing.add_task_type(
+    label=_('Finish an index rebuild'),
+    dotted_path='mayan.apps.document_indexing.tasks.task_rebuild_index_finish'
+)
 queue_tools.add_task_type(
     label=_('Rebuild index'),
     dotted_path='mayan.apps.document_indexing.tasks.task_rebuild_index'
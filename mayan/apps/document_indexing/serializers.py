@@ -27,7 +27,7 @@ class IndexInstanceSerializer(serializers.ModelSerializer):
         model = IndexInstance
 
     def get_item_count(self, obj):
-        return obj.get_item_count(user=self.context['request'])
+        return obj.get_item_count(user=self.context['request'].user)
 
     def get_node_count(self, obj):
         return obj.get_instance_node_count()
@@ -1,12 +1,15 @@
 import logging
 
+from celery import chord
+
 from django.apps import apps
 from django.db import OperationalError
 
+from mayan.apps.lock_manager.backends.base import LockingBackend
 from mayan.apps.lock_manager.exceptions import LockError
 from mayan.celery import app
 
-from .settings import setting_task_retry
+from .settings import setting_rebuild_chunk_size, setting_task_retry
 
 logger = logging.getLogger(name=__name__)
 
@@ -66,16 +69,100 @@ def task_index_document(self, document_id):
     ignore_result=True
 )
 def task_rebuild_index(self, index_id):
+    """
+    Reset the index and split its documents into primary key ranges, each
+    indexed in its own task. The pending ranges are stored and removed as
+    they are indexed. When a previous rebuild of the index was
+    interrupted, its pending ranges are indexed instead of resetting the
+    index.
+    """
+    IndexTemplate = apps.get_model(
+        app_label='document_indexing', model_name='IndexTemplate'
+    )
+
+    index = IndexTemplate.objects.get(pk=index_id)
+
+    if index.rebuild_chunks.exists():
+        logger.info('Resuming the rebuild of index: %s', index)
+    else:
+        index.reset()
+        index.rebuild_chunks_create(size=setting_rebuild_chunk_size.value)
+
+    chunks = list(index.rebuild_chunks.all())
+
+    finish_signature = task_rebuild_index_finish.si(index_id=index_id)
+
+    if not chunks:
+        finish_signature.apply_async()
+    else:
+        chord(
+            [
+                task_rebuild_index_chunk.s(
+                    chunk_count=chunk.chunk_count,
+                    chunk_number=chunk.chunk_number, id_end=chunk.id_end,
+                    id_start=chunk.id_start, index_id=index_id
+                ) for chunk in chunks
+            ]
+        )(finish_signature)
+
+
+@app.task(
+    bind=True, default_retry_delay=setting_task_retry.value, max_retries=None
+)
+def task_rebuild_index_chunk(
+    self, index_id, id_start, id_end, chunk_number=None, chunk_count=None
+):
+    """
+    The chunk number and count are only used to report the progress of the
+    rebuild in the task manager and the logs.
+    """
+    IndexTemplate = apps.get_model(
+        app_label='document_indexing', model_name='IndexTemplate'
+    )
+
+    index = IndexTemplate.objects.get(pk=index_id)
+
+    logger.info(
+        'Rebuilding index: %s, chunk %s of %s, IDs %d to %d', index,
+        chunk_number, chunk_count, id_start, id_end
+    )
+
+    try:
+        index.index_document_chunk(id_end=id_end, id_start=id_start)
+    except LockError as exception:
+        raise self.retry(exc=exception)
+
+    index.rebuild_chunks.filter(id_start=id_start).delete()
+
+    logger.info(
+        'Finished index: %s, chunk %s of %s', index, chunk_number,
+        chunk_count
+    )
+
+
+@app.task(
+    bind=True, default_retry_delay=setting_task_retry.value, max_retries=None,
+    ignore_result=True
+)
+def task_rebuild_index_finish(self, index_id):
     IndexTemplate = apps.get_model(
         app_label='document_indexing', model_name='IndexTemplate'
     )
 
+    index = IndexTemplate.objects.get(pk=index_id)
+
+    lock_name = index.template_root.get_lock_string()
     try:
-        index = IndexTemplate.objects.get(pk=index_id)
-        index.rebuild()
+        lock = LockingBackend.get_backend().acquire_lock(name=lock_name)
     except LockError as exception:
-        # This index is being rebuilt by another task, retry later
         raise self.retry(exc=exception)
+    else:
+        try:
+            index.rebuild_finish()
+        finally:
+            lock.release()
+
+    logger.info('Finished rebuilding index: %s', index)
 
 
 @app.task(
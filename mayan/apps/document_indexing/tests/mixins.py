@@ -95,11 +95,13 @@ class IndexInstanceNodeAPIViewTestMixin:
 
 
 class IndexInstanceViewTestMixin:
-    def _request_test_index_instance_node_view(self, index_instance_node):
+    def _request_test_index_instance_node_view(
+        self, index_instance_node, query=None
+    ):
         return self.get(
             viewname='indexing:index_instance_node_view', kwargs={
                 'index_instance_node_id': index_instance_node.pk
-            }
+            }, query=query
         )
 
 
@@ -427,6 +429,13 @@ class IndexTemplateViewTestMixin:
             }
         )
 
+    def _request_test_index_template_rebuild_get_view(self):
+        return self.get(
+            viewname='indexing:index_template_rebuild', kwargs={
+                'index_template_id': self.test_index_template.pk
+            }
+        )
+
     def _request_test_index_template_rebuild_view(self):
         return self.post(
             viewname='indexing:index_template_rebuild', kwargs={
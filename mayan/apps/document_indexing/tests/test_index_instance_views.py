@@ -1,5 +1,6 @@
 from mayan.apps.documents.permissions import permission_document_view
 from mayan.apps.documents.tests.base import GenericDocumentViewTestCase
+from mayan.apps.views.settings import setting_paginate_by
 
 from ..permissions import permission_index_instance_view
 
@@ -155,6 +156,38 @@ class IndexInstanceViewTestCase(
         events = self._get_test_events()
         self.assertEqual(events.count(), 0)
 
+    def test_index_instance_root_node_view_paginated_with_access(self):
+        self._create_test_document_stub()
+        self._create_test_document_stub()
+        self._create_test_index_template_node(rebuild=True)
+
+        self.grant_access(
+            obj=self.test_index_template,
+            permission=permission_index_instance_view
+        )
+
+        old_value = setting_paginate_by.value
+        setting_paginate_by.set(value=1)
+        self.addCleanup(setting_paginate_by.set, value=old_value)
+
+        self._clear_events()
+
+        response = self._request_test_index_instance_node_view(
+            index_instance_node=self.test_index_template.instance_root,
+            query={'page': 2}
+        )
+        self.assertContains(
+            response=response, text=self.test_documents[1].label,
+            status_code=200
+        )
+        self.assertNotContains(
+            response=response, text=self.test_documents[0].label,
+            status_code=200
+        )
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
     def test_index_instance_document_node_view_no_permission(self):
         self._create_test_document_stub()
         self._create_test_index_template_node(
@@ -424,6 +424,30 @@ class IndexTemplateViewTestCase(
         self.assertEqual(events.count(), 0)
 
 
+    def test_index_template_rebuild_view_progress(self):
+        self._create_test_document_stub()
+        self._create_test_document_stub()
+        self._create_test_index_template(add_test_document_type=True)
+
+        self.test_index_template.rebuild_chunks_create(size=1)
+        self.test_index_template.rebuild_chunks.first().delete()
+
+        self.grant_access(
+            obj=self.test_index_template,
+            permission=permission_index_template_rebuild
+        )
+
+        self._clear_events()
+
+        response = self._request_test_index_template_rebuild_get_view()
+        self.assertContains(
+            response=response, text='1 of 2 chunks indexed', status_code=200
+        )
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+
 class IndexTemplateAddRemoveDocumentTypeViewTestCase(
     IndexTemplateTestMixin, IndexTemplateViewTestMixin,
     GenericDocumentViewTestCase
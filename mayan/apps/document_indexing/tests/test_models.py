@@ -1,3 +1,7 @@
+import mock
+
+from mayan.apps.documents.models import TrashedDocument
+from mayan.apps.documents.permissions import permission_document_view
 from mayan.apps.documents.tests.base import DocumentTestMixin
 from mayan.apps.documents.tests.literals import (
     TEST_DOCUMENT_DESCRIPTION, TEST_DOCUMENT_DESCRIPTION_EDITED,
@@ -7,6 +11,8 @@ from mayan.apps.metadata.models import MetadataType, DocumentTypeMetadataType
 from mayan.apps.testing.tests.base import BaseTestCase
 
 from ..models import IndexInstanceNode, IndexTemplate, IndexTemplateNode
+from ..settings import setting_rebuild_chunk_size
+from ..tasks import task_rebuild_index
 
 from .literals import (
     TEST_INDEX_TEMPLATE_DOCUMENT_DESCRIPTION_EXPRESSION,
@@ -131,6 +137,356 @@ class IndexTestCase(IndexTemplateTestMixin, DocumentTestMixin, BaseTestCase):
             )
         )
 
+    def test_index_document_empty_ancestors_removed(self):
+        level_1 = self.test_index_template.node_templates.create(
+            parent=self.test_index_template.template_root,
+            expression='{{ document.uuid }}', link_documents=False
+        )
+        self.test_index_template.node_templates.create(
+            parent=level_1,
+            expression=TEST_INDEX_TEMPLATE_DOCUMENT_DESCRIPTION_EXPRESSION,
+            link_documents=True
+        )
+
+        self.test_document.description = TEST_DOCUMENT_DESCRIPTION
+        self.test_document.save()
+
+        self.assertEqual(
+            list(IndexInstanceNode.objects.values_list('value', flat=True)),
+            ['', str(self.test_document.uuid), TEST_DOCUMENT_DESCRIPTION]
+        )
+
+        self.test_document.description = ''
+        self.test_document.save()
+
+        self.assertEqual(
+            list(IndexInstanceNode.objects.values_list('value', flat=True)),
+            ['']
+        )
+
+    def test_index_document_unchanged_nodes_kept(self):
+        self._create_test_document_stub()
+
+        self.test_index_template.node_templates.create(
+            parent=self.test_index_template.template_root,
+            expression=TEST_INDEX_TEMPLATE_DOCUMENT_LABEL_EXPRESSION,
+            link_documents=True
+        )
+        self.test_index_template.rebuild()
+
+        test_index_instance_node_ids = {
+            node.value: node.pk for node in IndexInstanceNode.objects.all()
+        }
+
+        self.test_documents[0].label = TEST_DOCUMENT_LABEL_EDITED
+        self.test_documents[0].save()
+
+        self.assertEqual(
+            {
+                node.value: node.pk for node in IndexInstanceNode.objects.all()
+                if node.value != TEST_DOCUMENT_LABEL_EDITED
+            }, {
+                '': test_index_instance_node_ids[''],
+                self.test_documents[1].label: test_index_instance_node_ids[
+                    self.test_documents[1].label
+                ]
+            }
+        )
+        self.assertQuerysetEqual(
+            IndexInstanceNode.objects.get(
+                value=TEST_DOCUMENT_LABEL_EDITED
+            ).documents.all(), [repr(self.test_documents[0])]
+        )
+
+    def test_rebuild_chunked(self):
+        self._create_test_document_stub()
+        self._create_test_document_stub()
+
+        level_1 = self.test_index_template.node_templates.create(
+            parent=self.test_index_template.template_root,
+            expression='{{ document.uuid }}', link_documents=False
+        )
+        self.test_index_template.node_templates.create(
+            parent=level_1,
+            expression=TEST_INDEX_TEMPLATE_DOCUMENT_LABEL_EXPRESSION,
+            link_documents=True
+        )
+
+        old_value = setting_rebuild_chunk_size.value
+        setting_rebuild_chunk_size.set(value=1)
+        self.addCleanup(setting_rebuild_chunk_size.set, value=old_value)
+
+        self.test_index_template.rebuild()
+
+        instance_root = self.test_index_template.instance_root
+        self.assertEqual(instance_root.get_descendant_count(), 6)
+
+        for test_document in self.test_documents:
+            node = IndexInstanceNode.objects.get(documents=test_document)
+            self.assertEqual(
+                [
+                    ancestor.value for ancestor in node.get_ancestors(
+                        include_self=True
+                    )
+                ], ['', str(test_document.uuid), test_document.label]
+            )
+
+        # The tree must be usable for incremental indexing.
+        self.test_documents[0].label = TEST_DOCUMENT_LABEL_EDITED
+        self.test_documents[0].save()
+
+        self.assertEqual(
+            IndexInstanceNode.objects.get(
+                documents=self.test_documents[0]
+            ).value, TEST_DOCUMENT_LABEL_EDITED
+        )
+        self.assertEqual(instance_root.get_descendant_count(), 6)
+
+    def test_index_document_chunk_repeated(self):
+        self.test_index_template.node_templates.create(
+            parent=self.test_index_template.template_root,
+            expression=TEST_INDEX_TEMPLATE_DOCUMENT_LABEL_EXPRESSION,
+            link_documents=True
+        )
+        self.test_index_template.reset()
+
+        for count in range(2):
+            self.test_index_template.index_document_chunk(
+                id_end=self.test_document.pk, id_start=self.test_document.pk
+            )
+        self.test_index_template.rebuild_finish()
+
+        self.assertEqual(IndexInstanceNode.objects.count(), 2)
+        self.assertQuerysetEqual(
+            IndexInstanceNode.objects.get(
+                value=self.test_document.label
+            ).documents.all(), [repr(self.test_document)]
+        )
+
+    def test_index_document_between_chunks(self):
+        self._create_test_document_stub()
+
+        level_1 = self.test_index_template.node_templates.create(
+            parent=self.test_index_template.template_root,
+            expression='{{ document.uuid }}', link_documents=False
+        )
+        self.test_index_template.node_templates.create(
+            parent=level_1,
+            expression=TEST_INDEX_TEMPLATE_DOCUMENT_LABEL_EXPRESSION,
+            link_documents=True
+        )
+        self.test_index_template.reset()
+
+        self.test_index_template.index_document_chunk(
+            id_end=self.test_documents[0].pk,
+            id_start=self.test_documents[0].pk
+        )
+
+        # The nodes of the chunk have no tree fields yet.
+        self.test_documents[0].label = TEST_DOCUMENT_LABEL_EDITED
+        self.test_documents[0].save()
+
+        self.test_index_template.index_document_chunk(
+            id_end=self.test_documents[1].pk,
+            id_start=self.test_documents[1].pk
+        )
+        self.test_index_template.rebuild_finish()
+
+        instance_root = self.test_index_template.instance_root
+        self.assertEqual(instance_root.get_descendant_count(), 4)
+        self.assertEqual(instance_root.descendants_document_count, 2)
+
+        for test_document in self.test_documents:
+            node = IndexInstanceNode.objects.get(documents=test_document)
+            self.assertEqual(
+                [
+                    ancestor.value for ancestor in node.get_ancestors(
+                        include_self=True
+                    )
+                ], ['', str(test_document.uuid), test_document.label]
+            )
+
+    def test_rebuild_chunks_progress(self):
+        self._create_test_document_stub()
+
+        self.assertEqual(self.test_index_template.get_rebuild_progress(), None)
+
+        self.test_index_template.rebuild_chunks_create(size=1)
+        self.assertEqual(
+            self.test_index_template.get_rebuild_progress(), (0, 2)
+        )
+
+        self.test_index_template.rebuild_chunks.first().delete()
+        self.assertEqual(
+            self.test_index_template.get_rebuild_progress(), (1, 2)
+        )
+
+    def test_task_rebuild_index_chunks_removed(self):
+        self._create_test_document_stub()
+        self.test_index_template.node_templates.create(
+            parent=self.test_index_template.template_root,
+            expression=TEST_INDEX_TEMPLATE_DOCUMENT_LABEL_EXPRESSION,
+            link_documents=True
+        )
+
+        old_value = setting_rebuild_chunk_size.value
+        setting_rebuild_chunk_size.set(value=1)
+        self.addCleanup(setting_rebuild_chunk_size.set, value=old_value)
+
+        task_rebuild_index.apply_async(
+            kwargs={'index_id': self.test_index_template.pk}
+        )
+
+        self.assertEqual(self.test_index_template.rebuild_chunks.count(), 0)
+        self.assertEqual(
+            self.test_index_template.instance_root.get_descendant_count(), 2
+        )
+
+    def test_task_rebuild_index_resume(self):
+        self._create_test_document_stub()
+        self.test_index_template.node_templates.create(
+            parent=self.test_index_template.template_root,
+            expression=TEST_INDEX_TEMPLATE_DOCUMENT_LABEL_EXPRESSION,
+            link_documents=True
+        )
+        self.test_index_template.reset()
+
+        # Interrupted rebuild with the first chunk indexed.
+        self.test_index_template.rebuild_chunks_create(size=1)
+        self.test_index_template.index_document_chunk(
+            id_end=self.test_documents[0].pk,
+            id_start=self.test_documents[0].pk
+        )
+        self.test_index_template.rebuild_chunks.filter(
+            id_start=self.test_documents[0].pk
+        ).delete()
+
+        self.test_documents[0].label = TEST_DOCUMENT_LABEL_EDITED
+        self.test_documents[0].save()
+
+        with mock.patch.object(
+            target=IndexTemplate, attribute='reset'
+        ) as mock_reset:
+            task_rebuild_index.apply_async(
+                kwargs={'index_id': self.test_index_template.pk}
+            )
+
+        self.assertFalse(mock_reset.called)
+        self.assertEqual(self.test_index_template.rebuild_chunks.count(), 0)
+        self.assertEqual(self.test_index_template.get_rebuild_progress(), None)
+
+        instance_root = self.test_index_template.instance_root
+        self.assertEqual(instance_root.get_descendant_count(), 2)
+        self.assertEqual(instance_root.descendants_document_count, 2)
+
+    def test_document_counts(self):
+        self._create_test_document_stub()
+
+        self._create_test_index_template_node(rebuild=True)
+
+        instance_root = self.test_index_template.instance_root
+        self.assertEqual(instance_root.document_count, 0)
+        self.assertEqual(instance_root.descendants_document_count, 2)
+        self.assertEqual(
+            instance_root.document_type_counts.get(
+                document_type=self.test_document_type
+            ).descendants_document_count, 2
+        )
+
+        test_index_instance_node = IndexInstanceNode.objects.get(
+            documents=self.test_documents[0]
+        )
+        self.assertEqual(test_index_instance_node.document_count, 1)
+        self.assertEqual(
+            test_index_instance_node.descendants_document_count, 1
+        )
+
+        # Trashed documents keep their nodes but are not counted.
+        self.test_documents[0].delete()
+
+        instance_root.refresh_from_db()
+        test_index_instance_node.refresh_from_db()
+        self.assertEqual(instance_root.descendants_document_count, 1)
+        self.assertEqual(test_index_instance_node.document_count, 0)
+
+        TrashedDocument.objects.get(pk=self.test_documents[0].pk).restore()
+
+        instance_root.refresh_from_db()
+        self.assertEqual(instance_root.descendants_document_count, 2)
+
+    def test_document_counts_with_access(self):
+        self._create_test_document_stub()
+
+        self._create_test_index_template_node(rebuild=True)
+
+        instance_root = self.test_index_template.instance_root
+
+        self.assertEqual(
+            instance_root.get_descendants_document_count(
+                user=self._test_case_user
+            ), 0
+        )
+
+        self.grant_access(
+            obj=self.test_documents[0], permission=permission_document_view
+        )
+        instance_root = self.test_index_template.instance_root
+        self.assertEqual(
+            instance_root.get_descendants_document_count(
+                user=self._test_case_user
+            ), 1
+        )
+        self.assertEqual(
+            IndexInstanceNode.objects.get_document_counts(
+                include_descendants=False,
+                nodes=instance_root.get_children().order_by('value'),
+                user=self._test_case_user
+            ), {
+                IndexInstanceNode.objects.get(
+                    documents=self.test_documents[0]
+                ).pk: 1,
+                IndexInstanceNode.objects.get(
+                    documents=self.test_documents[1]
+                ).pk: 0
+            }
+        )
+
+        self.grant_access(
+            obj=self.test_document_type, permission=permission_document_view
+        )
+        instance_root = self.test_index_template.instance_root
+        self.assertEqual(
+            instance_root.get_descendants_document_count(
+                user=self._test_case_user
+            ), 2
+        )
+
+    def test_rebuild_document_counts(self):
+        self._create_test_document_stub()
+
+        level_1 = self.test_index_template.node_templates.create(
+            parent=self.test_index_template.template_root,
+            expression='{{ document.uuid }}', link_documents=False
+        )
+        self.test_index_template.node_templates.create(
+            parent=level_1,
+            expression=TEST_INDEX_TEMPLATE_DOCUMENT_LABEL_EXPRESSION,
+            link_documents=True
+        )
+
+        old_value = setting_rebuild_chunk_size.value
+        setting_rebuild_chunk_size.set(value=1)
+        self.addCleanup(setting_rebuild_chunk_size.set, value=old_value)
+
+        self.test_index_template.rebuild()
+
+        instance_root = self.test_index_template.instance_root
+        self.assertEqual(instance_root.descendants_document_count, 2)
+
+        for node in instance_root.get_children():
+            self.assertEqual(node.document_count, 0)
+            self.assertEqual(node.descendants_document_count, 1)
+
     def test_metadata_indexing(self):
         metadata_type = MetadataType.objects.create(
             name=TEST_METADATA_TYPE_NAME, label=TEST_METADATA_TYPE_LABEL
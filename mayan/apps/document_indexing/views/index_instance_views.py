@@ -64,6 +64,18 @@ class IndexInstanceNodeView(DocumentListView):
             self, request=request, *args, **kwargs
         )
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        if not self.index_instance_node.index_template_node.link_documents:
+            # Calculate the document counts of the page of child nodes
+            # at once instead of once per row.
+            IndexInstanceNode.objects.get_document_counts(
+                nodes=context['object_list'], user=self.request.user
+            )
+
+        return context
+
     def get_document_queryset(self):
         if self.index_instance_node:
             if self.index_instance_node.index_template_node.link_documents:
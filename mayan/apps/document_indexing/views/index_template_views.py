@@ -278,11 +278,20 @@ class IndexTemplateRebuildView(ConfirmView):
     )
 
     def get_extra_context(self):
-        return {
+        context = {
             'object': self.get_object(),
             'title': _('Rebuild index template: %s') % self.get_object()
         }
 
+        progress = self.get_object().get_rebuild_progress()
+        if progress:
+            context['message'] = _(
+                'Rebuild pending, %(indexed)d of %(count)d chunks indexed. '
+                'It will be resumed.'
+            ) % {'count': progress[1], 'indexed': progress[0]}
+
+        return context
+
     def get_object(self):
         return get_object_or_404(
             klass=self.get_queryset(), pk=self.kwargs['index_template_id']
@@ -1,7 +1,10 @@
+import hashlib
 import logging
 
 from django.conf import settings
-from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.encoding import force_bytes
+from django.utils.http import quote_etag
 from django.views.decorators.cache import cache_control, patch_cache_control
 
 from rest_framework import status
@@ -10,6 +13,7 @@ from rest_framework.response import Response
 from mayan.apps.rest_api import generics
 from mayan.apps.storage.models import SharedUploadedFile
 from mayan.apps.views.generics import DownloadViewMixin
+from mayan.apps.views.http import get_range_response
 
 from ..literals import DOCUMENT_IMAGE_TASK_TIMEOUT
 from ..permissions import (
@@ -188,35 +192,80 @@ class APIDocumentFilePageImageView(
 
         obj = self.get_object()
 
-        task = task_document_file_page_image_generate.apply_async(
-            kwargs={
-                'document_file_page_id': obj.pk,
-                'height': height,
-                'maximum_layer_order': maximum_layer_order,
-                'rotation': rotation,
-                'user_id': request.user.pk,
-                'width': width,
-                'zoom': zoom
-            }
+        image_kwargs = {
+            'height': height,
+            'maximum_layer_order': maximum_layer_order,
+            'rotation': rotation,
+            'width': width,
+            'zoom': zoom
+        }
+
+        # Calculate the cache filename the same way the image generation
+        # does to look up the memory tiers before dispatching the task.
+        cache_filename = obj.get_combined_cache_filename(
+            _transformation_list=obj.get_combined_transformation_list(
+                user=request.user, **image_kwargs
+            )
         )
+        etag = quote_etag(
+            etag_str=hashlib.sha256(
+                force_bytes(s='{}-{}'.format(obj.uuid, cache_filename))
+            ).hexdigest()
+        )
+
+        # Answer conditional requests before generating the image.
+        response = get_conditional_response(request=request, etag=etag)
 
-        kwargs = {'timeout': DOCUMENT_IMAGE_TASK_TIMEOUT}
-        if settings.DEBUG:
-            # In debug more, task are run synchronously, causing this method
-            # to be called inside another task. Disable the check of nested
-            # tasks when using debug mode.
-            kwargs['disable_sync_subtasks'] = False
-
-        cache_filename = task.get(**kwargs)
-        cache_file = obj.cache_partition.get_file(filename=cache_filename)
-        with cache_file.open() as file_object:
-            response = HttpResponse(content=file_object.read(), content_type='image')
-            if '_hash' in request.GET:
-                patch_cache_control(
-                    response=response,
-                    max_age=setting_document_file_page_image_cache_time.value
+        if response is None:
+            content = obj.get_cached_image_content(
+                combined_cache_filename=cache_filename
+            )
+
+            if content is None:
+                task = task_document_file_page_image_generate.apply_async(
+                    kwargs=dict(
+                        document_file_page_id=obj.pk, user_id=request.user.pk,
+                        **image_kwargs
+                    )
+                )
+
+                kwargs = {'timeout': DOCUMENT_IMAGE_TASK_TIMEOUT}
+                if settings.DEBUG:
+                    # In debug more, task are run synchronously, causing this
+                    # method to be called inside another task. Disable the
+                    # check of nested tasks when using debug mode.
+                    kwargs['disable_sync_subtasks'] = False
+
+                cache_filename = task.get(**kwargs)
+                cache_file = obj.cache_partition.get_file(
+                    filename=cache_filename
+                )
+
+                content = obj.get_image_file_content(
+                    cache_partition_file=cache_file
+                )
+
+            if content is None:
+                # Stream the file from the storage.
+                response = get_range_response(
+                    content_type='image', etag=etag,
+                    file_open=cache_file.open, request=request,
+                    size=cache_file.file_size
+                )
+            else:
+                response = get_range_response(
+                    content=content, content_type='image', etag=etag,
+                    request=request
                 )
-            return response
+        else:
+            response['ETag'] = etag
+
+        if '_hash' in request.GET:
+            patch_cache_control(
+                response=response,
+                max_age=setting_document_file_page_image_cache_time.value
+            )
+        return response
 
 
 class APIDocumentFilePageListView(
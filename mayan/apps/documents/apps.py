@@ -197,6 +197,7 @@ from .permissions import (
     permission_trashed_document_delete, permission_trashed_document_restore
 )
 
+from .caches import *  # NOQA
 from .statistics import *  # NOQA
 
 
@@ -0,0 +1,13 @@
+from mayan.apps.file_caching.caches import CacheMemoryTier
+
+from .literals import (
+    STORAGE_NAME_DOCUMENT_FILE_PAGE_IMAGE_CACHE,
+    STORAGE_NAME_DOCUMENT_VERSION_PAGE_IMAGE_CACHE
+)
+
+memory_tier_document_file_page_image = CacheMemoryTier(
+    name=STORAGE_NAME_DOCUMENT_FILE_PAGE_IMAGE_CACHE
+)
+memory_tier_document_version_page_image = CacheMemoryTier(
+    name=STORAGE_NAME_DOCUMENT_VERSION_PAGE_IMAGE_CACHE
+)
@@ -23,6 +23,7 @@ DEFAULT_DOCUMENTS_DISPLAY_WIDTH = '3600'
 DEFAULT_DOCUMENTS_FAVORITE_COUNT = 400
 DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_MAXIMUM_SIZE = 500 * 2 ** 20  # 500 Megabytes
 DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_TIME = '31556926'
+DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_PREFETCH_COUNT = 10
 DEFAULT_DOCUMENTS_FILE_STORAGE_BACKEND = 'django.core.files.storage.FileSystemStorage'
 DEFAULT_DOCUMENTS_FILE_STORAGE_BACKEND_ARGUMENTS = {
     'location': os.path.join(settings.MEDIA_ROOT, 'document_file_storage')
@@ -96,6 +97,8 @@ MONTH_NAMES = (
     _('November'), _('December')
 )
 
+DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME = 'base_image'
+
 PAGE_RANGE_ALL = 'all'
 PAGE_RANGE_RANGE = 'range'
 PAGE_RANGE_CHOICES = (
@@ -12,7 +12,7 @@ from django.utils.translation import ugettext_lazy as _
 from mayan.apps.common.classes import ModelQueryFields
 from mayan.apps.databases.model_mixins import ExtraDataModelMixin
 from mayan.apps.common.signals import signal_mayan_pre_save
-from mayan.apps.converter.classes import ConverterBase
+from mayan.apps.converter.classes import ConverterBase, ConverterSession
 from mayan.apps.converter.exceptions import (
     InvalidOfficeFormat, PageCountError
 )
@@ -21,12 +21,14 @@ from mayan.apps.events.decorators import method_event
 from mayan.apps.file_caching.models import CachePartitionFile
 from mayan.apps.mimetype.api import get_mimetype
 from mayan.apps.storage.classes import DefinedStorageLazy
+from mayan.apps.storage.utils import NamedTemporaryFile
 
 from ..events import (
     event_document_file_created, event_document_file_deleted,
     event_document_file_downloaded, event_document_file_edited
 )
 from ..literals import (
+    DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME,
     STORAGE_NAME_DOCUMENT_FILE_PAGE_IMAGE_CACHE, STORAGE_NAME_DOCUMENT_FILES
 )
 from ..managers import DocumentFileManager, ValidDocumentFileManager
@@ -218,6 +220,7 @@ class DocumentFile(
 
         self.file.storage.delete(name=self.file.name)
         self.cache_partition.delete()
+        ConverterSession.discard(name=self.get_converter_session_name())
 
         result = super().delete(*args, **kwargs)
 
@@ -276,6 +279,36 @@ class DocumentFile(
         # then download event in the same way.
         return self.open()
 
+    def _get_converter_session_file_object(self):
+        """
+        Return a temporary copy of the intermediate file owned by the
+        converter session. The cache file is only opened, and its lock
+        held, while it is copied.
+        """
+        file_object = NamedTemporaryFile()
+
+        with self.get_intermediate_file() as intermediate_file_object:
+            shutil.copyfileobj(
+                fsrc=intermediate_file_object, fdst=file_object
+            )
+
+        file_object.seek(0)
+        return file_object
+
+    def get_converter_session(self):
+        """
+        Return the converter session of the intermediate file. The session
+        is kept open by the worker to reuse the detected mimetype, the
+        page count and the file copies between calls.
+        """
+        return ConverterSession.get(
+            file_object_factory=self._get_converter_session_file_object,
+            name=self.get_converter_session_name()
+        )
+
+    def get_converter_session_name(self):
+        return 'document_file-{}'.format(self.uuid)
+
     def get_intermediate_file(self):
         cache_filename = 'intermediate_file'
 
@@ -392,6 +425,63 @@ class DocumentFile(
 
             return detected_pages
 
+    def page_base_images_generate(self, page_numbers=None):
+        """
+        Rasterize the base images of the pages that don't have one in a
+        single converter pass and store them in the page cache partitions.
+        Page numbers start with 1. Returns the page numbers generated.
+        """
+        queryset = self.file_pages.all()
+        if page_numbers is not None:
+            queryset = queryset.filter(page_number__in=page_numbers)
+
+        file_pages = {
+            file_page.uuid: file_page for file_page in queryset
+        }
+
+        cached_partition_names = CachePartitionFile.objects.filter(
+            filename=DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME,
+            partition__cache=self.cache,
+            partition__name__in=file_pages.keys()
+        ).values_list('partition__name', flat=True)
+
+        for partition_name in cached_partition_names:
+            file_pages.pop(partition_name, None)
+
+        missing_file_pages = {
+            file_page.page_number: file_page for file_page in file_pages.values()
+        }
+
+        generated_page_numbers = []
+
+        if not missing_file_pages:
+            return generated_page_numbers
+
+        page_images = self.get_converter_session().get_pages(
+            page_numbers=[
+                page_number - 1 for page_number in missing_file_pages
+            ]
+        )
+
+        for page_number, page_image in page_images:
+            file_page = missing_file_pages[page_number + 1]
+
+            try:
+                with file_page.cache_partition.create_file(filename=DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME) as file_object:
+                    file_object.write(page_image.getvalue())
+            except Exception as exception:
+                # Non fatal, another process might be generating the
+                # same base image. The page will generate its own base
+                # image if needed.
+                logger.warning(
+                    'Unable to store the base image of document file '
+                    'page %s; %s', file_page, exception
+                )
+            else:
+                generated_page_numbers.append(page_number + 1)
+
+        return generated_page_numbers
+
     @property
     def pages(self):
         DocumentFilePage = apps.get_model(
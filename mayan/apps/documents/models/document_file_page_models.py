@@ -17,24 +17,31 @@ from mayan.apps.converter.transformations import (
 from mayan.apps.file_caching.models import CachePartitionFile
 from mayan.apps.lock_manager.backends.base import LockingBackend
 
-from ..literals import DOCUMENT_IMAGE_TASK_TIMEOUT
+from ..caches import memory_tier_document_file_page_image
+from ..literals import (
+    DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME, DOCUMENT_IMAGE_TASK_TIMEOUT
+)
 from ..managers import DocumentFilePageManager, ValidDocumentFilePageManager
 from ..settings import (
-    setting_display_width, setting_display_height, setting_zoom_max_level,
+    setting_display_width, setting_display_height,
+    setting_document_file_page_image_prefetch_count, setting_zoom_max_level,
     setting_zoom_min_level
 )
 
 from .document_file_models import DocumentFile
-from .mixins import PagedModelMixin
+from .mixins import CachedImageModelMixin, PagedModelMixin
 
 __all__ = ('DocumentFilePage', 'DocumentFilePageSearchResult')
 logger = logging.getLogger(name=__name__)
 
 
-class DocumentFilePage(PagedModelMixin, models.Model):
+class DocumentFilePage(
+    CachedImageModelMixin, PagedModelMixin, models.Model
+):
     """
     Model that describes a document file page
     """
+    _memory_tier = memory_tier_document_file_page_image
     _paged_model_parent_field = 'document_file'
 
     document_file = models.ForeignKey(
@@ -101,12 +108,31 @@ class DocumentFilePage(PagedModelMixin, models.Model):
                         filename=combined_cache_filename
                     )
                 except CachePartitionFile.DoesNotExist:
-                    logger.debug(
-                        'transformations cache file "%s" not found', combined_cache_filename
+                    # An evicted image can still be kept by the memory
+                    # tiers. Restore it instead of converting the page.
+                    content = self.get_cached_image_content(
+                        combined_cache_filename=combined_cache_filename
                     )
-                    image = self.get_image(transformations=transformation_list)
+
+                    if content is None:
+                        logger.debug(
+                            'transformations cache file "%s" not found', combined_cache_filename
+                        )
+                        image = self.get_image(transformations=transformation_list)
+                        content = image.getvalue()
+                    else:
+                        logger.debug(
+                            'transformations cache file "%s" found in the '
+                            'memory tiers', combined_cache_filename
+                        )
+
                     with self.cache_partition.create_file(filename=combined_cache_filename) as file_object:
-                        file_object.write(image.getvalue())
+                        file_object.write(content)
+
+                    self._set_cached_image_content(
+                        combined_cache_filename=combined_cache_filename,
+                        content=content
+                    )
                 else:
                     logger.debug(
                         'transformations cache file "%s" found', combined_cache_filename
@@ -214,7 +240,7 @@ class DocumentFilePage(PagedModelMixin, models.Model):
         return transformation_list
 
     def get_image(self, transformations=None):
-        cache_filename = 'base_image'
+        cache_filename = DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME
         logger.debug('Page cache filename: %s', cache_filename)
 
         try:
@@ -222,24 +248,43 @@ class DocumentFilePage(PagedModelMixin, models.Model):
         except CachePartitionFile.DoesNotExist:
             logger.debug('Page cache file "%s" not found', cache_filename)
 
+            # Rasterize this page and the following ones in a single pass.
             try:
-                with self.document_file.get_intermediate_file() as file_object:
-                    converter = ConverterBase.get_converter_class()(
-                        file_object=file_object
+                self.document_file.page_base_images_generate(
+                    page_numbers=range(
+                        self.page_number, self.page_number + max(
+                            setting_document_file_page_image_prefetch_count.value, 1
+                        )
                     )
-                    converter.seek_page(page_number=self.page_number - 1)
-
-                    page_image = converter.get_page()
+                )
+                cache_file = self.cache_partition.get_file(
+                    filename=cache_filename
+                )
+            except Exception as exception:
+                logger.warning(
+                    'Unable to prefetch the base image of document file '
+                    'page %s; %s', self, exception
+                )
+            else:
+                return self._get_image_from_cache_file(
+                    cache_file=cache_file, transformations=transformations
+                )
 
-                    # Since open "wb+" doesn't create files, create it explicitly
-                    with self.cache_partition.create_file(filename=cache_filename) as file_object:
-                        file_object.write(page_image.getvalue())
+            try:
+                converter_session = self.document_file.get_converter_session()
+                page_image = converter_session.get_page(
+                    page_number=self.page_number - 1
+                )
 
-                    # Apply runtime transformations
-                    for transformation in transformations or ():
-                        converter.transform(transformation=transformation)
+                # Since open "wb+" doesn't create files, create it explicitly
+                with self.cache_partition.create_file(filename=cache_filename) as file_object:
+                    file_object.write(page_image.getvalue())
 
-                    return converter.get_page()
+                # Apply runtime transformations
+                converter_session.converter.transform_many(
+                    transformations=transformations or ()
+                )
+                return converter_session.converter.get_page()
             except Exception as exception:
                 logger.error(
                     'Error creating document file page cache file from '
@@ -251,20 +296,23 @@ class DocumentFilePage(PagedModelMixin, models.Model):
         else:
             logger.debug('Page cache file "%s" found', cache_filename)
 
-            with cache_file.open() as file_object:
-                converter = ConverterBase.get_converter_class()(
-                    file_object=file_object
-                )
+            return self._get_image_from_cache_file(
+                cache_file=cache_file, transformations=transformations
+            )
 
-                converter.seek_page(page_number=0)
+    def _get_image_from_cache_file(self, cache_file, transformations=None):
+        with cache_file.open() as file_object:
+            converter = ConverterBase.get_converter_class()(
+                file_object=file_object
+            )
 
-                # This code is also repeated below to allow using a context
-                # manager with cache_file.open and close it automatically.
-                # Apply runtime transformations
-                for transformation in transformations or ():
-                    converter.transform(transformation=transformation)
+            converter.seek_page(page_number=0)
+
+            # Apply runtime transformations
+            for transformation in transformations or ():
+                converter.transform(transformation=transformation)
 
-                return converter.get_page()
+            return converter.get_page()
 
     def get_label(self):
         return _(
@@ -24,6 +24,7 @@ from mayan.apps.events.decorators import method_event
 from mayan.apps.file_caching.models import CachePartitionFile
 from mayan.apps.lock_manager.backends.base import LockingBackend
 
+from ..caches import memory_tier_document_version_page_image
 from ..events import (
     event_document_version_page_created, event_document_version_page_deleted,
     event_document_version_page_edited
@@ -36,15 +37,17 @@ from ..settings import (
 )
 
 from .document_version_models import DocumentVersion
-from .mixins import PagedModelMixin
+from .mixins import CachedImageModelMixin, PagedModelMixin
 
 __all__ = ('DocumentVersionPage', 'DocumentVersionPageSearchResult')
 logger = logging.getLogger(name=__name__)
 
 
 class DocumentVersionPage(
-    ExtraDataModelMixin, PagedModelMixin, models.Model
+    CachedImageModelMixin, ExtraDataModelMixin, PagedModelMixin,
+    models.Model
 ):
+    _memory_tier = memory_tier_document_version_page_image
     _paged_model_parent_field = 'document_version'
 
     document_version = models.ForeignKey(
@@ -147,13 +150,32 @@ class DocumentVersionPage(
                             filename=combined_cache_filename
                         )
                     except CachePartitionFile.DoesNotExist:
-                        logger.debug(
-                            'transformations cache file "%s" not found, '
-                            'generating new image', combined_cache_filename
+                        # An evicted image can still be kept by the memory
+                        # tiers. Restore it instead of converting the page.
+                        content = self.get_cached_image_content(
+                            combined_cache_filename=combined_cache_filename
                         )
-                        image = self.get_image(transformations=transformation_list)
+
+                        if content is None:
+                            logger.debug(
+                                'transformations cache file "%s" not found, '
+                                'generating new image', combined_cache_filename
+                            )
+                            image = self.get_image(transformations=transformation_list)
+                            content = image.getvalue()
+                        else:
+                            logger.debug(
+                                'transformations cache file "%s" found in '
+                                'the memory tiers', combined_cache_filename
+                            )
+
                         with self.cache_partition.create_file(filename=combined_cache_filename) as file_object:
-                            file_object.write(image.getvalue())
+                            file_object.write(content)
+
+                        self._set_cached_image_content(
+                            combined_cache_filename=combined_cache_filename,
+                            content=content
+                        )
                     else:
                         logger.debug(
                             'transformations cache file "%s" found, '
@@ -1,6 +1,41 @@
 from django.db.models import Max
 
 
+class CachedImageModelMixin:
+    """
+    Keep the generated images of a model in the memory tier of its image
+    cache. The model sets `_memory_tier` and provides the `cache_partition`
+    and `uuid` attributes.
+    """
+    _memory_tier = None
+
+    def get_cached_image_content(self, combined_cache_filename):
+        """
+        Return the content of a generated image from the memory tiers or
+        None if the image is not kept in memory.
+        """
+        return self._memory_tier.get_content(
+            filename=combined_cache_filename, partition_name=self.uuid
+        )
+
+    def get_image_file_content(self, cache_partition_file):
+        """
+        Read a generated image and keep it in the memory tiers. Return None
+        if the image is too big to be kept in memory.
+        """
+        return self._memory_tier.get_file_content(
+            cache_partition_file=cache_partition_file
+        )
+
+    def _set_cached_image_content(self, combined_cache_filename, content):
+        if self._memory_tier.is_cacheable(size=len(content)):
+            self._memory_tier.set_content(
+                cache_partition_file=self.cache_partition.get_file(
+                    filename=combined_cache_filename
+                ), content=content
+            )
+
+
 class HooksModelMixin:
     @classmethod
     def _execute_hooks(cls, hook_list, **kwargs):
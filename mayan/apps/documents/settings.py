@@ -9,6 +9,7 @@ from .literals import (
     DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_STORAGE_BACKEND_ARGUMENTS,
     DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_TIME,
     DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_MAXIMUM_SIZE,
+    DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_PREFETCH_COUNT,
     DEFAULT_DOCUMENTS_FILE_STORAGE_BACKEND,
     DEFAULT_DOCUMENTS_FILE_STORAGE_BACKEND_ARGUMENTS,
     DEFAULT_DOCUMENTS_HASH_BLOCK_SIZE, DEFAULT_DOCUMENTS_LIST_THUMBNAIL_WIDTH,
@@ -64,6 +65,14 @@ setting_document_file_page_image_cache_time = namespace.add_setting(
         '1 year.'
     )
 )
+setting_document_file_page_image_prefetch_count = namespace.add_setting(
+    default=DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_PREFETCH_COUNT,
+    global_name='DOCUMENTS_FILE_PAGE_IMAGE_PREFETCH_COUNT', help_text=_(
+        'Number of pages whose base image is rasterized in a single '
+        'converter pass when the base image of a document file page is '
+        'not found. The pages following the requested one are included.'
+    )
+)
 setting_document_file_storage_backend = namespace.add_setting(
     default=DEFAULT_DOCUMENTS_FILE_STORAGE_BACKEND,
     global_name='DOCUMENTS_FILE_STORAGE_BACKEND', help_text=_(
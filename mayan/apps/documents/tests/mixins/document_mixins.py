@@ -4,7 +4,7 @@ from django.conf import settings
 from django.db.models import Q
 from django.utils.module_loading import import_string
 
-from mayan.apps.converter.classes import Layer
+from mayan.apps.converter.classes import ConverterSession, Layer
 
 from ...literals import DOCUMENT_FILE_ACTION_PAGES_NEW, PAGE_RANGE_ALL
 from ...models import Document, DocumentType
@@ -133,6 +133,7 @@ class DocumentTestMixin:
     def tearDown(self):
         for document_type in DocumentType.objects.all():
             document_type.delete()
+        ConverterSession.discard_all()
         super().tearDown()
 
     def _create_test_document_stub(self, document_type=None, label=None):
@@ -169,13 +169,15 @@ class DocumentVersionPageAPIViewTestMixin:
             }
         )
 
-    def _request_test_document_version_page_image_api_view(self):
+    def _request_test_document_version_page_image_api_view(
+        self, headers=None
+    ):
         return self.get(
             viewname='rest_api:documentversionpage-image', kwargs={
                 'document_id': self.test_document.pk,
                 'document_version_id': self.test_document_version.pk,
                 'document_version_page_id': self.test_document_version_page.pk
-            }
+            }, headers=headers
         )
 
     def _request_test_document_version_page_list_api_view(self):
@@ -1,7 +1,19 @@
 from pathlib import Path
+import unittest
+
+import mock
+
+from mayan.apps.converter.backends.python import pdftoppm
+from mayan.apps.converter.classes import ConverterBase, ConverterSession
+from mayan.apps.file_caching.models import CachePartitionFile
+
+from ..literals import DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME
 
 from .base import GenericDocumentTestCase
-from .literals import TEST_SMALL_DOCUMENT_CHECKSUM
+from .literals import (
+    TEST_MULTI_PAGE_TIFF, TEST_PDF_DOCUMENT_FILENAME,
+    TEST_SMALL_DOCUMENT_CHECKSUM
+)
 
 
 class DocumentFileTestCase(GenericDocumentTestCase):
@@ -46,5 +58,97 @@ class DocumentFileTestCase(GenericDocumentTestCase):
             self.test_document_file.filename, self.test_document.label
         )
 
+    def test_method_page_count_update_mime_type(self):
+        with mock.patch.object(
+            ConverterBase, 'get_converter_class'
+        ) as mock_get_converter_class:
+            mock_converter_class = mock_get_converter_class.return_value
+            mock_converter_class.return_value.get_page_count.return_value = 1
+
+            self.assertEqual(self.test_document_file.page_count_update(), 1)
+
+        self.assertEqual(
+            mock_converter_class.call_args[1]['mime_type'],
+            self.test_document_file.mimetype
+        )
+
+    def test_method_get_converter_session(self):
+        test_converter_session = self.test_document_file.get_converter_session()
+        self.addCleanup(
+            ConverterSession.discard,
+            name=self.test_document_file.get_converter_session_name()
+        )
+
+        with self.test_document_file.open() as file_object:
+            self.assertEqual(
+                test_converter_session.file_object.read(), file_object.read()
+            )
+
     def test_method_get_absolute_url(self):
         self.assertTrue(self.test_document.file_latest.get_absolute_url())
+
+
+class DocumentFilePageBaseImageTestMixin:
+    def _get_test_document_file_base_image_count(self):
+        return CachePartitionFile.objects.filter(
+            filename=DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME,
+            partition__name__in=[
+                page.uuid for page in self.test_document_file.pages.all()
+            ]
+        ).count()
+
+
+class DocumentFilePageBaseImageTestCase(
+    DocumentFilePageBaseImageTestMixin, GenericDocumentTestCase
+):
+    test_document_filename = TEST_MULTI_PAGE_TIFF
+
+    def test_method_page_base_images_generate(self):
+        page_count = self.test_document_file.pages.count()
+
+        self.assertEqual(
+            self.test_document_file.page_base_images_generate(),
+            list(range(1, page_count + 1))
+        )
+        self.assertEqual(
+            self._get_test_document_file_base_image_count(), page_count
+        )
+
+    def test_method_page_base_images_generate_existing(self):
+        self.test_document_file.page_base_images_generate(page_numbers=(1,))
+
+        page_count = self.test_document_file.pages.count()
+
+        self.assertEqual(
+            self.test_document_file.page_base_images_generate(),
+            list(range(2, page_count + 1))
+        )
+        self.assertEqual(
+            self._get_test_document_file_base_image_count(), page_count
+        )
+
+    def test_page_get_image_prefetch(self):
+        self.test_document_file.pages.first().get_image()
+
+        self.assertEqual(
+            self._get_test_document_file_base_image_count(),
+            self.test_document_file.pages.count()
+        )
+
+
+@unittest.skipIf(pdftoppm is None, 'pdftoppm is not installed.')
+class PDFDocumentFilePageBaseImageTestCase(
+    DocumentFilePageBaseImageTestMixin, GenericDocumentTestCase
+):
+    test_document_filename = TEST_PDF_DOCUMENT_FILENAME
+
+    def test_method_page_base_images_generate(self):
+        page_count = self.test_document_file.pages.count()
+
+        self.assertEqual(
+            self.test_document_file.page_base_images_generate(),
+            list(range(1, page_count + 1))
+        )
+        self.assertEqual(
+            self._get_test_document_file_base_image_count(), page_count
+        )
@@ -1,8 +1,12 @@
+import mock
+
 from rest_framework import status
 
 from mayan.apps.rest_api.tests.base import BaseAPITestCase
 
+from ..caches import memory_tier_document_file_page_image
 from ..permissions import permission_document_file_view
+from ..tasks import task_document_file_page_image_generate
 
 from .mixins.document_mixins import DocumentTestMixin
 from .mixins.document_file_mixins import DocumentFilePageAPIViewTestMixin
@@ -56,6 +60,110 @@ class DocumentFilePageAPIViewTestCase(
         events = self._get_test_events()
         self.assertEqual(events.count(), 0)
 
+    @mock.patch(
+        'mayan.apps.documents.api_views.document_file_api_views.task_document_file_page_image_generate'
+    )
+    def test_document_file_page_image_api_view_memory_tier(
+        self, mock_task_document_file_page_image_generate
+    ):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_file_view
+        )
+
+        mock_task_document_file_page_image_generate.apply_async.side_effect = task_document_file_page_image_generate.apply_async
+
+        response = self._request_test_document_file_page_image_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self._request_test_document_file_page_image_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            mock_task_document_file_page_image_generate.apply_async.call_count, 1
+        )
+
+    @mock.patch(
+        'mayan.apps.documents.api_views.document_file_api_views.task_document_file_page_image_generate'
+    )
+    def test_document_file_page_image_api_view_etag(
+        self, mock_task_document_file_page_image_generate
+    ):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_file_view
+        )
+
+        mock_task_document_file_page_image_generate.apply_async.side_effect = task_document_file_page_image_generate.apply_async
+
+        response = self._request_test_document_file_page_image_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'])
+
+        memory_tier_document_file_page_image.clear()
+
+        response = self._request_test_document_file_page_image_api_view(
+            headers={'HTTP_IF_NONE_MATCH': response['ETag']}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.assertEqual(
+            mock_task_document_file_page_image_generate.apply_async.call_count, 1
+        )
+
+    def test_document_file_page_image_api_view_range(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_file_view
+        )
+
+        response = self._request_test_document_file_page_image_api_view()
+        content = response.content
+
+        response = self._request_test_document_file_page_image_api_view(
+            headers={'HTTP_RANGE': 'bytes=10-19'}
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_206_PARTIAL_CONTENT
+        )
+        self.assertEqual(response.content, content[10:20])
+        self.assertEqual(
+            response['Content-Range'], 'bytes 10-19/{}'.format(len(content))
+        )
+
+        response = self._request_test_document_file_page_image_api_view(
+            headers={'HTTP_RANGE': 'bytes={}-'.format(len(content))}
+        )
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+
+    @mock.patch.object(
+        memory_tier_document_file_page_image, 'is_cacheable',
+        return_value=False
+    )
+    def test_document_file_page_image_api_view_streaming(
+        self, mock_is_cacheable
+    ):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_file_view
+        )
+
+        response = self._request_test_document_file_page_image_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+
+        content = b''.join(response.streaming_content)
+        self.assertEqual(len(content), int(response['Content-Length']))
+
+        response = self._request_test_document_file_page_image_api_view(
+            headers={'HTTP_RANGE': 'bytes=-10'}
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_206_PARTIAL_CONTENT
+        )
+        self.assertEqual(
+            b''.join(response.streaming_content), content[-10:]
+        )
+
     def test_document_file_page_list_api_view_no_permission(self):
         self._clear_events()
 
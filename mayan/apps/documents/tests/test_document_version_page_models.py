@@ -1,10 +1,15 @@
+import mock
+
 from mayan.apps.converter.transformations import (
     BaseTransformation, TransformationRotate90
 )
 from mayan.apps.converter.models import LayerTransformation
 from mayan.apps.converter.tests.mixins import LayerTestMixin
 
+from mayan.apps.file_caching.models import CachePartitionFile
+
 from ..literals import DOCUMENT_FILE_ACTION_PAGES_APPEND
+from ..models.document_version_page_models import DocumentVersionPage
 
 from .base import GenericDocumentTestCase
 
@@ -181,3 +186,21 @@ class DocumentVersionPageTestCase(LayerTestMixin, GenericDocumentTestCase):
         self.assertEqual(test_generate_image_1, test_generate_image_5)
         self.assertEqual(test_api_image_url_1, test_api_image_url_5)
         self.assertEqual(test_image_1, test_image_5)
+
+    def test_method_generate_image_memory_tier_restore(self):
+        test_combined_cache_filename = self.test_document_version_page.generate_image()
+        test_image = self._get_test_document_version_page_cached_image()
+
+        # Evict the file without invalidating the memory tier of this
+        # process, as another process would.
+        CachePartitionFile.objects.filter(
+            filename=test_combined_cache_filename
+        ).delete()
+
+        with mock.patch.object(DocumentVersionPage, 'get_image') as mock_get_image:
+            self.test_document_version_page.generate_image()
+
+        self.assertFalse(mock_get_image.called)
+        self.assertEqual(
+            self._get_test_document_version_page_cached_image(), test_image
+        )
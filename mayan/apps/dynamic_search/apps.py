@@ -1,12 +1,16 @@
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.apps import MayanAppConfig
 from mayan.apps.common.menus import menu_facet, menu_secondary, menu_tools
 
 from .classes import SearchModel
+from .handlers import handler_expire_search_results_acls
 from .links import (
     link_search, link_search_advanced, link_search_again,
-    link_search_backend_reindex
+    link_search_backend_reindex, link_search_explain
 )
 
 
@@ -21,6 +25,15 @@ class DynamicSearchApp(MayanAppConfig):
     def ready(self):
         super().ready()
 
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+        GlobalAccessControlListProxy = apps.get_model(
+            app_label='acls', model_name='GlobalAccessControlListProxy'
+        )
+        Role = apps.get_model(app_label='permissions', model_name='Role')
+        User = get_user_model()
+
         SearchModel.load_modules()
         SearchModel.initialize()
 
@@ -31,8 +44,34 @@ class DynamicSearchApp(MayanAppConfig):
             )
         )
         menu_secondary.bind_links(
-            links=(link_search_again,), sources=('search:results',)
+            links=(link_search_again, link_search_explain),
+            sources=('search:results',)
         )
         menu_tools.bind_links(
             links=(link_search_backend_reindex,),
         )
+
+        # Access changes invalidate the cached search results of all the
+        # users.
+        for model in (AccessControlList, GlobalAccessControlListProxy):
+            post_delete.connect(
+                dispatch_uid='search_handler_expire_search_results_acls_delete_{}'.format(
+                    model._meta.model_name
+                ), receiver=handler_expire_search_results_acls, sender=model
+            )
+            post_save.connect(
+                dispatch_uid='search_handler_expire_search_results_acls_save_{}'.format(
+                    model._meta.model_name
+                ), receiver=handler_expire_search_results_acls, sender=model
+            )
+
+        for through in (
+            AccessControlList.permissions.through, Role.groups.through,
+            Role.permissions.through, User.groups.through
+        ):
+            m2m_changed.connect(
+                dispatch_uid='search_handler_expire_search_results_acls_m2m_{}'.format(
+                    through._meta.label
+                ), receiver=handler_expire_search_results_acls,
+                sender=through
+            )
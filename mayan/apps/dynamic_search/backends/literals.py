@@ -5,6 +5,13 @@ from whoosh import qparser  # NOQA Used to initialize the whoosh.fields module
 
 from django.db import models
 
+DEFAULT_POSTGRESQL_SEARCH_CONFIG = 'simple'
+DEFAULT_WHOOSH_COMMIT_MERGE = True
+DEFAULT_WHOOSH_COMMIT_OPTIMIZE = False
+DEFAULT_WHOOSH_WRITER_LIMITMB = 128
+DEFAULT_WHOOSH_WRITER_MULTISEGMENT = False
+DEFAULT_WHOOSH_WRITER_PROCS = 1
+
 QUERY_OPERATION_AND = 1
 QUERY_OPERATION_OR = 2
 TERM_OPERATION_AND = 'AND'
@@ -14,6 +21,13 @@ TERM_QUOTES = ['"', '\'']
 TERM_NEGATION_CHARACTER = '-'
 TERM_SPACE_CHARACTER = ' '
 
+TSQUERY_OPERATOR_AND = ' & '
+TSQUERY_OPERATOR_NEGATION = '!'
+TSQUERY_OPERATOR_OR = ' | '
+TSQUERY_OPERATOR_PHRASE = ' <-> '
+TSQUERY_PREFIX_SUFFIX = ':*'
+TSQUERY_WORD_REGEX = r'[^\W_]+'
+
 DJANGO_TO_WHOOSH_FIELD_MAP = {
     models.AutoField: {
         'field': whoosh.fields.ID(stored=True), 'transformation': str
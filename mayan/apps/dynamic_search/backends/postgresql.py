@@ -0,0 +1,221 @@
+import logging
+import re
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, OuterRef, Q, Subquery
+from django.utils.encoding import force_text
+
+from ..classes import SearchBackend, SearchModel
+
+from .django import SearchTermCollection
+from .literals import (
+    DEFAULT_POSTGRESQL_SEARCH_CONFIG, TERM_OPERATION_OR,
+    TSQUERY_OPERATOR_AND, TSQUERY_OPERATOR_NEGATION, TSQUERY_OPERATOR_OR,
+    TSQUERY_OPERATOR_PHRASE, TSQUERY_PREFIX_SUFFIX, TSQUERY_WORD_REGEX
+)
+
+logger = logging.getLogger(name=__name__)
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """
+    Full text search backend using PostgreSQL text search. The values of
+    each search field are stored as a tsvector per instance and searched
+    using a GIN index. Terms match as word prefixes.
+
+    Arguments:
+    search_config: PostgreSQL text search configuration used to parse the
+    values and the terms. Defaults to 'simple' which does no stemming.
+    """
+    uses_index_queue = True
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.search_config = self.kwargs.get(
+            'search_config', DEFAULT_POSTGRESQL_SEARCH_CONFIG
+        )
+
+    def _search(
+        self, query_string, search_model, user, global_and_search=False,
+        ignore_limit=False
+    ):
+        FullTextSearchEntry = apps.get_model(
+            app_label='dynamic_search', model_name='FullTextSearchEntry'
+        )
+
+        entries = FullTextSearchEntry.objects.filter(
+            content_type=ContentType.objects.get_for_model(
+                model=search_model.model
+            )
+        )
+
+        # Map each distinct tsquery to the fields it is searched in.
+        field_queries = {}
+        for search_field in search_model.search_fields:
+            tsquery = self.get_tsquery(
+                search_field=search_field,
+                search_term_collection=SearchTermCollection(
+                    text=query_string.get(
+                        search_field.field, query_string.get('q', '')
+                    ).strip()
+                )
+            )
+
+            if tsquery:
+                field_queries.setdefault(tsquery, []).append(
+                    search_field.get_full_name()
+                )
+
+        if not field_queries:
+            return search_model.get_queryset().none()
+
+        search_queries = {
+            tsquery: SearchQuery(
+                tsquery, config=self.search_config, search_type='raw'
+            ) for tsquery in field_queries
+        }
+
+        entry_query = None
+        for tsquery, field_names in field_queries.items():
+            q_object = Q(
+                field_name__in=field_names,
+                search_vector=search_queries[tsquery]
+            )
+
+            if entry_query is None:
+                entry_query = q_object
+            else:
+                entry_query = entry_query | q_object
+
+        if global_and_search:
+            queryset = search_model.get_queryset()
+            for tsquery, field_names in field_queries.items():
+                for field_name in field_names:
+                    queryset = queryset.filter(
+                        pk__in=entries.filter(
+                            field_name=field_name,
+                            search_vector=search_queries[tsquery]
+                        ).values('object_id')
+                    )
+        else:
+            queryset = search_model.get_queryset().filter(
+                pk__in=entries.filter(entry_query).values('object_id')
+            )
+
+        # Rank each instance by its best matching field.
+        rank = None
+        for search_query in search_queries.values():
+            if rank is None:
+                rank = SearchRank(F('search_vector'), search_query)
+            else:
+                rank = rank + SearchRank(F('search_vector'), search_query)
+
+        return queryset.annotate(
+            search_rank=Subquery(
+                entries.filter(entry_query).filter(
+                    object_id=OuterRef('pk')
+                ).annotate(rank=rank).order_by('-rank').values('rank')[:1]
+            )
+        ).order_by('-search_rank', '-pk')
+
+    def deindex_instance(self, instance):
+        FullTextSearchEntry = apps.get_model(
+            app_label='dynamic_search', model_name='FullTextSearchEntry'
+        )
+        FullTextSearchEntry.objects.delete_instances(instances=(instance,))
+
+    def get_tsquery(self, search_field, search_term_collection):
+        """
+        Translate the terms of a field into a raw tsquery string. Terms
+        are joined with AND until an OR term is found, quoted terms become
+        phrases and negated terms are excluded. Only the word characters of
+        the terms are kept.
+        """
+        operator = TSQUERY_OPERATOR_AND
+        result = None
+
+        for term in search_term_collection.terms:
+            if term.is_meta:
+                if term.string == TERM_OPERATION_OR:
+                    operator = TSQUERY_OPERATOR_OR
+            else:
+                if search_field.transformation_function:
+                    term_string = search_field.transformation_function(
+                        term_string=term.string
+                    )
+                else:
+                    term_string = term.string
+
+                words = re.findall(
+                    TSQUERY_WORD_REGEX, force_text(s=term_string)
+                )
+
+                if words:
+                    tsquery_term = TSQUERY_OPERATOR_PHRASE.join(
+                        '{}{}'.format(word, TSQUERY_PREFIX_SUFFIX)
+                        for word in words
+                    )
+                    if len(words) > 1:
+                        tsquery_term = '({})'.format(tsquery_term)
+
+                    if term.negated:
+                        tsquery_term = '{}{}'.format(
+                            TSQUERY_OPERATOR_NEGATION, tsquery_term
+                        )
+
+                    if result is None:
+                        result = tsquery_term
+                    else:
+                        result = '({}{}{})'.format(
+                            result, operator, tsquery_term
+                        )
+
+        return result
+
+    def index_instance(self, instance):
+        self.index_instances(instances=(instance,))
+
+    def index_instances(self, instances):
+        FullTextSearchEntry = apps.get_model(
+            app_label='dynamic_search', model_name='FullTextSearchEntry'
+        )
+
+        instance_values = []
+        for instance in instances:
+            try:
+                search_model = SearchModel.get_for_model(instance=instance)
+            except KeyError:
+                """
+                A KeyError is not fatal. It means search is not configured
+                for this instance.
+                """
+            else:
+                instance_values.append(
+                    (
+                        instance, search_model.sieve(
+                            field_map=self.get_field_map(
+                                search_model=search_model
+                            ), instance=instance, separator=' '
+                        )
+                    )
+                )
+
+        FullTextSearchEntry.objects.store_instances(
+            config=self.search_config, instance_values=instance_values
+        )
+
+    def get_field_map(self, search_model):
+        return {
+            search_field.get_full_name(): {
+                'transformation': self.transformation_text
+            } for search_field in search_model.search_fields
+        }
+
+    @staticmethod
+    def transformation_text(value):
+        if value is None:
+            return ''
+        else:
+            return force_text(s=value)
@@ -12,14 +12,29 @@ from mayan.apps.lock_manager.backends.base import LockingBackend
 from mayan.apps.lock_manager.exceptions import LockError
 
 from ..classes import SearchBackend, SearchField, SearchModel
-from ..settings import setting_results_limit
-
-from .literals import DJANGO_TO_WHOOSH_FIELD_MAP, WHOOSH_INDEX_DIRECTORY_NAME
+from ..settings import setting_reindex_chunk_size, setting_results_limit
+
+from .literals import (
+    DEFAULT_WHOOSH_COMMIT_MERGE, DEFAULT_WHOOSH_COMMIT_OPTIMIZE,
+    DEFAULT_WHOOSH_WRITER_LIMITMB, DEFAULT_WHOOSH_WRITER_MULTISEGMENT,
+    DEFAULT_WHOOSH_WRITER_PROCS, DJANGO_TO_WHOOSH_FIELD_MAP,
+    WHOOSH_INDEX_DIRECTORY_NAME
+)
 logger = logging.getLogger(name=__name__)
 
 
 class WhooshSearchBackend(SearchBackend):
+    """
+    Arguments:
+    commit_merge: Merge small segments on commit.
+    commit_optimize: Merge all segments into one on commit.
+    index_path: Path of the index files.
+    writer_limitmb: Memory in megabytes used by each writer pool.
+    writer_multisegment: Have each writer process write its own segment.
+    writer_procs: Number of processes used by each writer.
+    """
     _resolved_field_maps = {}
+    uses_index_queue = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -29,6 +44,24 @@ class WhooshSearchBackend(SearchBackend):
             )
         )
         self.index_path.mkdir(exist_ok=True)
+        self.commit_kwargs = {
+            'merge': self.kwargs.get(
+                'commit_merge', DEFAULT_WHOOSH_COMMIT_MERGE
+            ), 'optimize': self.kwargs.get(
+                'commit_optimize', DEFAULT_WHOOSH_COMMIT_OPTIMIZE
+            )
+        }
+        self.writer_kwargs = {
+            'limitmb': self.kwargs.get(
+                'writer_limitmb', DEFAULT_WHOOSH_WRITER_LIMITMB
+            ), 'procs': self.kwargs.get(
+                'writer_procs', DEFAULT_WHOOSH_WRITER_PROCS
+            )
+        }
+        if self.writer_kwargs['procs'] > 1:
+            self.writer_kwargs['multisegment'] = self.kwargs.get(
+                'writer_multisegment', DEFAULT_WHOOSH_WRITER_MULTISEGMENT
+            )
 
     def _search(
         self, query_string, search_model, user, global_and_search=False,
@@ -159,7 +192,20 @@ class WhooshSearchBackend(SearchBackend):
     def get_storage(self):
         return FileStorage(path=self.index_path)
 
-    def index_instance(self, instance, exclude_set=None):
+    def get_writer(self, search_model):
+        return self.get_index(search_model=search_model).writer(
+            **self.writer_kwargs
+        )
+
+    def index_instance(self, instance):
+        self.index_instances(instances=(instance,))
+
+    def index_instances(self, instances):
+        """
+        Index the instances using a single writer per search model and one
+        commit per writer. The instances that read values from these
+        instances are reindexed by the index queue.
+        """
         try:
             lock = LockingBackend.get_backend().acquire_lock(
                 name='dynamic_search_whoosh_index_instance'
@@ -168,44 +214,44 @@ class WhooshSearchBackend(SearchBackend):
             raise
         else:
             try:
-                # Use a private method to allow using a single lock for
-                # all recursions.
-                self._index_instance(
-                    instance=instance, exclude_set=exclude_set
-                )
+                writers = {}
+
+                try:
+                    for instance in instances:
+                        self._index_instance(
+                            instance=instance, writers=writers
+                        )
+                except Exception:
+                    for writer in writers.values():
+                        writer.cancel()
+                    raise
+                else:
+                    for writer in writers.values():
+                        writer.commit(**self.commit_kwargs)
             finally:
                 lock.release()
 
-    def _index_instance(self, instance, exclude_set=None):
-        if not exclude_set:
-            exclude_set = set()
-
-        # Avoid infinite recursion.
-        if instance in exclude_set:
-            return
-
-        exclude_set.add(instance)
-
+    def _index_instance(self, instance, writers):
         try:
             search_model = SearchModel.get_for_model(instance=instance)
         except KeyError:
             """
             A KeyError is not fatal. It means search is not configured
-            for this instance but we still need to check if one of its
-            field's related models are configure for search and need
-            to be updated.
+            for this instance.
             """
         else:
-            index = self.get_index(search_model=search_model)
+            if search_model not in writers:
+                writers[search_model] = self.get_writer(
+                    search_model=search_model
+                )
 
-            writer = index.writer()
+            writer = writers[search_model]
             kwargs = search_model.sieve(
                 field_map=self.get_resolved_field_map(search_model=search_model), instance=instance
             )
             writer.delete_by_term('id', str(instance.pk))
             try:
                 writer.add_document(**kwargs)
-                writer.commit()
             except Exception as exception:
                 logger.error(
                     'Unexpected exception while indexing object id: %s, '
@@ -217,30 +263,6 @@ class WhooshSearchBackend(SearchBackend):
                 )
                 raise
 
-        for field_class in instance._meta.get_fields():
-            # Only to recursive indexing for related models that are
-            # known to have a search configuration.
-            if field_class.related_model and field_class.related_model in SearchModel._model_search_relationships.get(instance._meta.model, ()):
-                field_instance = getattr(instance, field_class.name, None)
-
-                if field_instance:
-                    try:
-                        # Try as a many field.
-                        results = field_instance.all()
-                    except AttributeError:
-                        # Try as a one to one field.
-                        try:
-                            results = [field_instance.get()]
-                        except AttributeError:
-                            # It is neither then it must be a
-                            # foreign key.
-                            results = [field_instance]
-
-                    for instance in results:
-                        self._index_instance(
-                            instance=instance, exclude_set=exclude_set
-                        )
-
     def index_search_model(self, search_model):
         index = self.get_index(search_model=search_model)
 
@@ -249,5 +271,63 @@ class WhooshSearchBackend(SearchBackend):
             index.schema, indexname=search_model.get_full_name()
         )
 
-        for instance in search_model.model._meta.default_manager.all():
-            self.index_instance(instance=instance)
+        for id_start, id_end in search_model.get_id_ranges(
+            size=setting_reindex_chunk_size.value
+        ):
+            self.index_search_model_chunk(
+                id_end=id_end, id_start=id_start, search_model=search_model
+            )
+
+        self.index_search_model_finish(search_model=search_model)
+
+    def index_search_model_chunk(self, search_model, id_start, id_end):
+        """
+        Prepare the documents of the chunk without holding the lock so
+        that chunks are processed in parallel. Only the write of the
+        chunk's segment is serialized.
+        """
+        field_map = self.get_resolved_field_map(search_model=search_model)
+
+        documents = [
+            search_model.sieve(field_map=field_map, instance=instance)
+            for instance in search_model.get_index_queryset().filter(
+                pk__gte=id_start, pk__lte=id_end
+            )
+        ]
+
+        try:
+            lock = LockingBackend.get_backend().acquire_lock(
+                name='dynamic_search_whoosh_index_instance'
+            )
+        except LockError:
+            raise
+        else:
+            try:
+                writer = self.get_writer(search_model=search_model)
+
+                try:
+                    for document in documents:
+                        writer.delete_by_term('id', document['id'])
+                        writer.add_document(**document)
+                except Exception:
+                    writer.cancel()
+                    raise
+                else:
+                    # Write the chunk as its own segment, segments are
+                    # merged once all chunks are indexed.
+                    writer.commit(merge=False)
+            finally:
+                lock.release()
+
+    def index_search_model_finish(self, search_model):
+        try:
+            lock = LockingBackend.get_backend().acquire_lock(
+                name='dynamic_search_whoosh_index_instance'
+            )
+        except LockError:
+            raise
+        else:
+            try:
+                self.get_index(search_model=search_model).optimize()
+            finally:
+                lock.release()
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import logging
+import uuid
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.encoding import force_bytes
+
+from .literals import (
+    SEARCH_RESULTS_CACHE_VERSION_ACL, SEARCH_RESULTS_CACHE_VERSION_PREFIX
+)
+from .settings import (
+    setting_results_cache_name, setting_results_cache_timeout
+)
+
+logger = logging.getLogger(name=__name__)
+
+
+class SearchResultCache:
+    """
+    Short lived cache of the ordered list of result ids of a search.
+    Entries are keyed by the normalized query, the user and version
+    tokens that change whenever the access control lists or the instances
+    of the search model change, making stale entries unreachable instead
+    of deleting them. The version tokens must be seen by every process,
+    the cache is disabled unless a shared Django cache is configured.
+    """
+    @staticmethod
+    def get_key_hash(key):
+        return hashlib.sha256(force_bytes(s=key)).hexdigest()
+
+    @staticmethod
+    def get_normalized_query(query_result, search_model):
+        """
+        Reduce a decoded query to the terms that affect the results.
+        Other keys like the pagination parameters are dropped so that all
+        the pages of a search share the same entry.
+        """
+        search_field_names = set(
+            search_field.get_full_name()
+            for search_field in search_model.search_fields
+        )
+        search_field_names.add('q')
+
+        scopes = {}
+        for scope_id, scope in query_result['scopes'].items():
+            scopes[scope_id] = {
+                'match_all': scope.get('match_all', False),
+                'query': {
+                    key: value for key, value in scope.get('query', {}).items()
+                    if key in search_field_names
+                }
+            }
+
+        operators = {}
+        for result, operator in query_result['operators'].items():
+            operators[result] = {
+                'function': operator['function'].__name__,
+                'scopes': operator['scopes']
+            }
+
+        return {
+            'operators': operators,
+            'result_scope': query_result['result_scope'], 'scopes': scopes
+        }
+
+    @staticmethod
+    def get_version_key(name):
+        return SearchResultCache.get_key_hash(
+            key='{}{}'.format(SEARCH_RESULTS_CACHE_VERSION_PREFIX, name)
+        )
+
+    def __init__(self, name=None):
+        self.cache = None
+        self.timeout = setting_results_cache_timeout.value
+
+        name = name or setting_results_cache_name.value
+
+        if name:
+            cache = caches[name]
+
+            if isinstance(cache, (DummyCache, LocMemCache)):
+                logger.warning(
+                    'The search results cache `%s` is local to the process '
+                    'and can\'t be used, the search results will not be '
+                    'cached.', name
+                )
+            else:
+                self.cache = cache
+
+    def expire_acls(self):
+        self.expire_version(name=SEARCH_RESULTS_CACHE_VERSION_ACL)
+
+    def expire_search_model(self, search_model):
+        self.expire_version(name=search_model.get_full_name())
+
+    def expire_search_models(self, search_models):
+        for search_model in search_models:
+            self.expire_search_model(search_model=search_model)
+
+    def expire_version(self, name):
+        if self.cache is None:
+            return
+
+        self.cache.set(
+            key=SearchResultCache.get_version_key(name=name), timeout=None,
+            value=uuid.uuid4().hex
+        )
+
+    def get_key(
+        self, backend, global_and_search, query_result, search_model, user
+    ):
+        return SearchResultCache.get_key_hash(
+            key=json.dumps(
+                obj={
+                    'acl_version': self.get_version(
+                        name=SEARCH_RESULTS_CACHE_VERSION_ACL
+                    ),
+                    'backend': '{}.{}'.format(
+                        backend.__class__.__module__,
+                        backend.__class__.__name__
+                    ),
+                    'global_and_search': global_and_search,
+                    'query': SearchResultCache.get_normalized_query(
+                        query_result=query_result, search_model=search_model
+                    ),
+                    'search_model': search_model.get_full_name(),
+                    'search_model_version': self.get_version(
+                        name=search_model.get_full_name()
+                    ),
+                    'user': (user.pk, user.is_superuser),
+                }, sort_keys=True
+            )
+        )
+
+    def get_result_ids(self, key):
+        return self.cache.get(key=key)
+
+    def get_version(self, name):
+        key = SearchResultCache.get_version_key(name=name)
+        version = self.cache.get(key=key)
+
+        if version is None:
+            version = uuid.uuid4().hex
+            if not self.cache.add(key=key, timeout=None, value=version):
+                # Another process initialized the version first.
+                version = self.cache.get(key=key)
+
+        return version
+
+    def is_enabled(self):
+        return self.cache is not None and self.timeout > 0
+
+    def set_result_ids(self, key, result_ids):
+        self.cache.set(key=key, timeout=self.timeout, value=result_ids)
@@ -2,7 +2,11 @@ from collections import Iterable
 import logging
 
 from django.apps import apps
-from django.db.models.signals import post_save, pre_delete
+from django.db.models import Case, IntegerField, Q, When
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
 from django.utils.encoding import force_text
 from django.utils.functional import cached_property
 from django.utils.module_loading import import_string
@@ -15,10 +19,12 @@ from mayan.apps.common.utils import (
 )
 from mayan.apps.views.literals import LIST_MODE_CHOICE_LIST
 
+from .caches import SearchResultCache
 from .exceptions import DynamicSearchException
 from .literals import (
     DEFAULT_SCOPE_ID, DELIMITER, SCOPE_MATCH_ALL, SCOPE_MARKER,
-    SCOPE_OPERATOR_CHOICES, SCOPE_OPERATOR_MARKER, SCOPE_RESULT_MAKER
+    SCOPE_OPERATOR_CHOICES, SCOPE_OPERATOR_MARKER, SCOPE_OPERATOR_NOT,
+    SCOPE_RESULT_MAKER, SEARCH_QUERY_AFTER_PARAMETER
 )
 from .settings import (
     setting_backend, setting_backend_arguments,
@@ -28,11 +34,17 @@ logger = logging.getLogger(name=__name__)
 
 
 class SearchBackend:
+    # Backends that keep their own index set this to True to have saved
+    # instances queued for indexing.
+    uses_index_queue = False
+
+    @staticmethod
+    def get_class():
+        return import_string(dotted_path=setting_backend.value)
+
     @staticmethod
     def get_instance():
-        return import_string(dotted_path=setting_backend.value)(
-            **setting_backend_arguments.value
-        )
+        return SearchBackend.get_class()(**setting_backend_arguments.value)
 
     @staticmethod
     def limit_queryset(queryset):
@@ -51,25 +63,163 @@ class SearchBackend:
     def index_instance(self, instance):
         raise NotImplementedError
 
-    def search(
-        self, search_model, query, user, global_and_search=False
-    ):
-        AccessControlList = apps.get_model(
-            app_label='acls', model_name='AccessControlList'
+    def index_instances(self, instances):
+        """
+        Index several instances. Backends able to write in bulk should
+        override this method.
+        """
+        for instance in instances:
+            self.index_instance(instance=instance)
+
+    def index_search_model_chunk(self, search_model, id_start, id_end):
+        """
+        Index the instances of a search model with a primary key between
+        `id_start` and `id_end` inclusive.
+        """
+        self.index_instances(
+            instances=search_model.get_index_queryset().filter(
+                pk__gte=id_start, pk__lte=id_end
+            )
         )
 
+    def index_search_model_finish(self, search_model):
+        """
+        Called after all the chunks of a search model reindex are indexed.
+        """
+
+    def explain(self, search_model, query, user, global_and_search=False):
+        """
+        Return the SQL statement and the database execution plan of a
+        search.
+        """
+        queryset = self.get_search_queryset(
+            query_result=self.decode_query(
+                query=query, global_and_search=global_and_search
+            ), search_model=search_model, user=user
+        )
+
+        return {
+            'plan': queryset.explain(), 'query': force_text(s=queryset.query)
+        }
+
+    def get_result_ids(
+        self, search_model, query, user, global_and_search=False
+    ):
+        """
+        Return the ordered list of the ids of the instances matching the
+        query that the user can access. The list is cached for a short time
+        to allow paging through the results without repeating the search.
+        """
         result = self.decode_query(
             query=query, global_and_search=global_and_search
         )
 
-        # Recursive call to the backend's search using queries as unscoped
-        # and then merge then using the corresponding operator.
+        search_result_cache = SearchResultCache()
+
+        if search_result_cache.is_enabled():
+            key = search_result_cache.get_key(
+                backend=self, global_and_search=global_and_search,
+                query_result=result, search_model=search_model, user=user
+            )
+
+            result_ids = search_result_cache.get_result_ids(key=key)
+            if result_ids is not None:
+                return result_ids
+
+        result_ids = list(
+            self.get_search_queryset(
+                query_result=result, search_model=search_model, user=user
+            ).values_list('pk', flat=True)
+        )
+
+        if search_result_cache.is_enabled():
+            search_result_cache.set_result_ids(key=key, result_ids=result_ids)
+
+        return result_ids
+
+    def get_scope_query(
+        self, search_model, user, result_scope, scopes, operators
+    ):
+        """
+        Compile a scope and the scopes and operators it references into a
+        single filter. Each scope becomes a subquery of primary keys that
+        the operators combine, allowing the database to plan the whole
+        advanced search as one statement.
+        """
+        try:
+            # Try scopes.
+            scope = scopes[result_scope]
+        except KeyError:
+            try:
+                # Try operators.
+                operator = operators[result_scope]
+            except KeyError:
+                raise DynamicSearchException(
+                    'Scope `{}` not found.'.format(result_scope)
+                )
+            else:
+                # NOT excludes the results of the other scopes from the
+                # results of the first scope.
+                is_exclusion = operator['function'] == SCOPE_OPERATOR_CHOICES[
+                    SCOPE_OPERATOR_NOT
+                ]
+
+                result = None
+                for scope in operator['scopes']:
+                    query = self.get_scope_query(
+                        operators=operators, result_scope=scope,
+                        search_model=search_model, scopes=scopes, user=user
+                    )
+
+                    if result is None:
+                        result = query
+                    elif is_exclusion:
+                        result = result & ~query
+                    else:
+                        result = operator['function'](result, query)
+
+                return result
+        else:
+            queryset = self.get_scope_queryset(
+                ignore_limit=True, result_scope=result_scope, scope=scope,
+                search_model=search_model, user=user
+            )
+
+            return Q(pk__in=queryset.order_by().values('pk'))
+
+    def get_scope_queryset(
+        self, search_model, user, result_scope, scope, ignore_limit=False
+    ):
+        try:
+            query_string = scope['query']
+        except KeyError:
+            raise DynamicSearchException(
+                'Scope `{}` does not specify a query.'.format(result_scope)
+            )
+        else:
+            return self._search(
+                global_and_search=scope['match_all'],
+                ignore_limit=ignore_limit, search_model=search_model,
+                query_string=query_string, user=user
+            )
+
+    def get_search_queryset(self, query_result, search_model, user):
+        """
+        Return the queryset of the results of a decoded query restricted
+        to the instances the user can access.
+        """
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
         queryset = self.solve_scope(
-            operators=result['operators'],
-            result_scope=result['result_scope'], search_model=search_model,
-            scopes=result['scopes'], user=user
+            operators=query_result['operators'],
+            result_scope=query_result['result_scope'],
+            search_model=search_model, scopes=query_result['scopes'],
+            user=user
         )
 
+        # Access is checked once for the whole search and not per scope.
         if search_model.permission:
             queryset = AccessControlList.objects.restrict_queryset(
                 permission=search_model.permission, queryset=queryset,
@@ -78,6 +228,58 @@ class SearchBackend:
 
         return SearchBackend.limit_queryset(queryset=queryset)
 
+    def search(
+        self, search_model, query, user, global_and_search=False
+    ):
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        # Keyset pagination, return only the results after the one
+        # specified.
+        result_after = query.get(SEARCH_QUERY_AFTER_PARAMETER)
+        query.pop(SEARCH_QUERY_AFTER_PARAMETER, None)
+
+        result_ids = self.get_result_ids(
+            global_and_search=global_and_search, query=query,
+            search_model=search_model, user=user
+        )
+
+        if result_after:
+            try:
+                index = [
+                    force_text(s=result_id) for result_id in result_ids
+                ].index(force_text(s=result_after))
+            except ValueError:
+                raise DynamicSearchException(
+                    'Result `{}` not found.'.format(result_after)
+                )
+            else:
+                result_ids = result_ids[index + 1:]
+
+        queryset = search_model.get_queryset().filter(pk__in=result_ids)
+
+        # The result ids might be cached, check the access again. Only the
+        # instances of the result ids are evaluated.
+        if search_model.permission:
+            queryset = AccessControlList.objects.restrict_queryset(
+                permission=search_model.permission, queryset=queryset,
+                user=user
+            )
+
+        if result_ids:
+            # Keep the order of the search results.
+            queryset = queryset.order_by(
+                Case(
+                    *[
+                        When(pk=result_id, then=position)
+                        for position, result_id in enumerate(result_ids)
+                    ], output_field=IntegerField()
+                )
+            )
+
+        return queryset
+
     def decode_query(self, query, global_and_search=False):
         # Clean up the query.
         # The original query is immutable, create a new
@@ -144,49 +346,24 @@ class SearchBackend:
     def solve_scope(
         self, search_model, user, result_scope, scopes, operators
     ):
-        if len(scopes) > 1:
-            ignore_limit = True
-        else:
-            ignore_limit = False
-
         try:
-            # Try scopes.
             scope = scopes[result_scope]
         except KeyError:
-            try:
-                # Try operators.
-                operator = operators[result_scope]
-            except KeyError:
-                raise DynamicSearchException(
-                    'Scope `{}` not found.'.format(result_scope)
+            # The result is the product of operators, compile the scope
+            # tree into a single queryset.
+            return search_model.get_queryset().filter(
+                self.get_scope_query(
+                    operators=operators, result_scope=result_scope,
+                    search_model=search_model, scopes=scopes, user=user
                 )
-            else:
-                result = None
-                for scope in operator['scopes']:
-                    queryset = self.solve_scope(
-                        operators=operators, result_scope=scope,
-                        search_model=search_model, scopes=scopes, user=user
-                    )
-
-                    if result is None:
-                        result = queryset
-                    else:
-                        result = operator['function'](result, queryset)
-
-                return result
+            )
         else:
-            try:
-                query_string = scope['query']
-            except KeyError:
-                raise DynamicSearchException(
-                    'Scope `{}` does not specify a query.'.format(result_scope)
-                )
-            else:
-                return self._search(
-                    global_and_search=scope['match_all'],
-                    ignore_limit=ignore_limit, search_model=search_model,
-                    query_string=query_string, user=user
-                )
+            # A single scope is returned as is to keep the ordering of
+            # the backend results.
+            return self.get_scope_queryset(
+                ignore_limit=len(scopes) > 1, result_scope=result_scope,
+                scope=scope, search_model=search_model, user=user
+            )
 
 
 class SearchField:
@@ -220,7 +397,7 @@ class SearchField:
 
 class SearchModel(AppsModuleLoaderMixin):
     _loader_module_name = 'search'
-    _model_search_relationships = {}
+    _model_search_dependencies = {}
     _registry = {}
 
     @staticmethod
@@ -242,7 +419,8 @@ class SearchModel(AppsModuleLoaderMixin):
     def initialize():
         # Hide a circular import.
         from .handlers import (
-            handler_factory_deindex_instance, handler_index_instance
+            handler_expire_search_results, handler_factory_deindex_instance,
+            handler_index_instance
         )
 
         for search_model in SearchModel.all():
@@ -272,6 +450,29 @@ class SearchModel(AppsModuleLoaderMixin):
 
             search_model._initialize()
 
+        # Changes to the search models, their proxies or to the models
+        # from which they read values make the cached results stale.
+        expire_models = set(SearchModel._model_search_dependencies.keys())
+        for search_model in SearchModel.all():
+            expire_models.add(search_model.model)
+            expire_models.update(search_model.proxies)
+
+        for model in expire_models:
+            for signal in (post_delete, post_save):
+                signal.connect(
+                    dispatch_uid='search_handler_expire_search_results_{}'.format(
+                        model._meta.label
+                    ), receiver=handler_expire_search_results, sender=model
+                )
+
+            for field in model._meta.many_to_many:
+                m2m_changed.connect(
+                    dispatch_uid='search_handler_expire_search_results_{}'.format(
+                        field.remote_field.through._meta.label
+                    ), receiver=handler_expire_search_results,
+                    sender=field.remote_field.through
+                )
+
     @classmethod
     def all(cls):
         return sorted(
@@ -299,6 +500,19 @@ class SearchModel(AppsModuleLoaderMixin):
             if search_class.default:
                 return search_class
 
+    @classmethod
+    def get_dependent_querysets(cls, instance):
+        """
+        Yield a queryset for each search model whose indexed values are
+        read from the instance through a related field.
+        """
+        for search_model, lookup in cls._model_search_dependencies.get(
+            instance._meta.concrete_model, ()
+        ):
+            yield search_model.model._meta.default_manager.filter(
+                **{lookup: instance}
+            )
+
     @classmethod
     def get_for_model(cls, instance):
         return cls.get(name=instance._meta.label)
@@ -333,25 +547,19 @@ class SearchModel(AppsModuleLoaderMixin):
         return force_text(s=self.label)
 
     def _initialize(self):
+        # Map each related model to the search models and lookups of the
+        # search fields that read its values.
         for search_field in self.search_fields:
-            related_model = get_related_field(
-                model=self.model, related_field_name=search_field.field
-            ).model
+            lookup_parts = search_field.field.split(LOOKUP_SEP)[:-1]
 
-            if related_model != self.model:
-                self.__class__._model_search_relationships.setdefault(
-                    self.model, set()
-                )
-                self.__class__._model_search_relationships[self.model].add(
-                    related_model
-                )
+            if lookup_parts:
+                related_model = get_related_field(
+                    model=self.model, related_field_name=search_field.field
+                ).model
 
-                self.__class__._model_search_relationships.setdefault(
+                self.__class__._model_search_dependencies.setdefault(
                     related_model, set()
-                )
-                self.__class__._model_search_relationships[related_model].add(
-                    self.model
-                )
+                ).add((self, LOOKUP_SEP.join(lookup_parts)))
 
     def add_model_field(self, *args, **kwargs):
         """
@@ -384,12 +592,81 @@ class SearchModel(AppsModuleLoaderMixin):
     def get_full_name(self):
         return '{}.{}'.format(self.app_label, self.model_name)
 
+    def get_id_ranges(self, size, id_start=None):
+        """
+        Yield the first and last primary key of consecutive chunks of
+        `size` instances. Uses one query per chunk instead of loading all
+        the primary keys.
+        """
+        queryset = self.model._meta.default_manager.order_by('pk')
+        if id_start is not None:
+            queryset = queryset.filter(pk__gte=id_start)
+
+        chunk_start = queryset.values_list('pk', flat=True).first()
+
+        while chunk_start is not None:
+            queryset_chunk = queryset.filter(
+                pk__gte=chunk_start
+            ).values_list('pk', flat=True)
+
+            chunk_end = queryset_chunk[size - 1:size].first()
+
+            if chunk_end is None:
+                yield chunk_start, queryset_chunk.last()
+                break
+
+            yield chunk_start, chunk_end
+
+            chunk_start = queryset.filter(
+                pk__gt=chunk_end
+            ).values_list('pk', flat=True).first()
+
+    def get_index_queryset(self):
+        """
+        Queryset used to index the instances of the model in bulk. The
+        related instances needed by the search fields are fetched with the
+        instances.
+        """
+        select_related, prefetch_related = self.get_related_lookups()
+        return self.model._meta.default_manager.select_related(
+            *select_related
+        ).prefetch_related(*prefetch_related)
+
     def get_queryset(self):
         if self.queryset:
             return self.queryset()
         else:
             return self.model.objects.all()
 
+    def get_related_lookups(self):
+        """
+        Return the lookups of the related instances traversed by the search
+        fields, split into lookups that can be joined (select_related) and
+        lookups of multi valued relations (prefetch_related).
+        """
+        select_related = set()
+        prefetch_related = set()
+
+        for search_field in self.search_fields:
+            parts = search_field.field.split(LOOKUP_SEP)[:-1]
+
+            if parts:
+                is_single_valued = True
+                model = self.model
+
+                for part in parts:
+                    field = model._meta.get_field(part)
+                    if field.many_to_many or field.one_to_many:
+                        is_single_valued = False
+                    model = field.related_model
+
+                if is_single_valued:
+                    select_related.add(LOOKUP_SEP.join(parts))
+                else:
+                    prefetch_related.add(LOOKUP_SEP.join(parts))
+
+        return sorted(select_related), sorted(prefetch_related)
+
     def get_search_field(self, full_name):
         try:
             return self.search_fields[full_name]
@@ -423,13 +700,14 @@ class SearchModel(AppsModuleLoaderMixin):
             )
         return result
 
-    def sieve(self, field_map, instance):
+    def sieve(self, field_map, instance, separator=''):
         """
         Method that receives an instance and a field map dictionary
         consisting of attribute names and transformations to apply.
         Returns a dictionary of the instance values with their respective
         transformations. Makes it easy to pre process an instance before
-        indexing it.
+        indexing it. Multiple values of a field are joined using
+        `separator`.
         """
         result = {}
         for field in field_map:
@@ -442,7 +720,7 @@ class SearchModel(AppsModuleLoaderMixin):
                     if value == [None]:
                         value = None
                     else:
-                        value = ''.join(value)
+                        value = separator.join(value)
                 except TypeError:
                     """Value is not a list."""
             except ResolverPipelineError:
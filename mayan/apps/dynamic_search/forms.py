@@ -29,3 +29,16 @@ class SearchForm(forms.Form):
     q = forms.CharField(
         max_length=128, label=_('Search terms'), required=False
     )
+
+
+class SearchExplainForm(forms.Form):
+    query = forms.CharField(
+        label=_('Query'), required=False, widget=forms.widgets.Textarea(
+            attrs={'readonly': 'readonly', 'rows': 10}
+        )
+    )
+    plan = forms.CharField(
+        label=_('Plan'), required=False, widget=forms.widgets.Textarea(
+            attrs={'readonly': 'readonly', 'rows': 10}
+        )
+    )
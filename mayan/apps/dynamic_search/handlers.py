@@ -1,4 +1,39 @@
-from .tasks import task_deindex_instance, task_index_instance
+from functools import partial
+
+from django.apps import apps
+from django.db import transaction
+
+from .caches import SearchResultCache
+from .classes import SearchBackend, SearchModel
+from .tasks import (
+    task_deindex_instance, task_index_instance, task_index_queue_add,
+    task_index_queue_process
+)
+
+
+def handler_expire_search_results(sender, **kwargs):
+    instance = kwargs['instance']
+
+    dependencies = SearchModel._model_search_dependencies.get(
+        instance._meta.concrete_model, ()
+    )
+    search_models = set(
+        search_model for search_model, lookup in dependencies
+    )
+
+    try:
+        search_models.add(SearchModel.get_for_model(instance=instance))
+    except KeyError:
+        """
+        Not a search model, only the search models reading its values
+        are affected.
+        """
+
+    SearchResultCache().expire_search_models(search_models=search_models)
+
+
+def handler_expire_search_results_acls(sender, **kwargs):
+    SearchResultCache().expire_acls()
 
 
 def handler_factory_deindex_instance(search_model):
@@ -6,6 +41,24 @@ def handler_factory_deindex_instance(search_model):
     def handler_deindex_instance(sender, **kwargs):
         instance = kwargs['instance']
 
+        if SearchBackend.get_class().uses_index_queue:
+            # Read the dependents while the relationships still exist and
+            # leave queueing them to the workers.
+            IndexQueueEntry = apps.get_model(
+                app_label='dynamic_search', model_name='IndexQueueEntry'
+            )
+            for content_type, id_list in IndexQueueEntry.objects.get_dependent_id_lists(
+                instances=(instance,)
+            ):
+                transaction.on_commit(
+                    func=partial(
+                        task_index_queue_add.apply_async, kwargs={
+                            'content_type_id': content_type.pk,
+                            'id_list': id_list
+                        }
+                    )
+                )
+
         task_deindex_instance.apply_async(
             kwargs={
                 'app_label': instance._meta.app_label,
@@ -20,6 +73,28 @@ def handler_factory_deindex_instance(search_model):
 def handler_index_instance(sender, **kwargs):
     instance = kwargs['instance']
 
+    if SearchBackend.get_class().uses_index_queue:
+        IndexQueueEntry = apps.get_model(
+            app_label='dynamic_search', model_name='IndexQueueEntry'
+        )
+        # Queued entries have a drain pending, either sent by the save
+        # that queued them or the periodic run. Only the save that finds
+        # the queue empty sends one, once its entry is visible to the
+        # workers.
+        is_drain_pending = IndexQueueEntry.objects.filter(
+            reindex_dependents=True
+        ).exists()
+
+        IndexQueueEntry.objects.add_instances(instances=(instance,))
+
+        if not is_drain_pending:
+            transaction.on_commit(
+                func=lambda: task_index_queue_process.apply_async(
+                    kwargs={'include_dependents': False}
+                )
+            )
+        return
+
     task_index_instance.apply_async(
         kwargs={
             'app_label': instance._meta.app_label,
@@ -15,4 +15,5 @@ icon_search_backend_reindex = Icon(
         {'class': 'fas fa-hammer', 'transform': 'shrink-4 down-3 right-10'}
     ]
 )
+icon_search_explain = Icon(driver_name='fontawesome', symbol='project-diagram')
 icon_search_submit = Icon(driver_name='fontawesome', symbol='search')
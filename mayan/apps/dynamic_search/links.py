@@ -4,7 +4,7 @@ from mayan.apps.navigation.classes import Link
 
 from .icons import (
     icon_search, icon_search_advanced, icon_search_again,
-    icon_search_backend_reindex
+    icon_search_backend_reindex, icon_search_explain
 )
 from .permissions import permission_search_tools
 
@@ -24,3 +24,8 @@ link_search_backend_reindex = Link(
     icon=icon_search_backend_reindex, permissions=(permission_search_tools,),
     text=_('Reindex search backend'), view='search:search_backend_reindex'
 )
+link_search_explain = Link(
+    args='search_model.get_full_name', icon=icon_search_explain,
+    keep_query=True, permissions=(permission_search_tools,),
+    text=_('Query plan'), view='search:search_explain'
+)
@@ -3,15 +3,28 @@ import operator
 DEFAULT_RESULTS_LIMIT = 100
 DEFAULT_SEARCH_BACKEND = 'mayan.apps.dynamic_search.backends.django.DjangoSearchBackend'
 DEFAULT_SEARCH_BACKEND_ARGUMENTS = {}
+DEFAULT_SEARCH_BENCHMARK_BACKENDS = (
+    'mayan.apps.dynamic_search.backends.django.DjangoSearchBackend',
+    'mayan.apps.dynamic_search.backends.postgresql.PostgreSQLSearchBackend'
+)
 DEFAULT_SEARCH_DISABLE_SIMPLE_SEARCH = False
+DEFAULT_SEARCH_INDEX_QUEUE_BATCH_SIZE = 500
 DEFAULT_SEARCH_MATCH_ALL_DEFAULT_VALUE = 'false'
+DEFAULT_SEARCH_REINDEX_CHUNK_SIZE = 1000
+DEFAULT_SEARCH_RESULTS_CACHE_NAME = None
+DEFAULT_SEARCH_RESULTS_CACHE_TIMEOUT = 60
 DEFAULT_SEARCH_RESULTS_LIMIT = 100
 
 DEFAULT_SCOPE_ID = '0'
 
 DELIMITER = '_'
 
+INDEX_QUEUE_PROCESS_INTERVAL = 60
+
 SEARCH_MODEL_NAME_KWARG = 'search_model_name'
+SEARCH_QUERY_AFTER_PARAMETER = '_after'
+SEARCH_RESULTS_CACHE_VERSION_ACL = 'acls'
+SEARCH_RESULTS_CACHE_VERSION_PREFIX = 'dynamic_search_results_version_'
 TASK_RETRY_DELAY = 5
 
 SCOPE_MARKER = '__'
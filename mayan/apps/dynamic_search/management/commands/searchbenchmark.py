@@ -0,0 +1,114 @@
+import statistics
+import time
+
+from django.core import management
+from django.core.management.base import CommandError
+from django.utils.module_loading import import_string
+
+from ...classes import SearchModel
+from ...literals import DEFAULT_SEARCH_BENCHMARK_BACKENDS
+from ...settings import (
+    setting_backend, setting_backend_arguments, setting_reindex_chunk_size,
+    setting_results_limit
+)
+
+
+class Command(management.BaseCommand):
+    help = (
+        'Compare the query times of search backends. The queries are run '
+        'without access control filtering.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'search_model', help='Full name of the search model. Example: '
+            'documents.Document'
+        )
+        parser.add_argument(
+            'queries', nargs='+', help='Search queries. Use the format '
+            'field=terms to search a single field.'
+        )
+        parser.add_argument(
+            '--backend', action='append', dest='backends',
+            help='Dotted path of a search backend. Can be specified multiple '
+            'times. Defaults to the configured backend and the database '
+            'backends.'
+        )
+        parser.add_argument(
+            '--iterations', action='store', default=5, dest='iterations',
+            help='Number of times each query is executed.', type=int
+        )
+        parser.add_argument(
+            '--reindex', action='store_true', default=False, dest='reindex',
+            help='Index the search model with each backend before running '
+            'the queries.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            search_model = SearchModel.get(name=options['search_model'])
+        except KeyError as exception:
+            raise CommandError(exception)
+
+        backend_paths = options['backends'] or [setting_backend.value] + [
+            path for path in DEFAULT_SEARCH_BENCHMARK_BACKENDS
+            if path != setting_backend.value
+        ]
+
+        for backend_path in backend_paths:
+            if backend_path == setting_backend.value:
+                backend_arguments = setting_backend_arguments.value
+            else:
+                backend_arguments = {}
+
+            search_backend = import_string(dotted_path=backend_path)(
+                **backend_arguments
+            )
+
+            self.stdout.write(backend_path)
+
+            if options['reindex']:
+                start_time = time.perf_counter()
+                for id_start, id_end in search_model.get_id_ranges(
+                    size=setting_reindex_chunk_size.value
+                ):
+                    search_backend.index_search_model_chunk(
+                        id_end=id_end, id_start=id_start,
+                        search_model=search_model
+                    )
+                search_backend.index_search_model_finish(
+                    search_model=search_model
+                )
+                self.stdout.write(
+                    '  reindex: {:.1f} ms'.format(
+                        (time.perf_counter() - start_time) * 1000
+                    )
+                )
+
+            for query in options['queries']:
+                if '=' in query:
+                    field_name, terms = query.split('=', 1)
+                    query_string = {field_name: terms}
+                else:
+                    query_string = {'q': query}
+
+                timings = []
+                for iteration in range(options['iterations']):
+                    start_time = time.perf_counter()
+                    results = list(
+                        search_backend._search(
+                            query_string=query_string,
+                            search_model=search_model, user=None
+                        ).values_list('pk', flat=True)[
+                            :setting_results_limit.value
+                        ]
+                    )
+                    timings.append((time.perf_counter() - start_time) * 1000)
+
+                self.stdout.write(
+                    '  {}: {} results, median {:.1f} ms, minimum {:.1f} '
+                    'ms'.format(
+                        query, len(results), statistics.median(timings),
+                        min(timings)
+                    )
+                )
@@ -0,0 +1,212 @@
+from itertools import islice
+import logging
+
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchVector
+from django.db import models, transaction
+from django.db.models import Value
+
+from .classes import SearchModel
+from .settings import setting_index_queue_batch_size
+
+logger = logging.getLogger(name=__name__)
+
+
+class FullTextSearchEntryManager(models.Manager):
+    def delete_instances(self, instances):
+        for content_type, id_list in self._get_content_type_ids(
+            instances=instances
+        ).items():
+            self.filter(
+                content_type=content_type, object_id__in=id_list
+            ).delete()
+
+    def store_instances(self, instance_values, config):
+        """
+        Replace the entries of the instances. `instance_values` is a list
+        of instances and dictionaries of field names and text values.
+        The search vectors are computed by the database.
+        """
+        with transaction.atomic():
+            self.delete_instances(
+                instances=[instance for instance, values in instance_values]
+            )
+
+            entries = []
+            for instance, values in instance_values:
+                content_type = ContentType.objects.get_for_model(
+                    model=instance
+                )
+                for field_name, value in values.items():
+                    if value:
+                        entries.append(
+                            self.model(
+                                content_type=content_type,
+                                field_name=field_name,
+                                object_id=instance.pk,
+                                search_vector=SearchVector(
+                                    Value(value), config=config
+                                )
+                            )
+                        )
+
+            self.bulk_create(objs=entries)
+
+    def _get_content_type_ids(self, instances):
+        result = {}
+        for instance in instances:
+            result.setdefault(
+                ContentType.objects.get_for_model(model=instance), []
+            ).append(instance.pk)
+
+        return result
+
+
+class IndexQueueEntryManager(models.Manager):
+    def add_dependents(self, instances):
+        """
+        Queue the instances of other search models that index values of
+        the instances. Dependents are read as primary keys and inserted in
+        batches without loading them.
+        """
+        for content_type, id_list in self.get_dependent_id_lists(
+            instances=instances
+        ):
+            self.add_object_ids(
+                content_type=content_type, id_list=id_list,
+                reindex_dependents=False
+            )
+
+    def add_object_ids(self, content_type, id_list, reindex_dependents=True):
+        self.bulk_create(
+            ignore_conflicts=True, objs=[
+                self.model(
+                    content_type=content_type, object_id=pk,
+                    reindex_dependents=reindex_dependents
+                ) for pk in id_list
+            ]
+        )
+
+        if reindex_dependents:
+            self.filter(
+                content_type=content_type, object_id__in=id_list,
+                reindex_dependents=False
+            ).update(reindex_dependents=True)
+
+    def add_instances(self, instances, reindex_dependents=True):
+        """
+        Queue instances for indexing. Instances already queued are not
+        added again. When `reindex_dependents` is True, queued instances are
+        marked to also queue their dependents.
+        """
+        object_ids = {}
+        for instance in instances:
+            object_ids.setdefault(
+                ContentType.objects.get_for_model(model=instance), []
+            ).append(instance.pk)
+
+        for content_type, id_list in object_ids.items():
+            self.add_object_ids(
+                content_type=content_type, id_list=id_list,
+                reindex_dependents=reindex_dependents
+            )
+
+    def get_dependent_id_lists(self, instances):
+        """
+        Yield the content type and a batch of primary keys of the instances
+        of other search models that index values of the instances.
+        """
+        for instance in instances:
+            for queryset in SearchModel.get_dependent_querysets(
+                instance=instance
+            ):
+                content_type = ContentType.objects.get_for_model(
+                    model=queryset.model
+                )
+                id_iterator = queryset.values_list(
+                    'pk', flat=True
+                ).distinct().iterator()
+
+                while True:
+                    id_list = list(
+                        islice(
+                            id_iterator, setting_index_queue_batch_size.value
+                        )
+                    )
+                    if not id_list:
+                        break
+
+                    yield content_type, id_list
+
+    def pop_instances(self, size, reindex_dependents=None):
+        """
+        Remove the oldest entries and return their model instances.
+        Instances that no longer exist are skipped. Optionally filter by
+        the entries that reindex their dependents.
+        """
+        queryset = self.select_for_update().order_by('pk')
+        if reindex_dependents is not None:
+            queryset = queryset.filter(reindex_dependents=reindex_dependents)
+
+        with transaction.atomic():
+            entries = list(
+                queryset.values_list('pk', 'content_type_id', 'object_id')[:size]
+            )
+            self.filter(pk__in=[entry[0] for entry in entries]).delete()
+
+        object_ids = {}
+        for pk, content_type_id, object_id in entries:
+            object_ids.setdefault(content_type_id, []).append(object_id)
+
+        result = []
+        for content_type_id, id_list in object_ids.items():
+            model = ContentType.objects.get_for_id(
+                id=content_type_id
+            ).model_class()
+
+            if model:
+                result.extend(
+                    model._meta.default_manager.filter(pk__in=id_list)
+                )
+            else:
+                logger.warning(
+                    'Skipping the index queue entries of the missing '
+                    'content type ID: %s', content_type_id
+                )
+
+        return result
+
+
+class SearchModelReindexChunkManager(models.Manager):
+    def create_chunks(self, search_model, size):
+        """
+        Split the instances of the search model into primary key ranges of
+        `size` instances and store them as the pending chunks of a new
+        reindex.
+        """
+        id_ranges = list(search_model.get_id_ranges(size=size))
+
+        return self.bulk_create(
+            objs=[
+                self.model(
+                    chunk_count=len(id_ranges), chunk_number=chunk_number,
+                    id_end=id_end, id_start=id_start,
+                    search_model_full_name=search_model.get_full_name()
+                ) for chunk_number, (id_start, id_end) in enumerate(
+                    iterable=id_ranges, start=1
+                )
+            ]
+        )
+
+    def get_progress(self, search_model):
+        """
+        Return the number of indexed chunks and the chunk count of the
+        reindex of the search model or None if no reindex is pending.
+        """
+        queryset = self.filter(
+            search_model_full_name=search_model.get_full_name()
+        )
+
+        chunk = queryset.first()
+        if chunk:
+            return chunk.chunk_count - queryset.count(), chunk.chunk_count
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('dynamic_search', '0003_auto_20161028_0707'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexQueueEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('datetime_added', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Date time added')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_index_queue_entries', to='contenttypes.ContentType')),
+            ],
+            options={
+                'verbose_name': 'Index queue entry',
+                'verbose_name_plural': 'Index queue entries',
+                'ordering': ('pk',),
+                'unique_together': {('content_type', 'object_id')},
+            },
+        ),
+    ]
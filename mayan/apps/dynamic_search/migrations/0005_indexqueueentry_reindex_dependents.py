@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('dynamic_search', '0004_indexqueueentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='indexqueueentry',
+            name='reindex_dependents',
+            field=models.BooleanField(default=True, help_text='Queue the instances that index values of this instance.', verbose_name='Reindex dependents'),
+        ),
+    ]
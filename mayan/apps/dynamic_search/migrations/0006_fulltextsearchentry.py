@@ -0,0 +1,50 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+import mayan.apps.dynamic_search.model_fields
+
+
+def operation_create_search_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX dynamic_search_fulltextsearchentry_search_vector_gin '
+            'ON dynamic_search_fulltextsearchentry USING gin (search_vector);'
+        )
+
+
+def operation_delete_search_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'DROP INDEX dynamic_search_fulltextsearchentry_search_vector_gin;'
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('dynamic_search', '0005_indexqueueentry_reindex_dependents'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FullTextSearchEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('field_name', models.CharField(max_length=255, verbose_name='Field name')),
+                ('search_vector', mayan.apps.dynamic_search.model_fields.PortableSearchVectorField(verbose_name='Search vector')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='full_text_search_entries', to='contenttypes.ContentType')),
+            ],
+            options={
+                'verbose_name': 'Full text search entry',
+                'verbose_name_plural': 'Full text search entries',
+                'ordering': ('pk',),
+                'unique_together': {('content_type', 'object_id', 'field_name')},
+                'index_together': {('content_type', 'field_name')},
+            },
+        ),
+        migrations.RunPython(
+            code=operation_create_search_vector_index,
+            reverse_code=operation_delete_search_vector_index
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dynamic_search', '0006_fulltextsearchentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchModelReindexChunk',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('search_model_full_name', models.CharField(db_index=True, max_length=255, verbose_name='Search model')),
+                ('chunk_number', models.PositiveIntegerField(verbose_name='Chunk number')),
+                ('chunk_count', models.PositiveIntegerField(verbose_name='Chunk count')),
+                ('id_start', models.PositiveIntegerField(verbose_name='ID start')),
+                ('id_end', models.PositiveIntegerField(verbose_name='ID end')),
+            ],
+            options={
+                'verbose_name': 'Search model reindex chunk',
+                'verbose_name_plural': 'Search model reindex chunks',
+                'ordering': ('search_model_full_name', 'chunk_number'),
+            },
+        ),
+    ]
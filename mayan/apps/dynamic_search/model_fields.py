@@ -0,0 +1,15 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class PortableSearchVectorField(SearchVectorField):
+    """
+    Search vector field that is stored as text by the databases without a
+    tsvector type. Only the PostgreSQL search backend uses the search
+    vectors, the column allows creating the table in every database.
+    """
+    def db_type(self, connection):
+        if connection.vendor == 'postgresql':
+            return super().db_type(connection=connection)
+        else:
+            return models.TextField().db_type(connection=connection)
@@ -0,0 +1,111 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+from .managers import (
+    FullTextSearchEntryManager, IndexQueueEntryManager,
+    SearchModelReindexChunkManager
+)
+from .model_fields import PortableSearchVectorField
+
+
+class FullTextSearchEntry(models.Model):
+    """
+    Denormalized full text search vector of one search field of a model
+    instance. Used by the PostgreSQL search backend.
+    """
+    content_type = models.ForeignKey(
+        on_delete=models.CASCADE, related_name='full_text_search_entries',
+        to=ContentType
+    )
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey(
+        ct_field='content_type', fk_field='object_id',
+    )
+    field_name = models.CharField(
+        max_length=255, verbose_name=_('Field name')
+    )
+    search_vector = PortableSearchVectorField(
+        verbose_name=_('Search vector')
+    )
+
+    objects = FullTextSearchEntryManager()
+
+    class Meta:
+        index_together = ('content_type', 'field_name')
+        ordering = ('pk',)
+        unique_together = ('content_type', 'object_id', 'field_name')
+        verbose_name = _('Full text search entry')
+        verbose_name_plural = _('Full text search entries')
+
+    def __str__(self):
+        return '{}.{}: {}'.format(
+            self.content_type, self.object_id, self.field_name
+        )
+
+
+class IndexQueueEntry(models.Model):
+    """
+    Model instance waiting to be written to the search backend. Entries are
+    unique per instance to coalesce repeated saves and are removed in
+    batches by the index queue task. Entries of saved instances also queue
+    the instances that index their values, entries queued that way don't.
+    """
+    content_type = models.ForeignKey(
+        on_delete=models.CASCADE, related_name='search_index_queue_entries',
+        to=ContentType
+    )
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey(
+        ct_field='content_type', fk_field='object_id',
+    )
+    datetime_added = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name=_('Date time added')
+    )
+    reindex_dependents = models.BooleanField(
+        default=True, help_text=_(
+            'Queue the instances that index values of this instance.'
+        ), verbose_name=_('Reindex dependents')
+    )
+
+    objects = IndexQueueEntryManager()
+
+    class Meta:
+        ordering = ('pk',)
+        unique_together = ('content_type', 'object_id')
+        verbose_name = _('Index queue entry')
+        verbose_name_plural = _('Index queue entries')
+
+    def __str__(self):
+        return '{}.{}'.format(self.content_type, self.object_id)
+
+
+class SearchModelReindexChunk(models.Model):
+    """
+    Primary key range of a search model pending to be indexed by a
+    reindex. Chunks are removed once indexed. The chunks left by an
+    interrupted reindex are indexed when the search model is reindexed
+    again instead of starting a new reindex.
+    """
+    search_model_full_name = models.CharField(
+        db_index=True, max_length=255, verbose_name=_('Search model')
+    )
+    chunk_number = models.PositiveIntegerField(
+        verbose_name=_('Chunk number')
+    )
+    chunk_count = models.PositiveIntegerField(verbose_name=_('Chunk count'))
+    id_start = models.PositiveIntegerField(verbose_name=_('ID start'))
+    id_end = models.PositiveIntegerField(verbose_name=_('ID end'))
+
+    objects = SearchModelReindexChunkManager()
+
+    class Meta:
+        ordering = ('search_model_full_name', 'chunk_number')
+        verbose_name = _('Search model reindex chunk')
+        verbose_name_plural = _('Search model reindex chunks')
+
+    def __str__(self):
+        return '{}: {}/{}'.format(
+            self.search_model_full_name, self.chunk_number, self.chunk_count
+        )
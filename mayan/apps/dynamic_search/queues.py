@@ -1,12 +1,20 @@
+from datetime import timedelta
+
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.queues import queue_tools
 from mayan.apps.task_manager.classes import CeleryQueue
 from mayan.apps.task_manager.workers import worker_b
 
+from .literals import INDEX_QUEUE_PROCESS_INTERVAL
+
 queue_search = CeleryQueue(
     label=_('Search'), name='search', worker=worker_b
 )
+queue_search_periodic = CeleryQueue(
+    label=_('Search periodic'), name='search_periodic', transient=True,
+    worker=worker_b
+)
 
 queue_search.add_task_type(
     dotted_path='mayan.apps.dynamic_search.tasks.task_deindex_instance',
@@ -18,9 +26,30 @@ queue_search.add_task_type(
     label=_('Index a model instance to the search engine.'),
     name='task_index_instance',
 )
+queue_search.add_task_type(
+    dotted_path='mayan.apps.dynamic_search.tasks.task_index_queue_add',
+    label=_('Queue model instances to be written to the search engine.'),
+    name='task_index_queue_add',
+)
+queue_search_periodic.add_task_type(
+    dotted_path='mayan.apps.dynamic_search.tasks.task_index_queue_process',
+    label=_('Write the queued model instances to the search engine.'),
+    name='task_index_queue_process',
+    schedule=timedelta(seconds=INDEX_QUEUE_PROCESS_INTERVAL)
+)
 
 queue_tools.add_task_type(
     dotted_path='mayan.apps.dynamic_search.tasks.task_index_search_model',
     label=_('Index all instances of a search model to the search engine.'),
     name='task_index_search_model',
 )
+queue_tools.add_task_type(
+    dotted_path='mayan.apps.dynamic_search.tasks.task_index_search_model_chunk',
+    label=_('Index a range of instances of a search model.'),
+    name='task_index_search_model_chunk',
+)
+queue_tools.add_task_type(
+    dotted_path='mayan.apps.dynamic_search.tasks.task_index_search_model_finish',
+    label=_('Finish the indexing of a search model.'),
+    name='task_index_search_model_finish',
+)
@@ -5,7 +5,10 @@ from mayan.apps.smart_settings.classes import SettingNamespace
 from .literals import (
     DEFAULT_SEARCH_BACKEND, DEFAULT_SEARCH_BACKEND_ARGUMENTS,
     DEFAULT_SEARCH_DISABLE_SIMPLE_SEARCH,
-    DEFAULT_SEARCH_MATCH_ALL_DEFAULT_VALUE, DEFAULT_SEARCH_RESULTS_LIMIT
+    DEFAULT_SEARCH_INDEX_QUEUE_BATCH_SIZE,
+    DEFAULT_SEARCH_MATCH_ALL_DEFAULT_VALUE, DEFAULT_SEARCH_REINDEX_CHUNK_SIZE,
+    DEFAULT_SEARCH_RESULTS_CACHE_NAME, DEFAULT_SEARCH_RESULTS_CACHE_TIMEOUT,
+    DEFAULT_SEARCH_RESULTS_LIMIT
 )
 
 namespace = SettingNamespace(label=_('Search'), name='search')
@@ -27,11 +30,42 @@ setting_disable_simple_search = namespace.add_setting(
         'search button.'
     )
 )
+setting_index_queue_batch_size = namespace.add_setting(
+    default=DEFAULT_SEARCH_INDEX_QUEUE_BATCH_SIZE,
+    global_name='SEARCH_INDEX_QUEUE_BATCH_SIZE', help_text=_(
+        'Maximum number of queued instances written to the search backend '
+        'with a single commit.'
+    )
+)
 setting_match_all_default_value = namespace.add_setting(
     global_name='SEARCH_MATCH_ALL_DEFAULT_VALUE',
     default=DEFAULT_SEARCH_MATCH_ALL_DEFAULT_VALUE,
     help_text=_('Sets the default state of the "Match all" checkbox.')
 )
+setting_reindex_chunk_size = namespace.add_setting(
+    default=DEFAULT_SEARCH_REINDEX_CHUNK_SIZE,
+    global_name='SEARCH_REINDEX_CHUNK_SIZE', help_text=_(
+        'Number of instances indexed by each task when reindexing a search '
+        'model.'
+    )
+)
+setting_results_cache_name = namespace.add_setting(
+    default=DEFAULT_SEARCH_RESULTS_CACHE_NAME,
+    global_name='SEARCH_RESULTS_CACHE_NAME', help_text=_(
+        'Name of the Django cache, as defined in the CACHES setting, used '
+        'to store the result ids of recent searches. The cache must be '
+        'shared by all the processes, local memory caches are not used. '
+        'Leave empty to disable.'
+    )
+)
+setting_results_cache_timeout = namespace.add_setting(
+    default=DEFAULT_SEARCH_RESULTS_CACHE_TIMEOUT,
+    global_name='SEARCH_RESULTS_CACHE_TIMEOUT', help_text=_(
+        'Time in seconds to keep the result ids of a search to serve the '
+        'following pages of results without repeating the search. '
+        'Use 0 to disable.'
+    )
+)
 setting_results_limit = namespace.add_setting(
     default=DEFAULT_SEARCH_RESULTS_LIMIT, global_name='SEARCH_RESULTS_LIMIT',
     help_text=_('Maximum number search results to fetch and display.')
@@ -1,12 +1,20 @@
 import logging
 
+from celery import chord
+
 from django.apps import apps
+from django.db import OperationalError
 
+from mayan.apps.lock_manager.backends.base import LockingBackend
 from mayan.apps.lock_manager.exceptions import LockError
 from mayan.celery import app
 
+from .caches import SearchResultCache
 from .classes import SearchBackend, SearchModel
 from .literals import TASK_RETRY_DELAY
+from .settings import (
+    setting_index_queue_batch_size, setting_reindex_chunk_size
+)
 
 logger = logging.getLogger(name=__name__)
 
@@ -26,24 +34,221 @@ def task_deindex_instance(self, app_label, model_name, object_id):
     except LockError as exception:
         raise self.retry(exc=exception)
 
+    SearchResultCache().expire_search_model(
+        search_model=SearchModel.get_for_model(instance=instance)
+    )
+
     logger.info('Finished')
 
 
+@app.task(
+    bind=True, default_retry_delay=TASK_RETRY_DELAY, max_retries=None,
+    ignore_result=True
+)
+def task_index_queue_add(self, content_type_id, id_list):
+    """
+    Queue the dependents of a deleted instance. They are indexed by the
+    periodic run of the index queue task.
+    """
+    ContentType = apps.get_model(
+        app_label='contenttypes', model_name='ContentType'
+    )
+    IndexQueueEntry = apps.get_model(
+        app_label='dynamic_search', model_name='IndexQueueEntry'
+    )
+
+    try:
+        IndexQueueEntry.objects.add_object_ids(
+            content_type=ContentType.objects.get_for_id(id=content_type_id),
+            id_list=id_list, reindex_dependents=False
+        )
+    except OperationalError as exception:
+        raise self.retry(exc=exception)
+
+
+@app.task(
+    bind=True, default_retry_delay=TASK_RETRY_DELAY, max_retries=None,
+    ignore_result=True
+)
+def task_index_queue_process(self, include_dependents=True):
+    """
+    Write the queued instances to the search backend in batches until the
+    queue is empty. Only one task drains the queue at a time, the others
+    exit immediately and their entries are written by the running task or
+    by the periodic run. Saved instances are indexed first and queue their
+    dependents. Dependents are only indexed when `include_dependents` is
+    True, which is the case for the periodic run. Repeated edits between two periodic runs cost one
+    reindex per dependent.
+    """
+    IndexQueueEntry = apps.get_model(
+        app_label='dynamic_search', model_name='IndexQueueEntry'
+    )
+
+    search_backend = SearchBackend.get_instance()
+
+    phases = (True, False) if include_dependents else (True,)
+
+    for reindex_dependents in phases:
+        while True:
+            try:
+                lock = LockingBackend.get_backend().acquire_lock(
+                    name='dynamic_search_index_queue_process'
+                )
+            except LockError:
+                logger.debug('Index queue is being processed by another task')
+                return
+            else:
+                try:
+                    instances = IndexQueueEntry.objects.pop_instances(
+                        reindex_dependents=reindex_dependents,
+                        size=setting_index_queue_batch_size.value
+                    )
+
+                    if not instances:
+                        break
+
+                    logger.debug(
+                        'Indexing %d queued instances', len(instances)
+                    )
+
+                    try:
+                        search_backend.index_instances(instances=instances)
+                    except Exception as exception:
+                        IndexQueueEntry.objects.add_instances(
+                            instances=instances,
+                            reindex_dependents=reindex_dependents
+                        )
+
+                        if isinstance(exception, LockError):
+                            raise self.retry(exc=exception)
+                        else:
+                            raise
+                    else:
+                        SearchResultCache().expire_search_models(
+                            search_models=set(
+                                SearchModel.get_for_model(instance=instance)
+                                for instance in instances
+                            )
+                        )
+
+                        if reindex_dependents:
+                            IndexQueueEntry.objects.add_dependents(
+                                instances=instances
+                            )
+                finally:
+                    lock.release()
+
+
 @app.task(
     bind=True, default_retry_delay=TASK_RETRY_DELAY, max_retries=None,
     ignore_result=True
 )
 def task_index_search_model(self, search_model_full_name):
+    """
+    Split the instances of the search model into primary key ranges and
+    index each range in its own task. The pending ranges are stored and
+    removed as they are indexed. When a previous reindex of the search
+    model was interrupted, its pending ranges are indexed instead of
+    starting a new reindex.
+    """
+    SearchModelReindexChunk = apps.get_model(
+        app_label='dynamic_search', model_name='SearchModelReindexChunk'
+    )
+
+    search_model = SearchModel.get(name=search_model_full_name)
+
+    queryset = SearchModelReindexChunk.objects.filter(
+        search_model_full_name=search_model_full_name
+    )
+
+    if queryset.exists():
+        logger.info(
+            'Resuming the reindex of search model: %s', search_model_full_name
+        )
+    else:
+        SearchModelReindexChunk.objects.create_chunks(
+            search_model=search_model, size=setting_reindex_chunk_size.value
+        )
+
+    chunks = list(queryset)
+
+    finish_signature = task_index_search_model_finish.si(
+        search_model_full_name=search_model_full_name
+    )
+
+    if not chunks:
+        finish_signature.apply_async()
+    else:
+        chord(
+            [
+                task_index_search_model_chunk.s(
+                    chunk_count=chunk.chunk_count,
+                    chunk_number=chunk.chunk_number, id_end=chunk.id_end,
+                    id_start=chunk.id_start,
+                    search_model_full_name=search_model_full_name
+                ) for chunk in chunks
+            ]
+        )(finish_signature)
+
+
+@app.task(
+    bind=True, default_retry_delay=TASK_RETRY_DELAY, max_retries=None
+)
+def task_index_search_model_chunk(
+    self, search_model_full_name, id_start, id_end, chunk_number=None,
+    chunk_count=None
+):
+    """
+    The chunk number and count are only used to report the progress of the
+    reindex in the task manager and the logs.
+    """
+    SearchModelReindexChunk = apps.get_model(
+        app_label='dynamic_search', model_name='SearchModelReindexChunk'
+    )
+
+    logger.info(
+        'Indexing search model: %s, chunk %s of %s, IDs %d to %d',
+        search_model_full_name, chunk_number, chunk_count, id_start, id_end
+    )
+
     search_model = SearchModel.get(name=search_model_full_name)
 
-    for instance in search_model.model._meta.default_manager.all():
-        task_index_instance.apply_async(
-            kwargs={
-                'app_label': instance._meta.app_label,
-                'model_name': instance._meta.model_name,
-                'object_id': instance.pk
-            }
+    try:
+        SearchBackend.get_instance().index_search_model_chunk(
+            id_end=id_end, id_start=id_start, search_model=search_model
         )
+    except LockError as exception:
+        raise self.retry(exc=exception)
+
+    SearchModelReindexChunk.objects.filter(
+        id_start=id_start, search_model_full_name=search_model_full_name
+    ).delete()
+
+    SearchResultCache().expire_search_model(search_model=search_model)
+
+    logger.info(
+        'Finished search model: %s, chunk %s of %s',
+        search_model_full_name, chunk_number, chunk_count
+    )
+
+
+@app.task(
+    bind=True, default_retry_delay=TASK_RETRY_DELAY, max_retries=None,
+    ignore_result=True
+)
+def task_index_search_model_finish(self, search_model_full_name):
+    search_model = SearchModel.get(name=search_model_full_name)
+
+    try:
+        SearchBackend.get_instance().index_search_model_finish(
+            search_model=search_model
+        )
+    except LockError as exception:
+        raise self.retry(exc=exception)
+
+    SearchResultCache().expire_search_model(search_model=search_model)
+
+    logger.info('Finished indexing search model: %s', search_model_full_name)
 
 
 @app.task(
@@ -74,4 +279,8 @@ def task_index_instance(self, app_label, model_name, object_id):
             except LockError as exception:
                 raise self.retry(exc=exception)
 
+            SearchResultCache().expire_search_model(
+                search_model=SearchModel.get_for_model(instance=instance)
+            )
+
     logger.info('Finished')
@@ -0,0 +1 @@
+TEST_SEARCH_RESULTS_CACHE_NAME = 'test_search_results'
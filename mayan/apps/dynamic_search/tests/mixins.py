@@ -20,10 +20,22 @@ class SearchAPIViewTestMixin:
         )
 
 
+class SearchExplainViewTestMixin:
+    def _request_search_explain_view(self):
+        return self.get(
+            viewname='search:search_explain', kwargs={
+                'search_model_name': document_search.get_full_name()
+            }, query={'q': self.test_document.label}
+        )
+
+
 class SearchToolsViewTestMixin:
     def _request_search_backend_reindex_view(self):
         return self.post(viewname='search:search_backend_reindex')
 
+    def _request_search_backend_reindex_get_view(self):
+        return self.get(viewname='search:search_backend_reindex')
+
 
 class SearchViewTestMixin:
     def _request_search_results_view(self, data, kwargs=None, query=None):
@@ -1,14 +1,30 @@
+import unittest
+
+import mock
+from whoosh.writing import SegmentWriter
+
+from django.db import connection, transaction
 from django.test import override_settings
 from django.utils.encoding import force_text
 
 from mayan.apps.documents.permissions import permission_document_view
 from mayan.apps.documents.search import document_search
 from mayan.apps.documents.tests.mixins.document_mixins import DocumentTestMixin
+from mayan.apps.lock_manager.backends.base import LockingBackend
 from mayan.apps.storage.utils import fs_cleanup, mkdtemp
-from mayan.apps.testing.tests.base import BaseTestCase
+from mayan.apps.tags.models import Tag
+from mayan.apps.testing.tests.base import (
+    BaseTestCase, BaseTransactionTestCase
+)
 
+from ..backends.django import SearchTermCollection
+from ..backends.postgresql import PostgreSQLSearchBackend
 from ..classes import SearchBackend
-from ..settings import setting_backend_arguments
+from ..models import IndexQueueEntry, SearchModelReindexChunk
+from ..tasks import task_index_queue_process, task_index_search_model
+from ..settings import (
+    setting_backend_arguments, setting_reindex_chunk_size
+)
 
 
 @override_settings(SEARCH_BACKEND='mayan.apps.dynamic_search.backends.django.DjangoSearchBackend')
@@ -214,7 +230,7 @@ class DjangoSearchBackendDocumentSearchTestCase(
 
 @override_settings(SEARCH_BACKEND='mayan.apps.dynamic_search.backends.whoosh.WhooshSearchBackend')
 class WhooshSearchBackendDocumentSearchTestCase(
-    DocumentTestMixin, BaseTestCase
+    DocumentTestMixin, BaseTransactionTestCase
 ):
     auto_upload_test_document = False
 
@@ -348,3 +364,290 @@ class WhooshSearchBackendDocumentSearchTestCase(
             user=self._test_case_user
         )
         self.assertEqual(queryset.count(), 1)
+
+    def test_index_queue_drained(self):
+        self._upload_test_document(label='first_doc')
+
+        self.assertEqual(
+            IndexQueueEntry.objects.filter(reindex_dependents=True).count(), 0
+        )
+
+        task_index_queue_process.apply()
+
+        self.assertEqual(IndexQueueEntry.objects.count(), 0)
+
+    def test_index_queue_deleted_dependents(self):
+        self._upload_test_document()
+
+        test_tag = Tag.objects.create(label='test_tag')
+        test_tag.documents.add(self.test_document)
+
+        IndexQueueEntry.objects.all().delete()
+
+        test_tag.delete()
+
+        self.assertTrue(
+            IndexQueueEntry.objects.filter(
+                object_id=self.test_document.pk, reindex_dependents=False
+            ).exists()
+        )
+
+    def test_index_queue_drain_pending(self):
+        self._upload_test_document()
+        IndexQueueEntry.objects.all().delete()
+
+        with mock.patch(
+            'mayan.apps.dynamic_search.handlers.task_index_queue_process.apply_async'
+        ) as mock_apply_async:
+            with transaction.atomic():
+                self.test_document.label = 'edited_label'
+                self.test_document.save()
+                self.test_document.description = 'edited_description'
+                self.test_document.save()
+
+            self.assertEqual(mock_apply_async.call_count, 1)
+
+            self.test_document.save()
+
+            self.assertEqual(mock_apply_async.call_count, 1)
+
+    def test_index_queue_locked(self):
+        lock = LockingBackend.get_backend().acquire_lock(
+            name='dynamic_search_index_queue_process'
+        )
+        self.addCleanup(lock.release)
+
+        self._upload_test_document(label='first_doc')
+
+        result = task_index_queue_process.apply()
+
+        self.assertEqual(result.state, 'SUCCESS')
+        self.assertTrue(IndexQueueEntry.objects.exists())
+
+    def test_index_queue_dependents(self):
+        self._upload_test_document()
+        task_index_queue_process.apply()
+
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        test_document_file = self.test_document.file_latest
+        test_document_file.filename = 'edited_filename'
+        test_document_file.save()
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query={'files__filename': 'edited_filename'},
+            user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 0)
+
+        self.assertTrue(
+            IndexQueueEntry.objects.filter(
+                object_id=self.test_document.pk, reindex_dependents=False
+            ).exists()
+        )
+        self.assertFalse(
+            IndexQueueEntry.objects.filter(reindex_dependents=True).exists()
+        )
+
+        task_index_queue_process.apply()
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query={'files__filename': 'edited_filename'},
+            user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 1)
+
+    def test_method_index_instances_single_commit(self):
+        self._upload_test_document(label='first_doc')
+        self._upload_test_document(label='second_doc')
+
+        with mock.patch.object(
+            autospec=True, attribute='commit', side_effect=SegmentWriter.commit,
+            target=SegmentWriter
+        ) as mock_commit:
+            self.search_backend.index_instances(
+                instances=self.test_documents
+            )
+
+        # One commit per search model instead of one per instance.
+        index_names = [
+            mock_call[0][0].indexname for mock_call in mock_commit.call_args_list
+        ]
+        self.assertTrue(index_names)
+        self.assertEqual(len(index_names), len(set(index_names)))
+
+        for test_document in self.test_documents:
+            self.grant_access(
+                obj=test_document, permission=permission_document_view
+            )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query={'q': 'first* OR second*'}, user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 2)
+
+    def test_task_index_search_model(self):
+        old_value = setting_reindex_chunk_size.value
+        setting_reindex_chunk_size.set(value=1)
+        self.addCleanup(setting_reindex_chunk_size.set, value=old_value)
+
+        self._upload_test_document(label='first_doc')
+        self._upload_test_document(label='second_doc')
+
+        self.search_backend.clear_search_model_index(
+            search_model=document_search
+        )
+
+        for test_document in self.test_documents:
+            self.grant_access(
+                obj=test_document, permission=permission_document_view
+            )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query={'q': 'first* OR second*'}, user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 0)
+
+        task_index_search_model.apply(
+            kwargs={'search_model_full_name': document_search.get_full_name()}
+        )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query={'q': 'first* OR second*'}, user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 2)
+        self.assertEqual(
+            len(
+                self.search_backend.get_index(
+                    search_model=document_search
+                ).reader().leaf_readers()
+            ), 1
+        )
+        self.assertEqual(SearchModelReindexChunk.objects.count(), 0)
+
+    def test_task_index_search_model_resume(self):
+        self._upload_test_document(label='first_doc')
+        self._upload_test_document(label='second_doc')
+
+        self.search_backend.clear_search_model_index(
+            search_model=document_search
+        )
+
+        for test_document in self.test_documents:
+            self.grant_access(
+                obj=test_document, permission=permission_document_view
+            )
+
+        # Interrupted reindex with the first chunk already indexed.
+        SearchModelReindexChunk.objects.create_chunks(
+            search_model=document_search, size=1
+        )
+        SearchModelReindexChunk.objects.first().delete()
+
+        task_index_search_model.apply(
+            kwargs={'search_model_full_name': document_search.get_full_name()}
+        )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query={'q': 'first* OR second*'}, user=self._test_case_user
+        )
+        self.assertEqual(list(queryset), [self.test_documents[1]])
+        self.assertEqual(SearchModelReindexChunk.objects.count(), 0)
+
+
+class PostgreSQLSearchBackendTSQueryTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.search_backend = PostgreSQLSearchBackend()
+        self.search_field = document_search.search_fields[0]
+
+    def _get_tsquery(self, text):
+        return self.search_backend.get_tsquery(
+            search_field=self.search_field,
+            search_term_collection=SearchTermCollection(text=text)
+        )
+
+    def test_terms_and(self):
+        self.assertEqual(self._get_tsquery(text='a b'), '(a:* & b:*)')
+
+    def test_terms_or(self):
+        self.assertEqual(self._get_tsquery(text='a OR b'), '(a:* | b:*)')
+
+    def test_terms_negated(self):
+        self.assertEqual(self._get_tsquery(text='a -b'), '(a:* & !b:*)')
+
+    def test_terms_phrase(self):
+        self.assertEqual(
+            self._get_tsquery(text='"a b" c'), '((a:* <-> b:*) & c:*)'
+        )
+
+    def test_terms_sanitized(self):
+        self.assertEqual(self._get_tsquery(text='a&!|'), 'a:*')
+        self.assertEqual(self._get_tsquery(text='&!|'), None)
+
+
+@unittest.skipUnless(
+    connection.vendor == 'postgresql', 'Requires a PostgreSQL database.'
+)
+@override_settings(SEARCH_BACKEND='mayan.apps.dynamic_search.backends.postgresql.PostgreSQLSearchBackend')
+class PostgreSQLSearchBackendDocumentSearchTestCase(
+    DocumentTestMixin, BaseTestCase
+):
+    auto_upload_test_document = False
+
+    def setUp(self):
+        super().setUp()
+        self.search_backend = SearchBackend.get_instance()
+
+    def test_simple_search(self):
+        self._upload_test_document(label='first_doc')
+
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query={'q': 'first'}, user=self._test_case_user
+        )
+
+        self.assertEqual(queryset.count(), 1)
+        self.assertTrue(self.test_document in queryset)
+
+    def test_simple_or_search(self):
+        self._upload_test_document(label='first_doc')
+        self._upload_test_document(label='second_doc')
+
+        for test_document in self.test_documents:
+            self.grant_access(
+                obj=test_document, permission=permission_document_view
+            )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query={'q': 'first OR second'}, user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 2)
+
+    def test_negated_search(self):
+        self._upload_test_document(label='first_doc')
+        self._upload_test_document(label='second_doc')
+
+        for test_document in self.test_documents:
+            self.grant_access(
+                obj=test_document, permission=permission_document_view
+            )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query={'label': 'doc -first'}, user=self._test_case_user
+        )
+        self.assertEqual(list(queryset), [self.test_documents[1]])
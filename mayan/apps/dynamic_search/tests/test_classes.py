@@ -1,12 +1,23 @@
+import shutil
+
+import mock
+
+from django.test import override_settings
+
 from mayan.apps.documents.permissions import permission_document_view
 from mayan.apps.documents.search import document_search
 from mayan.apps.documents.tests.literals import DEFAULT_DOCUMENT_STUB_LABEL
 from mayan.apps.documents.tests.mixins.document_mixins import DocumentTestMixin
 from mayan.apps.tags.tests.mixins import TagTestMixin
+from mayan.apps.storage.utils import mkdtemp
 from mayan.apps.testing.tests.base import BaseTestCase
 
+from ..caches import SearchResultCache
 from ..classes import SearchBackend
 from ..exceptions import DynamicSearchException
+from ..settings import setting_results_cache_name
+
+from .literals import TEST_SEARCH_RESULTS_CACHE_NAME
 
 
 class QueryStringDecodeTestCase(BaseTestCase):
@@ -292,3 +303,213 @@ class ScopeOperatorSearchTestCase(DocumentTestMixin, BaseTestCase):
             user=self._test_case_user
         )
         self.assertEqual(queryset.count(), 0)
+
+
+    def test_not_operator(self):
+        query = {
+            '__0_label': DEFAULT_DOCUMENT_STUB_LABEL,
+            '__operator_0_1': 'NOT_2',
+            '__1_label': self.test_documents[0].label,
+            '__result': '2'
+        }
+        queryset = self.search_backend.search(
+            search_model=document_search, query=query,
+            user=self._test_case_user
+        )
+        self.assertEqual(list(queryset), [self.test_documents[1]])
+
+    def test_operator_scopes_single_statement(self):
+        query = {
+            '__0_label': DEFAULT_DOCUMENT_STUB_LABEL,
+            '__operator_0_1': 'OR_2',
+            '__1_label': 'invalid',
+            '__result': '2'
+        }
+        result = self.search_backend.explain(
+            search_model=document_search, query=query,
+            user=self._test_case_user
+        )
+        self.assertTrue(result['plan'])
+
+        with self.assertNumQueries(num=1):
+            list(
+                self.search_backend.solve_scope(
+                    search_model=document_search, user=self._test_case_user,
+                    **self.search_backend.decode_query(query=query)
+                )
+            )
+
+
+class SearchModelTestCase(DocumentTestMixin, BaseTestCase):
+    auto_upload_test_document = False
+
+    def test_method_get_id_ranges(self):
+        for count in range(5):
+            self._create_test_document_stub()
+
+        id_list = sorted(
+            test_document.pk for test_document in self.test_documents
+        )
+
+        self.assertEqual(
+            list(document_search.get_id_ranges(size=2)), [
+                (id_list[0], id_list[1]), (id_list[2], id_list[3]),
+                (id_list[4], id_list[4])
+            ]
+        )
+        self.assertEqual(
+            list(document_search.get_id_ranges(id_start=id_list[3], size=2)),
+            [(id_list[3], id_list[4])]
+        )
+
+    def test_method_get_id_ranges_empty(self):
+        self.assertEqual(list(document_search.get_id_ranges(size=2)), [])
+
+    def test_method_get_related_lookups(self):
+        select_related, prefetch_related = document_search.get_related_lookups()
+
+        self.assertTrue('document_type' in select_related)
+        self.assertTrue('files' in prefetch_related)
+        self.assertFalse('files' in select_related)
+
+
+class SearchResultCacheTestCase(DocumentTestMixin, BaseTestCase):
+    auto_upload_test_document = False
+
+    def setUp(self):
+        super().setUp()
+        self.test_cache_location = mkdtemp()
+        self.addCleanup(
+            shutil.rmtree, self.test_cache_location, ignore_errors=True
+        )
+
+        # The version tokens must be shared, use a file based cache.
+        test_settings = override_settings(
+            CACHES={
+                'default': {
+                    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+                },
+                TEST_SEARCH_RESULTS_CACHE_NAME: {
+                    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                    'LOCATION': self.test_cache_location
+                }
+            }
+        )
+        test_settings.enable()
+        self.addCleanup(test_settings.disable)
+
+        self.old_setting_results_cache_name = setting_results_cache_name.value
+        setting_results_cache_name.set(value=TEST_SEARCH_RESULTS_CACHE_NAME)
+        self.addCleanup(
+            setting_results_cache_name.set,
+            value=self.old_setting_results_cache_name
+        )
+
+        self.search_backend = SearchBackend.get_instance()
+
+        self._create_test_document_stub()
+        self._create_test_document_stub()
+
+        for test_document in self.test_documents:
+            self.grant_access(
+                obj=test_document, permission=permission_document_view
+            )
+
+    def _search(self, query):
+        return self.search_backend.search(
+            search_model=document_search, query=query,
+            user=self._test_case_user
+        )
+
+    def test_result_ids_cached(self):
+        with mock.patch.object(
+            attribute='solve_scope', target=self.search_backend,
+            wraps=self.search_backend.solve_scope
+        ) as mock_solve_scope:
+            self.assertEqual(
+                self._search(
+                    query={'label': DEFAULT_DOCUMENT_STUB_LABEL}
+                ).count(), 2
+            )
+            self.assertEqual(
+                self._search(
+                    query={'label': DEFAULT_DOCUMENT_STUB_LABEL, 'page': '2'}
+                ).count(), 2
+            )
+
+        self.assertEqual(mock_solve_scope.call_count, 1)
+
+    def test_result_ids_access_checked(self):
+        self.assertEqual(
+            self._search(query={'label': DEFAULT_DOCUMENT_STUB_LABEL}).count(),
+            2
+        )
+
+        # Serve the cached result ids without expiring them.
+        with mock.patch.object(attribute='expire_acls', target=SearchResultCache):
+            self.revoke_access(
+                obj=self.test_documents[0], permission=permission_document_view
+            )
+
+        self.assertEqual(
+            list(self._search(query={'label': DEFAULT_DOCUMENT_STUB_LABEL})),
+            [self.test_documents[1]]
+        )
+
+    def test_result_ids_local_cache_disabled(self):
+        setting_results_cache_name.set(value='default')
+
+        self.assertFalse(SearchResultCache().is_enabled())
+
+    def test_result_ids_expired_by_access_change(self):
+        self.assertEqual(
+            self._search(query={'label': DEFAULT_DOCUMENT_STUB_LABEL}).count(),
+            2
+        )
+
+        self.revoke_access(
+            obj=self.test_documents[0], permission=permission_document_view
+        )
+
+        self.assertEqual(
+            list(self._search(query={'label': DEFAULT_DOCUMENT_STUB_LABEL})),
+            [self.test_documents[1]]
+        )
+
+    def test_result_ids_expired_by_instance_change(self):
+        self.assertEqual(
+            self._search(query={'label': DEFAULT_DOCUMENT_STUB_LABEL}).count(),
+            2
+        )
+
+        self._create_test_document_stub()
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        self.assertEqual(
+            self._search(query={'label': DEFAULT_DOCUMENT_STUB_LABEL}).count(),
+            3
+        )
+
+    def test_result_keyset_pagination(self):
+        result_list = list(
+            self._search(query={'label': DEFAULT_DOCUMENT_STUB_LABEL})
+        )
+
+        self.assertEqual(
+            list(
+                self._search(
+                    query={
+                        '_after': str(result_list[0].pk),
+                        'label': DEFAULT_DOCUMENT_STUB_LABEL
+                    }
+                )
+            ), result_list[1:]
+        )
+
+    def test_result_keyset_pagination_invalid(self):
+        with self.assertRaises(expected_exception=DynamicSearchException):
+            self._search(
+                query={'_after': 'invalid', 'label': DEFAULT_DOCUMENT_STUB_LABEL}
+            )
@@ -0,0 +1,129 @@
+from django.db import connection
+
+from mayan.apps.documents.search import document_search
+from mayan.apps.documents.tests.base import GenericDocumentTestCase
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..models import (
+    FullTextSearchEntry, IndexQueueEntry, SearchModelReindexChunk
+)
+
+
+class IndexQueueEntryManagerTestCase(GenericDocumentTestCase):
+    def test_method_add_instances_coalesce(self):
+        IndexQueueEntry.objects.all().delete()
+
+        IndexQueueEntry.objects.add_instances(
+            instances=(self.test_document, self.test_document)
+        )
+        IndexQueueEntry.objects.add_instances(
+            instances=(self.test_document, self.test_document_type)
+        )
+
+        self.assertEqual(IndexQueueEntry.objects.count(), 2)
+
+    def test_method_pop_instances(self):
+        IndexQueueEntry.objects.all().delete()
+
+        IndexQueueEntry.objects.add_instances(
+            instances=(self.test_document, self.test_document_type)
+        )
+
+        self.assertEqual(
+            IndexQueueEntry.objects.pop_instances(size=1),
+            [self.test_document]
+        )
+        self.assertEqual(
+            IndexQueueEntry.objects.pop_instances(size=10),
+            [self.test_document_type]
+        )
+        self.assertEqual(IndexQueueEntry.objects.count(), 0)
+
+    def test_method_pop_instances_deleted(self):
+        IndexQueueEntry.objects.all().delete()
+
+        IndexQueueEntry.objects.add_instances(instances=(self.test_document,))
+        self.test_document.delete(to_trash=False)
+
+        self.assertEqual(IndexQueueEntry.objects.pop_instances(size=10), [])
+
+    def test_method_add_dependents(self):
+        IndexQueueEntry.objects.all().delete()
+
+        IndexQueueEntry.objects.add_dependents(
+            instances=(self.test_document_file,)
+        )
+
+        self.assertTrue(
+            IndexQueueEntry.objects.filter(
+                object_id=self.test_document.pk, reindex_dependents=False
+            ).exists()
+        )
+
+    def test_method_add_instances_dependent_upgrade(self):
+        IndexQueueEntry.objects.all().delete()
+
+        IndexQueueEntry.objects.add_instances(
+            instances=(self.test_document,), reindex_dependents=False
+        )
+        IndexQueueEntry.objects.add_instances(instances=(self.test_document,))
+
+        self.assertEqual(
+            list(
+                IndexQueueEntry.objects.values_list(
+                    'reindex_dependents', flat=True
+                )
+            ), [True]
+        )
+
+
+class FullTextSearchEntryTestCase(BaseTestCase):
+    def test_search_vector_db_type(self):
+        db_type = FullTextSearchEntry._meta.get_field(
+            field_name='search_vector'
+        ).db_type(connection=connection)
+
+        if connection.vendor == 'postgresql':
+            self.assertEqual(db_type, 'tsvector')
+        else:
+            self.assertNotEqual(db_type, 'tsvector')
+
+
+class SearchModelReindexChunkManagerTestCase(GenericDocumentTestCase):
+    def test_method_create_chunks(self):
+        self._upload_test_document()
+
+        SearchModelReindexChunk.objects.create_chunks(
+            search_model=document_search, size=1
+        )
+
+        self.assertEqual(
+            list(
+                SearchModelReindexChunk.objects.values_list(
+                    'chunk_number', 'chunk_count', 'id_start', 'id_end'
+                )
+            ), [
+                (1, 2, self.test_documents[0].pk, self.test_documents[0].pk),
+                (2, 2, self.test_documents[1].pk, self.test_documents[1].pk)
+            ]
+        )
+
+    def test_method_get_progress(self):
+        self._upload_test_document()
+
+        self.assertEqual(
+            SearchModelReindexChunk.objects.get_progress(
+                search_model=document_search
+            ), None
+        )
+
+        SearchModelReindexChunk.objects.create_chunks(
+            search_model=document_search, size=1
+        )
+        SearchModelReindexChunk.objects.first().delete()
+
+        self.assertEqual(
+            SearchModelReindexChunk.objects.get_progress(
+                search_model=document_search
+            ), (1, 2)
+        )
@@ -8,10 +8,14 @@ from mayan.apps.testing.tests.base import GenericViewTestCase
 from mayan.apps.storage.utils import fs_cleanup, mkdtemp
 
 from ..classes import SearchBackend, SearchModel
+from ..models import SearchModelReindexChunk
 from ..permissions import permission_search_tools
 from ..settings import setting_backend_arguments
 
-from .mixins import SearchToolsViewTestMixin, SearchViewTestMixin
+from .mixins import (
+    SearchExplainViewTestMixin, SearchToolsViewTestMixin,
+    SearchViewTestMixin
+)
 
 
 class AdvancedSearchViewTestCase(
@@ -105,6 +109,28 @@ class SearchViewTestCase(
         )
 
 
+class SearchExplainViewTestCase(
+    DocumentTestMixin, SearchExplainViewTestMixin, GenericViewTestCase
+):
+    auto_upload_test_document = False
+
+    def setUp(self):
+        super().setUp()
+        self._create_test_document_stub()
+
+    def test_search_explain_view_no_permission(self):
+        response = self._request_search_explain_view()
+        self.assertEqual(response.status_code, 403)
+
+    def test_search_explain_view_with_permission(self):
+        self.grant_permission(permission=permission_search_tools)
+
+        response = self._request_search_explain_view()
+        self.assertContains(
+            response=response, status_code=200, text='SELECT'
+        )
+
+
 @override_settings(SEARCH_BACKEND='mayan.apps.dynamic_search.backends.whoosh.WhooshSearchBackend')
 class SearchToolsViewTestCase(
     DocumentTestMixin, SearchToolsViewTestMixin, GenericViewTestCase
@@ -163,3 +189,14 @@ class SearchToolsViewTestCase(
             user=self._test_case_user
         )
         self.assertNotEqual(queryset.count(), 0)
+
+    def test_search_backend_reindex_view_progress(self):
+        SearchModelReindexChunk.objects.create_chunks(
+            search_model=document_search, size=1
+        )
+        self.grant_permission(permission=permission_search_tools)
+
+        response = self._request_search_backend_reindex_get_view()
+        self.assertContains(
+            response=response, status_code=200, text='0 of 1 chunks indexed'
+        )
@@ -5,7 +5,7 @@ from .api_views import (
 )
 from .views import (
     AdvancedSearchView, ResultsView, SearchAgainView,
-    SearchBackendReindexView, SearchView
+    SearchBackendReindexView, SearchExplainView, SearchView
 )
 
 urlpatterns_search = [
@@ -31,6 +31,10 @@ urlpatterns_search = [
     url(
         regex=r'^search/(?P<search_model_name>[\.\w]+)/$', name='search',
         view=SearchView.as_view()
+    ),
+    url(
+        regex=r'^search/(?P<search_model_name>[\.\w]+)/explain/$',
+        name='search_explain', view=SearchExplainView.as_view()
     )
 ]
 
@@ -8,15 +8,16 @@ from django.utils.translation import ugettext_lazy as _
 from django.views.generic.base import RedirectView
 
 from mayan.apps.views.generics import (
-    ConfirmView, FormView, SingleObjectListView
+    ConfirmView, FormView, SimpleView, SingleObjectListView
 )
 from mayan.apps.views.literals import LIST_MODE_CHOICE_ITEM
 
 from .classes import SearchBackend, SearchModel
 from .exceptions import DynamicSearchException
-from .forms import SearchForm, AdvancedSearchForm
+from .forms import AdvancedSearchForm, SearchExplainForm, SearchForm
 from .icons import icon_search_submit
 from .links import link_search_again
+from .models import SearchModelReindexChunk
 from .permissions import permission_search_tools
 from .tasks import task_index_search_model
 from .view_mixins import SearchModelViewMixin
@@ -90,20 +91,44 @@ class SearchAgainView(RedirectView):
 
 
 class SearchBackendReindexView(ConfirmView):
-    extra_context = {
-        'message': _(
-            'This tool is required only for some search backends. '
-            'Search results will be affected while the backend is '
-            'being reindexed.'
-        ),
-        'title': _('Reindex search backend'),
-        'subtitle': _(
-            'This tool erases and populates the search backend\'s '
-            'internal index.'
-        ),
-    }
     view_permission = permission_search_tools
 
+    def get_extra_context(self):
+        messages_progress = []
+        for search_model in SearchModel.all():
+            progress = SearchModelReindexChunk.objects.get_progress(
+                search_model=search_model
+            )
+            if progress:
+                messages_progress.append(
+                    _(
+                        'Reindex of %(search_model)s pending, %(indexed)d of '
+                        '%(count)d chunks indexed. It will be resumed.'
+                    ) % {
+                        'count': progress[1], 'indexed': progress[0],
+                        'search_model': search_model.label
+                    }
+                )
+
+        return {
+            'message': ' '.join(
+                [
+                    str(
+                        _(
+                            'This tool is required only for some search '
+                            'backends. Search results will be affected '
+                            'while the backend is being reindexed.'
+                        )
+                    )
+                ] + messages_progress
+            ),
+            'title': _('Reindex search backend'),
+            'subtitle': _(
+                'This tool erases and populates the search backend\'s '
+                'internal index.'
+            ),
+        }
+
     def get_post_action_redirect(self):
         return reverse(viewname='common:tools_list')
 
@@ -121,6 +146,43 @@ class SearchBackendReindexView(ConfirmView):
         )
 
 
+class SearchExplainView(SearchModelViewMixin, SimpleView):
+    """
+    Show the SQL statement of a search and how the database executes it.
+    """
+    template_name = 'appearance/generic_form.html'
+    view_permission = permission_search_tools
+
+    def get_extra_context(self):
+        query_dict = self.request.GET.copy()
+        query_dict.update(self.request.POST)
+
+        if query_dict.get('_match_all', 'off') == 'on':
+            global_and_search = True
+        else:
+            global_and_search = False
+
+        try:
+            explanation = SearchBackend.get_instance().explain(
+                global_and_search=global_and_search,
+                search_model=self.search_model,
+                query=query_dict, user=self.request.user
+            )
+        except DynamicSearchException as exception:
+            if settings.DEBUG or settings.TESTING:
+                raise
+
+            messages.error(message=exception, request=self.request)
+            explanation = {}
+
+        return {
+            'form': SearchExplainForm(initial=explanation),
+            'read_only': True,
+            'search_model': self.search_model,
+            'title': _('Search query plan for: %s') % self.search_model.label,
+        }
+
+
 class SearchView(SearchModelViewMixin, FormView):
     template_name = 'appearance/generic_form.html'
     title = _('Search')
@@ -1,6 +1,15 @@
 from django.contrib import admin
 
-from .models import EventSubscription, Notification, StoredEventType
+from .models import (
+    EventArchive, EventSubscription, Notification, StoredEventType
+)
+
+
+@admin.register(EventArchive)
+class EventArchiveAdmin(admin.ModelAdmin):
+    list_display = (
+        'filename', 'timestamp_start', 'timestamp_end', 'event_count'
+    )
 
 
 @admin.register(EventSubscription)
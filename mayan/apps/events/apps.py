@@ -1,3 +1,5 @@
+from celery.signals import task_postrun, task_prerun
+
 from django.apps import apps
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
@@ -10,6 +12,7 @@ from mayan.apps.common.menus import (
 from mayan.apps.navigation.classes import SourceColumn
 from mayan.apps.views.html_widgets import ObjectLinkWidget, TwoStateWidget
 
+from .handlers import handler_event_batch_begin, handler_event_batch_end
 from .html_widgets import widget_event_actor_link, widget_event_type_link
 from .links import (
     link_current_user_events, link_current_user_events_export,
@@ -145,3 +148,14 @@ class EventsApp(MayanAppConfig):
                 link_event_types_subscriptions_list, link_current_user_events
             ), position=50
         )
+
+        # Write the events of each task in bulk when the task ends.
+        # Celery signals only accept the receiver as a positional argument.
+        task_prerun.connect(
+            handler_event_batch_begin,
+            dispatch_uid='events_handler_event_batch_begin'
+        )
+        task_postrun.connect(
+            handler_event_batch_end,
+            dispatch_uid='events_handler_event_batch_end'
+        )
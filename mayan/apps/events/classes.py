@@ -1,13 +1,21 @@
 import csv
+from functools import partial
+import gzip
+import io
+import itertools
 import logging
+import threading
 
 from furl import furl
 
 from django.apps import apps
-from django.contrib.auth import get_user_model
-from django.core.exceptions import PermissionDenied
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.signals import post_save
 from django.urls import reverse
 from django.utils.encoding import force_text
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 
 from actstream import action
@@ -17,12 +25,13 @@ from mayan.apps.common.settings import setting_project_url
 from mayan.apps.common.utils import return_attrib
 
 from .literals import (
-    DEFAULT_EVENT_LIST_EXPORT_FILENAME, EVENT_MANAGER_ORDER_AFTER
+    DEFAULT_EVENT_LIST_EXPORT_FILENAME, EVENT_BATCH_MAXIMUM_SIZE,
+    EVENT_EXPORT_CHUNK_SIZE, EVENT_MANAGER_ORDER_AFTER
 )
 from .links import (
     link_events_for_object, link_object_event_types_user_subcriptions_list
 )
-from .permissions import permission_events_export, permission_events_view
+from .permissions import permission_events_export
 
 logger = logging.getLogger(name=__name__)
 
@@ -35,35 +44,103 @@ DEFAULT_ACTION_EXPORTER_FIELD_NAMES = (
 
 
 class ActionExporter:
-    def __init__(self, queryset, field_names=None):
+    """
+    Export actions to CSV as a stream. The actions are read as plain values
+    in chunks using a server side cursor when the database supports it.
+    The content types and the labels of the objects referenced by each
+    chunk are resolved with one query per content type instead of one
+    query per column of every row. The date range and verb filters are
+    applied by the database. The events removed by the retention policy
+    can be included from their archives.
+    """
+    generic_foreign_key_names = ('action_object', 'actor', 'target')
+
+    def __init__(
+        self, queryset, field_names=None, date_from=None, date_to=None,
+        include_archives=False, verbs=None
+    ):
+        self.date_from = date_from
+        self.date_to = date_to
         self.field_names = field_names or DEFAULT_ACTION_EXPORTER_FIELD_NAMES
+        self.include_archives = include_archives
         self.queryset = queryset
+        self.verbs = verbs
+
+    def _get_chunk_object_labels(self, chunk, names):
+        object_ids = {}
+        for entry in chunk:
+            for name in names:
+                content_type_id = entry['{}_content_type_id'.format(name)]
+                object_id = entry['{}_object_id'.format(name)]
+                if content_type_id is not None and object_id is not None:
+                    object_ids.setdefault(content_type_id, set()).add(
+                        object_id
+                    )
 
-    def export(self, file_object, user=None):
-        AccessControlList = apps.get_model(
-            app_label='acls', model_name='AccessControlList'
+        result = {}
+        for content_type_id, id_list in object_ids.items():
+            model = self.get_content_type(
+                content_type_id=content_type_id
+            ).model_class()
+
+            if model is None:
+                continue
+
+            pk_list = []
+            for object_id in id_list:
+                try:
+                    pk_list.append(model._meta.pk.to_python(object_id))
+                except ValidationError:
+                    """Object ID is not valid for the model, skip it."""
+
+            for pk, instance in model._base_manager.in_bulk(id_list=pk_list).items():
+                result[(content_type_id, force_text(s=pk))] = force_text(
+                    s=instance
+                )
+
+        return result
+
+    def _get_value_field_names(self):
+        result = []
+        for field_name in self.field_names:
+            if field_name in self.generic_foreign_key_names:
+                result.extend(
+                    (
+                        '{}_content_type_id'.format(field_name),
+                        '{}_object_id'.format(field_name)
+                    )
+                )
+            elif self._is_content_type_field_name(field_name=field_name):
+                result.append('{}_id'.format(field_name))
+            else:
+                result.append(field_name)
+
+        return tuple(sorted(set(result)))
+
+    def _is_content_type_field_name(self, field_name):
+        return field_name in (
+            '{}_content_type'.format(name)
+            for name in self.generic_foreign_key_names
         )
-        if user:
-            self.queryset = AccessControlList.objects.restrict_queryset(
-                queryset=self.queryset,
-                permission=permission_events_export,
-                user=user
-            )
 
+    def export(self, file_object, user=None):
+        """
+        Write the CSV header and rows to the file object. Returns the
+        number of rows exported.
+        """
         writer = csv.writer(
             file_object, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL
         )
-        file_object.write(','.join(self.field_names + ('\n',)))
-
-        for entry in self.queryset.iterator():
-            row = [
-                str(
-                    getattr(entry, field_name)
-                ) for field_name in self.field_names
-            ]
+        writer.writerow(self.field_names)
+
+        count = 0
+        for row in self.get_rows(user=user):
             writer.writerow(row)
+            count += 1
+
+        return count
 
-    def export_to_download_file(self, user=None):
+    def export_to_download_file(self, user=None, compress=False):
         # Avoid circular import
         from .events import event_events_exported
 
@@ -74,16 +151,28 @@ class ActionExporter:
             app_label='messaging', model_name='Message'
         )
 
+        if compress:
+            filename = '{}.gz'.format(DEFAULT_EVENT_LIST_EXPORT_FILENAME)
+        else:
+            filename = DEFAULT_EVENT_LIST_EXPORT_FILENAME
+
         download_file = DownloadFile(
-            filename=DEFAULT_EVENT_LIST_EXPORT_FILENAME,
-            label=_('Event list export to CSV'),
+            filename=filename, label=_('Event list export to CSV'),
             permission=permission_events_export.stored_permission
         )
         download_file._event_actor = user
         download_file.save()
 
-        with download_file.open(mode='w') as file_object:
-            self.export(file_object=file_object, user=user)
+        if compress:
+            with download_file.open(mode='wb') as file_object:
+                with gzip.GzipFile(fileobj=file_object, mode='wb') as gzip_file_object:
+                    with io.TextIOWrapper(
+                        buffer=gzip_file_object, encoding='utf-8', newline=''
+                    ) as text_file_object:
+                        self.export(file_object=text_file_object, user=user)
+        else:
+            with download_file.open(mode='w') as file_object:
+                self.export(file_object=file_object, user=user)
 
         event_events_exported.commit(
             actor=user, target=download_file
@@ -116,6 +205,212 @@ class ActionExporter:
                 }
             )
 
+        return download_file
+
+    def get_archive_rows(self, user=None):
+        """
+        Generator of the rows of the archived events. The objects of
+        archived events might no longer exist and their access cannot be
+        checked. Archived events are only exported for users with the
+        export permission granted by a role.
+        """
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+        EventArchive = apps.get_model(
+            app_label='events', model_name='EventArchive'
+        )
+
+        if user:
+            try:
+                AccessControlList.objects.check_user_permissions(
+                    permissions=(permission_events_export,), user=user
+                )
+            except PermissionDenied:
+                return
+
+        queryset = EventArchive.objects.all()
+
+        if self.date_from:
+            queryset = queryset.filter(timestamp_end__gte=self.date_from)
+
+        if self.date_to:
+            queryset = queryset.filter(timestamp_start__lt=self.date_to)
+
+        for event_archive in queryset:
+            yield from event_archive.get_rows(
+                date_from=self.date_from, date_to=self.date_to,
+                field_names=self.field_names, verbs=self.verbs
+            )
+
+    def get_content_type(self, content_type_id):
+        ContentType = apps.get_model(
+            app_label='contenttypes', model_name='ContentType'
+        )
+        return ContentType.objects.get_for_id(id=content_type_id)
+
+    def get_queryset(self, user=None):
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        queryset = self.queryset
+
+        if self.date_from:
+            queryset = queryset.filter(timestamp__gte=self.date_from)
+
+        if self.date_to:
+            queryset = queryset.filter(timestamp__lt=self.date_to)
+
+        if self.verbs:
+            queryset = queryset.filter(verb__in=self.verbs)
+
+        if user:
+            queryset = AccessControlList.objects.restrict_queryset(
+                queryset=queryset, permission=permission_events_export,
+                user=user
+            )
+
+        return queryset
+
+    def get_rows(self, user=None):
+        """
+        Generator of the exported rows, each a list of strings.
+        """
+        if self.include_archives:
+            yield from self.get_archive_rows(user=user)
+
+        names = [
+            name for name in self.generic_foreign_key_names
+            if name in self.field_names
+        ]
+
+        iterator = self.get_queryset(user=user).values(
+            *self._get_value_field_names()
+        ).iterator(chunk_size=EVENT_EXPORT_CHUNK_SIZE)
+
+        while True:
+            chunk = list(
+                itertools.islice(iterator, EVENT_EXPORT_CHUNK_SIZE)
+            )
+            if not chunk:
+                break
+
+            object_labels = self._get_chunk_object_labels(
+                chunk=chunk, names=names
+            )
+
+            for entry in chunk:
+                row = []
+                for field_name in self.field_names:
+                    if field_name in names:
+                        value = object_labels.get(
+                            (
+                                entry['{}_content_type_id'.format(field_name)],
+                                entry['{}_object_id'.format(field_name)]
+                            )
+                        )
+                    elif self._is_content_type_field_name(field_name=field_name):
+                        content_type_id = entry['{}_id'.format(field_name)]
+                        if content_type_id is None:
+                            value = None
+                        else:
+                            value = self.get_content_type(
+                                content_type_id=content_type_id
+                            )
+                    else:
+                        value = entry[field_name]
+
+                    row.append(str(value))
+
+                yield row
+
+
+class EventBatch:
+    """
+    Context manager that accumulates the actions of the events committed
+    inside it and writes them with a single bulk insert when the outermost
+    batch exits. Actions of events committed inside a transaction are only
+    added to the batch once the transaction commits and are dropped if it
+    is rolled back, the batch only holds the actions of committed changes.
+    The actions are inserted in the order they were added. The post_save
+    signal of each action is sent after the insert. Batches can be nested
+    and are kept per thread. Every Celery task runs inside a batch.
+    """
+    _local = threading.local()
+
+    @classmethod
+    def add(cls, action):
+        if connection.in_atomic_block:
+            transaction.on_commit(
+                func=partial(cls._add_committed, action=action)
+            )
+        else:
+            cls._add_committed(action=action)
+
+    @classmethod
+    def _add_committed(cls, action):
+        if cls.is_active():
+            cls._local.actions.append(action)
+
+            if len(cls._local.actions) >= EVENT_BATCH_MAXIMUM_SIZE:
+                cls.flush()
+        else:
+            # The transaction committed after the batch ended.
+            cls.write(actions=(action,))
+
+    @classmethod
+    def begin(cls):
+        cls._local.depth = getattr(cls._local, 'depth', 0) + 1
+        if cls._local.depth == 1:
+            cls._local.actions = []
+
+    @classmethod
+    def end(cls):
+        cls._local.depth = max(getattr(cls._local, 'depth', 0) - 1, 0)
+        if not cls._local.depth:
+            cls.flush()
+
+    @classmethod
+    def flush(cls):
+        actions = getattr(cls._local, 'actions', None)
+        cls._local.actions = []
+
+        if actions:
+            cls.write(actions=actions)
+
+    @classmethod
+    def is_active(cls):
+        return bool(getattr(cls._local, 'depth', 0))
+
+    @staticmethod
+    def write(actions):
+        Action = apps.get_model(app_label='actstream', model_name='Action')
+
+        if connection.features.can_return_ids_from_bulk_insert:
+            Action.objects.bulk_create(objs=actions)
+
+            for action in actions:
+                post_save.send(
+                    created=True, instance=action, raw=False, sender=Action,
+                    update_fields=None, using=action._state.db
+                )
+        else:
+            # The primary keys are required by the signal handlers and by
+            # the notifications, save the actions one by one on databases
+            # that don't return them from bulk inserts.
+            for action in actions:
+                action.save(force_insert=True)
+
+        EventType.create_notifications(actions=actions)
+
+    def __enter__(self):
+        EventBatch.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        EventBatch.end()
+
 
 class EventManager:
     EVENT_ATTRIBUTES = ('ignore', 'keep_attributes',)
@@ -220,6 +515,23 @@ class EventModelRegistry:
             )
 
 
+class EventRetentionProtection:
+    """
+    Registry of the event types whose events are never removed by the
+    event retention policy, because other apps count them.
+    """
+    _registry = set()
+
+    @classmethod
+    def get_verbs(cls):
+        return sorted(cls._registry)
+
+    @classmethod
+    def register(cls, event_types):
+        for event_type in event_types:
+            cls._registry.add(event_type.id)
+
+
 class EventTypeNamespace:
     _registry = {}
 
@@ -291,21 +603,96 @@ class EventType:
     def __str__(self):
         return '{}: {}'.format(self.namespace.label, self.label)
 
-    def commit(self, actor=None, action_object=None, target=None):
-        AccessControlList = apps.get_model(
-            app_label='acls', model_name='AccessControlList'
-        )
+    @staticmethod
+    def create_notifications(actions):
+        """
+        Create the notifications of the actions outside of the request or
+        task committing the events. Only the actions with subscribers are
+        sent, in a single task, once the transaction that created them is
+        committed.
+        """
+        # Import here to avoid circular import.
+        from .tasks import task_event_notifications_create
+
+        action_ids = EventType.get_subscribed_action_ids(actions=actions)
+
+        if action_ids:
+            transaction.on_commit(
+                func=partial(
+                    task_event_notifications_create.apply_async,
+                    kwargs={'action_ids': action_ids}
+                )
+            )
+
+    @staticmethod
+    def get_subscribed_action_ids(actions):
+        """
+        Return the primary keys of the actions with users subscribed to
+        their event type, to their target or to their action object.
+        """
         EventSubscription = apps.get_model(
             app_label='events', model_name='EventSubscription'
         )
-        Notification = apps.get_model(
-            app_label='events', model_name='Notification'
-        )
         ObjectEventSubscription = apps.get_model(
             app_label='events', model_name='ObjectEventSubscription'
         )
-        User = get_user_model()
 
+        subscribed_verbs = set(
+            EventSubscription.objects.filter(
+                stored_event_type__name__in={action.verb for action in actions}
+            ).values_list('stored_event_type__name', flat=True)
+        )
+
+        # The subscriptions to the target and to the action object are
+        # only looked up for the actions without event type subscribers.
+        action_objects = []
+        for action in actions:
+            if action.verb in subscribed_verbs:
+                objects = None
+            else:
+                objects = {
+                    (content_type_id, int(object_id), action.verb)
+                    for content_type_id, object_id in (
+                        (
+                            action.target_content_type_id,
+                            force_text(s=action.target_object_id)
+                        ),
+                        (
+                            action.action_object_content_type_id,
+                            force_text(s=action.action_object_object_id)
+                        )
+                    ) if content_type_id and object_id.isdigit()
+                }
+
+            action_objects.append((action, objects))
+
+        query = Q()
+        for action, objects in action_objects:
+            for content_type_id, object_id, verb in objects or ():
+                query |= Q(
+                    content_type_id=content_type_id, object_id=object_id,
+                    stored_event_type__name=verb
+                )
+
+        if query:
+            subscribed_objects = set(
+                ObjectEventSubscription.objects.filter(query).values_list(
+                    'content_type_id', 'object_id', 'stored_event_type__name'
+                )
+            )
+        else:
+            subscribed_objects = set()
+
+        return [
+            action.pk for action, objects in action_objects
+            if objects is None or objects & subscribed_objects
+        ]
+
+    def commit(self, actor=None, action_object=None, target=None):
+        """
+        Create the action of the event. Inside an event batch the action
+        is returned unsaved and is written when the batch ends.
+        """
         if actor is None and target is None:
             # If the actor and the target are None there is no way to
             # create a new event.
@@ -315,78 +702,52 @@ class EventType:
             )
             return
 
-        result = action.send(
-            actor or target, actor=actor, verb=self.id,
-            action_object=action_object, target=target
-        )[0][1]
-        # The [0][1] means: get the first and only action from the list
-        # and ignore the handler.
+        if EventBatch.is_active():
+            result = self.get_action(
+                actor=actor, action_object=action_object, target=target
+            )
+            EventBatch.add(action=result)
+        else:
+            result = action.send(
+                actor or target, actor=actor, verb=self.id,
+                action_object=action_object, target=target
+            )[0][1]
+            # The [0][1] means: get the first and only action from the list
+            # and ignore the handler.
 
-        # Create notifications for the actions created by the event committed.
+            EventType.create_notifications(actions=(result,))
 
-        # Gather the users subscribed globally to the event.
-        user_queryset = User.objects.filter(
-            id__in=EventSubscription.objects.filter(
-                stored_event_type__name=result.verb
-            ).values('user')
-        )
+        return result
 
-        # Gather the users subscribed to the target object event.
-        if result.target:
-            user_queryset = user_queryset | User.objects.filter(
-                id__in=ObjectEventSubscription.objects.filter(
-                    content_type=result.target_content_type,
-                    object_id=result.target.pk,
-                    stored_event_type__name=result.verb
-                ).values('user')
-            )
+    def get_action(self, actor=None, action_object=None, target=None):
+        """
+        Return an unsaved action for the event, in the same way as the
+        django-activity-stream action signal handler.
+        """
+        from actstream.registry import check
 
-        # Gather the users subscribed to the action object event.
-        if result.action_object:
-            user_queryset = user_queryset | User.objects.filter(
-                id__in=ObjectEventSubscription.objects.filter(
-                    content_type=result.action_object_content_type,
-                    object_id=result.action_object.pk,
-                    stored_event_type__name=result.verb
-                ).values('user')
-            )
+        Action = apps.get_model(app_label='actstream', model_name='Action')
+        ContentType = apps.get_model(
+            app_label='contenttypes', model_name='ContentType'
+        )
 
-        for user in user_queryset:
-            if result.target:
-                try:
-                    AccessControlList.objects.check_access(
-                        obj=result.target,
-                        permissions=(permission_events_view,),
-                        user=user
-                    )
-                except PermissionDenied:
-                    """
-                    User is subscribed to the event but does
-                    not have permissions for the event's target.
-                    """
-                else:
-                    Notification.objects.create(action=result, user=user)
-                    # Don't check or add any other notification for the
-                    # same user-event-object.
-                    continue
+        sender = actor or target
 
-            if result.action_object:
-                try:
-                    AccessControlList.objects.check_access(
-                        obj=result.action_object,
-                        permissions=(permission_events_view,),
-                        user=user
-                    )
-                except PermissionDenied:
-                    """
-                    User is subscribed to the event but does
-                    not have permissions for the event's action_object.
-                    """
-                else:
-                    Notification.objects.create(action=result, user=user)
-                    # Don't check or add any other notification for the
-                    # same user-event-object.
-                    continue
+        result = Action(
+            actor_content_type=ContentType.objects.get_for_model(
+                model=sender
+            ), actor_object_id=sender.pk, public=True, timestamp=now(),
+            verb=self.id
+        )
+
+        for name, obj in (('action_object', action_object), ('target', target)):
+            if obj is not None:
+                check(obj)
+                setattr(result, '{}_object_id'.format(name), obj.pk)
+                setattr(
+                    result, '{}_content_type'.format(name),
+                    ContentType.objects.get_for_model(model=obj)
+                )
 
         return result
 
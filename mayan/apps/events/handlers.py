@@ -0,0 +1,11 @@
+from .classes import EventBatch
+
+
+def handler_event_batch_begin(sender, **kwargs):
+    EventBatch.begin()
+
+
+def handler_event_batch_end(sender, **kwargs):
+    # The batch only holds the events of committed changes, these are
+    # written even if the task failed or will be retried.
+    EventBatch.end()
@@ -1,4 +1,28 @@
+import os
+
+from django.conf import settings
+
 DEFAULT_EVENT_LIST_EXPORT_FILENAME = 'events_list.csv'
+DEFAULT_EVENTS_ARCHIVE_STORAGE_BACKEND = 'django.core.files.storage.FileSystemStorage'
+DEFAULT_EVENTS_ARCHIVE_STORAGE_BACKEND_ARGUMENTS = {
+    'location': os.path.join(settings.MEDIA_ROOT, 'event_archives')
+}
+DEFAULT_EVENTS_RETENTION_ARCHIVE = True
+DEFAULT_EVENTS_RETENTION_BATCH_SIZE = 5000
+DEFAULT_EVENTS_RETENTION_DEFAULT_PERIOD = None
+DEFAULT_EVENTS_RETENTION_EVENT_TYPE_PERIODS = {}
+
+EVENT_BATCH_MAXIMUM_SIZE = 1000
+
+EVENT_EXPORT_CHUNK_SIZE = 2000
 
 EVENT_MANAGER_ORDER_AFTER = 1
 EVENT_MANAGER_ORDER_BEFORE = 2
+
+EVENT_RETENTION_PRUNE_INTERVAL = 60 * 60  # 1 hour
+EVENT_RETENTION_PRUNE_MAXIMUM_BATCHES = 20
+
+STORAGE_NAME_EVENT_ARCHIVES = 'events__eventarchives'
+
+TASK_NOTIFICATIONS_CREATE_MAX_RETRIES = 10
+TASK_NOTIFICATIONS_CREATE_RETRY_DELAY = 5
@@ -0,0 +1,85 @@
+import gzip
+import io
+import statistics
+import tempfile
+import time
+
+from django.core import management
+from django.core.management.base import CommandError
+from django.utils.dateparse import parse_datetime
+
+from actstream.models import Action
+
+from ...classes import ActionExporter
+
+
+class Command(management.BaseCommand):
+    help = (
+        'Measure the throughput of the event CSV exporter. The events are '
+        'exported to a temporary file without access control filtering.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compress', action='store_true', default=False,
+            dest='compress', help='Compress the output using gzip.'
+        )
+        parser.add_argument(
+            '--date-from', action='store', dest='date_from',
+            help='Export only the events from this date and time onwards. '
+            'Use the ISO 8601 format.'
+        )
+        parser.add_argument(
+            '--date-to', action='store', dest='date_to',
+            help='Export only the events before this date and time. Use the '
+            'ISO 8601 format.'
+        )
+        parser.add_argument(
+            '--iterations', action='store', default=3, dest='iterations',
+            help='Number of times the export is executed.', type=int
+        )
+        parser.add_argument(
+            '--verb', action='append', dest='verbs',
+            help='Export only the events of this type. Can be specified '
+            'multiple times.'
+        )
+
+    def handle(self, *args, **options):
+        dates = {}
+        for name in ('date_from', 'date_to'):
+            if options[name]:
+                dates[name] = parse_datetime(value=options[name])
+                if not dates[name]:
+                    raise CommandError(
+                        'Invalid date and time: {}'.format(options[name])
+                    )
+
+        exporter = ActionExporter(
+            queryset=Action.objects.all(), verbs=options['verbs'], **dates
+        )
+
+        timings = []
+        for iteration in range(options['iterations']):
+            with tempfile.TemporaryFile() as file_object:
+                start_time = time.perf_counter()
+                if options['compress']:
+                    with gzip.GzipFile(fileobj=file_object, mode='wb') as gzip_file_object:
+                        with io.TextIOWrapper(
+                            buffer=gzip_file_object, encoding='utf-8',
+                            newline=''
+                        ) as text_file_object:
+                            count = exporter.export(file_object=text_file_object)
+                else:
+                    with io.TextIOWrapper(
+                        buffer=file_object, encoding='utf-8', newline=''
+                    ) as text_file_object:
+                        count = exporter.export(file_object=text_file_object)
+                timings.append(time.perf_counter() - start_time)
+
+        median = statistics.median(timings)
+
+        self.stdout.write(
+            '{} rows, median {:.1f} ms, {:.0f} rows/second'.format(
+                count, median * 1000, count / median if median else 0
+            )
+        )
@@ -1,5 +1,133 @@
+from datetime import timedelta
+import gzip
+import io
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils.timezone import now
+
+from .classes import (
+    ActionExporter, DEFAULT_ACTION_EXPORTER_FIELD_NAMES,
+    EventRetentionProtection
+)
+from .permissions import permission_events_view
+from .settings import (
+    setting_retention_archive, setting_retention_batch_size,
+    setting_retention_default_period, setting_retention_event_type_periods
+)
+
+
+class EventArchiveManager(models.Manager):
+    def create_for_actions(self, queryset):
+        """
+        Write the actions of the queryset to a new compressed CSV archive.
+        """
+        aggregate = queryset.aggregate(
+            event_count=Count('pk'), timestamp_end=Max('timestamp'),
+            timestamp_start=Min('timestamp')
+        )
+
+        event_archive = self.model(
+            filename='events_{:%Y%m%d%H%M%S}_{:%Y%m%d%H%M%S}.csv.gz'.format(
+                aggregate['timestamp_start'], aggregate['timestamp_end']
+            ), **aggregate
+        )
+        event_archive.save()
+
+        with event_archive.open(mode='wb') as file_object:
+            with gzip.GzipFile(fileobj=file_object, mode='wb') as gzip_file_object:
+                with io.TextIOWrapper(
+                    buffer=gzip_file_object, encoding='utf-8', newline=''
+                ) as text_file_object:
+                    ActionExporter(
+                        field_names=DEFAULT_ACTION_EXPORTER_FIELD_NAMES,
+                        queryset=queryset.order_by('timestamp')
+                    ).export(file_object=text_file_object)
+
+        return event_archive
+
+    def get_expired_action_queryset(self):
+        """
+        Return the actions older than the retention period of their event
+        type. The actions of the event types protected from retention are
+        never returned.
+        """
+        Action = apps.get_model(app_label='actstream', model_name='Action')
+
+        timestamp = now()
+        event_type_periods = setting_retention_event_type_periods.value or {}
+
+        query = Q()
+        for verb, period in event_type_periods.items():
+            if period is not None:
+                query |= Q(
+                    timestamp__lt=timestamp - timedelta(days=period),
+                    verb=verb
+                )
+
+        if setting_retention_default_period.value is not None:
+            query |= Q(
+                timestamp__lt=timestamp - timedelta(
+                    days=setting_retention_default_period.value
+                )
+            ) & ~Q(verb__in=tuple(event_type_periods))
+
+        if not query:
+            return Action.objects.none()
+
+        return Action.objects.filter(query).exclude(
+            verb__in=EventRetentionProtection.get_verbs()
+        )
+
+    def prune(self, maximum_batches=None):
+        """
+        Archive and delete the expired actions in batches until there are
+        none left or `maximum_batches` batches were processed. Returns the
+        number of actions removed.
+        """
+        batch_count = 0
+        result = 0
+
+        while maximum_batches is None or batch_count < maximum_batches:
+            count = self.prune_batch()
+            if not count:
+                break
+
+            batch_count += 1
+            result += count
+
+        return result
+
+    def prune_batch(self):
+        """
+        Archive and delete the oldest expired actions in a single
+        transaction. The batch is delimited by timestamp instead of by a
+        list of primary keys and can exceed the batch size only by the
+        actions that share the timestamp of the last one.
+        """
+        queryset = self.get_expired_action_queryset()
+        batch_size = setting_retention_batch_size.value
+
+        with transaction.atomic():
+            timestamps = queryset.order_by('timestamp').values_list(
+                'timestamp', flat=True
+            )[batch_size - 1:batch_size]
+
+            if timestamps:
+                queryset = queryset.filter(timestamp__lte=timestamps[0])
+
+            count = queryset.count()
+
+            if count:
+                if setting_retention_archive.value:
+                    self.create_for_actions(queryset=queryset)
+
+                queryset.delete()
+
+        return count
 
 
 class EventSubscriptionManager(models.Manager):
@@ -15,6 +143,72 @@ class EventSubscriptionManager(models.Manager):
 
 
 class NotificationManager(models.Manager):
+    def create_for_action(self, action):
+        """
+        Create the notifications of an action for the users subscribed to
+        its event type, its target or its action object that have access
+        to the target or to the action object. Access only depends on the
+        groups of a user, it is checked once per combination of groups
+        instead of once per user.
+        """
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+        EventSubscription = apps.get_model(
+            app_label='events', model_name='EventSubscription'
+        )
+        ObjectEventSubscription = apps.get_model(
+            app_label='events', model_name='ObjectEventSubscription'
+        )
+        User = get_user_model()
+
+        # Gather the users subscribed globally to the event.
+        query = Q(
+            id__in=EventSubscription.objects.filter(
+                stored_event_type__name=action.verb
+            ).values('user')
+        )
+
+        objects = []
+
+        # Gather the users subscribed to the target or the action object
+        # event.
+        for obj, content_type in (
+            (action.target, action.target_content_type),
+            (action.action_object, action.action_object_content_type)
+        ):
+            if obj:
+                objects.append(obj)
+                query |= Q(
+                    id__in=ObjectEventSubscription.objects.filter(
+                        content_type=content_type, object_id=obj.pk,
+                        stored_event_type__name=action.verb
+                    ).values('user')
+                )
+
+        if not objects:
+            return []
+
+        users_per_groups = {}
+        for user in User.objects.filter(query).prefetch_related('groups'):
+            key = (
+                user.is_superuser, user.is_staff,
+                frozenset(group.pk for group in user.groups.all())
+            )
+            users_per_groups.setdefault(key, []).append(user)
+
+        notifications = []
+        for users in users_per_groups.values():
+            if AccessControlList.objects.restrict_objects(
+                objects=objects, permissions=(permission_events_view,),
+                user=users[0]
+            ):
+                notifications.extend(
+                    self.model(action=action, user=user) for user in users
+                )
+
+        return self.bulk_create(objs=notifications)
+
     def get_unread(self):
         return self.filter(read=False)
 
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+import mayan.apps.events.models
+import mayan.apps.storage.classes
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('events', '0008_auto_20180315_0029'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventArchive',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filename', models.CharField(db_index=True, max_length=255, verbose_name='Filename')),
+                ('datetime', models.DateTimeField(auto_now_add=True, verbose_name='Date time')),
+                ('file', models.FileField(storage=mayan.apps.storage.classes.DefinedStorageLazy(name='events__eventarchives'), upload_to=mayan.apps.events.models.event_archive_upload_to, verbose_name='File')),
+                ('timestamp_start', models.DateTimeField(db_index=True, help_text='Timestamp of the oldest archived event.', verbose_name='Start')),
+                ('timestamp_end', models.DateTimeField(db_index=True, help_text='Timestamp of the newest archived event.', verbose_name='End')),
+                ('event_count', models.PositiveIntegerField(default=0, verbose_name='Event count')),
+            ],
+            options={
+                'verbose_name': 'Event archive',
+                'verbose_name_plural': 'Event archives',
+                'ordering': ('timestamp_start',),
+            },
+        ),
+    ]
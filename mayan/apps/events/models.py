@@ -1,19 +1,33 @@
+import csv
+import gzip
+import io
+import uuid
+
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.utils.dateparse import parse_datetime
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
 
 from actstream.models import Action
 
-from .classes import EventType
+from mayan.apps.storage.classes import DefinedStorageLazy
+from mayan.apps.storage.model_mixins import DatabaseFileModelMixin
+
+from .classes import DEFAULT_ACTION_EXPORTER_FIELD_NAMES, EventType
+from .literals import STORAGE_NAME_EVENT_ARCHIVES
 from .managers import (
-    EventSubscriptionManager, NotificationManager,
+    EventArchiveManager, EventSubscriptionManager, NotificationManager,
     ObjectEventSubscriptionManager
 )
 
 
+def event_archive_upload_to(instance, filename):
+    return 'event-archive-{}'.format(uuid.uuid4().hex)
+
+
 class StoredEventType(models.Model):
     """
     Model to mirror the real event classes as database objects.
@@ -41,6 +55,70 @@ class StoredEventType(models.Model):
         return self.get_class().namespace
 
 
+class EventArchive(DatabaseFileModelMixin, models.Model):
+    """
+    Compressed CSV file holding the events removed by the retention policy.
+    """
+    file = models.FileField(
+        storage=DefinedStorageLazy(
+            name=STORAGE_NAME_EVENT_ARCHIVES
+        ), upload_to=event_archive_upload_to, verbose_name=_('File')
+    )
+    timestamp_start = models.DateTimeField(
+        db_index=True, help_text=_('Timestamp of the oldest archived event.'),
+        verbose_name=_('Start')
+    )
+    timestamp_end = models.DateTimeField(
+        db_index=True, help_text=_('Timestamp of the newest archived event.'),
+        verbose_name=_('End')
+    )
+    event_count = models.PositiveIntegerField(
+        default=0, verbose_name=_('Event count')
+    )
+
+    objects = EventArchiveManager()
+
+    class Meta:
+        ordering = ('timestamp_start',)
+        verbose_name = _('Event archive')
+        verbose_name_plural = _('Event archives')
+
+    def __str__(self):
+        return self.filename
+
+    def get_rows(
+        self, field_names=None, date_from=None, date_to=None, verbs=None
+    ):
+        """
+        Generator of the archived rows, each a list of strings, with the
+        same format as the rows of the event exporter.
+        """
+        field_names = field_names or DEFAULT_ACTION_EXPORTER_FIELD_NAMES
+
+        with self.open(mode='rb') as file_object:
+            with gzip.GzipFile(fileobj=file_object, mode='rb') as gzip_file_object:
+                with io.TextIOWrapper(
+                    buffer=gzip_file_object, encoding='utf-8', newline=''
+                ) as text_file_object:
+                    for entry in csv.DictReader(text_file_object):
+                        if verbs and entry['verb'] not in verbs:
+                            continue
+
+                        if date_from or date_to:
+                            timestamp = parse_datetime(
+                                value=entry['timestamp']
+                            )
+                            if date_from and timestamp < date_from:
+                                continue
+                            if date_to and timestamp >= date_to:
+                                continue
+
+                        yield [
+                            entry.get(field_name, '')
+                            for field_name in field_names
+                        ]
+
+
 class EventSubscription(models.Model):
     """
     This model stores the event subscriptions of a user for the entire
@@ -1,14 +1,33 @@
+from datetime import timedelta
+
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.task_manager.classes import CeleryQueue
-from mayan.apps.task_manager.workers import worker_c
+from mayan.apps.task_manager.workers import worker_b, worker_c
+
+from .literals import EVENT_RETENTION_PRUNE_INTERVAL
 
 queue_events = CeleryQueue(
     label=_('Events'), name='events', transient=True,
     worker=worker_c
 )
+queue_events_notifications = CeleryQueue(
+    label=_('Event notifications'), name='events_notifications',
+    worker=worker_b
+)
 
 queue_events.add_task_type(
     dotted_path='mayan.apps.events.tasks.task_event_queryset_export',
     label=_('Export event querysets'), name='task_event_queryset_export',
 )
+queue_events.add_task_type(
+    dotted_path='mayan.apps.events.tasks.task_event_retention_prune',
+    label=_('Archive and delete the expired events'),
+    name='task_event_retention_prune',
+    schedule=timedelta(seconds=EVENT_RETENTION_PRUNE_INTERVAL)
+)
+queue_events_notifications.add_task_type(
+    dotted_path='mayan.apps.events.tasks.task_event_notifications_create',
+    label=_('Create event notifications'),
+    name='task_event_notifications_create'
+)
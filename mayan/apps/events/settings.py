@@ -0,0 +1,58 @@
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.smart_settings.classes import SettingNamespace
+
+from .literals import (
+    DEFAULT_EVENTS_ARCHIVE_STORAGE_BACKEND,
+    DEFAULT_EVENTS_ARCHIVE_STORAGE_BACKEND_ARGUMENTS,
+    DEFAULT_EVENTS_RETENTION_ARCHIVE, DEFAULT_EVENTS_RETENTION_BATCH_SIZE,
+    DEFAULT_EVENTS_RETENTION_DEFAULT_PERIOD,
+    DEFAULT_EVENTS_RETENTION_EVENT_TYPE_PERIODS
+)
+
+namespace = SettingNamespace(label=_('Events'), name='events')
+
+setting_archive_storage_backend = namespace.add_setting(
+    default=DEFAULT_EVENTS_ARCHIVE_STORAGE_BACKEND,
+    global_name='EVENTS_ARCHIVE_STORAGE_BACKEND', help_text=_(
+        'Path to the Storage subclass to use when storing the archives of '
+        'the events removed by the retention policy.'
+    )
+)
+setting_archive_storage_backend_arguments = namespace.add_setting(
+    default=DEFAULT_EVENTS_ARCHIVE_STORAGE_BACKEND_ARGUMENTS,
+    global_name='EVENTS_ARCHIVE_STORAGE_BACKEND_ARGUMENTS', help_text=_(
+        'Arguments to pass to the EVENTS_ARCHIVE_STORAGE_BACKEND.'
+    )
+)
+setting_retention_archive = namespace.add_setting(
+    default=DEFAULT_EVENTS_RETENTION_ARCHIVE,
+    global_name='EVENTS_RETENTION_ARCHIVE', help_text=_(
+        'Write the events removed by the retention policy to compressed '
+        'CSV archives before deleting them. Archived events are included '
+        'in the event exports that request them.'
+    )
+)
+setting_retention_batch_size = namespace.add_setting(
+    default=DEFAULT_EVENTS_RETENTION_BATCH_SIZE,
+    global_name='EVENTS_RETENTION_BATCH_SIZE', help_text=_(
+        'Maximum number of events archived and deleted in a single '
+        'transaction by the retention policy.'
+    )
+)
+setting_retention_default_period = namespace.add_setting(
+    default=DEFAULT_EVENTS_RETENTION_DEFAULT_PERIOD,
+    global_name='EVENTS_RETENTION_DEFAULT_PERIOD', help_text=_(
+        'Number of days events are kept. Applies to the event types not '
+        'listed in EVENTS_RETENTION_EVENT_TYPE_PERIODS. Leave empty to keep '
+        'the events forever.'
+    )
+)
+setting_retention_event_type_periods = namespace.add_setting(
+    default=DEFAULT_EVENTS_RETENTION_EVENT_TYPE_PERIODS,
+    global_name='EVENTS_RETENTION_EVENT_TYPE_PERIODS', help_text=_(
+        'Dictionary of event type IDs and the number of days their events '
+        'are kept. Use an empty value to keep the events of a type forever. '
+        'Example: {"documents.document_view": 30}'
+    )
+)
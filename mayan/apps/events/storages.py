@@ -0,0 +1,23 @@
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.storage.classes import DefinedStorage
+
+from .literals import STORAGE_NAME_EVENT_ARCHIVES
+from .settings import (
+    setting_archive_storage_backend,
+    setting_archive_storage_backend_arguments
+)
+
+storage_event_archives = DefinedStorage(
+    dotted_path=setting_archive_storage_backend.value,
+    error_message=_(
+        'Unable to initialize the event archive storage. Check '
+        'the settings {} and {} for formatting errors.'.format(
+            setting_archive_storage_backend.global_name,
+            setting_archive_storage_backend_arguments.global_name
+        )
+    ),
+    label=_('Event archives'),
+    name=STORAGE_NAME_EVENT_ARCHIVES,
+    kwargs=setting_archive_storage_backend_arguments.value
+)
@@ -1,20 +1,99 @@
+import logging
+
+from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.db import OperationalError
+from django.utils.dateparse import parse_datetime
 
 from mayan.apps.common.classes import QuerysetParametersSerializer
+from mayan.apps.lock_manager.backends.base import LockingBackend
+from mayan.apps.lock_manager.exceptions import LockError
 from mayan.celery import app
 
 from .classes import ActionExporter
+from .literals import (
+    EVENT_RETENTION_PRUNE_INTERVAL, EVENT_RETENTION_PRUNE_MAXIMUM_BATCHES,
+    TASK_NOTIFICATIONS_CREATE_MAX_RETRIES,
+    TASK_NOTIFICATIONS_CREATE_RETRY_DELAY
+)
+
+logger = logging.getLogger(name=__name__)
+
+
+@app.task(
+    bind=True, default_retry_delay=TASK_NOTIFICATIONS_CREATE_RETRY_DELAY,
+    ignore_result=True, max_retries=TASK_NOTIFICATIONS_CREATE_MAX_RETRIES
+)
+def task_event_notifications_create(self, action_ids):
+    Action = apps.get_model(app_label='actstream', model_name='Action')
+    Notification = apps.get_model(
+        app_label='events', model_name='Notification'
+    )
+
+    processed_action_ids = set()
+
+    for action in Action.objects.filter(pk__in=action_ids).order_by('pk'):
+        try:
+            Notification.objects.create_for_action(action=action)
+        except OperationalError as exception:
+            # Retry only the actions whose notifications were not created.
+            raise self.retry(
+                exc=exception, kwargs={
+                    'action_ids': [
+                        action_id for action_id in action_ids
+                        if action_id not in processed_action_ids
+                    ]
+                }
+            )
+        else:
+            processed_action_ids.add(action.pk)
 
 
 @app.task(ignore_result=True)
-def task_event_queryset_export(decomposed_queryset, user_id=None):
+def task_event_queryset_export(
+    decomposed_queryset, compress=False, date_from=None, date_to=None,
+    include_archives=False, user_id=None, verbs=None
+):
     queryset = QuerysetParametersSerializer.rebuild(
         decomposed_queryset=decomposed_queryset
     )
 
+    # Dates are received in ISO 8601 format.
+    if date_from:
+        date_from = parse_datetime(value=date_from)
+
+    if date_to:
+        date_to = parse_datetime(value=date_to)
+
     if user_id:
         user = get_user_model().objects.get(pk=user_id)
     else:
         user = None
 
-    ActionExporter(queryset=queryset).export_to_download_file(user=user)
+    ActionExporter(
+        date_from=date_from, date_to=date_to,
+        include_archives=include_archives, queryset=queryset, verbs=verbs
+    ).export_to_download_file(compress=compress, user=user)
+
+
+@app.task(ignore_result=True)
+def task_event_retention_prune():
+    EventArchive = apps.get_model(
+        app_label='events', model_name='EventArchive'
+    )
+
+    try:
+        lock = LockingBackend.get_backend().acquire_lock(
+            name='events_retention_prune',
+            timeout=EVENT_RETENTION_PRUNE_INTERVAL
+        )
+    except LockError:
+        logger.debug('Event retention prune already running')
+    else:
+        try:
+            count = EventArchive.objects.prune(
+                maximum_batches=EVENT_RETENTION_PRUNE_MAXIMUM_BATCHES
+            )
+            logger.info('Removed %d expired events', count)
+        finally:
+            lock.release()
@@ -2,3 +2,5 @@ TEST_EVENT_TYPE_NAMESPACE_LABEL = 'test event type namespace label'
 TEST_EVENT_TYPE_NAMESPACE_NAME = 'test_event_type_namespace_name'
 TEST_EVENT_TYPE_LABEL = 'test event type label'
 TEST_EVENT_TYPE_NAME = 'test_event_type_name'
+TEST_EVENT_TYPE_2_LABEL = 'test event type 2 label'
+TEST_EVENT_TYPE_2_NAME = 'test_event_type_2_name'
@@ -1,4 +1,9 @@
+from datetime import timedelta
+
 from actstream.models import Action
+import mock
+
+from django.utils.timezone import now
 
 from mayan.apps.acls.classes import ModelPermission
 from mayan.apps.permissions.tests.mixins import RoleTestMixin
@@ -26,6 +31,15 @@ class EventTestCaseMixin:
         super().setUp()
         Action.objects.all().delete()
 
+        # The test case transaction is never committed, write the events
+        # of the tasks and send the notification tasks immediately.
+        patcher = mock.patch(
+            'mayan.apps.events.classes.transaction.on_commit',
+            side_effect=lambda func: func()
+        )
+        self._test_event_on_commit = patcher.start()
+        self.addCleanup(patcher.stop)
+
     def _clear_events(self):
         Action.objects.all().delete()
 
@@ -65,6 +79,31 @@ class EventTypeTestMixin:
         )
 
 
+class EventRetentionTestMixin(EventTypeTestMixin):
+    def setUp(self):
+        super().setUp()
+        self._create_test_event_type()
+        self._create_test_object()
+
+        EventModelRegistry.register(model=self.TestModel)
+
+        self._clear_events()
+
+    def _create_test_events(self, age, count=1, event_type=None):
+        event_type = event_type or self.test_event_type
+
+        for index in range(count):
+            event_type.commit(target=self.test_object)
+
+        Action.objects.filter(verb=event_type.id).update(
+            timestamp=now() - timedelta(days=age)
+        )
+
+    def _set_test_setting(self, setting, value):
+        self.addCleanup(setting.set, value=setting.value)
+        setting.set(value=value)
+
+
 class EventViewTestMixin:
     def _request_test_current_user_events_view(self):
         return self.get(
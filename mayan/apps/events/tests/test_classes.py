@@ -1,13 +1,248 @@
-from mayan.apps.testing.tests.base import BaseTestCase
+import csv
+import datetime
+import gzip
+import io
+
+from actstream.models import Action
+from celery import states
+
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from django.test.utils import CaptureQueriesContext
+
+from mayan.apps.testing.tests.base import (
+    BaseTestCase, BaseTransactionTestCase
+)
 
 from ..classes import (
+    ActionExporter, DEFAULT_ACTION_EXPORTER_FIELD_NAMES, EventBatch,
     EventManagerMethodAfter, EventModelRegistry, EventType, ModelEventType
 )
 from ..decorators import method_event
+from ..handlers import handler_event_batch_begin, handler_event_batch_end
 
 from .mixins import EventTypeTestMixin
 
 
+class ActionExporterTestCase(EventTypeTestMixin, BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self._create_test_event_type()
+        self._create_test_object()
+
+        EventModelRegistry.register(model=self.TestModel)
+
+        self._clear_events()
+        self.test_event_type.commit(target=self.test_object)
+
+    def _export_test_events(self, **kwargs):
+        file_object = io.StringIO()
+        count = ActionExporter(
+            queryset=Action.objects.all(), **kwargs
+        ).export(file_object=file_object)
+        file_object.seek(0)
+
+        rows = list(csv.reader(file_object))
+        self.assertEqual(count, len(rows) - 1)
+        return rows
+
+    def test_export(self):
+        rows = self._export_test_events()
+
+        self.assertEqual(rows[0], list(DEFAULT_ACTION_EXPORTER_FIELD_NAMES))
+        self.assertEqual(len(rows), 2)
+
+        row = dict(zip(rows[0], rows[1]))
+        action = Action.objects.get()
+
+        self.assertEqual(row['id'], str(action.pk))
+        self.assertEqual(row['target'], str(self.test_object))
+        self.assertEqual(
+            row['target_content_type'], str(action.target_content_type)
+        )
+        self.assertEqual(row['action_object'], 'None')
+        self.assertEqual(row['verb'], self.test_event_type.id)
+
+    def test_export_date_filter(self):
+        timestamp = Action.objects.get().timestamp
+
+        rows = self._export_test_events(
+            date_from=timestamp + datetime.timedelta(seconds=1)
+        )
+        self.assertEqual(len(rows), 1)
+
+        rows = self._export_test_events(
+            date_from=timestamp, date_to=timestamp + datetime.timedelta(
+                seconds=1
+            )
+        )
+        self.assertEqual(len(rows), 2)
+
+    def test_export_query_count(self):
+        with CaptureQueriesContext(connection=connection) as queries:
+            self._export_test_events()
+        query_count = len(queries)
+
+        for count in range(5):
+            self.test_event_type.commit(
+                target=self.TestModel.objects.create()
+            )
+
+        with CaptureQueriesContext(connection=connection) as queries:
+            rows = self._export_test_events()
+
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(len(queries), query_count)
+
+    def test_export_to_download_file_compressed(self):
+        download_file = ActionExporter(
+            queryset=Action.objects.all(), verbs=(self.test_event_type.id,)
+        ).export_to_download_file(compress=True)
+
+        self.assertTrue(download_file.filename.endswith('.gz'))
+
+        with download_file.open(mode='rb') as file_object:
+            content = gzip.decompress(data=file_object.read()).decode('utf-8')
+
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0], list(DEFAULT_ACTION_EXPORTER_FIELD_NAMES))
+        self.assertEqual(len(rows), 2)
+
+    def test_export_verb_filter(self):
+        rows = self._export_test_events(verbs=('invalid_verb',))
+        self.assertEqual(len(rows), 1)
+
+        rows = self._export_test_events(verbs=(self.test_event_type.id,))
+        self.assertEqual(len(rows), 2)
+
+
+class EventBatchTestCase(EventTypeTestMixin, BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self._create_test_event_type()
+        self._create_test_object()
+
+        EventModelRegistry.register(model=self.TestModel)
+
+        self.test_objects = [self.test_object]
+        for count in range(2):
+            self.test_objects.append(self.TestModel.objects.create())
+
+    def _commit_test_events(self):
+        for test_object in self.test_objects:
+            self.test_event_type.commit(target=test_object)
+
+    def test_batch(self):
+        self._clear_events()
+
+        with EventBatch():
+            self._commit_test_events()
+            self.assertEqual(Action.objects.count(), 0)
+
+        self.assertEqual(
+            list(
+                Action.objects.order_by('timestamp').values_list(
+                    'target_object_id', flat=True
+                )
+            ), [str(test_object.pk) for test_object in self.test_objects]
+        )
+
+    def test_batch_post_save_signal(self):
+        instances = []
+
+        def receiver(instance, **kwargs):
+            instances.append(instance)
+
+        post_save.connect(receiver=receiver, sender=Action)
+        self.addCleanup(post_save.disconnect, receiver=receiver, sender=Action)
+
+        with EventBatch():
+            self._commit_test_events()
+            self.assertEqual(instances, [])
+
+        self.assertEqual(len(instances), len(self.test_objects))
+        self.assertTrue(all(instance.pk for instance in instances))
+
+    def test_nested_batches(self):
+        self._clear_events()
+
+        with EventBatch():
+            with EventBatch():
+                self._commit_test_events()
+
+            self.assertEqual(Action.objects.count(), 0)
+
+        self.assertEqual(Action.objects.count(), len(self.test_objects))
+
+    def _test_task_batch(self, state):
+        self._clear_events()
+
+        handler_event_batch_begin(sender=None)
+        self._commit_test_events()
+        handler_event_batch_end(sender=None, state=state)
+
+    def test_task_batch_failure(self):
+        self._test_task_batch(state=states.FAILURE)
+
+        self.assertEqual(Action.objects.count(), len(self.test_objects))
+        self.assertFalse(EventBatch.is_active())
+
+    def test_task_batch_retry(self):
+        self._test_task_batch(state=states.RETRY)
+
+        self.assertEqual(Action.objects.count(), len(self.test_objects))
+        self.assertFalse(EventBatch.is_active())
+
+    def test_task_batch_success(self):
+        self._test_task_batch(state=states.SUCCESS)
+
+        self.assertEqual(Action.objects.count(), len(self.test_objects))
+
+
+class EventBatchTransactionTestCase(
+    EventTypeTestMixin, BaseTransactionTestCase
+):
+    def setUp(self):
+        super().setUp()
+        self._create_test_event_type()
+        self._create_test_object()
+
+        EventModelRegistry.register(model=self.TestModel)
+
+        # Use the commit callbacks of the database connection.
+        self._test_event_on_commit.side_effect = lambda func: connection.on_commit(
+            func=func
+        )
+
+    def test_task_batch_rollback(self):
+        self._clear_events()
+
+        handler_event_batch_begin(sender=None)
+
+        try:
+            with transaction.atomic():
+                self.test_event_type.commit(target=self.test_object)
+                raise ValueError
+        except ValueError:
+            """
+            Roll back the changes of the first event.
+            """
+
+        with transaction.atomic():
+            test_action = self.test_event_type.commit(
+                target=self.test_object
+            )
+
+        self.assertEqual(Action.objects.count(), 0)
+
+        handler_event_batch_end(sender=None, state=states.FAILURE)
+
+        self.assertEqual(
+            list(Action.objects.values_list('pk', flat=True)),
+            [test_action.pk]
+        )
+
+
 class EventManagerTestCase(EventTypeTestMixin, BaseTestCase):
     def setUp(self):
         super().setUp()
@@ -0,0 +1,40 @@
+import io
+
+from django.core import management
+
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..classes import EventModelRegistry
+
+from .mixins import EventTypeTestMixin
+
+
+class EventExportBenchmarkManagementCommandTestCase(
+    EventTypeTestMixin, BaseTestCase
+):
+    def setUp(self):
+        super().setUp()
+        self._create_test_event_type()
+        self._create_test_object()
+
+        EventModelRegistry.register(model=self.TestModel)
+
+        self._clear_events()
+        self.test_event_type.commit(target=self.test_object)
+
+    def _call_command(self, **kwargs):
+        stdout = io.StringIO()
+        management.call_command(
+            command_name='eventexportbenchmark', iterations=1, stdout=stdout,
+            **kwargs
+        )
+        return stdout.getvalue()
+
+    def test_benchmark(self):
+        output = self._call_command()
+        self.assertTrue(output.startswith('1 rows'))
+        self.assertIn('rows/second', output)
+
+    def test_benchmark_compressed_verb_filter(self):
+        output = self._call_command(compress=True, verbs=('invalid_verb',))
+        self.assertTrue(output.startswith('0 rows'))
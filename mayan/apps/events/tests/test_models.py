@@ -1,10 +1,167 @@
+import csv
+import io
+
+from actstream.models import Action
+import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from mayan.apps.acls.models import AccessControlList
 from mayan.apps.testing.tests.base import BaseTestCase
 
-from ..models import EventSubscription, Notification, ObjectEventSubscription
+from ..classes import ActionExporter, EventBatch, EventRetentionProtection
+from ..models import (
+    EventArchive, EventSubscription, Notification, ObjectEventSubscription
+)
 from ..permissions import permission_events_view
+from ..settings import (
+    setting_retention_archive, setting_retention_batch_size,
+    setting_retention_default_period, setting_retention_event_type_periods
+)
+
+from .literals import TEST_EVENT_TYPE_2_LABEL, TEST_EVENT_TYPE_2_NAME
+from .mixins import EventRetentionTestMixin, NotificationTestMixin
+
+
+class EventArchiveModelTestCase(EventRetentionTestMixin, BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.test_event_type_2 = self.test_event_type_namespace.add_event_type(
+            label=TEST_EVENT_TYPE_2_LABEL, name=TEST_EVENT_TYPE_2_NAME
+        )
+
+    def test_prune_default_period(self):
+        self._set_test_setting(
+            setting=setting_retention_default_period, value=30
+        )
+        self._create_test_events(age=60, count=2)
+        self._create_test_events(age=1, event_type=self.test_event_type_2)
+
+        self.assertEqual(EventArchive.objects.prune(), 2)
+
+        self.assertEqual(
+            list(Action.objects.values_list('verb', flat=True)),
+            [self.test_event_type_2.id]
+        )
+
+        event_archive = EventArchive.objects.get()
+        self.assertEqual(event_archive.event_count, 2)
+        self.assertEqual(len(list(event_archive.get_rows())), 2)
+
+    def test_prune_event_type_period(self):
+        self._set_test_setting(
+            setting=setting_retention_event_type_periods, value={
+                self.test_event_type.id: 30
+            }
+        )
+        self._create_test_events(age=60)
+        self._create_test_events(age=60, event_type=self.test_event_type_2)
+
+        self.assertEqual(EventArchive.objects.prune(), 1)
+
+        self.assertEqual(
+            list(Action.objects.values_list('verb', flat=True)),
+            [self.test_event_type_2.id]
+        )
+
+    def test_prune_protected_event_type(self):
+        self._set_test_setting(
+            setting=setting_retention_default_period, value=30
+        )
+        EventRetentionProtection.register(
+            event_types=(self.test_event_type_2,)
+        )
+        self.addCleanup(
+            EventRetentionProtection._registry.discard,
+            self.test_event_type_2.id
+        )
+        self._create_test_events(age=60)
+        self._create_test_events(age=60, event_type=self.test_event_type_2)
+
+        self.assertEqual(EventArchive.objects.prune(), 1)
+
+        self.assertEqual(
+            list(Action.objects.values_list('verb', flat=True)),
+            [self.test_event_type_2.id]
+        )
+
+    def test_prune_event_type_period_overrides_default(self):
+        self._set_test_setting(
+            setting=setting_retention_default_period, value=30
+        )
+        self._set_test_setting(
+            setting=setting_retention_event_type_periods, value={
+                self.test_event_type.id: None
+            }
+        )
+        self._create_test_events(age=60)
+        self._create_test_events(age=60, event_type=self.test_event_type_2)
+
+        self.assertEqual(EventArchive.objects.prune(), 1)
+
+        self.assertEqual(
+            list(Action.objects.values_list('verb', flat=True)),
+            [self.test_event_type.id]
+        )
+
+    def test_prune_maximum_batches(self):
+        self._set_test_setting(
+            setting=setting_retention_batch_size, value=1
+        )
+        self._set_test_setting(
+            setting=setting_retention_default_period, value=30
+        )
+        self._create_test_events(age=60)
+        self._create_test_events(age=50, event_type=self.test_event_type_2)
+
+        self.assertEqual(EventArchive.objects.prune(maximum_batches=1), 1)
+        self.assertEqual(Action.objects.count(), 1)
+        self.assertEqual(EventArchive.objects.count(), 1)
+
+        self.assertEqual(EventArchive.objects.prune(), 1)
+        self.assertEqual(Action.objects.count(), 0)
+        self.assertEqual(EventArchive.objects.count(), 2)
+
+    def test_prune_no_archive(self):
+        self._set_test_setting(setting=setting_retention_archive, value=False)
+        self._set_test_setting(
+            setting=setting_retention_default_period, value=30
+        )
+        self._create_test_events(age=60)
+
+        self.assertEqual(EventArchive.objects.prune(), 1)
+        self.assertEqual(Action.objects.count(), 0)
+        self.assertEqual(EventArchive.objects.count(), 0)
+
+    def test_prune_no_retention(self):
+        self._create_test_events(age=3650)
+
+        self.assertEqual(EventArchive.objects.prune(), 0)
+        self.assertEqual(Action.objects.count(), 1)
+
+    def test_export_include_archives(self):
+        self._set_test_setting(
+            setting=setting_retention_default_period, value=30
+        )
+        self._create_test_events(age=60)
+        EventArchive.objects.prune()
+        self._create_test_events(age=1, event_type=self.test_event_type_2)
+
+        file_object = io.StringIO()
+        ActionExporter(
+            include_archives=True, queryset=Action.objects.all()
+        ).export(file_object=file_object)
+        file_object.seek(0)
+
+        rows = list(csv.DictReader(file_object))
+        self.assertEqual(
+            [row['verb'] for row in rows],
+            [self.test_event_type.id, self.test_event_type_2.id]
+        )
+        self.assertEqual(rows[0]['target'], str(self.test_object))
+
 
-from .mixins import NotificationTestMixin
 
 
 class EventNotificationModelTestCase(NotificationTestMixin, BaseTestCase):
@@ -131,6 +288,71 @@ class EventNotificationModelTestCase(NotificationTestMixin, BaseTestCase):
         self.assertTrue(self.test_users[1].pk in user_pk_list)
         self.assertEqual(notifications[1].action, result)
 
+    def _create_test_group_users(self, count):
+        for index in range(count):
+            self._create_test_user()
+            self.test_group.user_set.add(self.test_user)
+            EventSubscription.objects.create(
+                stored_event_type=self.test_event_type.stored_event_type,
+                user=self.test_user
+            )
+
+    def test_event_notification_users_with_same_groups(self):
+        AccessControlList.objects.grant(
+            obj=self.test_object, permission=permission_events_view,
+            role=self.test_role
+        )
+
+        self._create_test_group_users(count=2)
+
+        action = self.test_event_type.commit(target=self.test_object)
+        Notification.objects.filter(action=action).delete()
+
+        with CaptureQueriesContext(connection=connection) as queries:
+            Notification.objects.create_for_action(action=action)
+        query_count = len(queries)
+
+        self._create_test_group_users(count=8)
+
+        Notification.objects.filter(action=action).delete()
+
+        with CaptureQueriesContext(connection=connection) as queries:
+            Notification.objects.create_for_action(action=action)
+
+        self.assertEqual(len(queries), query_count)
+        self.assertEqual(
+            Notification.objects.filter(action=action).count(), 10
+        )
+
+    @mock.patch(
+        'mayan.apps.events.tasks.task_event_notifications_create.apply_async'
+    )
+    def test_event_notification_batch_single_task(self, mocked_apply_async):
+        EventSubscription.objects.create(
+            stored_event_type=self.test_event_type.stored_event_type,
+            user=self.test_user
+        )
+
+        with EventBatch():
+            self.test_event_type.commit(target=self.test_object)
+            self.test_event_type.commit(target=self.test_object)
+
+        self.assertEqual(mocked_apply_async.call_count, 1)
+        self.assertEqual(
+            len(mocked_apply_async.call_args[1]['kwargs']['action_ids']), 2
+        )
+
+    @mock.patch(
+        'mayan.apps.events.tasks.task_event_notifications_create.apply_async'
+    )
+    def test_event_notification_no_subscriptions(self, mocked_apply_async):
+        with EventBatch():
+            self.test_event_type.commit(target=self.test_object)
+
+        self.test_event_type.commit(target=self.test_object)
+
+        self.assertEqual(mocked_apply_async.call_count, 0)
+
 
 class ObjectEventNotificationModelTestCase(NotificationTestMixin, BaseTestCase):
     def setUp(self):
@@ -435,3 +657,29 @@ class ObjectEventNotificationModelTestCase(NotificationTestMixin, BaseTestCase):
         self.assertEqual(notifications[0].action, result_1)
         self.assertEqual(notifications[1].user, self.test_users[0])
         self.assertEqual(notifications[1].action, result_0)
+
+    @mock.patch(
+        'mayan.apps.events.tasks.task_event_notifications_create.apply_async'
+    )
+    def test_object_notification_batch_subscribed_actions(
+        self, mocked_apply_async
+    ):
+        self._create_local_test_object()
+
+        ObjectEventSubscription.objects.create(
+            content_object=self.test_objects[1],
+            stored_event_type=self.test_event_type.stored_event_type,
+            user=self.test_user
+        )
+
+        with EventBatch():
+            self.test_event_type.commit(target=self.test_objects[0])
+            result_1 = self.test_event_type.commit(
+                target=self.test_objects[1]
+            )
+
+        self.assertEqual(mocked_apply_async.call_count, 1)
+        self.assertEqual(
+            mocked_apply_async.call_args[1]['kwargs']['action_ids'],
+            [result_1.pk]
+        )
@@ -18,6 +18,7 @@ __all__ = (
 
 
 class EventExportBaseView(ConfirmView):
+    include_archives = False
     object_permission = permission_events_export
 
     def get_extra_context(self):
@@ -36,6 +37,7 @@ class EventExportBaseView(ConfirmView):
         task_event_queryset_export.apply_async(
             kwargs={
                 'decomposed_queryset': decomposed_queryset,
+                'include_archives': self.include_archives,
                 'user_id': self.request.user.pk
             }
         )
@@ -48,6 +50,7 @@ class EventExportBaseView(ConfirmView):
 
 
 class EventListExportView(EventExportBaseView):
+    include_archives = True
     object_permission = permission_events_export
 
     def get_extra_context(self):
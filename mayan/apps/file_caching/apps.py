@@ -14,9 +14,12 @@ from .events import (
     event_cache_edited, event_cache_partition_purged, event_cache_purged
 )
 from .links import (
-    link_caches_list, link_cache_multiple_purge, link_cache_purge
+    link_caches_list, link_cache_edit, link_cache_multiple_purge,
+    link_cache_purge
+)
+from .permissions import (
+    permission_cache_edit, permission_cache_purge, permission_cache_view
 )
-from .permissions import permission_cache_purge, permission_cache_view
 
 
 class FileCachingConfig(MayanAppConfig):
@@ -46,7 +49,8 @@ class FileCachingConfig(MayanAppConfig):
         ModelPermission.register(
             model=Cache, permissions=(
                 permission_acl_edit, permission_acl_view,
-                permission_cache_purge, permission_cache_view
+                permission_cache_edit, permission_cache_purge,
+                permission_cache_view
             )
         )
 
@@ -59,6 +63,26 @@ class FileCachingConfig(MayanAppConfig):
         )
         SourceColumn(
             attribute='get_total_size_display', include_label=True,
+            is_sortable=True, sort_field='current_size', source=Cache
+        )
+        SourceColumn(
+            attribute='get_eviction_policy_label', include_label=True,
+            is_sortable=True, sort_field='eviction_policy', source=Cache
+        )
+        SourceColumn(
+            attribute='hits', include_label=True, is_sortable=True,
+            source=Cache
+        )
+        SourceColumn(
+            attribute='misses', include_label=True, is_sortable=True,
+            source=Cache
+        )
+        SourceColumn(
+            attribute='get_hit_ratio_display', include_label=True,
+            source=Cache
+        )
+        SourceColumn(
+            attribute='evictions', include_label=True, is_sortable=True,
             source=Cache
         )
 
@@ -67,7 +91,7 @@ class FileCachingConfig(MayanAppConfig):
         )
 
         menu_object.bind_links(
-            links=(link_cache_purge,),
+            links=(link_cache_edit, link_cache_purge,),
             sources=(Cache,)
         )
         menu_multi_item.bind_links(
@@ -0,0 +1,197 @@
+from collections import OrderedDict
+import hashlib
+import logging
+import threading
+import time
+
+from django.core.cache import caches
+from django.utils.encoding import force_bytes
+
+from .classes import cache_partition_file_hit_buffer
+from .literals import MEMORY_CACHE_FILE_SIZE_DIVISOR
+from .settings import (
+    setting_memory_cache_maximum_size, setting_memory_cache_timeout,
+    setting_shared_cache_name
+)
+
+logger = logging.getLogger(name=__name__)
+
+
+class CacheMemoryTier:
+    """
+    Memory tiers in front of the storage of a file cache. The first level
+    is a bounded least recently used dictionary local to the process. The
+    second level is an optional Django cache shared by all processes. The
+    tier uses the same name as the defined storage of the cache it
+    fronts. Reading a file from the tiers counts as a hit of the cache
+    file.
+
+    Deleting a cache file only removes it from the local level of the
+    deleting process and from the shared level. The local level of the
+    other processes keeps serving the deleted content for up to
+    `FILE_CACHING_MEMORY_CACHE_TIMEOUT` seconds. The content of a cache
+    file is derived deterministically from its filename, so a stale entry
+    is never different from the content the file would be regenerated
+    with.
+    """
+    _registry = {}
+
+    @staticmethod
+    def get_key(name, partition_name, filename):
+        return 'file_caching_{}'.format(
+            hashlib.sha256(
+                force_bytes(
+                    s='{}-{}-{}'.format(name, partition_name, filename)
+                )
+            ).hexdigest()
+        )
+
+    @classmethod
+    def get(cls, name):
+        return cls._registry[name]
+
+    @classmethod
+    def get_all(cls):
+        return cls._registry.values()
+
+    def __init__(self, name):
+        self.name = name
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self.__class__._registry[name] = self
+
+    def _local_delete(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._size -= len(entry[1])
+
+    def _local_get(self, key):
+        """
+        Return a tuple with the cache file ID and the content or None.
+        """
+        with self._lock:
+            try:
+                partition_file_id, content, expiration = self._entries[key]
+            except KeyError:
+                return None
+            else:
+                if expiration < time.monotonic():
+                    self._local_delete(key=key)
+                    return None
+                else:
+                    self._entries.move_to_end(key=key)
+                    return partition_file_id, content
+
+    def _local_set(self, key, partition_file_id, content):
+        maximum_size = setting_memory_cache_maximum_size.value
+
+        if len(content) > maximum_size:
+            return
+
+        with self._lock:
+            self._local_delete(key=key)
+            self._entries[key] = (
+                partition_file_id, content,
+                time.monotonic() + setting_memory_cache_timeout.value
+            )
+            self._size += len(content)
+
+            while self._size > maximum_size:
+                oldest_key = next(iter(self._entries))
+                self._local_delete(key=oldest_key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get_content(self, partition_name, filename):
+        """
+        Return the content of a cache file or None if the file is not
+        in any of the memory tiers.
+        """
+        key = CacheMemoryTier.get_key(
+            name=self.name, partition_name=partition_name, filename=filename
+        )
+
+        entry = self._local_get(key=key)
+
+        if entry is None:
+            shared_cache = self.get_shared_cache()
+            if shared_cache:
+                entry = shared_cache.get(key=key)
+                if entry is not None:
+                    self._local_set(
+                        key=key, partition_file_id=entry[0],
+                        content=entry[1]
+                    )
+
+        if entry is None:
+            return None
+        else:
+            partition_file_id, content = entry
+            cache_partition_file_hit_buffer.add(
+                partition_file_id=partition_file_id
+            )
+            return content
+
+    def get_file_content(self, cache_partition_file):
+        """
+        Read a cache file and keep its content in the memory tiers. Return
+        None if the file is too big to be kept in memory.
+        """
+        if self.is_cacheable(size=cache_partition_file.file_size):
+            with cache_partition_file.open() as file_object:
+                content = file_object.read()
+
+            self.set_content(
+                cache_partition_file=cache_partition_file, content=content
+            )
+
+            return content
+
+    def get_shared_cache(self):
+        if setting_shared_cache_name.value:
+            return caches[setting_shared_cache_name.value]
+
+    def is_cacheable(self, size):
+        """
+        Return True if a file of `size` bytes is small enough to be kept
+        in memory. Larger files are served from the storage.
+        """
+        return size <= setting_memory_cache_maximum_size.value // MEMORY_CACHE_FILE_SIZE_DIVISOR
+
+    def invalidate(self, partition_name, filenames):
+        keys = [
+            CacheMemoryTier.get_key(
+                name=self.name, partition_name=partition_name,
+                filename=filename
+            ) for filename in filenames
+        ]
+
+        with self._lock:
+            for key in keys:
+                self._local_delete(key=key)
+
+        shared_cache = self.get_shared_cache()
+        if shared_cache:
+            shared_cache.delete_many(keys=keys)
+
+    def set_content(self, cache_partition_file, content):
+        key = CacheMemoryTier.get_key(
+            name=self.name, partition_name=cache_partition_file.partition.name,
+            filename=cache_partition_file.filename
+        )
+
+        self._local_set(
+            key=key, partition_file_id=cache_partition_file.pk,
+            content=content
+        )
+
+        shared_cache = self.get_shared_cache()
+        if shared_cache:
+            shared_cache.set(
+                key=key, value=(cache_partition_file.pk, content),
+                timeout=setting_memory_cache_timeout.value
+            )
@@ -0,0 +1,296 @@
+import logging
+import threading
+import time
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import (
+    Case, DateTimeField, ExpressionWrapper, F, FloatField, Max,
+    PositiveIntegerField, Subquery, Sum, Value, When
+)
+from django.db.models.functions import Cast, Greatest
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.lock_manager.backends.base import LockingBackend
+from mayan.apps.lock_manager.exceptions import LockError
+
+from .literals import HIT_BUFFER_FLUSH_BATCH_SIZE, HIT_BUFFER_FLUSH_LOCK_NAME
+from .settings import (
+    setting_hit_buffer_maximum_age, setting_hit_buffer_maximum_size
+)
+
+logger = logging.getLogger(name=__name__)
+
+
+class CacheEvictionPolicy:
+    """
+    Base class for the cache eviction policies. A policy decides the order
+    in which the files of a cache are evicted when the cache is pruned.
+    Policies that use a priority value update it on each access and on
+    creation, and use the priority of the last evicted file to age the
+    priority of the remaining files.
+    """
+    _registry = {}
+    label = None
+    name = None
+    uses_priority = False
+
+    @classmethod
+    def get(cls, name):
+        return cls._registry[name]
+
+    @classmethod
+    def get_all(cls):
+        return sorted(cls._registry.values(), key=lambda x: x.name)
+
+    @classmethod
+    def get_choices(cls):
+        return [
+            (policy.name, policy.label) for policy in cls.get_all()
+        ]
+
+    @classmethod
+    def register(cls, policy_class):
+        cls._registry[policy_class.name] = policy_class
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def get_priority_expression(self):
+        """
+        Return the expression used to update the priority of a file when
+        it is created or when its hits are updated.
+        """
+        return None
+
+    def order_queryset(self, queryset):
+        """
+        Return the file queryset ordered by eviction preference.
+        """
+        raise NotImplementedError
+
+
+class CachePartitionFileHitBuffer:
+    """
+    Accumulate the hits of the cache partition files in memory and stage
+    them in the database with a single bulk insert of one row per file.
+    The hits are staged when the oldest entry reaches the maximum age or
+    when the buffer reaches the maximum size. The staged hits of every
+    process are written to the files with a single bulk update per batch
+    by the periodic `task_cache_partition_file_hits_flush` task.
+    """
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._time_first_entry = None
+
+    def add(self, partition_file_id):
+        with self._lock:
+            entry = self._entries.setdefault(partition_file_id, {'hits': 0})
+            entry['datetime_accessed'] = timezone.now()
+            entry['hits'] += 1
+
+            if self._time_first_entry is None:
+                self._time_first_entry = time.monotonic()
+
+            stage = len(self._entries) >= setting_hit_buffer_maximum_size.value or time.monotonic() - self._time_first_entry >= setting_hit_buffer_maximum_age.value
+
+        if stage:
+            self.stage()
+
+    def stage(self):
+        """
+        Move the hits accumulated in memory to the staging table.
+        """
+        CachePartitionFileHit = apps.get_model(
+            app_label='file_caching', model_name='CachePartitionFileHit'
+        )
+
+        with self._lock:
+            entries = self._entries
+            self._entries = {}
+            self._time_first_entry = None
+
+        if entries:
+            CachePartitionFileHit.objects.bulk_create(
+                objs=[
+                    CachePartitionFileHit(
+                        datetime_accessed=entry['datetime_accessed'],
+                        hits=entry['hits'], partition_file_id=pk
+                    ) for pk, entry in entries.items()
+                ]
+            )
+
+    def flush(self):
+        """
+        Stage the hits of this process and write all the staged hits in
+        batches. Only one process writes them at a time, the others return
+        after staging their hits.
+        """
+        self.stage()
+
+        try:
+            lock = LockingBackend.get_backend().acquire_lock(
+                name=HIT_BUFFER_FLUSH_LOCK_NAME
+            )
+        except LockError:
+            return
+
+        try:
+            while self._flush_batch():
+                """Continue until there are no more staged hits."""
+        finally:
+            lock.release()
+
+    def _flush_batch(self):
+        Cache = apps.get_model(app_label='file_caching', model_name='Cache')
+        CachePartitionFile = apps.get_model(
+            app_label='file_caching', model_name='CachePartitionFile'
+        )
+        CachePartitionFileHit = apps.get_model(
+            app_label='file_caching', model_name='CachePartitionFileHit'
+        )
+
+        last_id = CachePartitionFileHit.objects.order_by('pk').values_list(
+            'pk', flat=True
+        )[HIT_BUFFER_FLUSH_BATCH_SIZE - 1:HIT_BUFFER_FLUSH_BATCH_SIZE].first()
+
+        if last_id is None:
+            last_id = CachePartitionFileHit.objects.order_by('pk').values_list(
+                'pk', flat=True
+            ).last()
+
+            if last_id is None:
+                return False
+
+        queryset = CachePartitionFileHit.objects.filter(pk__lte=last_id)
+
+        entries = {
+            entry['partition_file_id']: entry for entry in queryset.order_by().values(
+                'partition_file_id'
+            ).annotate(
+                datetime_accessed=Max('datetime_accessed'), hits=Sum('hits')
+            )
+        }
+
+        logger.debug('Flushing hits of %d cache files', len(entries))
+
+        with transaction.atomic():
+            # Hits of deleted files are discarded.
+            files = CachePartitionFile.objects.filter(pk__in=entries.keys())
+
+            files.update(
+                datetime_accessed=Case(
+                    *[
+                        When(pk=pk, then=Value(entry['datetime_accessed'])) for pk, entry in entries.items()
+                    ], output_field=DateTimeField()
+                ),
+                hits=Case(
+                    *[
+                        When(pk=pk, then=F('hits') + entry['hits']) for pk, entry in entries.items()
+                    ], output_field=PositiveIntegerField()
+                )
+            )
+
+            cache_entries = {}
+            for pk, cache_id in files.values_list('pk', 'partition__cache_id'):
+                cache_entry = cache_entries.setdefault(
+                    cache_id, {'hits': 0, 'pks': []}
+                )
+                cache_entry['hits'] += entries[pk]['hits']
+                cache_entry['pks'].append(pk)
+
+            for cache in Cache.objects.filter(pk__in=cache_entries.keys()):
+                cache_entry = cache_entries[cache.pk]
+
+                priority_expression = cache.get_eviction_policy().get_priority_expression()
+                if priority_expression is not None:
+                    CachePartitionFile.objects.filter(
+                        pk__in=cache_entry['pks']
+                    ).update(priority=priority_expression)
+
+                cache._statistics_update(hits=cache_entry['hits'])
+
+            queryset.delete()
+
+        return True
+
+
+class CacheEvictionPolicyLFU(CacheEvictionPolicy):
+    label = _('Least frequently used')
+    name = 'lfu'
+
+    def order_queryset(self, queryset):
+        return queryset.order_by('hits', 'datetime')
+
+
+class CacheEvictionPolicyLRU(CacheEvictionPolicy):
+    label = _('Least recently used')
+    name = 'lru'
+
+    def order_queryset(self, queryset):
+        return queryset.order_by('datetime_accessed', 'datetime')
+
+
+class CacheEvictionPolicyLFUDA(CacheEvictionPolicy):
+    """
+    Least frequently used with dynamic aging. The priority of a file is
+    its hits, counting the creation as a hit, plus the priority of the
+    last evicted file. This allows files with many historical hits to
+    eventually be evicted.
+    """
+    label = _('Least frequently used with dynamic aging')
+    name = 'lfuda'
+    uses_priority = True
+
+    def get_priority_inflation_expression(self):
+        """
+        Read the inflation value from the database as part of the update
+        to avoid using the stale value of the cache instance.
+        """
+        Cache = apps.get_model(app_label='file_caching', model_name='Cache')
+
+        return Subquery(
+            queryset=Cache.objects.filter(pk=self.cache.pk).values(
+                'priority_inflation'
+            )[:1], output_field=FloatField()
+        )
+
+    def get_priority_expression(self):
+        return ExpressionWrapper(
+            expression=self.get_priority_inflation_expression() + Cast(
+                expression=F('hits') + 1,
+                output_field=FloatField()
+            ), output_field=FloatField()
+        )
+
+    def order_queryset(self, queryset):
+        return queryset.order_by('priority', 'datetime')
+
+
+class CacheEvictionPolicyGDSF(CacheEvictionPolicyLFUDA):
+    """
+    Greedy dual size frequency. Like LFUDA but the frequency is divided
+    by the size of the file, favoring the eviction of large files that
+    are rarely accessed.
+    """
+    label = _('Greedy dual size frequency')
+    name = 'gdsf'
+
+    def get_priority_expression(self):
+        return ExpressionWrapper(
+            expression=self.get_priority_inflation_expression() + Cast(
+                expression=F('hits') + 1,
+                output_field=FloatField()
+            ) / Greatest(F('file_size'), Value(1)),
+            output_field=FloatField()
+        )
+
+
+CacheEvictionPolicy.register(policy_class=CacheEvictionPolicyGDSF)
+CacheEvictionPolicy.register(policy_class=CacheEvictionPolicyLFU)
+CacheEvictionPolicy.register(policy_class=CacheEvictionPolicyLFUDA)
+CacheEvictionPolicy.register(policy_class=CacheEvictionPolicyLRU)
+
+cache_partition_file_hit_buffer = CachePartitionFileHitBuffer()
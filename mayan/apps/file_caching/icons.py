@@ -3,6 +3,7 @@ from mayan.apps.appearance.classes import Icon
 icon_file_caching = Icon(
     driver_name='fontawesome', symbol='warehouse'
 )
+icon_cache_edit = Icon(driver_name='fontawesome', symbol='pen')
 icon_cache_partition_purge = Icon(
     driver_name='fontawesome-dual', primary_symbol='warehouse',
     secondary_symbol='check'
@@ -5,9 +5,12 @@ from mayan.apps.navigation.utils import get_content_type_kwargs_factory
 from mayan.apps.storage.classes import DefinedStorage
 
 from .icons import (
-    icon_cache_partition_purge, icon_cache_purge, icon_file_caching
+    icon_cache_edit, icon_cache_partition_purge, icon_cache_purge,
+    icon_file_caching
+)
+from .permissions import (
+    permission_cache_edit, permission_cache_purge, permission_cache_view
 )
-from .permissions import permission_cache_purge, permission_cache_view
 
 
 def condition_valid_storage(context):
@@ -23,6 +26,11 @@ link_caches_list = Link(
     icon=icon_file_caching, permissions=(permission_cache_view,),
     text=_('File caches'), view='file_caching:cache_list'
 )
+link_cache_edit = Link(
+    icon=icon_cache_edit, kwargs={'cache_id': 'resolved_object.id'},
+    permissions=(permission_cache_edit,), text=_('Edit'),
+    view='file_caching:cache_edit'
+)
 link_cache_partition_purge = Link(
     icon=icon_cache_partition_purge, kwargs=get_content_type_kwargs_factory(
         variable_name='resolved_object'
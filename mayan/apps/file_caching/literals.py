@@ -1,2 +1,22 @@
+CACHE_COUNTER_FIELDS = (
+    'current_size', 'evictions', 'hits', 'misses', 'priority_inflation'
+)
+
+DEFAULT_EVICTION_POLICY = 'lfu'
+DEFAULT_HIT_BUFFER_MAXIMUM_AGE = 10
+DEFAULT_HIT_BUFFER_MAXIMUM_SIZE = 1000
 DEFAULT_MAXIMUM_FAILED_PRUNE_ATTEMPTS = 100
 DEFAULT_MAXIMUM_NORMAL_PRUNE_ATTEMPTS = 100
+DEFAULT_MEMORY_CACHE_MAXIMUM_SIZE = 32 * 2 ** 20  # 32 Megabytes
+DEFAULT_MEMORY_CACHE_TIMEOUT = 60
+DEFAULT_PRUNE_BATCH_CHUNK_SIZE = 100
+DEFAULT_PRUNE_LOW_WATERMARK = 90
+DEFAULT_SHARED_CACHE_NAME = None
+
+HIT_BUFFER_FLUSH_BATCH_SIZE = 10000
+HIT_BUFFER_FLUSH_INTERVAL = 30
+HIT_BUFFER_FLUSH_LOCK_NAME = 'file_caching_hit_buffer_flush'
+# Fraction of the memory cache maximum size a single file can use.
+MEMORY_CACHE_FILE_SIZE_DIVISOR = 16
+PRUNE_INTERVAL = 60
+SIZE_RECALCULATE_INTERVAL = 24 * 60 * 60  # 24 hours
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def operation_cache_current_size_calculate(apps, schema_editor):
+    Cache = apps.get_model(
+        app_label='file_caching', model_name='Cache'
+    )
+    CachePartitionFile = apps.get_model(
+        app_label='file_caching', model_name='CachePartitionFile'
+    )
+
+    for cache in Cache.objects.using(alias=schema_editor.connection.alias).all():
+        cache.current_size = CachePartitionFile.objects.using(
+            alias=schema_editor.connection.alias
+        ).filter(partition__cache_id=cache.pk).aggregate(
+            file_size__sum=Sum('file_size')
+        )['file_size__sum'] or 0
+        cache.save(update_fields=('current_size',))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('file_caching', '0008_auto_20210426_0717'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cache',
+            name='current_size',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Running total of the '
+                'size of the files in the cache in bytes.',
+                verbose_name='Current size'
+            ),
+        ),
+        migrations.RunPython(
+            code=operation_cache_current_size_calculate,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
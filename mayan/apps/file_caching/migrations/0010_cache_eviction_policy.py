@@ -0,0 +1,76 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('file_caching', '0009_cache_current_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cache',
+            name='eviction_policy',
+            field=models.CharField(
+                choices=[
+                    ('gdsf', 'Greedy dual size frequency'),
+                    ('lfu', 'Least frequently used'),
+                    ('lfuda', 'Least frequently used with dynamic aging'),
+                    ('lru', 'Least recently used')
+                ], default='lfu', help_text='Policy used to select the '
+                'files to delete when the cache needs to free up space.',
+                max_length=16, verbose_name='Eviction policy'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cache',
+            name='evictions',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Number of files '
+                'deleted to free up space.', verbose_name='Evictions'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cache',
+            name='hits',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Number of times a '
+                'file was found in the cache.', verbose_name='Hits'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cache',
+            name='misses',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Number of times a '
+                'file was not found in the cache.', verbose_name='Misses'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cache',
+            name='priority_inflation',
+            field=models.FloatField(
+                default=0, editable=False, help_text='Priority of the last '
+                'file evicted. Used by the aging eviction policies.',
+                verbose_name='Priority inflation'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cachepartitionfile',
+            name='datetime_accessed',
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now,
+                help_text='Date and time this cache partition file was '
+                'last accessed.', verbose_name='Date time accessed'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cachepartitionfile',
+            name='priority',
+            field=models.FloatField(
+                db_index=True, default=0, help_text='Eviction priority '
+                'used by the aging eviction policies. Files with lower '
+                'values are evicted first.', verbose_name='Priority'
+            ),
+        ),
+    ]
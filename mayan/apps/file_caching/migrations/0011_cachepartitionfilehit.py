@@ -0,0 +1,23 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('file_caching', '0010_cache_eviction_policy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CachePartitionFileHit',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('partition_file_id', models.PositiveIntegerField(db_index=True, verbose_name='Cache partition file ID')),
+                ('datetime_accessed', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Date time accessed')),
+            ],
+            options={
+                'verbose_name': 'Cache partition file hit',
+                'verbose_name_plural': 'Cache partition file hits',
+            },
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('file_caching', '0011_cachepartitionfilehit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cachepartitionfilehit',
+            name='hits',
+            field=models.PositiveIntegerField(default=1, verbose_name='Hits'),
+        ),
+    ]
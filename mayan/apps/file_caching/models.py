@@ -4,16 +4,20 @@ import logging
 from django.core import validators
 from django.core.files.base import ContentFile
 from django.db import models
-from django.db.models import F, Sum
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
 from django.template.defaultfilters import filesizeformat
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.encoding import force_text
 from django.utils.functional import cached_property
 from django.utils.text import format_lazy
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.databases.model_mixins import ValueChangeModelMixin
-from mayan.apps.events.classes import EventManagerMethodAfter, EventManagerSave
+from mayan.apps.events.classes import (
+    EventBatch, EventManagerMethodAfter, EventManagerSave
+)
 from mayan.apps.events.decorators import method_event
 from mayan.apps.lock_manager.backends.base import LockingBackend
 from mayan.apps.lock_manager.decorators import (
@@ -22,30 +26,69 @@ from mayan.apps.lock_manager.decorators import (
 from mayan.apps.lock_manager.exceptions import LockError
 from mayan.apps.storage.classes import DefinedStorage
 
+from .caches import CacheMemoryTier
+from .classes import CacheEvictionPolicy, cache_partition_file_hit_buffer
 from .events import (
     event_cache_created, event_cache_edited, event_cache_partition_purged,
     event_cache_purged
 )
 from .exceptions import FileCachingException
+from .literals import (
+    CACHE_COUNTER_FIELDS, DEFAULT_EVICTION_POLICY,
+    DEFAULT_PRUNE_BATCH_CHUNK_SIZE
+)
 from .settings import (
     setting_maximum_failed_prune_attempts,
-    setting_maximum_normal_prune_attempts
+    setting_maximum_normal_prune_attempts, setting_prune_low_watermark
 )
 
 logger = logging.getLogger(name=__name__)
 
 
 class Cache(ValueChangeModelMixin, models.Model):
+    current_size = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Running total of the size of the files in the cache in bytes.'
+        ), verbose_name=_('Current size')
+    )
     defined_storage_name = models.CharField(
         db_index=True, help_text=_(
             'Internal name of the defined storage for this cache.'
         ), max_length=96, unique=True, verbose_name=_('Defined storage name')
     )
+    eviction_policy = models.CharField(
+        choices=CacheEvictionPolicy.get_choices(),
+        default=DEFAULT_EVICTION_POLICY, help_text=_(
+            'Policy used to select the files to delete when the cache '
+            'needs to free up space.'
+        ), max_length=16, verbose_name=_('Eviction policy')
+    )
+    evictions = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Number of files deleted to free up space.'
+        ), verbose_name=_('Evictions')
+    )
+    hits = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Number of times a file was found in the cache.'
+        ), verbose_name=_('Hits')
+    )
     maximum_size = models.BigIntegerField(
         help_text=_('Maximum size of the cache in bytes.'), validators=[
             validators.MinValueValidator(limit_value=1)
         ], verbose_name=_('Maximum size')
     )
+    misses = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Number of times a file was not found in the cache.'
+        ), verbose_name=_('Misses')
+    )
+    priority_inflation = models.FloatField(
+        default=0, editable=False, help_text=_(
+            'Priority of the last file evicted. Used by the aging eviction '
+            'policies.'
+        ), verbose_name=_('Priority inflation')
+    )
 
     class Meta:
         verbose_name = _('Cache')
@@ -61,9 +104,36 @@ class Cache(ValueChangeModelMixin, models.Model):
             }
         )
 
+    def get_eviction_policy(self):
+        return CacheEvictionPolicy.get(name=self.eviction_policy)(cache=self)
+
+    def get_eviction_policy_label(self):
+        return self.get_eviction_policy().label
+
+    get_eviction_policy_label.short_description = _('Eviction policy')
+
     def get_files(self):
         return CachePartitionFile.objects.filter(partition__cache__id=self.pk)
 
+    def get_memory_tier(self):
+        try:
+            return CacheMemoryTier.get(name=self.defined_storage_name)
+        except KeyError:
+            return None
+
+    def get_hit_ratio_display(self):
+        total = self.hits + self.misses
+
+        if total:
+            return '{:0.1f}%'.format(self.hits / total * 100)
+        else:
+            return _('None')
+
+    get_hit_ratio_display.help_text = _(
+        'Percentage of cache lookups that found the file in the cache.'
+    )
+    get_hit_ratio_display.short_description = _('Hit ratio')
+
     def get_maximum_size_display(self):
         return filesizeformat(bytes_=self.maximum_size)
 
@@ -80,6 +150,27 @@ class Cache(ValueChangeModelMixin, models.Model):
                 dotted_path='', label=_('Unknown'), name='unknown'
             )
 
+    def get_current_size(self):
+        """
+        Return the running total of the cache from the database. Unlike
+        `get_total_size` this doesn't aggregate the files of the cache.
+        """
+        return Cache.objects.filter(pk=self.pk).values_list(
+            'current_size', flat=True
+        ).first() or 0
+
+    def get_low_watermark(self):
+        """
+        Size the background prune task reduces the cache to once the
+        cache grows past it.
+        """
+        return int(
+            self.maximum_size * setting_prune_low_watermark.value / 100
+        )
+
+    def get_size_lock_name(self):
+        return 'file_caching_cache_size_{}'.format(self.pk)
+
     def get_total_size(self):
         """
         Return the actual usage of the cache.
@@ -90,8 +181,8 @@ class Cache(ValueChangeModelMixin, models.Model):
 
     def get_total_size_display(self):
         return format_lazy(
-            '{} ({:0.1f}%)', filesizeformat(bytes_=self.get_total_size()),
-            self.get_total_size() / self.maximum_size * 100
+            '{} ({:0.1f}%)', filesizeformat(bytes_=self.current_size),
+            self.current_size / self.maximum_size * 100
         )
 
     get_total_size_display.short_description = _('Current size')
@@ -101,54 +192,169 @@ class Cache(ValueChangeModelMixin, models.Model):
     def label(self):
         return self.get_defined_storage().label
 
-    def prune(self):
+    def _current_size_update(self, delta):
+        Cache.objects.filter(pk=self.pk).update(
+            current_size=F('current_size') + delta
+        )
+
+    def _statistics_update(self, **kwargs):
+        """
+        Increment the hit, miss and eviction counters of the cache.
+        """
+        Cache.objects.filter(pk=self.pk).update(
+            **{
+                name: F(name) + value for name, value in kwargs.items()
+            }
+        )
+
+    def current_size_recalculate(self):
+        """
+        Resynchronize the running total with the actual usage of the cache.
+        The total is calculated and written by a single update statement
+        so that the size deltas applied concurrently by the cache files are
+        not overwritten by a stale value. Only one recalculation per cache
+        runs at a time, raises LockError otherwise.
+        """
+        lock = LockingBackend.get_backend().acquire_lock(
+            name=self.get_size_lock_name()
+        )
+        try:
+            Cache.objects.filter(pk=self.pk).update(
+                current_size=Coalesce(
+                    Subquery(
+                        queryset=CachePartitionFile.objects.filter(
+                            partition__cache_id=OuterRef('pk')
+                        ).order_by().values('partition__cache_id').annotate(
+                            file_size__sum=Sum('file_size')
+                        ).values('file_size__sum'),
+                        output_field=models.BigIntegerField()
+                    ), Value(0)
+                )
+            )
+        finally:
+            lock.release()
+
+        self.current_size = self.get_current_size()
+
+    def _prune_batch_get(self, size):
         """
-        Deletes files until the total size of the cache is below the allowed
-        maximum size of the cache.
+        Select and lock the files to evict to free up at least `size` bytes.
+        Files locked by other processes are skipped.
         """
         failed_attempts = 0
+        freed_size = 0
+        locks = []
+        entries = []
+
+        queryset = self.get_eviction_policy().order_queryset(
+            queryset=self.get_files()
+        ).values_list(
+            'pk', 'file_size', 'partition_id', 'partition__name', 'filename',
+            'priority'
+        )
+
+        for pk, file_size, partition_id, partition_name, filename, priority in queryset.iterator(chunk_size=DEFAULT_PRUNE_BATCH_CHUNK_SIZE):
+            lock_name = CachePartition.get_lock_name(
+                cache_id=self.pk, cache_partition_id=partition_id,
+                filename=filename
+            )
+            try:
+                lock = LockingBackend.get_backend().acquire_lock(
+                    name=lock_name
+                )
+            except LockError:
+                logger.debug(
+                    'Lock error trying to delete file "%s" for prune. '
+                    'Skipping and attempting next file.', filename
+                )
+                failed_attempts += 1
+
+                if failed_attempts > setting_maximum_failed_prune_attempts.value:
+                    for lock in locks:
+                        lock.release()
+
+                    raise FileCachingException(
+                        'Too many cache prune attempts failed.'
+                    )
+            else:
+                locks.append(lock)
+                entries.append(
+                    (
+                        pk, CachePartition.get_combined_filename(
+                            parent=partition_name, filename=filename
+                        ), priority
+                    )
+                )
+                freed_size += file_size
+
+                if freed_size >= size:
+                    break
+
+        return entries, freed_size, locks
+
+    def prune(self, target_size=None):
+        """
+        Deletes files until the total size of the cache is below
+        `target_size`, which defaults to the maximum size of the cache.
+        The running size is used to compute the overflow and the files
+        to evict are selected with a single query and deleted in bulk.
+        """
+        if target_size is None:
+            target_size = self.maximum_size
+
         normal_attempts = 0
-        file_index = 0
 
-        while self.get_total_size() >= self.maximum_size:
-            cache_partition_file_queryset = self.get_files().order_by(
-                'hits', 'datetime'
+        while True:
+            current_size = self.get_current_size()
+
+            if current_size < target_size:
+                break
+
+            entries, freed_size, locks = self._prune_batch_get(
+                size=current_size - target_size + 1
             )
 
             try:
-                cache_partition_file = cache_partition_file_queryset[file_index]
-            except IndexError:
-                # Attempted to get a file beyond what the queryset provided.
-                file_index = 0
-            else:
+                for pk, full_filename, priority in entries:
+                    self.storage.delete(name=full_filename)
+
+                CachePartitionFile.objects.filter(
+                    pk__in=[entry[0] for entry in entries]
+                ).delete()
+            finally:
+                for lock in locks:
+                    lock.release()
+
+            self._current_size_update(delta=-freed_size)
+
+            if entries:
+                self._statistics_update(evictions=len(entries))
+
+                if self.get_eviction_policy().uses_priority:
+                    Cache.objects.filter(pk=self.pk).update(
+                        priority_inflation=Greatest(
+                            F('priority_inflation'),
+                            Value(max(entry[2] for entry in entries))
+                        )
+                    )
+
+            if freed_size < current_size - target_size + 1:
+                # The files available were not enough to cover the
+                # overflow. The running total has drifted from the actual
+                # usage of the cache, resynchronize it.
                 try:
-                    cache_partition_file.delete()
-                except CachePartitionFile.DoesNotExist:
-                    # The file selected from deletion was deleted by another
-                    # process before the lock was acquired.
-                    file_index += 1
+                    self.current_size_recalculate()
                 except LockError:
-                    logger.debug(
-                        'Lock error trying to delete file "%s" for prune. '
-                        'Skipping and attempting next file.',
-                        cache_partition_file
-                    )
-                    failed_attempts += 1
-                    file_index += 1
+                    # Already being recalculated.
+                    pass
 
-                    if failed_attempts > setting_maximum_failed_prune_attempts.value:
-                        raise FileCachingException(
-                            'Too many cache prune attempts failed.'
-                        )
-                else:
-                    file_index = 0
-                    normal_attempts += 1
+            normal_attempts += 1
 
-                    if normal_attempts > setting_maximum_normal_prune_attempts.value:
-                        raise FileCachingException(
-                            'Too many cache prunes trying to create a '
-                            'single new file.'
-                        )
+            if normal_attempts > setting_maximum_normal_prune_attempts.value:
+                raise FileCachingException(
+                    'Too many cache prunes trying to create a '
+                    'single new file.'
+                )
 
     @method_event(
         event=event_cache_purged,
@@ -168,9 +374,12 @@ class Cache(ValueChangeModelMixin, models.Model):
             will remain.
             """
         else:
-            for partition in self.partitions.all():
-                partition._event_actor = getattr(self, '_event_actor', None)
-                partition.purge()
+            with EventBatch():
+                for partition in self.partitions.all():
+                    partition._event_actor = getattr(
+                        self, '_event_actor', None
+                    )
+                    partition.purge()
 
     @method_event(
         event_manager_class=EventManagerSave,
@@ -184,6 +393,13 @@ class Cache(ValueChangeModelMixin, models.Model):
         }
     )
     def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # Don't overwrite the counters updated concurrently by the
+            # cache files with the stale values of this instance.
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields if not field.primary_key and field.name not in CACHE_COUNTER_FIELDS
+            ]
+
         old_maximum_size = self._get_field_previous_value(
             field='maximum_size'
         )
@@ -218,6 +434,12 @@ class CachePartition(models.Model):
     def get_combined_filename(parent, filename):
         return '{}-{}'.format(parent, filename)
 
+    @staticmethod
+    def get_lock_name(cache_id, cache_partition_id, filename):
+        return 'cache_partition-file-{}-{}-{}'.format(
+            cache_id, cache_partition_id, filename
+        )
+
     def _lock_manager_get_lock_name(self, filename):
         return self.get_file_lock_name(filename=filename)
 
@@ -229,7 +451,11 @@ class CachePartition(models.Model):
             lock = LockingBackend.get_backend().acquire_lock(name=lock_name)
             logger.debug('acquired lock: %s', lock_name)
             try:
-                self.cache.prune()
+                # Only prune inline when the cache is past its maximum size.
+                # Bringing the cache down to the low watermark is done by
+                # the background prune task, away from the request path.
+                if self.cache.get_current_size() >= self.cache.maximum_size:
+                    self.cache.prune()
 
                 # Since open "wb+" doesn't create files, force the creation
                 # of an empty file.
@@ -275,11 +501,16 @@ class CachePartition(models.Model):
         return super().delete(*args, **kwargs)
 
     def get_file(self, filename):
-        return self.files.get(filename=filename)
+        try:
+            return self.files.get(filename=filename)
+        except CachePartitionFile.DoesNotExist:
+            self.cache._statistics_update(misses=1)
+            raise
 
     def get_file_lock_name(self, filename):
-        return 'cache_partition-file-{}-{}-{}'.format(
-            self.cache.pk, self.pk, filename
+        return CachePartition.get_lock_name(
+            cache_id=self.cache.pk, cache_partition_id=self.pk,
+            filename=filename
         )
 
     def get_full_filename(self, filename):
@@ -307,6 +538,11 @@ class CachePartitionFile(models.Model):
     datetime = models.DateTimeField(
         auto_now_add=True, db_index=True, verbose_name=_('Date time')
     )
+    datetime_accessed = models.DateTimeField(
+        db_index=True, default=timezone.now, help_text=_(
+            'Date and time this cache partition file was last accessed.'
+        ), verbose_name=_('Date time accessed')
+    )
     filename = models.CharField(max_length=255, verbose_name=_('Filename'))
     file_size = models.PositiveIntegerField(
         default=0, verbose_name=_('File size')
@@ -316,6 +552,12 @@ class CachePartitionFile(models.Model):
             'Times this cache partition file has been accessed.'
         ), verbose_name='Hits'
     )
+    priority = models.FloatField(
+        db_index=True, default=0, help_text=_(
+            'Eviction priority used by the aging eviction policies. Files '
+            'with lower values are evicted first.'
+        ), verbose_name=_('Priority')
+    )
 
     class Meta:
         get_latest_by = 'datetime'
@@ -349,10 +591,21 @@ class CachePartitionFile(models.Model):
         """
         Called after creation and initial write only.
         """
+        old_file_size = self.file_size
         self.file_size = self.partition.cache.storage.size(
             name=self.full_filename
         )
         self.save(update_fields=('file_size',))
+
+        priority_expression = self.partition.cache.get_eviction_policy().get_priority_expression()
+        if priority_expression is not None:
+            CachePartitionFile.objects.filter(pk=self.pk).update(
+                priority=priority_expression
+            )
+
+        self.partition.cache._current_size_update(
+            delta=self.file_size - old_file_size
+        )
         if self.file_size > self.partition.cache.maximum_size:
             raise FileCachingException(
                 'Cache partition file %s is bigger than the maximum cache '
@@ -367,8 +620,21 @@ class CachePartitionFile(models.Model):
 
     @locked_class_method
     def delete(self, *args, **kwargs):
+        # Other processes keep the content in their local memory tier until
+        # it expires.
+        memory_tier = self.partition.cache.get_memory_tier()
+        if memory_tier:
+            memory_tier.invalidate(
+                partition_name=self.partition.name, filenames=(self.filename,)
+            )
+
         self.partition.cache.storage.delete(name=self.full_filename)
-        return super().delete(*args, **kwargs)
+        result = super().delete(*args, **kwargs)
+        self.partition.cache._current_size_update(delta=-self.file_size)
+        return result
+
+    def _update_hits(self):
+        cache_partition_file_hit_buffer.add(partition_file_id=self.pk)
 
     @cached_property
     def full_filename(self):
@@ -385,7 +651,7 @@ class CachePartitionFile(models.Model):
         try:
             logger.debug('trying to acquire lock: %s', lock_name)
             self._lock = LockingBackend.get_backend().acquire_lock(name=lock_name)
-            CachePartitionFile.objects.filter(pk=self.pk).update(hits=F('hits') + 1)
+            self._update_hits()
             logger.debug('acquired lock: %s', lock_name)
             self._storage_object = None
             try:
@@ -407,3 +673,22 @@ class CachePartitionFile(models.Model):
         except LockError:
             logger.debug('unable to obtain lock: %s' % lock_name)
             raise
+
+
+class CachePartitionFileHit(models.Model):
+    """
+    Hits of a cache partition file waiting to be written to the file by
+    the hit buffer. The file is referenced by its id only to keep the
+    staging inserts and the deletion of files free of constraints checks.
+    """
+    partition_file_id = models.PositiveIntegerField(
+        db_index=True, verbose_name=_('Cache partition file ID')
+    )
+    datetime_accessed = models.DateTimeField(
+        default=timezone.now, verbose_name=_('Date time accessed')
+    )
+    hits = models.PositiveIntegerField(default=1, verbose_name=_('Hits'))
+
+    class Meta:
+        verbose_name = _('Cache partition file hit')
+        verbose_name_plural = _('Cache partition file hits')
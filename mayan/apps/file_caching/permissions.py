@@ -4,6 +4,9 @@ from mayan.apps.permissions import PermissionNamespace
 
 namespace = PermissionNamespace(label=_('File caching'), name='file_caching')
 
+permission_cache_edit = namespace.add_permission(
+    label=_('Edit a file cache'), name='file_caching_cache_edit'
+)
 permission_cache_partition_purge = namespace.add_permission(
     label=_('Purge an object cache'), name='file_caching_cache_partition_purge'
 )
@@ -1,13 +1,24 @@
+from datetime import timedelta
+
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.queues import queue_tools
 from mayan.apps.task_manager.classes import CeleryQueue
-from mayan.apps.task_manager.workers import worker_b
+from mayan.apps.task_manager.workers import worker_b, worker_c
+
+from .literals import (
+    HIT_BUFFER_FLUSH_INTERVAL, PRUNE_INTERVAL, SIZE_RECALCULATE_INTERVAL
+)
 
 queue_file_caching = CeleryQueue(
     name='file_caching', label=_('File caching'), worker=worker_b
 )
 
+queue_file_caching_periodic = CeleryQueue(
+    name='file_caching_periodic', label=_('File caching periodic'),
+    transient=True, worker=worker_c
+)
+
 queue_file_caching.add_task_type(
     dotted_path='mayan.apps.file_caching.tasks.task_cache_partition_purge',
     label=_('Purge a file cache partition')
@@ -17,3 +28,21 @@ queue_tools.add_task_type(
     dotted_path='mayan.apps.file_caching.tasks.task_cache_purge',
     label=_('Purge a file cache')
 )
+
+queue_file_caching_periodic.add_task_type(
+    dotted_path='mayan.apps.file_caching.tasks.task_cache_partition_file_hits_flush',
+    label=_('Write the buffered cache file hits'),
+    name='task_cache_partition_file_hits_flush',
+    schedule=timedelta(seconds=HIT_BUFFER_FLUSH_INTERVAL)
+)
+queue_file_caching_periodic.add_task_type(
+    dotted_path='mayan.apps.file_caching.tasks.task_cache_prune',
+    label=_('Prune the file caches'), name='task_cache_prune',
+    schedule=timedelta(seconds=PRUNE_INTERVAL)
+)
+queue_file_caching_periodic.add_task_type(
+    dotted_path='mayan.apps.file_caching.tasks.task_cache_size_recalculate',
+    label=_('Recalculate the size of the file caches'),
+    name='task_cache_size_recalculate',
+    schedule=timedelta(seconds=SIZE_RECALCULATE_INTERVAL)
+)
@@ -3,12 +3,32 @@ from django.utils.translation import ugettext_lazy as _
 from mayan.apps.smart_settings.classes import SettingNamespace
 
 from .literals import (
+    DEFAULT_HIT_BUFFER_MAXIMUM_AGE, DEFAULT_HIT_BUFFER_MAXIMUM_SIZE,
     DEFAULT_MAXIMUM_FAILED_PRUNE_ATTEMPTS,
-    DEFAULT_MAXIMUM_NORMAL_PRUNE_ATTEMPTS
+    DEFAULT_MAXIMUM_NORMAL_PRUNE_ATTEMPTS, DEFAULT_MEMORY_CACHE_MAXIMUM_SIZE,
+    DEFAULT_MEMORY_CACHE_TIMEOUT, DEFAULT_PRUNE_LOW_WATERMARK,
+    DEFAULT_SHARED_CACHE_NAME
 )
 
 namespace = SettingNamespace(label=_('File caching'), name='file_caching')
 
+setting_hit_buffer_maximum_age = namespace.add_setting(
+    default=DEFAULT_HIT_BUFFER_MAXIMUM_AGE,
+    global_name='FILE_CACHING_HIT_BUFFER_MAXIMUM_AGE', help_text=_(
+        'Maximum time in seconds the hits of the cache files are kept in '
+        'memory before being staged in the database. Bounds how stale the '
+        'hit counts used by the eviction policies can be. Set to 0 to '
+        'stage each hit immediately.'
+    )
+)
+setting_hit_buffer_maximum_size = namespace.add_setting(
+    default=DEFAULT_HIT_BUFFER_MAXIMUM_SIZE,
+    global_name='FILE_CACHING_HIT_BUFFER_MAXIMUM_SIZE', help_text=_(
+        'Maximum number of different cache files whose hits are kept in '
+        'memory before being staged in the database.'
+    )
+)
+
 setting_maximum_failed_prune_attempts = namespace.add_setting(
     default=DEFAULT_MAXIMUM_FAILED_PRUNE_ATTEMPTS,
     global_name='FILE_CACHING_MAXIMUM_FAILED_PRUNE_ATTEMPTS', help_text=_(
@@ -24,3 +44,34 @@ setting_maximum_normal_prune_attempts = namespace.add_setting(
         'space for new a file being requested, before giving up.'
     )
 )
+setting_memory_cache_maximum_size = namespace.add_setting(
+    default=DEFAULT_MEMORY_CACHE_MAXIMUM_SIZE,
+    global_name='FILE_CACHING_MEMORY_CACHE_MAXIMUM_SIZE', help_text=_(
+        'Maximum size in bytes of the in process memory tier of each file '
+        'cache that supports it. Set to 0 to disable the in process tier.'
+    )
+)
+setting_memory_cache_timeout = namespace.add_setting(
+    default=DEFAULT_MEMORY_CACHE_TIMEOUT,
+    global_name='FILE_CACHING_MEMORY_CACHE_TIMEOUT', help_text=_(
+        'Time in seconds the content of a cache file is kept in the memory '
+        'tiers. Bounds how long other processes can serve a purged file.'
+    )
+)
+setting_prune_low_watermark = namespace.add_setting(
+    default=DEFAULT_PRUNE_LOW_WATERMARK,
+    global_name='FILE_CACHING_PRUNE_LOW_WATERMARK', help_text=_(
+        'Percentage of the maximum size of a cache to which the background '
+        'prune task will reduce the cache. Caches are only pruned while '
+        'creating a new file when they exceed their maximum size.'
+    )
+)
+setting_shared_cache_name = namespace.add_setting(
+    default=DEFAULT_SHARED_CACHE_NAME,
+    global_name='FILE_CACHING_SHARED_CACHE_NAME', help_text=_(
+        'Name of the Django cache, as defined in the CACHES setting, to use '
+        'as the shared memory tier of the file caches. Use a cache shared '
+        'by all processes like memcached or Redis. Leave empty to disable '
+        'the shared tier.'
+    )
+)
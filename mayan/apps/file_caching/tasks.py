@@ -6,6 +6,9 @@ from django.contrib.auth import get_user_model
 from mayan.apps.lock_manager.exceptions import LockError
 from mayan.celery import app
 
+from .classes import cache_partition_file_hit_buffer
+from .exceptions import FileCachingException
+
 logger = logging.getLogger(name=__name__)
 
 
@@ -47,6 +50,52 @@ def task_cache_partition_purge(
         logger.info('Finished cache partition id %s purge', cache_partition)
 
 
+@app.task(ignore_result=True)
+def task_cache_partition_file_hits_flush():
+    cache_partition_file_hit_buffer.flush()
+
+
+@app.task(ignore_result=True)
+def task_cache_prune():
+    Cache = apps.get_model(
+        app_label='file_caching', model_name='Cache'
+    )
+
+    for cache in Cache.objects.all():
+        low_watermark = cache.get_low_watermark()
+
+        if cache.get_current_size() >= low_watermark:
+            logger.info('Starting cache id %s prune', cache)
+            try:
+                cache.prune(target_size=low_watermark)
+            except (FileCachingException, LockError) as exception:
+                logger.warning(
+                    'Unable to prune cache id %s; %s', cache, exception
+                )
+            else:
+                logger.info('Finished cache id %s prune', cache)
+
+
+@app.task(ignore_result=True)
+def task_cache_size_recalculate():
+    """
+    Correct any drift of the running size of the caches. The prune task
+    relies on the running size only.
+    """
+    Cache = apps.get_model(
+        app_label='file_caching', model_name='Cache'
+    )
+
+    for cache in Cache.objects.all():
+        try:
+            cache.current_size_recalculate()
+        except LockError as exception:
+            logger.warning(
+                'Unable to recalculate the size of cache id %s; %s', cache,
+                exception
+            )
+
+
 @app.task(bind=True, ignore_result=True)
 def task_cache_purge(self, cache_id, user_id=None):
     Cache = apps.get_model(
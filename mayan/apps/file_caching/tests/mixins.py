@@ -3,11 +3,15 @@ from django.utils.encoding import force_bytes
 from mayan.apps.storage.classes import DefinedStorage
 from mayan.apps.storage.utils import fs_cleanup, mkdtemp
 
+from ..classes import cache_partition_file_hit_buffer
 from ..models import Cache
-from ..tasks import task_cache_partition_purge, task_cache_purge
+from ..tasks import (
+    task_cache_partition_file_hits_flush, task_cache_partition_purge,
+    task_cache_prune, task_cache_purge, task_cache_size_recalculate
+)
 
 from .literals import (
-    TEST_CACHE_MAXIMUM_SIZE, TEST_CACHE_PARTITION_FILE_FILENAME,
+    TEST_CACHE_EVICTION_POLICY, TEST_CACHE_MAXIMUM_SIZE, TEST_CACHE_PARTITION_FILE_FILENAME,
     TEST_CACHE_PARTITION_FILE_SIZE, TEST_CACHE_PARTITION_NAME,
     TEST_STORAGE_NAME_FILE_CACHING_TEST_STORAGE
 )
@@ -24,6 +28,8 @@ class CachePartitionViewTestMixin:
 class CacheTestMixin:
     def setUp(self):
         super().setUp()
+        # Discard the hits buffered by previous tests.
+        cache_partition_file_hit_buffer.flush()
         self.temporary_directory = mkdtemp()
         DefinedStorage(
             dotted_path='django.core.files.storage.FileSystemStorage',
@@ -81,6 +87,15 @@ class CacheViewTestMixin:
             }
         )
 
+    def _request_test_cache_edit_view(self):
+        return self.post(
+            viewname='file_caching:cache_edit', kwargs={
+                'cache_id': self.test_cache.pk
+            }, data={
+                'eviction_policy': TEST_CACHE_EVICTION_POLICY
+            }
+        )
+
     def _request_test_cache_list_view(self):
         return self.get(viewname='file_caching:cache_list')
 
@@ -100,6 +115,9 @@ class CacheViewTestMixin:
 
 
 class FileCachingTaskTestMixin:
+    def _execute_task_cache_partition_file_hits_flush(self):
+        task_cache_partition_file_hits_flush.apply_async().get()
+
     def _execute_task_cache_partition_purge(self):
         task_cache_partition_purge.apply_async(
             kwargs={
@@ -107,9 +125,15 @@ class FileCachingTaskTestMixin:
             }
         ).get()
 
+    def _execute_task_cache_prune(self):
+        task_cache_prune.apply_async().get()
+
     def _execute_task_cache_purge(self):
         task_cache_purge.apply_async(
             kwargs={
                 'cache_id': self.test_cache.pk
             }
         ).get()
+
+    def _execute_task_cache_size_recalculate(self):
+        task_cache_size_recalculate.apply_async().get()
@@ -0,0 +1,147 @@
+import mock
+
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..caches import CacheMemoryTier
+from ..classes import cache_partition_file_hit_buffer
+
+from .literals import TEST_STORAGE_NAME_FILE_CACHING_TEST_STORAGE
+from .mixins import CacheTestMixin
+
+
+class CacheMemoryTierTestCase(CacheTestMixin, BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.test_memory_tier = CacheMemoryTier(
+            name=TEST_STORAGE_NAME_FILE_CACHING_TEST_STORAGE
+        )
+        self._create_test_cache()
+        self._create_test_cache_partition()
+
+    def tearDown(self):
+        CacheMemoryTier._registry.pop(
+            TEST_STORAGE_NAME_FILE_CACHING_TEST_STORAGE
+        )
+        super().tearDown()
+
+    def _get_test_memory_tier_content(self, cache_partition_file):
+        return self.test_memory_tier.get_content(
+            filename=cache_partition_file.filename,
+            partition_name=self.test_cache_partition.name
+        )
+
+    def test_memory_tier_get_content(self):
+        self._create_test_cache_partition_file()
+
+        self.test_memory_tier.set_content(
+            cache_partition_file=self.test_cache_partition_file,
+            content=b'test'
+        )
+
+        self.assertEqual(
+            self._get_test_memory_tier_content(
+                cache_partition_file=self.test_cache_partition_file
+            ), b'test'
+        )
+
+    def test_memory_tier_get_content_hits(self):
+        self._create_test_cache_partition_file()
+
+        cache_partition_file_hits = self.test_cache_partition_file.hits
+
+        self.test_memory_tier.set_content(
+            cache_partition_file=self.test_cache_partition_file,
+            content=b'test'
+        )
+        self._get_test_memory_tier_content(
+            cache_partition_file=self.test_cache_partition_file
+        )
+
+        cache_partition_file_hit_buffer.flush()
+
+        self.test_cache_partition_file.refresh_from_db()
+        self.assertEqual(
+            self.test_cache_partition_file.hits, cache_partition_file_hits + 1
+        )
+
+    def test_memory_tier_get_file_content(self):
+        self._create_test_cache_partition_file()
+
+        content = self.test_memory_tier.get_file_content(
+            cache_partition_file=self.test_cache_partition_file
+        )
+
+        self.assertEqual(
+            self._get_test_memory_tier_content(
+                cache_partition_file=self.test_cache_partition_file
+            ), content
+        )
+
+    @mock.patch(
+        'mayan.apps.file_caching.caches.setting_memory_cache_maximum_size'
+    )
+    def test_memory_tier_maximum_size(
+        self, mock_setting_memory_cache_maximum_size
+    ):
+        mock_setting_memory_cache_maximum_size.value = 2
+
+        for index in range(4):
+            self._create_test_cache_partition_file()
+
+        for cache_partition_file in self.test_cache_partition_files[:3]:
+            self.test_memory_tier.set_content(
+                cache_partition_file=cache_partition_file, content=b'1'
+            )
+
+        self._get_test_memory_tier_content(
+            cache_partition_file=self.test_cache_partition_files[1]
+        )
+        self.test_memory_tier.set_content(
+            cache_partition_file=self.test_cache_partition_files[3],
+            content=b'1'
+        )
+
+        self.assertEqual(self.test_memory_tier._size, 2)
+        self.assertIsNone(
+            self._get_test_memory_tier_content(
+                cache_partition_file=self.test_cache_partition_files[2]
+            )
+        )
+        self.assertIsNotNone(
+            self._get_test_memory_tier_content(
+                cache_partition_file=self.test_cache_partition_files[1]
+            )
+        )
+
+    @mock.patch('mayan.apps.file_caching.caches.setting_memory_cache_timeout')
+    def test_memory_tier_timeout(self, mock_setting_memory_cache_timeout):
+        mock_setting_memory_cache_timeout.value = -1
+
+        self._create_test_cache_partition_file()
+
+        self.test_memory_tier.set_content(
+            cache_partition_file=self.test_cache_partition_file,
+            content=b'test'
+        )
+
+        self.assertIsNone(
+            self._get_test_memory_tier_content(
+                cache_partition_file=self.test_cache_partition_file
+            )
+        )
+
+    def test_memory_tier_cache_partition_file_delete_invalidation(self):
+        self._create_test_cache_partition_file()
+
+        self.test_memory_tier.set_content(
+            cache_partition_file=self.test_cache_partition_file,
+            content=b'test'
+        )
+
+        self.test_cache_partition.purge()
+
+        self.assertIsNone(
+            self._get_test_memory_tier_content(
+                cache_partition_file=self.test_cache_partition_file
+            )
+        )
@@ -1,9 +1,16 @@
 import mock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from mayan.apps.testing.tests.base import BaseTestCase
 
+from ..classes import (
+    CachePartitionFileHitBuffer, cache_partition_file_hit_buffer
+)
 from ..exceptions import FileCachingException
-from ..models import CachePartitionFile
+from ..models import CachePartitionFile, CachePartitionFileHit
+from ..settings import setting_hit_buffer_maximum_size
 
 from .literals import TEST_CACHE_PARTITION_FILE_FILENAME
 from .mixins import CacheTestMixin
@@ -101,12 +108,117 @@ class CacheModelTestCase(CacheTestMixin, BaseTestCase):
         with self.test_cache_partition_file.open():
             """Do nothing"""
 
+        cache_partition_file_hit_buffer.flush()
+
         self.test_cache_partition_file.refresh_from_db()
 
         self.assertEqual(
             self.test_cache_partition_file.hits, cache_partition_file_hits + 1
         )
 
+    def test_cache_partition_file_hits_buffering(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+
+        cache_partition_file_hits = self.test_cache_partition_file.hits
+
+        with CaptureQueriesContext(connection=connection) as queries:
+            for index in range(3):
+                with self.test_cache_partition_file.open():
+                    """Do nothing"""
+
+        self.test_cache_partition_file.refresh_from_db()
+        self.assertEqual(
+            self.test_cache_partition_file.hits, cache_partition_file_hits
+        )
+        self.assertFalse(
+            [
+                query for query in queries.captured_queries if 'UPDATE' in query['sql'] or 'INSERT' in query['sql']
+            ]
+        )
+
+        cache_partition_file_hit_buffer.flush()
+
+        self.test_cache_partition_file.refresh_from_db()
+        self.assertEqual(
+            self.test_cache_partition_file.hits, cache_partition_file_hits + 3
+        )
+
+    def test_cache_partition_file_hits_other_buffer(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+
+        cache_partition_file_hits = self.test_cache_partition_file.hits
+
+        # Hits staged by another process are flushed too.
+        test_cache_partition_file_hit_buffer = CachePartitionFileHitBuffer()
+        test_cache_partition_file_hit_buffer.add(
+            partition_file_id=self.test_cache_partition_file.pk
+        )
+        test_cache_partition_file_hit_buffer.stage()
+
+        cache_partition_file_hit_buffer.flush()
+
+        self.test_cache_partition_file.refresh_from_db()
+        self.assertEqual(
+            self.test_cache_partition_file.hits, cache_partition_file_hits + 1
+        )
+        self.assertEqual(CachePartitionFileHit.objects.count(), 0)
+
+    def test_cache_partition_file_hits_staging(self):
+        old_value = setting_hit_buffer_maximum_size.value
+        setting_hit_buffer_maximum_size.set(value=2)
+        self.addCleanup(setting_hit_buffer_maximum_size.set, value=old_value)
+
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+        self._create_test_cache_partition_file()
+
+        for index in range(3):
+            with self.test_cache_partition_files[0].open():
+                """Do nothing"""
+
+        self.assertEqual(CachePartitionFileHit.objects.count(), 0)
+
+        with self.test_cache_partition_files[1].open():
+            """Do nothing"""
+
+        self.assertEqual(
+            dict(
+                CachePartitionFileHit.objects.values_list(
+                    'partition_file_id', 'hits'
+                )
+            ), {
+                self.test_cache_partition_files[0].pk: 3,
+                self.test_cache_partition_files[1].pk: 1
+            }
+        )
+
+    def test_cache_partition_file_hits_prune(self):
+        self._create_test_cache(
+            extra_data={
+                'maximum_size': 2
+            }
+        )
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=1)
+
+        test_cache_partition_file_hit_buffer = CachePartitionFileHitBuffer()
+        test_cache_partition_file_hit_buffer.add(
+            partition_file_id=self.test_cache_partition_file.pk
+        )
+        test_cache_partition_file_hit_buffer.stage()
+
+        self._create_test_cache_partition_file(file_size=1)
+        self._create_test_cache_partition_file(file_size=1)
+
+        # Pruning while creating a file leaves the staged hits to the
+        # periodic task.
+        self.assertEqual(CachePartitionFileHit.objects.count(), 1)
+
     def test_cache_partition_file_lru_eviction(self):
         self._create_test_cache(
             extra_data={
@@ -121,6 +233,9 @@ class CacheModelTestCase(CacheTestMixin, BaseTestCase):
         with self.test_cache_partition_files[0].open():
             """Do nothing"""
 
+        # Write the hits as the periodic task does, pruning doesn't.
+        cache_partition_file_hit_buffer.flush()
+
         self._create_test_cache_partition_file(file_size=1)
 
         # Older but more hits was kept.
@@ -187,3 +302,199 @@ class CacheModelTestCase(CacheTestMixin, BaseTestCase):
         self.assertTrue(
             self.test_cache_partition_files[2] in CachePartitionFile.objects.all()
         )
+
+    def test_cache_current_size_tracking(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=3)
+        self._create_test_cache_partition_file(file_size=5)
+
+        self.assertEqual(self.test_cache.get_current_size(), 8)
+
+        self.test_cache_partition_files[0].delete()
+
+        self.assertEqual(self.test_cache.get_current_size(), 5)
+        self.assertEqual(
+            self.test_cache.get_current_size(),
+            self.test_cache.get_total_size()
+        )
+
+    def test_cache_current_size_recalculate(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=3)
+
+        self.test_cache._current_size_update(delta=100)
+        self.test_cache.current_size_recalculate()
+
+        self.assertEqual(self.test_cache.get_current_size(), 3)
+
+    def test_cache_prune_target_size(self):
+        self._create_test_cache(
+            extra_data={
+                'maximum_size': 10
+            }
+        )
+        self._create_test_cache_partition()
+
+        for index in range(5):
+            self._create_test_cache_partition_file(file_size=2)
+
+        self.test_cache.prune(target_size=5)
+
+        self.assertEqual(self.test_cache.get_current_size(), 4)
+        self.assertEqual(self.test_cache.get_files().count(), 2)
+        # Oldest files were evicted first.
+        self.assertTrue(
+            self.test_cache_partition_files[4] in CachePartitionFile.objects.all()
+        )
+        self.assertTrue(
+            self.test_cache_partition_files[0] not in CachePartitionFile.objects.all()
+        )
+
+    def _get_prune_query_count(self, file_count):
+        self._create_test_cache(
+            extra_data={
+                'maximum_size': file_count + 1
+            }
+        )
+        self._create_test_cache_partition()
+
+        for index in range(file_count):
+            self._create_test_cache_partition_file(file_size=1)
+
+        with CaptureQueriesContext(connection=connection) as queries:
+            self.test_cache.prune(target_size=file_count)
+
+        self.test_cache.delete()
+        self.test_cache_partition_files = []
+
+        return len(queries)
+
+    def test_cache_prune_query_count_benchmark(self):
+        """
+        The cost of evicting a file must not depend on the number of files
+        in the cache.
+        """
+        self.assertEqual(
+            self._get_prune_query_count(file_count=5),
+            self._get_prune_query_count(file_count=25)
+        )
+
+    def test_cache_statistics(self):
+        self._create_test_cache(
+            extra_data={
+                'maximum_size': 2
+            }
+        )
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=1)
+
+        with self.test_cache_partition_file.open():
+            """Do nothing"""
+
+        with self.assertRaises(expected_exception=CachePartitionFile.DoesNotExist):
+            self.test_cache_partition.get_file(filename='missing')
+
+        cache_partition_file_hit_buffer.flush()
+
+        self._create_test_cache_partition_file(file_size=1)
+        self._create_test_cache_partition_file(file_size=1)
+
+        self.test_cache.refresh_from_db()
+        self.assertEqual(self.test_cache.evictions, 1)
+        self.assertEqual(self.test_cache.hits, 1)
+        self.assertEqual(self.test_cache.misses, 1)
+
+    def test_cache_save_counter_preservation(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=1)
+
+        self.test_cache.save()
+
+        self.assertEqual(self.test_cache.get_current_size(), 1)
+
+
+class CacheEvictionPolicyTestCase(CacheTestMixin, BaseTestCase):
+    def _create_test_cache_with_policy(self, eviction_policy, maximum_size):
+        self._create_test_cache(
+            extra_data={
+                'eviction_policy': eviction_policy,
+                'maximum_size': maximum_size
+            }
+        )
+        self._create_test_cache_partition()
+
+    def test_lru_eviction_policy(self):
+        self._create_test_cache_with_policy(
+            eviction_policy='lru', maximum_size=2
+        )
+        self._create_test_cache_partition_file(file_size=1)
+        self._create_test_cache_partition_file(file_size=1)
+
+        with self.test_cache_partition_files[1].open():
+            """Do nothing"""
+
+        with self.test_cache_partition_files[0].open():
+            """Do nothing"""
+
+        cache_partition_file_hit_buffer.flush()
+
+        self._create_test_cache_partition_file(file_size=1)
+
+        # File #1 has the same hits but was accessed earlier.
+        self.assertTrue(
+            self.test_cache_partition_files[0] in CachePartitionFile.objects.all()
+        )
+        self.assertTrue(
+            self.test_cache_partition_files[1] not in CachePartitionFile.objects.all()
+        )
+
+    def test_lfuda_eviction_policy_aging(self):
+        self._create_test_cache_with_policy(
+            eviction_policy='lfuda', maximum_size=2
+        )
+        self._create_test_cache_partition_file(file_size=1)
+
+        for index in range(2):
+            with self.test_cache_partition_files[0].open():
+                """Do nothing"""
+
+        cache_partition_file_hit_buffer.flush()
+
+        # Each new file evicts the previous one and raises the inflation
+        # value until the new files outrank the old but frequent file.
+        for index in range(4):
+            self._create_test_cache_partition_file(file_size=1)
+
+        self.test_cache.refresh_from_db()
+        self.assertTrue(self.test_cache.priority_inflation > 0)
+        self.assertTrue(
+            self.test_cache_partition_files[0] not in CachePartitionFile.objects.all()
+        )
+
+    def test_gdsf_eviction_policy_size(self):
+        self._create_test_cache_with_policy(
+            eviction_policy='gdsf', maximum_size=5
+        )
+        self._create_test_cache_partition_file(file_size=1)
+        self._create_test_cache_partition_file(file_size=4)
+
+        with self.test_cache_partition_files[0].open():
+            """Do nothing"""
+
+        with self.test_cache_partition_files[1].open():
+            """Do nothing"""
+
+        cache_partition_file_hit_buffer.flush()
+
+        self._create_test_cache_partition_file(file_size=1)
+
+        # Same hits but the bigger file was evicted first.
+        self.assertTrue(
+            self.test_cache_partition_files[0] in CachePartitionFile.objects.all()
+        )
+        self.assertTrue(
+            self.test_cache_partition_files[1] not in CachePartitionFile.objects.all()
+        )
@@ -2,6 +2,8 @@ from mayan.apps.testing.tests.base import BaseTestCase
 
 from ..events import event_cache_partition_purged, event_cache_purged
 
+from ..models import Cache
+
 from .mixins import CacheTestMixin, FileCachingTaskTestMixin
 
 
@@ -48,3 +50,51 @@ class FileCachingTaskTestCase(
         self.assertEqual(events[1].actor, self.test_cache)
         self.assertEqual(events[1].target, self.test_cache)
         self.assertEqual(events[1].verb, event_cache_purged.id)
+
+    def test_task_cache_partition_file_hits_flush(self):
+        cache_partition_file_hits = self.test_cache_partition_file.hits
+
+        with self.test_cache_partition_file.open():
+            """Do nothing"""
+
+        self._execute_task_cache_partition_file_hits_flush()
+
+        self.test_cache_partition_file.refresh_from_db()
+        self.assertEqual(
+            self.test_cache_partition_file.hits, cache_partition_file_hits + 1
+        )
+
+    def test_task_cache_prune(self):
+        # Above the low watermark but below the maximum size.
+        Cache.objects.filter(pk=self.test_cache.pk).update(
+            maximum_size=self.test_cache.get_current_size() + 1
+        )
+
+        self._execute_task_cache_prune()
+
+        self.assertEqual(self.test_cache_partition.files.count(), 0)
+        self.assertEqual(
+            Cache.objects.get(pk=self.test_cache.pk).current_size, 0
+        )
+
+    def test_task_cache_prune_uses_running_size(self):
+        # The running size is below the low watermark, the files are not
+        # aggregated by the prune task.
+        Cache.objects.filter(pk=self.test_cache.pk).update(current_size=0)
+        Cache.objects.filter(pk=self.test_cache.pk).update(
+            maximum_size=self.test_cache.get_total_size() + 1
+        )
+
+        self._execute_task_cache_prune()
+
+        self.assertEqual(self.test_cache_partition.files.count(), 1)
+
+    def test_task_cache_size_recalculate(self):
+        Cache.objects.filter(pk=self.test_cache.pk).update(current_size=0)
+
+        self._execute_task_cache_size_recalculate()
+
+        self.assertEqual(
+            self.test_cache.get_current_size(),
+            self.test_cache.get_total_size()
+        )
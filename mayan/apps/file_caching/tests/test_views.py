@@ -1,10 +1,14 @@
 from mayan.apps.testing.tests.base import GenericViewTestCase
 
-from ..events import event_cache_partition_purged, event_cache_purged
+from ..events import (
+    event_cache_edited, event_cache_partition_purged, event_cache_purged
+)
 from ..permissions import (
-    permission_cache_purge, permission_cache_view
+    permission_cache_edit, permission_cache_purge, permission_cache_view
 )
 
+from .literals import TEST_CACHE_EVICTION_POLICY
+
 from .mixins import CacheTestMixin, CacheViewTestMixin
 
 
@@ -41,6 +45,49 @@ class CacheViewTestCase(
         events = self._get_test_events()
         self.assertEqual(events.count(), 0)
 
+    def test_cache_edit_view_no_permission(self):
+        self._create_test_cache()
+
+        cache_eviction_policy = self.test_cache.eviction_policy
+
+        self._clear_events()
+
+        response = self._request_test_cache_edit_view()
+        self.assertEqual(response.status_code, 404)
+
+        self.test_cache.refresh_from_db()
+        self.assertEqual(
+            self.test_cache.eviction_policy, cache_eviction_policy
+        )
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_cache_edit_view_with_access(self):
+        self._create_test_cache()
+
+        self.grant_access(
+            obj=self.test_cache, permission=permission_cache_edit
+        )
+
+        self._clear_events()
+
+        response = self._request_test_cache_edit_view()
+        self.assertEqual(response.status_code, 302)
+
+        self.test_cache.refresh_from_db()
+        self.assertEqual(
+            self.test_cache.eviction_policy, TEST_CACHE_EVICTION_POLICY
+        )
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 1)
+
+        self.assertEqual(events[0].action_object, None)
+        self.assertEqual(events[0].actor, self._test_case_user)
+        self.assertEqual(events[0].target, self.test_cache)
+        self.assertEqual(events[0].verb, event_cache_edited.id)
+
     def test_cache_list_view_with_no_permission(self):
         self._create_test_cache()
 
@@ -1,7 +1,8 @@
 from django.conf.urls import url
 
 from .views import (
-    CacheDetailView, CacheListView, CachePartitionPurgeView, CachePurgeView
+    CacheDetailView, CacheEditView, CacheListView, CachePartitionPurgeView,
+    CachePurgeView
 )
 
 urlpatterns = [
@@ -12,6 +13,10 @@ urlpatterns = [
         regex=r'^caches/(?P<cache_id>\d+)/detail/$', name='cache_detail',
         view=CacheDetailView.as_view()
     ),
+    url(
+        regex=r'^caches/(?P<cache_id>\d+)/edit/$', name='cache_edit',
+        view=CacheEditView.as_view()
+    ),
     url(
         regex=r'^caches/(?P<cache_id>\d+)/purge/$', name='cache_purge',
         view=CachePurgeView.as_view()
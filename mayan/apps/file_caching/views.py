@@ -4,15 +4,15 @@ from django.utils.translation import ungettext
 
 from mayan.apps.views.generics import (
     ConfirmView, MultipleObjectConfirmActionView, SingleObjectDetailView,
-    SingleObjectListView
+    SingleObjectEditView, SingleObjectListView
 )
 from mayan.apps.views.mixins import ContentTypeViewMixin, ExternalObjectViewMixin
 
 from .forms import CacheDetailForm
 from .models import Cache
 from .permissions import (
-    permission_cache_partition_purge, permission_cache_purge,
-    permission_cache_view
+    permission_cache_edit, permission_cache_partition_purge,
+    permission_cache_purge, permission_cache_view
 )
 
 from .tasks import task_cache_partition_purge, task_cache_purge
@@ -31,6 +31,21 @@ class CacheDetailView(SingleObjectDetailView):
             {
                 'field': 'get_total_size_display',
             },
+            {
+                'field': 'get_eviction_policy_label',
+            },
+            {
+                'field': 'hits',
+            },
+            {
+                'field': 'misses',
+            },
+            {
+                'field': 'get_hit_ratio_display',
+            },
+            {
+                'field': 'evictions',
+            },
         ]
     }
     model = Cache
@@ -44,6 +59,24 @@ class CacheDetailView(SingleObjectDetailView):
         }
 
 
+class CacheEditView(SingleObjectEditView):
+    fields = ('eviction_policy',)
+    model = Cache
+    object_permission = permission_cache_edit
+    pk_url_kwarg = 'cache_id'
+
+    def get_extra_context(self):
+        return {
+            'object': self.object,
+            'title': _('Edit cache: %s') % self.object,
+        }
+
+    def get_instance_extra_data(self):
+        return {
+            '_event_actor': self.request.user
+        }
+
+
 class CacheListView(SingleObjectListView):
     model = Cache
     object_permission = permission_cache_view
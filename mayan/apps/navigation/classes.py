@@ -19,7 +19,6 @@ from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.settings import setting_home_view
 from mayan.apps.common.utils import get_related_field, resolve_attribute
-from mayan.apps.permissions import Permission
 from mayan.apps.views.icons import icon_sort_down, icon_sort_up
 from mayan.apps.views.literals import (
     TEXT_SORT_FIELD_PARAMETER, TEXT_SORT_FIELD_VARIABLE_NAME
@@ -121,7 +120,7 @@ class Link:
                     return None
             else:
                 try:
-                    Permission.check_user_permissions(
+                    AccessControlList.objects.check_user_permissions(
                         permissions=self.permissions, user=request.user
                     )
                 except PermissionDenied:
@@ -491,6 +490,41 @@ class Menu:
 
         return result
 
+    def resolve_access(self, context, objects):
+        """
+        Resolve in bulk the access of the user to a list of objects for the
+        permissions of the links bound to them. The links of each object
+        are then resolved from the memoized access decisions instead of
+        checking the access of each object and link.
+        """
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        try:
+            request = context.request
+        except AttributeError:
+            try:
+                request = Variable(var='request').resolve(context=context)
+            except VariableDoesNotExist:
+                return
+
+        objects_by_model = {}
+        for obj in objects:
+            if hasattr(obj, '_meta'):
+                objects_by_model.setdefault(type(obj), []).append(obj)
+
+        for model, model_objects in objects_by_model.items():
+            permissions = set()
+            for link in self.bound_links.get(model, ()):
+                permissions.update(getattr(link, 'permissions', None) or ())
+
+            for permission in permissions:
+                AccessControlList.objects.restrict_objects(
+                    objects=model_objects, permissions=(permission,),
+                    user=request.user
+                )
+
     def unbind_links(self, links, sources=None):
         """
         Allow unbinding links from sources, used to allow 3rd party apps to
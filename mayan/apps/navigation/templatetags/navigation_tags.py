@@ -56,6 +56,14 @@ def navigation_resolve_menu(context, name, source=None, sort_results=None):
     return result
 
 
+@register.simple_tag(takes_context=True)
+def navigation_resolve_access(context, names, source):
+    for name in names.split(','):
+        Menu.get(name=name).resolve_access(context=context, objects=source)
+
+    return ''
+
+
 @register.simple_tag(takes_context=True)
 def navigation_resolve_menus(context, names, source=None, sort_results=None):
     result = []
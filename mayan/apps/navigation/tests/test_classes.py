@@ -3,7 +3,7 @@ from django.urls import reverse
 
 from furl import furl
 
-from mayan.apps.acls.classes import ModelPermission
+from mayan.apps.acls.classes import AccessCache, ModelPermission
 from mayan.apps.permissions import Permission, PermissionNamespace
 from mayan.apps.testing.literals import TEST_VIEW_NAME
 from mayan.apps.testing.tests.base import GenericViewTestCase
@@ -176,6 +176,36 @@ class MenuClassTestCase(GenericViewTestCase):
         Menu.remove(name=TEST_SUBMENU_NAME)
         super().tearDown()
 
+    def test_resolve_access(self):
+        ModelPermission.register(
+            model=self.test_object._meta.model,
+            permissions=(self.test_permission,)
+        )
+        link = Link(
+            permissions=(self.test_permission,), text=TEST_LINK_TEXT,
+            view=TEST_VIEW_NAME
+        )
+        self.menu.bind_links(
+            links=(link,), sources=(self.test_object._meta.model,)
+        )
+
+        self.grant_access(obj=self.test_object, permission=self.test_permission)
+
+        response = self.get(viewname=TEST_VIEW_NAME)
+        context = Context({'request': response.wsgi_request})
+
+        AccessCache.activate()
+        self.addCleanup(AccessCache.deactivate)
+
+        self.menu.resolve_access(context=context, objects=(self.test_object,))
+
+        with self.assertNumQueries(num=0):
+            resolved_link = link.resolve(
+                context=context, resolved_object=self.test_object
+            )
+
+        self.assertEqual(resolved_link.url, reverse(viewname=TEST_VIEW_NAME))
+
     def test_null_source_link_unbinding(self):
         self.menu.bind_links(links=(self.link,))
 
@@ -1,14 +1,11 @@
 import logging
 import os
-import shutil
 
 import sh
 
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
 
-from mayan.apps.storage.utils import TemporaryFile
-
 from ..classes import OCRBackendBase
 from ..exceptions import OCRError
 
@@ -34,49 +31,42 @@ class Tesseract(OCRBackendBase):
         if self.command_tesseract:
             image = self.converter.get_page()
 
-            try:
-                temporary_image_file = TemporaryFile()
-                shutil.copyfileobj(fsrc=image, fdst=temporary_image_file)
-                temporary_image_file.seek(0)
-
-                arguments = ['-', '-']
+            arguments = ['-', '-']
 
-                keyword_arguments = {
-                    '_in': temporary_image_file,
-                    '_timeout': self.command_timeout
-                }
+            # Hand the image over in memory instead of copying it to a
+            # temporary file.
+            keyword_arguments = {
+                '_in': image.getvalue(),
+                '_timeout': self.command_timeout
+            }
 
-                if self.language:
-                    keyword_arguments['l'] = self.language
+            if self.language:
+                keyword_arguments['l'] = self.language
 
-                environment = os.environ.copy()
-                environment.update(self.environment)
-                keyword_arguments['_env'] = environment
+            environment = os.environ.copy()
+            environment.update(self.environment)
+            keyword_arguments['_env'] = environment
 
-                try:
-                    result = self.command_tesseract(
-                        *arguments, **keyword_arguments
-                    )
-                    return force_text(s=result.stdout)
-                except Exception as exception:
+            try:
+                result = self.command_tesseract(
+                    *arguments, **keyword_arguments
+                )
+                return force_text(s=result.stdout)
+            except Exception as exception:
+                error_message = (
+                    'Exception calling Tesseract with language option: {}; {}'
+                ).format(self.language, exception)
+
+                if self.language not in self.languages:
                     error_message = (
-                        'Exception calling Tesseract with language option: {}; {}'
-                    ).format(self.language, exception)
-
-                    if self.language not in self.languages:
-                        error_message = (
-                            '{}\nThe requested OCR language "{}" is not '
-                            'available and needs to be installed.\n'
-                        ).format(
-                            error_message, self.language
-                        )
-
-                    logger.error(error_message, exc_info=True)
-                    raise OCRError(error_message)
-                else:
-                    return result
-            finally:
-                temporary_image_file.close()
+                        '{}\nThe requested OCR language "{}" is not '
+                        'available and needs to be installed.\n'
+                    ).format(
+                        error_message, self.language
+                    )
+
+                logger.error(error_message, exc_info=True)
+                raise OCRError(error_message)
 
     def initialize(self):
         self.languages = ()
@@ -0,0 +1,146 @@
+from collections import OrderedDict
+import logging
+import os
+
+from django.utils.translation import ugettext_lazy as _
+
+from ..classes import OCRBackendBase
+from ..exceptions import OCRError
+
+from .literals import (
+    DEFAULT_TESSERACT_TIMEOUT, DEFAULT_TESSEROCR_MAXIMUM_LANGUAGES
+)
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+logger = logging.getLogger(name=__name__)
+
+
+class TesserOCR(OCRBackendBase):
+    """
+    OCR backend using the Tesseract library through the tesserocr bindings.
+    Keeps a warm Tesseract instance with the language model loaded for
+    each of the most recently used languages and hands the page images
+    over in memory.
+
+    Arguments:
+    environment: Environment variables to set before loading the library.
+    maximum_languages: Number of language models to keep loaded.
+    preload_languages: List of language models to load on initialization.
+    tessdata_path: Path to the language models, optional.
+    timeout: Maximum recognition time per page in seconds.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read_settings()
+
+        if kwargs.get('auto_initialize', True):
+            self.initialize()
+
+    def execute(self, *args, **kwargs):
+        super().execute(*args, **kwargs)
+
+        if not self.converter.image:
+            self.converter.seek_page(page_number=0)
+
+        image = self.converter.image
+        if image.mode not in ('1', 'L', 'RGB', 'RGBA'):
+            image = image.convert('RGB')
+
+        language = self.language or self.get_default_language()
+        api = self.get_api(language=language)
+
+        try:
+            api.SetImage(image)
+            if not api.Recognize(timeout=self.command_timeout * 1000):
+                raise OCRError(_('Tesseract recognition timed out.'))
+
+            return api.GetUTF8Text()
+        except Exception as exception:
+            error_message = (
+                'Exception calling Tesseract with language option: {}; {}'
+            ).format(language, exception)
+            logger.error(error_message, exc_info=True)
+
+            # Don't reuse an instance that might be in a bad state.
+            self.release_api(language=language)
+            raise OCRError(error_message)
+        finally:
+            if language in self.apis:
+                api.Clear()
+
+    def get_api(self, language):
+        try:
+            api = self.apis.pop(language)
+        except KeyError:
+            if language not in self.languages:
+                raise OCRError(
+                    _(
+                        'The requested OCR language "%s" is not available '
+                        'and needs to be installed.'
+                    ) % language
+                )
+
+            logger.debug('Loading Tesseract language model: %s', language)
+
+            kwargs = {'lang': language}
+            if self.tessdata_path:
+                kwargs['path'] = self.tessdata_path
+
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+
+        # Most recently used language at the end.
+        self.apis[language] = api
+
+        while len(self.apis) > self.maximum_languages:
+            language_expired, api_expired = self.apis.popitem(last=False)
+            api_expired.End()
+
+        return api
+
+    def get_default_language(self):
+        return 'eng' if 'eng' in self.languages else self.languages[0]
+
+    def initialize(self):
+        self.apis = OrderedDict()
+        self.languages = ()
+
+        if not tesserocr:
+            raise OCRError(
+                _('The tesserocr Tesseract library bindings not found.')
+            )
+
+        # Apply the environment before the library starts its threads.
+        for key, value in self.environment.items():
+            os.environ.setdefault(key, value)
+
+        logger.debug('Tesseract version: %s', tesserocr.tesseract_version())
+
+        if self.tessdata_path:
+            path, self.languages = tesserocr.get_languages(self.tessdata_path)
+        else:
+            path, self.languages = tesserocr.get_languages()
+
+        logger.debug('Available languages: %s', ', '.join(self.languages))
+
+        for language in self.preload_languages:
+            self.get_api(language=language)
+
+    def read_settings(self):
+        self.command_timeout = self.kwargs.get(
+            'timeout', DEFAULT_TESSERACT_TIMEOUT
+        )
+        self.environment = self.kwargs.get('environment', {})
+        self.maximum_languages = self.kwargs.get(
+            'maximum_languages', DEFAULT_TESSEROCR_MAXIMUM_LANGUAGES
+        )
+        self.preload_languages = self.kwargs.get('preload_languages', ())
+        self.tessdata_path = self.kwargs.get('tessdata_path')
+
+    def release_api(self, language):
+        api = self.apis.pop(language, None)
+        if api:
+            api.End()
@@ -1,3 +1,6 @@
+import os
+import threading
+
 from django.utils.module_loading import import_string
 
 from mayan.apps.converter.classes import ConverterBase
@@ -6,11 +9,27 @@ from .settings import setting_ocr_backend, setting_ocr_backend_arguments
 
 
 class OCRBackendBase:
+    _local = threading.local()
+
     @staticmethod
     def get_instance():
-        return import_string(
-            dotted_path=setting_ocr_backend.value
-        )(**setting_ocr_backend_arguments.value)
+        """
+        Return the backend instance of the current thread. The instance is
+        initialized once per process and thread and reused for every page
+        instead of probing the OCR engine each time.
+        """
+        key = (
+            os.getpid(), setting_ocr_backend.value,
+            repr(setting_ocr_backend_arguments.value)
+        )
+
+        if getattr(OCRBackendBase._local, 'key', None) != key:
+            OCRBackendBase._local.instance = import_string(
+                dotted_path=setting_ocr_backend.value
+            )(**setting_ocr_backend_arguments.value)
+            OCRBackendBase._local.key = key
+
+        return OCRBackendBase._local.instance
 
     def __init__(self, *args, **kwargs):
         self.args = args
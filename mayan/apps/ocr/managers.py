@@ -1,7 +1,7 @@
 import logging
 
 from django.apps import apps
-from django.db import models
+from django.db import IntegrityError, models, transaction
 
 from mayan.apps.documents.literals import DOCUMENT_IMAGE_TASK_TIMEOUT
 from mayan.apps.lock_manager.backends.base import LockingBackend
@@ -21,19 +21,19 @@ class DocumentVersionPageOCRContentManager(models.Manager):
             target=document_version
         )
 
-    def process_document_version_page(
+    def get_document_version_page_content(
         self, document_version_page, user=None
     ):
+        """
+        Generate the image of a document version page and return the text
+        extracted by the OCR backend without storing it.
+        """
         logger.info(
             'Processing page: %d of document version: %s',
             document_version_page.page_number,
             document_version_page.document_version
         )
 
-        DocumentVersionPageOCRContent = apps.get_model(
-            app_label='ocr', model_name='DocumentVersionPageOCRContent'
-        )
-
         lock_name = document_version_page.get_lock_name(user=user)
 
         try:
@@ -54,11 +54,6 @@ class DocumentVersionPageOCRContentManager(models.Manager):
                         file_object=file_object,
                         language=document_version_page.document_version.document.language
                     )
-                    DocumentVersionPageOCRContent.objects.update_or_create(
-                        document_version_page=document_version_page, defaults={
-                            'content': ocr_content
-                        }
-                    )
             except Exception as exception:
                 logger.error(
                     'OCR error for document version page: %d; %s',
@@ -71,9 +66,66 @@ class DocumentVersionPageOCRContentManager(models.Manager):
                     document_version_page.page_number,
                     document_version_page.document_version
                 )
+                return ocr_content
             finally:
                 document_version_page_lock.release()
 
+    def process_document_version_page(
+        self, document_version_page, user=None
+    ):
+        self.update_or_create(
+            document_version_page=document_version_page, defaults={
+                'content': self.get_document_version_page_content(
+                    document_version_page=document_version_page, user=user
+                )
+            }
+        )
+
+    def store_contents(self, contents):
+        """
+        Store the OCR content of several document version pages with one
+        bulk update and one bulk create. `contents` is a dictionary of
+        document version page IDs and their OCR content.
+        """
+        existing = dict(
+            self.filter(
+                document_version_page_id__in=contents.keys()
+            ).values_list('document_version_page_id', 'pk')
+        )
+
+        self.bulk_update(
+            fields=('content',), objs=[
+                self.model(
+                    content=content, document_version_page_id=page_id,
+                    pk=existing[page_id]
+                ) for page_id, content in contents.items() if page_id in existing
+            ]
+        )
+
+        new_contents = {
+            page_id: content for page_id, content in contents.items()
+            if page_id not in existing
+        }
+
+        try:
+            with transaction.atomic():
+                self.bulk_create(
+                    objs=[
+                        self.model(
+                            content=content, document_version_page_id=page_id
+                        ) for page_id, content in new_contents.items()
+                    ]
+                )
+        except IntegrityError:
+            # Another task created some of the entries, update them
+            # individually.
+            for page_id, content in new_contents.items():
+                self.update_or_create(
+                    document_version_page_id=page_id, defaults={
+                        'content': content
+                    }
+                )
+
 
 class DocumentTypeSettingsManager(models.Manager):
     def get_by_natural_key(self, document_type_natural_key):
@@ -13,6 +13,10 @@ queue_ocr.add_task_type(
     dotted_path='mayan.apps.ocr.tasks.task_document_version_page_ocr_process',
     label=_('Document file page OCR')
 )
+queue_ocr.add_task_type(
+    dotted_path='mayan.apps.ocr.tasks.task_document_version_page_ocr_process_batch',
+    label=_('Document version page OCR batch')
+)
 queue_ocr.add_task_type(
     dotted_path='mayan.apps.ocr.tasks.task_document_version_ocr_process',
     label=_('Document file OCR')
@@ -3,7 +3,8 @@ from django.utils.translation import ugettext_lazy as _
 from mayan.apps.smart_settings.classes import SettingNamespace
 
 from .literals import (
-    DEFAULT_OCR_AUTO_OCR, DEFAULT_OCR_BACKEND, DEFAULT_OCR_BACKEND_ARGUMENTS
+    DEFAULT_OCR_AUTO_OCR, DEFAULT_OCR_BACKEND, DEFAULT_OCR_BACKEND_ARGUMENTS,
+    DEFAULT_OCR_PAGE_BATCH_SIZE
 )
 from .setting_migrations import OCRSettingMigration
 
@@ -26,3 +27,12 @@ setting_ocr_backend_arguments = namespace.add_setting(
     default=DEFAULT_OCR_BACKEND_ARGUMENTS,
     global_name='OCR_BACKEND_ARGUMENTS'
 )
+setting_ocr_page_batch_size = namespace.add_setting(
+    default=DEFAULT_OCR_PAGE_BATCH_SIZE, global_name='OCR_PAGE_BATCH_SIZE',
+    help_text=_(
+        'Number of document version pages processed by each OCR task. '
+        'Larger batches reduce the number of task messages and database '
+        'queries while smaller batches spread the pages of a document '
+        'among more workers.'
+    )
+)
@@ -4,13 +4,14 @@ from celery import chord
 
 from django.apps import apps
 from django.contrib.auth import get_user_model
-from django.db import OperationalError
+from django.db import DatabaseError, OperationalError, transaction
 
 from mayan.apps.lock_manager.exceptions import LockError
 from mayan.celery import app
 
 from .events import event_ocr_document_version_finished
 from .literals import TASK_DOCUMENT_VERSION_PAGE_OCR_RETRY_DELAY
+from .settings import setting_ocr_page_batch_size
 from .signals import signal_post_document_version_ocr
 
 logger = logging.getLogger(name=__name__)
@@ -30,12 +31,21 @@ def task_document_version_ocr_process(self, document_version_id, user_id=None):
     )
 
     try:
+        document_version_page_id_list = list(
+            document_version.pages.values_list('pk', flat=True)
+        )
+        batch_size = max(1, setting_ocr_page_batch_size.value)
+
+        batch_starts = range(0, len(document_version_page_id_list), batch_size)
+
         document_version_page_tasks = []
-        for document_version_page in document_version.pages.all():
+        for batch_number, index in enumerate(iterable=batch_starts, start=1):
             document_version_page_tasks.append(
-                task_document_version_page_ocr_process.s(
-                    document_version_page_id=document_version_page.pk,
-                    user_id=user_id
+                task_document_version_page_ocr_process_batch.s(
+                    batch_count=len(batch_starts), batch_number=batch_number,
+                    document_version_page_id_list=document_version_page_id_list[
+                        index:index + batch_size
+                    ], user_id=user_id
                 )
             )
         chord(document_version_page_tasks)(
@@ -91,6 +101,174 @@ def task_document_version_page_ocr_process(
         raise self.retry(exc=exception)
 
 
+def _document_version_pages_base_images_generate(document_version_pages):
+    """
+    Rasterize the base images of the source document file pages of a batch
+    with one converter pass per document file instead of one pass per page.
+    The converter splits the pages into bounded runs of contiguous pages.
+    """
+    ContentType = apps.get_model(
+        app_label='contenttypes', model_name='ContentType'
+    )
+    DocumentFilePage = apps.get_model(
+        app_label='documents', model_name='DocumentFilePage'
+    )
+
+    content_type = ContentType.objects.get_for_model(model=DocumentFilePage)
+
+    document_file_pages = DocumentFilePage.objects.filter(
+        pk__in=[
+            document_version_page.object_id for document_version_page in document_version_pages
+            if document_version_page.content_type_id == content_type.pk
+        ]
+    ).select_related('document_file')
+
+    document_file_page_numbers = {}
+    for document_file_page in document_file_pages:
+        document_file_page_numbers.setdefault(
+            document_file_page.document_file, []
+        ).append(document_file_page.page_number)
+
+    for document_file, page_numbers in document_file_page_numbers.items():
+        try:
+            document_file.page_base_images_generate(page_numbers=page_numbers)
+        except Exception as exception:
+            # Non fatal, each page will generate its own base image.
+            logger.warning(
+                'Unable to prefetch the page base images of document '
+                'file %s; %s', document_file, exception
+            )
+
+
+def _document_version_pages_contents_store(contents):
+    """
+    Store the OCR content of a batch with a single call. If the batch
+    can't be stored, store each page on its own so that a page that fails
+    doesn't discard the others. Return the IDs of the pages that could not
+    be stored.
+    """
+    DocumentVersionPageOCRContent = apps.get_model(
+        app_label='ocr', model_name='DocumentVersionPageOCRContent'
+    )
+
+    if not contents:
+        return ()
+
+    try:
+        with transaction.atomic():
+            DocumentVersionPageOCRContent.objects.store_contents(
+                contents=contents
+            )
+    except DatabaseError as exception:
+        logger.warning(
+            'Unable to store the OCR content of %d pages in a single '
+            'batch; %s. Storing each page.', len(contents), exception
+        )
+    else:
+        return ()
+
+    failed_page_ids = []
+    for document_version_page_id, content in contents.items():
+        try:
+            with transaction.atomic():
+                DocumentVersionPageOCRContent.objects.store_contents(
+                    contents={document_version_page_id: content}
+                )
+        except DatabaseError as exception:
+            logger.error(
+                'Unable to store the OCR content of document version '
+                'page: %d; %s', document_version_page_id, exception
+            )
+            failed_page_ids.append(document_version_page_id)
+
+    return failed_page_ids
+
+
+@app.task(
+    bind=True, default_retry_delay=TASK_DOCUMENT_VERSION_PAGE_OCR_RETRY_DELAY
+)
+def task_document_version_page_ocr_process_batch(
+    self, document_version_page_id_list, user_id=None, batch_number=None,
+    batch_count=None
+):
+    """
+    OCR a batch of document version pages. The content of the pages is
+    stored with a single call at the end of the batch or when an error
+    stops it, so that an error doesn't discard the pages already
+    processed. On a retriable error only the remaining pages and the pages
+    that could not be stored are retried.
+    The batch number and count are only used to report the progress of the
+    OCR in the task manager and the logs.
+    """
+    CachePartitionFile = apps.get_model(
+        app_label='file_caching', model_name='CachePartitionFile'
+    )
+    DocumentVersionPageOCRContent = apps.get_model(
+        app_label='ocr', model_name='DocumentVersionPageOCRContent'
+    )
+    DocumentVersionPage = apps.get_model(
+        app_label='documents', model_name='DocumentVersionPage'
+    )
+    document_version_pages = DocumentVersionPage.objects.filter(
+        pk__in=document_version_page_id_list
+    ).select_related('document_version__document').order_by('page_number')
+
+    User = get_user_model()
+
+    if user_id:
+        user = User.objects.get(pk=user_id)
+    else:
+        user = None
+
+    _document_version_pages_base_images_generate(
+        document_version_pages=document_version_pages
+    )
+
+    contents = {}
+    retry_exception = None
+    total = len(document_version_pages)
+
+    try:
+        for index, document_version_page in enumerate(
+            iterable=document_version_pages, start=1
+        ):
+            contents[document_version_page.pk] = DocumentVersionPageOCRContent.objects.get_document_version_page_content(
+                document_version_page=document_version_page, user=user
+            )
+            logger.info(
+                'OCR batch %s of %s progress for document version: %s; '
+                'page %d (%d/%d)', batch_number, batch_count,
+                document_version_page.document_version,
+                document_version_page.page_number, index, total
+            )
+    except (CachePartitionFile.DoesNotExist, LockError, OperationalError) as exception:
+        if isinstance(exception, CachePartitionFile.DoesNotExist):
+            logger.info(
+                'Document version page image not found. Possible cause '
+                'overloaded system or cache size too small. Retrying task.',
+            )
+
+        retry_exception = exception
+    except Exception:
+        _document_version_pages_contents_store(contents=contents)
+        raise
+
+    failed_page_ids = _document_version_pages_contents_store(
+        contents=contents
+    )
+
+    if retry_exception or failed_page_ids:
+        raise self.retry(
+            exc=retry_exception, kwargs={
+                'batch_count': batch_count, 'batch_number': batch_number,
+                'document_version_page_id_list': [
+                    document_version_page.pk for document_version_page in document_version_pages
+                    if document_version_page.pk not in contents or document_version_page.pk in failed_page_ids
+                ], 'user_id': user_id
+            }
+        )
+
+
 @app.task(bind=True, ignore_result=True)
 def task_document_version_ocr_finished(self, results, document_version_id, user_id=None):
     logger.info(
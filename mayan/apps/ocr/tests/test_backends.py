@@ -0,0 +1,77 @@
+import mock
+
+from mayan.apps.documents.tests.base import GenericDocumentTestCase
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..backends.tesserocr import TesserOCR
+from ..classes import OCRBackendBase
+
+
+class OCRBackendInstanceTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        OCRBackendBase._local.__dict__.clear()
+
+    def tearDown(self):
+        OCRBackendBase._local.__dict__.clear()
+        super().tearDown()
+
+    @mock.patch('mayan.apps.ocr.classes.import_string')
+    def test_instance_reuse(self, mock_import_string):
+        instance = OCRBackendBase.get_instance()
+
+        self.assertEqual(OCRBackendBase.get_instance(), instance)
+        self.assertEqual(mock_import_string.return_value.call_count, 1)
+
+    @mock.patch('mayan.apps.ocr.classes.import_string')
+    @mock.patch('mayan.apps.ocr.classes.setting_ocr_backend_arguments')
+    def test_instance_arguments_change(
+        self, mock_setting_ocr_backend_arguments, mock_import_string
+    ):
+        mock_setting_ocr_backend_arguments.value = {}
+        OCRBackendBase.get_instance()
+
+        mock_setting_ocr_backend_arguments.value = {'timeout': 1}
+        OCRBackendBase.get_instance()
+
+        self.assertEqual(mock_import_string.return_value.call_count, 2)
+
+
+@mock.patch('mayan.apps.ocr.backends.tesserocr.tesserocr')
+class TesserOCRBackendTestCase(GenericDocumentTestCase):
+    def _get_test_backend(self, mock_tesserocr, **kwargs):
+        mock_tesserocr.get_languages.return_value = ('', ['deu', 'eng'])
+        mock_tesserocr.PyTessBaseAPI.side_effect = lambda **kwargs: mock.MagicMock()
+
+        return TesserOCR(**kwargs)
+
+    def _execute_test_backend(self, backend, language=None):
+        with self.test_document_file.open() as file_object:
+            return backend.execute(file_object=file_object, language=language)
+
+    def test_language_model_reuse(self, mock_tesserocr):
+        backend = self._get_test_backend(mock_tesserocr=mock_tesserocr)
+
+        self._execute_test_backend(backend=backend, language='eng')
+        self._execute_test_backend(backend=backend, language='eng')
+
+        self.assertEqual(mock_tesserocr.PyTessBaseAPI.call_count, 1)
+
+    def test_language_model_preload(self, mock_tesserocr):
+        self._get_test_backend(
+            mock_tesserocr=mock_tesserocr, preload_languages=('deu',)
+        )
+
+        mock_tesserocr.PyTessBaseAPI.assert_called_once_with(lang='deu')
+
+    def test_language_model_maximum(self, mock_tesserocr):
+        backend = self._get_test_backend(
+            maximum_languages=1, mock_tesserocr=mock_tesserocr
+        )
+
+        self._execute_test_backend(backend=backend, language='eng')
+        api = backend.apis['eng']
+        self._execute_test_backend(backend=backend, language='deu')
+
+        self.assertEqual(list(backend.apis.keys()), ['deu'])
+        api.End.assert_called_once()
@@ -1,7 +1,20 @@
+import mock
+
+from django.db import DataError
 from django.test import override_settings
 
 from mayan.apps.documents.tests.base import GenericDocumentTestCase
-from mayan.apps.documents.tests.literals import TEST_DEU_DOCUMENT_PATH
+from mayan.apps.documents.tests.literals import (
+    TEST_DEU_DOCUMENT_PATH, TEST_MULTI_PAGE_TIFF
+)
+
+from ..managers import DocumentVersionPageOCRContentManager
+from ..models import DocumentVersionPageOCRContent
+from ..settings import setting_ocr_page_batch_size
+from ..tasks import (
+    task_document_version_ocr_process,
+    task_document_version_page_ocr_process_batch
+)
 
 from .literals import (
     TEST_DOCUMENT_VERSION_OCR_CONTENT, TEST_DOCUMENT_VERSION_OCR_CONTENT_DEU_1,
@@ -30,3 +43,155 @@ class GermanOCRSupportTestCase(GenericDocumentTestCase):
         self.assertTrue(
             TEST_DOCUMENT_VERSION_OCR_CONTENT_DEU_2 in content
         )
+
+
+class DocumentVersionPageOCRContentManagerTestCase(GenericDocumentTestCase):
+    test_document_filename = TEST_MULTI_PAGE_TIFF
+
+    def test_method_store_contents(self):
+        document_version_pages = list(self.test_document_version.pages.all())
+
+        DocumentVersionPageOCRContent.objects.create(
+            document_version_page=document_version_pages[0], content='old'
+        )
+
+        DocumentVersionPageOCRContent.objects.store_contents(
+            contents={
+                document_version_page.pk: 'page {}'.format(
+                    document_version_page.page_number
+                ) for document_version_page in document_version_pages
+            }
+        )
+
+        self.assertEqual(
+            DocumentVersionPageOCRContent.objects.count(),
+            len(document_version_pages)
+        )
+        for document_version_page in document_version_pages:
+            document_version_page.refresh_from_db()
+            self.assertEqual(
+                document_version_page.ocr_content.content,
+                'page {}'.format(document_version_page.page_number)
+            )
+
+
+class DocumentVersionOCRBatchTaskTestCase(GenericDocumentTestCase):
+    test_document_filename = TEST_MULTI_PAGE_TIFF
+
+    def setUp(self):
+        super().setUp()
+        self.old_setting_ocr_page_batch_size = setting_ocr_page_batch_size.value
+        setting_ocr_page_batch_size.set(value=1)
+        self.addCleanup(
+            setting_ocr_page_batch_size.set,
+            value=self.old_setting_ocr_page_batch_size
+        )
+
+    @mock.patch('mayan.apps.ocr.managers.OCRBackendBase.get_instance')
+    def test_batched_ocr(self, mock_get_instance):
+        mock_get_instance.return_value.execute.return_value = 'content'
+
+        with mock.patch(
+            'mayan.apps.ocr.tasks.task_document_version_page_ocr_process_batch.s',
+            wraps=task_document_version_page_ocr_process_batch.s
+        ) as mock_signature:
+            task_document_version_ocr_process.apply(
+                kwargs={'document_version_id': self.test_document_version.pk}
+            )
+
+        page_count = self.test_document_version.pages.count()
+        self.assertTrue(page_count > 1)
+        self.assertEqual(mock_signature.call_count, page_count)
+        self.assertEqual(
+            mock_signature.call_args[1]['batch_count'], page_count
+        )
+        self.assertEqual(
+            DocumentVersionPageOCRContent.objects.filter(
+                document_version_page__document_version=self.test_document_version,
+                content='content'
+            ).count(), page_count
+        )
+
+    @mock.patch('mayan.apps.ocr.managers.OCRBackendBase.get_instance')
+    def test_batched_ocr_error(self, mock_get_instance):
+        self._silence_logger(name='mayan.apps.ocr.managers')
+        mock_get_instance.return_value.execute.side_effect = (
+            'content', ValueError
+        )
+
+        with self.assertRaises(expected_exception=ValueError):
+            task_document_version_page_ocr_process_batch.apply(
+                kwargs={
+                    'document_version_page_id_list': list(
+                        self.test_document_version.pages.values_list(
+                            'pk', flat=True
+                        )
+                    )
+                }
+            )
+
+        self.assertEqual(
+            DocumentVersionPageOCRContent.objects.filter(
+                document_version_page=self.test_document_version.pages.first(),
+                content='content'
+            ).count(), 1
+        )
+
+    @mock.patch('mayan.apps.ocr.managers.OCRBackendBase.get_instance')
+    def test_batched_ocr_single_store(self, mock_get_instance):
+        mock_get_instance.return_value.execute.return_value = 'content'
+
+        with mock.patch.object(
+            DocumentVersionPageOCRContentManager, 'store_contents',
+            autospec=True,
+            side_effect=DocumentVersionPageOCRContentManager.store_contents
+        ) as mock_store_contents:
+            task_document_version_page_ocr_process_batch.apply(
+                kwargs={
+                    'document_version_page_id_list': list(
+                        self.test_document_version.pages.values_list(
+                            'pk', flat=True
+                        )
+                    )
+                }
+            )
+
+        self.assertEqual(mock_store_contents.call_count, 1)
+        self.assertEqual(
+            DocumentVersionPageOCRContent.objects.filter(
+                content='content'
+            ).count(), self.test_document_version.pages.count()
+        )
+
+    @mock.patch('mayan.apps.ocr.managers.OCRBackendBase.get_instance')
+    def test_batched_ocr_store_error(self, mock_get_instance):
+        self._silence_logger(name='mayan.apps.ocr.tasks')
+        mock_get_instance.return_value.execute.return_value = 'content'
+
+        store_contents = DocumentVersionPageOCRContentManager.store_contents
+
+        def side_effect(manager, contents):
+            if len(contents) > 1:
+                raise DataError
+
+            return store_contents(manager, contents=contents)
+
+        with mock.patch.object(
+            DocumentVersionPageOCRContentManager, 'store_contents',
+            autospec=True, side_effect=side_effect
+        ):
+            task_document_version_page_ocr_process_batch.apply(
+                kwargs={
+                    'document_version_page_id_list': list(
+                        self.test_document_version.pages.values_list(
+                            'pk', flat=True
+                        )
+                    )
+                }
+            )
+
+        self.assertEqual(
+            DocumentVersionPageOCRContent.objects.filter(
+                content='content'
+            ).count(), self.test_document_version.pages.count()
+        )
@@ -12,6 +12,7 @@ from actstream.models import Action
 from mayan.apps.common.signals import signal_mayan_pre_save
 from mayan.apps.documents.events import event_document_created
 from mayan.apps.documents.models import Document, DocumentFile
+from mayan.apps.events.classes import EventRetentionProtection
 from mayan.apps.user_management.querysets import get_user_queryset
 
 from .classes import QuotaBackend
@@ -87,6 +88,11 @@ class DocumentCountQuota(
         Document.register_pre_create_hook(
             func=hook_factory_document_check_quota(klass=cls)
         )
+        # The documents created by each user are counted from the
+        # document creation events, keep them from being pruned.
+        EventRetentionProtection.register(
+            event_types=(event_document_created,)
+        )
 
     def __init__(
         self, document_type_all, document_type_ids, documents_limit,
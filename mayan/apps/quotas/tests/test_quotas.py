@@ -1,6 +1,13 @@
+from datetime import timedelta
 import logging
 
+from actstream.models import Action
+
+from django.utils.timezone import now
+
 from mayan.apps.documents.tests.base import GenericDocumentTestCase
+from mayan.apps.events.models import EventArchive
+from mayan.apps.events.settings import setting_retention_default_period
 from mayan.apps.user_management.tests.mixins import GroupTestMixin
 
 from ..exceptions import QuotaExceeded
@@ -113,6 +120,28 @@ class DocumentCountQuotaTestCase(GroupTestMixin, GenericDocumentTestCase):
 
         self._upload_test_document(_user=self.test_superuser)
 
+    def test_user_all_document_type_all_after_event_prune(self):
+        self.addCleanup(
+            setting_retention_default_period.set,
+            value=setting_retention_default_period.value
+        )
+        setting_retention_default_period.set(value=30)
+
+        Action.objects.update(timestamp=now() - timedelta(days=60))
+        EventArchive.objects.prune()
+
+        self.test_quota = DocumentCountQuota.create(
+            documents_limit=1,
+            document_type_all=True,
+            document_type_ids=(),
+            group_ids=(),
+            user_all=True,
+            user_ids=(),
+        )
+
+        with self.assertRaises(expected_exception=QuotaExceeded):
+            self._upload_test_document()
+
 
 class DocumentSizeQuotaTestCase(GroupTestMixin, GenericDocumentTestCase):
     auto_upload_test_document = False
@@ -1,3 +1,4 @@
+import functools
 import hashlib
 
 from django.template import Context, Engine, Template as DjangoTemplate
@@ -6,6 +7,8 @@ from django.urls import reverse
 
 from mayan.apps.common.settings import setting_home_view
 
+from .literals import TEMPLATE_COMPILED_CACHE_MAXIMUM_SIZE
+
 
 class AJAXTemplate:
     _registry = {}
@@ -52,16 +55,31 @@ class AJAXTemplate:
 
 
 class Template:
-    def __init__(self, template_string):
-        engine = Engine(
+    """
+    Django template rendered with the templating builtins. The engine is
+    created once per process and the compiled templates are kept in a
+    least recently used cache keyed by the template string.
+    """
+    @staticmethod
+    @functools.lru_cache(maxsize=TEMPLATE_COMPILED_CACHE_MAXIMUM_SIZE)
+    def get_compiled_template(template_string):
+        return DjangoTemplate(
+            engine=Template.get_engine(), template_string=template_string
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def get_engine():
+        return Engine(
             builtins=[
                 'mathfilters.templatetags.mathfilters',
                 'mayan.apps.templating.templatetags.templating_tags',
             ]
         )
 
-        self._template = DjangoTemplate(
-            engine=engine, template_string=template_string
+    def __init__(self, template_string):
+        self._template = Template.get_compiled_template(
+            template_string=template_string
         )
 
     def render(self, context=None):
@@ -1 +1,3 @@
 EMPTY_LABEL = '---------'
+
+TEMPLATE_COMPILED_CACHE_MAXIMUM_SIZE = 1000
@@ -0,0 +1,13 @@
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..classes import Template
+
+
+class TemplateTestCase(BaseTestCase):
+    def test_compiled_template_reuse(self):
+        template = Template(template_string='{{ 1|add:1 }}')
+
+        self.assertTrue(
+            Template(template_string='{{ 1|add:1 }}')._template is template._template
+        )
+        self.assertEqual(template.render(), '2')
@@ -479,6 +479,16 @@ class TestModelTestCaseMixin(ContentTypeTestCaseMixin, PermissionTestMixin):
                 content_type.delete()
             ModelPermission.deregister(model=model)
 
+            # Remove the model from the registry too, otherwise its reverse
+            # relations remain and are collected by later deletions after
+            # the table was rolled back.
+            apps.all_models[model._meta.app_label].pop(
+                model._meta.model_name, None
+            )
+
+        if self._test_models:
+            apps.clear_cache()
+
         super().tearDown()
 
     def _create_test_model(
@@ -574,7 +584,7 @@ class TestModelTestCaseMixin(ContentTypeTestCaseMixin, PermissionTestMixin):
         def save(instance, *args, **kwargs):
             # Custom .save() method to use random primary key values.
             if instance.pk:
-                return models.Model.self(instance, *args, **kwargs)
+                return models.Model.save(instance, *args, **kwargs)
             else:
                 instance.pk = RandomPrimaryKeyModelMonkeyPatchMixin.get_unique_primary_key(
                     model=instance._meta.model
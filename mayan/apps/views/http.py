@@ -1,9 +1,14 @@
 import copy
+import re
 from urllib.parse import urlsplit, urlunsplit
 
-from django.http import QueryDict
+from django.http import HttpResponse, QueryDict, StreamingHttpResponse
 from django.urls import reverse
 
+from .literals import HTTP_RANGE_CHUNK_SIZE
+
+RANGE_HEADER_REGEX = re.compile(r'^bytes=(\d*)-(\d*)$')
+
 
 class URL:
     def __init__(
@@ -87,3 +92,105 @@ class URL:
         split_result = split_result._replace(query=query_string)
 
         return urlunsplit(split_result)
+
+
+def get_range(request, size, etag=None):
+    """
+    Return the (start, end) inclusive byte positions of a single range
+    `Range` request header. Return None to serve the entire content and
+    raise ValueError if the range can't be satisfied. Multiple ranges are
+    not supported and are served as the entire content.
+    """
+    header = request.META.get('HTTP_RANGE')
+
+    if not header:
+        return None
+
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range != etag:
+        return None
+
+    match = RANGE_HEADER_REGEX.match(header.strip())
+    if not match:
+        return None
+
+    start, end = match.groups()
+
+    if not start and not end:
+        return None
+
+    if not start:
+        # Suffix range, the last `end` bytes.
+        start = max(size - int(end), 0)
+        end = size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+
+    if start > end or start >= size:
+        raise ValueError('Range not satisfiable.')
+
+    return start, end
+
+
+def get_range_response(
+    request, content_type, content=None, etag=None, file_open=None,
+    size=None
+):
+    """
+    Return a response for the `content` bytes or for the file opened by the
+    `file_open` context manager factory honoring `Range` request headers.
+    Files are streamed and remain open until the response is consumed.
+    """
+    if content is not None:
+        size = len(content)
+
+    try:
+        byte_range = get_range(request=request, etag=etag, size=size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = 'bytes */{}'.format(size)
+        return response
+
+    if byte_range:
+        start, end = byte_range
+    else:
+        start, end = 0, size - 1
+
+    length = end - start + 1
+
+    if content is not None:
+        response = HttpResponse(
+            content=content[start:end + 1], content_type=content_type
+        )
+    else:
+        response = StreamingHttpResponse(
+            content_type=content_type, streaming_content=iterate_file(
+                file_open=file_open, length=length, start=start
+            )
+        )
+
+    if byte_range:
+        response.status_code = 206
+        response['Content-Range'] = 'bytes {}-{}/{}'.format(start, end, size)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Length'] = length
+
+    if etag:
+        response['ETag'] = etag
+
+    return response
+
+
+def iterate_file(file_open, length, start=0):
+    with file_open() as file_object:
+        file_object.seek(start)
+
+        while length > 0:
+            chunk = file_object.read(min(HTTP_RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+
+            length -= len(chunk)
+            yield chunk
@@ -1,5 +1,7 @@
 DEFAULT_VIEWS_PAGINATE_BY = 40
 
+HTTP_RANGE_CHUNK_SIZE = 64 * 2 ** 10  # 64 Kilobytes
+
 LIST_MODE_CHOICE_LIST = 'list'
 LIST_MODE_CHOICE_ITEM = 'item'
 